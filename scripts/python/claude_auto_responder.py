@@ -21,13 +21,21 @@ Claude Auto Responder (claude-auto-responder)
 """
 
 import argparse
+import asyncio
+import ctypes
+import hashlib
 import json
 import os
 import re
+import select
+import shlex
 import signal
+import struct
 import subprocess
 import sys
+import threading
 import time
+from collections import OrderedDict
 from dataclasses import dataclass
 from datetime import datetime
 from fnmatch import fnmatch
@@ -52,6 +60,12 @@ class SafetyPolicyError(Exception):
     pass
 
 
+class SupervisorConfigError(Exception):
+    """Raised when the --supervise session config file is invalid."""
+
+    pass
+
+
 # ============================================================================
 # Dataclasses (Task 1.5)
 # ============================================================================
@@ -213,6 +227,94 @@ def extract_pending_tool_use(records: list) -> Optional[PendingToolUse]:
     return None
 
 
+class JsonlTail:
+    """增量读取 jsonl：只解析上次读取之后新追加的完整行。
+
+    offset 指向最后一个已处理完整行的末尾，逐行推进：未写完的尾行留到下次
+    poll 再读，格式异常的记录单独跳过，不会丢掉同一批中后面的行。文件被截断
+    （size < offset）或被替换（inode 变化）时从头重新读取。未应答的 tool_use
+    随读随更新：tool_use 加入、tool_result 移除，所以每次 poll 的开销只与新增
+    字节数成正比。结果与 ``extract_pending_tool_use(parse_jsonl(path))`` 一致。
+    """
+
+    def __init__(self, path):
+        self._path = Path(path)
+        self._reset(None)
+
+    def _reset(self, file_id: Optional[tuple]) -> None:
+        self._file_id = file_id
+        self._offset = 0
+        self._unresolved: dict = {}  # tool_use_id -> PendingToolUse, 按出现顺序
+        self._answered_ids: set = set()
+
+    @property
+    def offset(self) -> int:
+        return self._offset
+
+    def poll(self) -> int:
+        """读取新追加的内容并更新状态，返回本次解析的完整行数。"""
+        try:
+            st = os.stat(self._path)
+        except OSError:
+            self._reset(None)
+            return 0
+
+        file_id = (st.st_dev, st.st_ino)
+        if file_id != self._file_id or st.st_size < self._offset:
+            self._reset(file_id)
+        if st.st_size == self._offset:
+            return 0
+
+        try:
+            with open(self._path, "rb") as f:
+                f.seek(self._offset)
+                chunk = f.read()
+        except OSError:
+            return 0
+
+        *lines, _partial = chunk.split(b"\n")
+        for raw in lines:
+            line = raw.decode("utf-8", errors="replace").strip()
+            if line:
+                try:
+                    self._apply(json.loads(line))
+                except (ValueError, TypeError, AttributeError, KeyError):
+                    pass  # 格式异常的记录跳过，不影响后面的行
+            self._offset += len(raw) + 1
+        return len(lines)
+
+    def _apply(self, rec) -> None:
+        if not isinstance(rec, dict):
+            return
+        content = (rec.get("message") or {}).get("content")
+        if not isinstance(content, list):
+            return
+        rec_type = rec.get("type")
+        for block in content:
+            if not isinstance(block, dict):
+                continue
+            if rec_type == "assistant" and block.get("type") == "tool_use":
+                tid = block.get("id")
+                if not tid or tid in self._answered_ids:
+                    continue
+                # 重复的 id 以最后一次出现的位置为准
+                self._unresolved.pop(tid, None)
+                self._unresolved[tid] = PendingToolUse(
+                    tool_use_id=tid, name=block.get("name", ""), input=block.get("input", {})
+                )
+            elif rec_type == "user" and block.get("type") == "tool_result":
+                tid = block.get("tool_use_id")
+                if tid:
+                    self._answered_ids.add(tid)
+                    self._unresolved.pop(tid, None)
+
+    def pending(self) -> Optional[PendingToolUse]:
+        """返回最近一个尚未应答的 tool_use。"""
+        if not self._unresolved:
+            return None
+        return self._unresolved[next(reversed(self._unresolved))]
+
+
 # ============================================================================
 # PathChecker (Task 3.2)
 # ============================================================================
@@ -337,30 +439,100 @@ DANGEROUS_PATTERNS = (
 )
 
 
-def _classify_segment(segment: str, project_root: Path, policy: Optional[dict] = None) -> tuple:
+class PrefixTrie:
+    """前缀 trie：返回列表中最靠前的、是 text 前缀的模式。
+
+    与按列表顺序逐个 ``text.startswith(pat)`` 的结果相同，但只需沿 text 走一遍，
+    开销与模式数量无关。
+    """
+
+    _END = ""  # 节点上记录模式下标的键（单字符键不会与之冲突）
+
+    def __init__(self, patterns):
+        self.patterns = list(patterns)
+        self._root: dict = {}
+        for index, pat in enumerate(self.patterns):
+            node = self._root
+            for ch in pat:
+                node = node.setdefault(ch, {})
+            node.setdefault(self._END, index)
+
+    def first_match(self, text: str) -> Optional[str]:
+        node = self._root
+        best = node.get(self._END)
+        for ch in text:
+            node = node.get(ch)
+            if node is None:
+                break
+            index = node.get(self._END)
+            if index is not None and (best is None or index < best):
+                best = index
+        return None if best is None else self.patterns[best]
+
+
+class SubstringMatcher:
+    """子串黑名单：返回列表中最靠前的、出现在 text 中的模式。
+
+    用一个合并的正则做预筛（C 实现，一次扫描）；只有命中时才按列表顺序确定
+    具体模式，与逐个 ``pat in text`` 的结果相同。
+    """
+
+    def __init__(self, patterns):
+        self.patterns = list(patterns)
+        self._any = re.compile("|".join(re.escape(pat) for pat in self.patterns)) if self.patterns else None
+
+    def first_match(self, text: str) -> Optional[str]:
+        if self._any is None or not self._any.search(text):
+            return None
+        for pat in self.patterns:
+            if pat in text:
+                return pat
+        return None
+
+
+class CompiledPolicy:
+    """加载时编译一次的安全策略，供 Bash 命令分类使用。"""
+
+    def __init__(self, policy: Optional[dict] = None):
+        self.policy = policy or {}
+        self.deny_commands = PrefixTrie(self.policy.get("deny_commands", []))
+        self.allow_commands = PrefixTrie(self.policy.get("allow_commands", []))
+        self.allow_paths_outside_project = list(self.policy.get("allow_paths_outside_project", []))
+
+
+def compile_policy(policy) -> CompiledPolicy:
+    """dict（或 None）编译为 CompiledPolicy；已编译的原样返回。"""
+    if isinstance(policy, CompiledPolicy):
+        return policy
+    return CompiledPolicy(policy)
+
+
+_SAFE_PREFIX_TRIE = PrefixTrie(SAFE_PREFIXES)
+_DANGEROUS_MATCHER = SubstringMatcher(DANGEROUS_PATTERNS)
+
+
+def _classify_segment(segment: str, project_root: Path, policy=None) -> tuple:
     segment = segment.strip()
     if not segment:
         return ("DANGEROUS", "空命令")
 
-    policy = policy or {}
-    policy_deny = policy.get("deny_commands", [])
-    policy_allow = policy.get("allow_commands", [])
+    compiled = compile_policy(policy)
 
-    for pat in policy_deny:
-        if segment.startswith(pat):
-            return ("DANGEROUS", f"策略拒绝: {pat}")
+    pat = compiled.deny_commands.first_match(segment)
+    if pat is not None:
+        return ("DANGEROUS", f"策略拒绝: {pat}")
 
-    for pat in policy_allow:
-        if segment.startswith(pat):
-            return ("SAFE", f"策略允许: {pat}")
+    pat = compiled.allow_commands.first_match(segment)
+    if pat is not None:
+        return ("SAFE", f"策略允许: {pat}")
 
-    for pat in DANGEROUS_PATTERNS:
-        if pat in segment:
-            return ("DANGEROUS", f"黑名单: {pat.strip()}")
+    pat = _DANGEROUS_MATCHER.first_match(segment)
+    if pat is not None:
+        return ("DANGEROUS", f"黑名单: {pat.strip()}")
 
     # Check redirect to outside project (before whitelist — redirect overrides safety)
     if ">" in segment:
-        allow_outside = policy.get("allow_paths_outside_project", [])
+        allow_outside = compiled.allow_paths_outside_project
         parts = segment.split(">")
         for part in parts[1:]:
             redir_path = part.strip().split()[0] if part.strip() else ""
@@ -369,9 +541,9 @@ def _classify_segment(segment: str, project_root: Path, policy: Optional[dict] =
                     continue
                 return ("DANGEROUS", f"重定向到项目外: {redir_path}")
 
-    for prefix in SAFE_PREFIXES:
-        if segment.startswith(prefix):
-            return ("SAFE", f"白名单前缀: {prefix}")
+    prefix = _SAFE_PREFIX_TRIE.first_match(segment)
+    if prefix is not None:
+        return ("SAFE", f"白名单前缀: {prefix}")
 
     first_token = segment.split()[0] if segment.split() else ""
     if first_token in SAFE_COMMANDS:
@@ -380,10 +552,16 @@ def _classify_segment(segment: str, project_root: Path, policy: Optional[dict] =
     return ("UNKNOWN", f"未知命令: {first_token}")
 
 
-def classify_bash_command(command: str, project_root: Path, policy: Optional[dict] = None) -> tuple:
+def classify_bash_command(command: str, project_root: Path, policy=None) -> tuple:
+    """对 Bash 命令分类，返回 (SAFE|DANGEROUS|UNKNOWN, 原因)。
+
+    policy 可以是策略 dict 或 CompiledPolicy；调用方应复用编译结果
+    （SafetyPolicyEngine 在构造时编译一次）。
+    """
     if not command or not command.strip():
         return ("DANGEROUS", "空命令")
 
+    compiled = compile_policy(policy)
     segments = re.split(r"\s*(?:&&|\|\||;)\s*", command)
 
     # Also split by pipe and check all segments
@@ -396,7 +574,7 @@ def classify_bash_command(command: str, project_root: Path, policy: Optional[dic
     for seg in all_segments:
         if not seg.strip():
             continue
-        cat, reason = _classify_segment(seg.strip(), project_root, policy)
+        cat, reason = _classify_segment(seg.strip(), project_root, compiled)
         if cat == "DANGEROUS":
             return ("DANGEROUS", reason)
         if cat == "UNKNOWN":
@@ -416,13 +594,112 @@ ALWAYS_ALLOW_TOOLS = frozenset(["Read", "Grep", "Glob"])
 PATH_TOOLS = frozenset(["Edit", "Write", "NotebookEdit"])
 
 
+DEFAULT_DECISION_CACHE_SIZE = 1024
+
+
+class DecisionCache:
+    """有界 LRU 决策缓存，带命中/未命中计数。maxsize 为 0 时不缓存。
+
+    多会话模式下多个会话的 tick 可能在不同线程里同时查询，所有读写都在锁内。
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_DECISION_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, key) -> Optional[PolicyDecision]:
+        with self._lock:
+            decision = self._entries.get(key)
+            if decision is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return decision
+
+    def put(self, key, decision: PolicyDecision) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = decision
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.invalidations += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+            }
+
+
+def _decision_cache_key(tool_name: str, tool_input: dict) -> Optional[tuple]:
+    """只取决定结果的输入字段作为缓存键；无法安全作为键时返回 None（不缓存）。"""
+    if tool_name == "Bash":
+        cmd = tool_input.get("command")
+        return (tool_name, cmd) if isinstance(cmd, str) else None
+    if tool_name in PATH_TOOLS:
+        fp = tool_input.get("file_path")
+        return (tool_name, fp) if isinstance(fp, str) else None
+    # 其余工具的判定只取决于工具名
+    return (tool_name,)
+
+
 class SafetyPolicyEngine:
-    def __init__(self, project_root: Path, policy: Optional[dict] = None):
+    def __init__(
+        self,
+        project_root: Path,
+        policy: Optional[dict] = None,
+        policy_file: Optional[str] = None,
+        cache_size: int = DEFAULT_DECISION_CACHE_SIZE,
+        source: Optional["PolicySource"] = None,
+    ):
         self._root = project_root
-        self._policy = policy or {}
+        # 同一策略文件可由多个 engine 共用一个 PolicySource（多会话模式）
+        self._source = source if source is not None else PolicySource(policy_file, policy)
+        self._cache = DecisionCache(cache_size)
+        self._generation = self._source.snapshot[0]
+
+    @property
+    def policy_source(self) -> "PolicySource":
+        return self._source
+
+    def cache_stats(self) -> dict:
+        return self._cache.stats()
 
     def evaluate(self, tool_name: str, tool_input: dict) -> PolicyDecision:
-        deny_tools = self._policy.get("deny_tools", [])
+        # 策略文件变化时先重新加载；失败则继续使用上一版有效策略
+        self._source.reload_if_changed()
+        generation, policy, compiled = self._source.snapshot
+        if generation != self._generation:
+            self._generation = generation
+            self._cache.clear()
+
+        key = _decision_cache_key(tool_name, tool_input)
+        if key is None:
+            return self._evaluate(tool_name, tool_input, policy, compiled)
+        key = (generation, *key)
+        decision = self._cache.get(key)
+        if decision is None:
+            decision = self._evaluate(tool_name, tool_input, policy, compiled)
+            self._cache.put(key, decision)
+        return decision
+
+    def _evaluate(self, tool_name: str, tool_input: dict, policy: dict, compiled: CompiledPolicy) -> PolicyDecision:
+        deny_tools = policy.get("deny_tools", [])
         if tool_name in deny_tools:
             return PolicyDecision("DENY", f"策略拒绝工具: {tool_name}")
 
@@ -435,7 +712,7 @@ class SafetyPolicyEngine:
                 return PolicyDecision("DENY", f"{tool_name} 缺少 file_path")
             if is_path_within_project(fp, self._root):
                 return PolicyDecision("ALLOW", f"项目内路径: {fp}")
-            allow_outside = self._policy.get("allow_paths_outside_project", [])
+            allow_outside = policy.get("allow_paths_outside_project", [])
             for pattern in allow_outside:
                 if fnmatch(fp, pattern):
                     return PolicyDecision("ALLOW", f"策略允许外部路径: {pattern}")
@@ -445,12 +722,12 @@ class SafetyPolicyEngine:
             cmd = tool_input.get("command")
             if not cmd:
                 return PolicyDecision("DENY", "Bash 缺少 command")
-            cat, reason = classify_bash_command(cmd, self._root, self._policy)
+            cat, reason = classify_bash_command(cmd, self._root, compiled)
             if cat == "SAFE":
                 return PolicyDecision("ALLOW", reason)
             return PolicyDecision("DENY", reason)
 
-        if self._policy.get("allow_unknown_tools", False):
+        if policy.get("allow_unknown_tools", False):
             return PolicyDecision("ALLOW", f"策略允许未知工具: {tool_name}")
 
         return PolicyDecision("DENY", f"未知工具默认拒绝: {tool_name}")
@@ -474,40 +751,236 @@ def load_safety_policy(path: Optional[str]) -> Optional[dict]:
         raise SafetyPolicyError(f"安全策略文件读取失败: {e}") from e
 
 
+def policy_version(policy: Optional[dict]) -> str:
+    """策略内容的短哈希；未提供策略文件时为 builtin。"""
+    if policy is None:
+        return "builtin"
+    canonical = json.dumps(policy, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:12]
+
+
+def _file_signature(path: str) -> Optional[tuple]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_ino, st.st_size, st.st_mtime_ns)
+
+
+class PolicySource:
+    """安全策略的当前有效版本，支持热加载。
+
+    ``reload_if_changed()`` 在策略文件签名（inode/size/mtime）变化时重新解析并
+    编译，成功后以一次赋值原子替换 ``snapshot``（generation, policy, compiled）；
+    新文件无效时保留上一版有效策略并记录 ``last_error``，直到文件再次变化。
+    """
+
+    def __init__(self, path: Optional[str] = None, policy: Optional[dict] = None):
+        self.path = path
+        self._signature = _file_signature(path) if path else None
+        self._lock = threading.Lock()
+        self.last_error: Optional[str] = None
+        self.snapshot = (0, {}, CompiledPolicy())
+        self._install(policy)
+
+    @classmethod
+    def load(cls, path: Optional[str]) -> "PolicySource":
+        """启动时加载；策略文件无效时抛出 SafetyPolicyError。"""
+        signature = _file_signature(path) if path else None
+        source = cls(path, load_safety_policy(path))
+        source._signature = signature
+        return source
+
+    def _install(self, policy: Optional[dict]) -> None:
+        compiled = CompiledPolicy(policy)
+        self.snapshot = (self.snapshot[0] + 1, policy or {}, compiled)
+        self.version = policy_version(policy)
+        self.loaded_at = datetime.now().isoformat(timespec="seconds")
+
+    def reload_if_changed(self) -> Optional[bool]:
+        """Returns: None 未变化；True 已加载新版本；False 新文件无效，沿用上一版。"""
+        if not self.path:
+            return None
+        signature = _file_signature(self.path)
+        if signature == self._signature:
+            return None
+        with self._lock:
+            if signature == self._signature:
+                return None
+            self._signature = signature
+            try:
+                policy = load_safety_policy(self.path)
+                self._install(policy)
+            except SafetyPolicyError as e:
+                self.last_error = str(e)
+                return False
+            except (TypeError, AttributeError) as e:
+                self.last_error = f"安全策略编译失败: {e}"
+                return False
+            self.last_error = None
+            return True
+
+    def info(self) -> dict:
+        return {
+            "path": self.path,
+            "version": self.version,
+            "loaded_at": self.loaded_at,
+            "generation": self.snapshot[0],
+            "last_error": self.last_error,
+        }
+
+
 # ============================================================================
 # ContextLoader + PromptBuilder (Task 4.2)
 # ============================================================================
 
 MAX_CONTEXT_SIZE = 30000
+DEFAULT_CONTEXT_BUDGET = 60000
+# 回答 AskUserQuestion 时参考的项目画像类别（按优先级排列）
+PROFILE_CONTEXT_CATEGORIES = ("constraints", "conventions", "decisions")
 
 
-def load_project_context(project_root: Path) -> dict:
-    ctx = {"claude_md": "", "constitution": ""}
-    claude_md = project_root / "CLAUDE.md"
-    if claude_md.exists():
-        try:
-            text = claude_md.read_text(encoding="utf-8")
-            ctx["claude_md"] = text[:MAX_CONTEXT_SIZE]
-        except OSError:
-            pass
-    constitution = project_root / ".codexspec" / "memory" / "constitution.md"
-    if constitution.exists():
-        try:
-            text = constitution.read_text(encoding="utf-8")
-            ctx["constitution"] = text[:MAX_CONTEXT_SIZE]
-        except OSError:
-            pass
-    return ctx
+@dataclass
+class ContextSnapshot:
+    ctx: dict
+    version: str
+    sources: list
+
+
+def _truncate_utf8(text: str, limit: int) -> str:
+    data = text.encode("utf-8")
+    if len(data) <= limit:
+        return text
+    return data[:limit].decode("utf-8", errors="ignore")
+
+
+def allocate_budget(sizes: list, budget: int) -> list:
+    """按水位线把总字节预算分给各来源：小于平均份额的来源完整保留，剩余份额留给其余来源。"""
+    allocation = [0] * len(sizes)
+    remaining = max(budget, 0)
+    order = sorted(range(len(sizes)), key=lambda i: sizes[i])
+    for n, i in enumerate(order):
+        share = remaining // (len(order) - n)
+        allocation[i] = min(sizes[i], share)
+        remaining -= allocation[i]
+    return allocation
+
+
+class ContextLoader:
+    """项目上下文加载器：按 mtime/大小检测变化，只重新读取变化的文件。
+
+    来源依次为 CLAUDE.md、constitution 与 ``.codexspec/profile/`` 下
+    PROFILE_CONTEXT_CATEGORIES 类别的记录。所有来源共享 ``budget`` 字节预算
+    （单个来源另有 ``source_limit`` 上限），内容不变时 ``refresh()`` 返回同一个
+    快照，调用方可以按 ``version`` 缓存由它拼出的提示词前缀。
+    """
+
+    def __init__(self, project_root: Path, budget: int = DEFAULT_CONTEXT_BUDGET, source_limit: int = MAX_CONTEXT_SIZE):
+        self.project_root = Path(project_root)
+        self.budget = budget
+        self.source_limit = source_limit
+        self._files: dict = {}  # name -> (signature, sha256, text)
+        self._snapshot: Optional[ContextSnapshot] = None
+        self._lock = threading.Lock()
+        self.reads = 0
+        self.rebuilds = 0
+
+    def _paths(self) -> list:
+        paths = [
+            ("claude_md", self.project_root / "CLAUDE.md"),
+            ("constitution", self.project_root / ".codexspec" / "memory" / "constitution.md"),
+        ]
+        profile = self.project_root / ".codexspec" / "profile"
+        for category in PROFILE_CONTEXT_CATEGORIES:
+            try:
+                records = sorted((profile / category).glob("*.md"))
+            except OSError:
+                continue
+            paths.extend((f"{category}/{record.name}", record) for record in records)
+        return paths
+
+    def refresh(self) -> ContextSnapshot:
+        """检查各来源是否变化；有变化时重新组装快照。"""
+        with self._lock:
+            changed = self._snapshot is None
+            names = []
+            for name, path in self._paths():
+                signature = _file_signature(str(path))
+                cached = self._files.get(name)
+                if signature is None:
+                    continue
+                if cached is None or cached[0] != signature:
+                    try:
+                        text = path.read_text(encoding="utf-8")
+                    except (OSError, UnicodeDecodeError):
+                        continue
+                    self.reads += 1
+                    digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+                    changed = changed or cached is None or cached[1] != digest
+                    self._files[name] = (signature, digest, text)
+                names.append(name)
+            for name in set(self._files) - set(names):
+                del self._files[name]
+                changed = True
+            if changed:
+                self._snapshot = self._assemble(names)
+                self.rebuilds += 1
+            return self._snapshot
+
+    def _assemble(self, names: list) -> ContextSnapshot:
+        texts = [self._files[name][2] for name in names]
+        sizes = [min(len(text.encode("utf-8")), self.source_limit) for text in texts]
+        allocation = allocate_budget(sizes, self.budget)
+        ctx = {"claude_md": "", "constitution": "", "profile": ""}
+        records = []
+        sources = []
+        for name, text, limit in zip(names, texts, allocation):
+            kept = _truncate_utf8(text, limit)
+            sources.append({"name": name, "bytes": len(text.encode("utf-8")), "kept": len(kept.encode("utf-8"))})
+            if name in ("claude_md", "constitution"):
+                ctx[name] = kept
+            elif kept:
+                records.append(f'<record path="{name}">\n{kept}\n</record>')
+        ctx["profile"] = "\n".join(records)
+        digests = "\n".join(f"{name}:{self._files[name][1]}" for name in names)
+        version = hashlib.sha256(f"{self.budget}:{self.source_limit}\n{digests}".encode("utf-8")).hexdigest()[:12]
+        return ContextSnapshot(ctx=ctx, version=version, sources=sources)
+
+    def info(self) -> dict:
+        snapshot = self._snapshot
+        return {
+            "version": snapshot.version if snapshot else None,
+            "budget": self.budget,
+            "sources": snapshot.sources if snapshot else [],
+            "reads": self.reads,
+            "rebuilds": self.rebuilds,
+        }
+
+
+def load_project_context(project_root: Path, budget: int = DEFAULT_CONTEXT_BUDGET) -> dict:
+    return ContextLoader(project_root, budget=budget).refresh().ctx
 
 
 def build_prompt(system_prompt: Optional[str], ctx: dict, question: dict) -> str:
+    return build_context_prompt(system_prompt, ctx) + "\n\n" + build_question_prompt(question)
+
+
+def build_context_prompt(system_prompt: Optional[str], ctx: dict) -> str:
+    """提示词中与具体问题无关的部分（系统提示词 + 项目上下文）。"""
     parts = []
     if system_prompt:
         parts.append(f"<system_prompt>\n{system_prompt}\n</system_prompt>")
     parts.append(f"<project_claude_md>\n{ctx.get('claude_md', '')}\n</project_claude_md>")
     parts.append(f"<project_constitution>\n{ctx.get('constitution', '')}\n</project_constitution>")
+    if ctx.get("profile"):
+        parts.append(f"<project_profile>\n{ctx['profile']}\n</project_profile>")
+    return "\n\n".join(parts)
+
+
+def build_question_prompt(question: dict) -> str:
+    """提示词中针对单个问题的 <task> 部分。"""
     question_json = json.dumps(question, ensure_ascii=False, indent=2)
-    parts.append(
+    return (
         "<task>\n"
         "你正在代替人类用户回答另一个 Claude Code 实例发起的 AskUserQuestion 问题。\n"
         "基于上面的项目上下文和系统提示词，为下列问题选出最符合项目规则和开发者偏好的答案。\n\n"
@@ -520,7 +993,6 @@ def build_prompt(system_prompt: Optional[str], ctx: dict, question: dict) -> str
         '- 禁止输出 "Other" 或不在 options 中的内容\n'
         "</task>"
     )
-    return "\n\n".join(parts)
 
 
 # ============================================================================
@@ -579,24 +1051,374 @@ class ClaudeDecider:
         if result.returncode != 0:
             return None
 
-        parsed = _parse_json_response(result.stdout)
-        if not parsed or "answers" not in parsed:
-            return None
+        return parse_decider_answers(result.stdout, question)
+
+
+def parse_decider_answers(text: str, question: dict) -> Optional[list]:
+    """解析决策者输出并校验 answers 是否都是合法选项；不合法时返回 None。"""
+    parsed = _parse_json_response(text)
+    if not parsed or "answers" not in parsed:
+        return None
+
+    answers = parsed["answers"]
+    if not isinstance(answers, list):
+        return None
 
-        answers = parsed["answers"]
-        if not isinstance(answers, list):
+    valid_labels = {opt["label"] for opt in question.get("options", [])}
+    for a in answers:
+        if a not in valid_labels:
             return None
 
-        valid_labels = {opt["label"] for opt in question.get("options", [])}
-        for a in answers:
-            if a not in valid_labels:
+    is_multi = question.get("multiSelect", False)
+    if not is_multi and len(answers) != 1:
+        return None
+
+    return answers
+
+
+# ============================================================================
+# PersistentClaudeDecider (常驻决策进程)
+# ============================================================================
+
+DEFAULT_DECIDER_MAX_QUESTIONS = 20
+
+
+def default_worker_command(claude_bin: str = "claude") -> list:
+    """常驻 claude 进程：stream-json 输入输出，一个进程内保持同一会话。"""
+    return [claude_bin, "-p", "--input-format", "stream-json", "--output-format", "stream-json", "--verbose"]
+
+
+class _DeciderWorker:
+    """一个常驻决策进程。
+
+    协议（与 ``claude -p --input-format stream-json --output-format stream-json`` 相同）：
+    每个问题写一行 ``{"type": "user", "message": {...}}``，读取输出直到
+    ``{"type": "result", "result": "<回复文本>"}`` 行，其余行忽略。
+    """
+
+    def __init__(self, command: list, context_key: str):
+        self.context_key = context_key
+        self.questions = 0
+        self._buf = b""
+        self._proc = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+
+    @property
+    def pid(self) -> int:
+        return self._proc.pid
+
+    def alive(self) -> bool:
+        return self._proc.poll() is None
+
+    def ask(self, text: str, timeout: float) -> Optional[str]:
+        """发送一条消息并等待结果；超时、进程退出或结果为错误时返回 None。"""
+        message = {"type": "user", "message": {"role": "user", "content": [{"type": "text", "text": text}]}}
+        try:
+            self._proc.stdin.write((json.dumps(message, ensure_ascii=False) + "\n").encode("utf-8"))
+            self._proc.stdin.flush()
+        except (BrokenPipeError, OSError):
+            return None
+        deadline = time.monotonic() + timeout
+        while True:
+            line = self._readline(deadline)
+            if line is None:
                 return None
+            try:
+                event = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if isinstance(event, dict) and event.get("type") == "result":
+                if event.get("is_error"):
+                    return None
+                return str(event.get("result") or "")
+
+    def _readline(self, deadline: float) -> Optional[str]:
+        fd = self._proc.stdout.fileno()
+        while b"\n" not in self._buf:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            ready, _, _ = select.select([fd], [], [], remaining)
+            if not ready:
+                return None
+            chunk = os.read(fd, 65536)
+            if not chunk:
+                return None
+            self._buf += chunk
+        line, self._buf = self._buf.split(b"\n", 1)
+        return line.decode("utf-8", errors="replace")
+
+    def close(self) -> None:
+        try:
+            self._proc.stdin.close()
+        except OSError:
+            pass
+        try:
+            self._proc.terminate()
+            self._proc.wait(timeout=2)
+        except (OSError, subprocess.TimeoutExpired):
+            self._proc.kill()
+            self._proc.wait()
+
+
+class PersistentClaudeDecider:
+    """复用常驻进程的决策者，避免每个问题都冷启动 ``claude -p``。
 
-        is_multi = question.get("multiSelect", False)
-        if not is_multi and len(answers) != 1:
+    每个 worker 在首个问题时收到完整的项目上下文，之后同一会话中只发送问题
+    本身；上下文不同（如多会话模式下不同项目）的问题使用不同的 worker。
+    worker 回答 ``max_questions`` 个问题后回收（控制会话长度），超时或异常
+    退出时丢弃，下次按需重启。最多同时运行 ``pool_size`` 个问题。
+
+    Args:
+        command: worker 命令（默认 ``default_worker_command(claude_bin)``）；
+            测试中可以换成本地 stub 进程
+    """
+
+    def __init__(
+        self,
+        claude_bin: str = "claude",
+        timeout: int = 180,
+        command: Optional[list] = None,
+        pool_size: int = 1,
+        max_questions: int = DEFAULT_DECIDER_MAX_QUESTIONS,
+    ):
+        self._command = command or default_worker_command(claude_bin)
+        self._timeout = timeout
+        self._pool_size = max(1, pool_size)
+        self._max_questions = max_questions
+        self._slots = threading.BoundedSemaphore(self._pool_size)
+        self._lock = threading.Lock()
+        self._idle: list = []
+        self.workers_started = 0
+        self.questions = 0
+        self.warm_questions = 0
+
+    def decide_with_context(self, context_prompt: str, question: dict) -> Optional[list]:
+        key = hashlib.sha256(context_prompt.encode("utf-8")).hexdigest()
+        with self._slots:
+            worker = self._acquire(key)
+            if worker is None:
+                return None
+            warm = worker.questions > 0
+            text = build_question_prompt(question)
+            if not warm:
+                text = context_prompt + "\n\n" + text
+            result = worker.ask(text, self._timeout)
+            if result is None:
+                worker.close()
+                return None
+            worker.questions += 1
+            with self._lock:
+                self.questions += 1
+                self.warm_questions += int(warm)
+            self._release(worker)
+        return parse_decider_answers(result, question)
+
+    def _acquire(self, key: str) -> Optional[_DeciderWorker]:
+        with self._lock:
+            for worker in reversed(self._idle):
+                if worker.context_key == key:
+                    self._idle.remove(worker)
+                    if worker.alive():
+                        return worker
+                    worker.close()
+                    break
+            # 空闲 worker 总数不超过 pool_size：淘汰最久未用的
+            while len(self._idle) >= self._pool_size:
+                self._idle.pop(0).close()
+        try:
+            worker = _DeciderWorker(self._command, key)
+        except OSError:
             return None
+        with self._lock:
+            self.workers_started += 1
+        return worker
+
+    def _release(self, worker: _DeciderWorker) -> None:
+        if worker.questions >= self._max_questions or not worker.alive():
+            worker.close()
+            return
+        with self._lock:
+            self._idle.append(worker)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "backend": "persistent",
+                "workers_started": self.workers_started,
+                "idle_workers": len(self._idle),
+                "questions": self.questions,
+                "warm_questions": self.warm_questions,
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for worker in idle:
+            worker.close()
+
+
+def make_decider(args: argparse.Namespace):
+    """按 ``--decider`` 创建决策者。"""
+    if getattr(args, "decider", "oneshot") == "persistent":
+        command = shlex.split(args.decider_command) if args.decider_command else None
+        return PersistentClaudeDecider(
+            claude_bin=args.claude_bin,
+            timeout=args.decide_timeout,
+            command=command,
+            pool_size=args.decider_pool_size,
+            max_questions=args.decider_max_questions,
+        )
+    return ClaudeDecider(claude_bin=args.claude_bin, timeout=args.decide_timeout)
+
+
+# ============================================================================
+# AnswerMemo (AskUserQuestion 答案缓存)
+# ============================================================================
+
+DEFAULT_ANSWER_MEMO_TTL = 7 * 24 * 3600
+DEFAULT_ANSWER_MEMO_SIZE = 256
+ANSWER_MEMO_REASON = "answer memo 命中"
+
+
+def _sha256(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def context_fingerprint(ctx: dict, system_prompt: Optional[str] = None) -> str:
+    """项目上下文指纹：CLAUDE.md、constitution、系统提示词（及项目画像）各自哈希后再合并。"""
+    parts = [_sha256(ctx.get("claude_md", "")), _sha256(ctx.get("constitution", "")), _sha256(system_prompt or "")]
+    if ctx.get("profile"):
+        parts.append(_sha256(ctx["profile"]))
+    return _sha256(":".join(parts))[:16]
+
+
+def normalize_question(question: dict) -> dict:
+    """问题的结构化表示：只保留影响答案的字段，空白归一，选项顺序无关。"""
+    options = []
+    for opt in question.get("options", []):
+        if isinstance(opt, dict):
+            options.append(
+                [" ".join(str(opt.get("label", "")).split()), " ".join(str(opt.get("description", "")).split())]
+            )
+    return {
+        "question": " ".join(str(question.get("question", "")).split()),
+        "options": sorted(options),
+        "multiSelect": bool(question.get("multiSelect", False)),
+    }
+
 
-        return answers
+def answer_memo_key(question: dict, fingerprint: str) -> str:
+    normalized = json.dumps(normalize_question(question), ensure_ascii=False, sort_keys=True)
+    return f"{fingerprint}:{_sha256(normalized)[:32]}"
+
+
+class AnswerMemo:
+    """持久化的 AskUserQuestion 答案缓存（有 TTL 与条目上限的 LRU）。
+
+    键为 ``answer_memo_key``：问题结构哈希 + 项目上下文指纹，CLAUDE.md 或
+    constitution 变化后旧答案自然失效。每次写入都原子地保存到 JSON 文件，
+    进程重启后继续生效；文件缺失或损坏时从空缓存开始。
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        ttl: float = DEFAULT_ANSWER_MEMO_TTL,
+        maxsize: int = DEFAULT_ANSWER_MEMO_SIZE,
+        clock=time.time,
+    ):
+        self.path = path
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._clock = clock
+        self._entries: OrderedDict = OrderedDict()  # key -> (answers, created_at)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self._load()
+
+    def _load(self) -> None:
+        if not self.path:
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            entries = data["entries"]
+        except (OSError, json.JSONDecodeError, KeyError, TypeError):
+            return
+        now = self._clock()
+        for entry in entries if isinstance(entries, list) else []:
+            try:
+                key, answers, created_at = entry["key"], entry["answers"], float(entry["created_at"])
+            except (KeyError, TypeError, ValueError):
+                continue
+            if isinstance(key, str) and isinstance(answers, list) and now - created_at < self.ttl:
+                self._entries[key] = (answers, created_at)
+        self._evict()
+
+    def _evict(self) -> None:
+        while len(self._entries) > max(self.maxsize, 0):
+            self._entries.popitem(last=False)
+
+    def _save(self) -> None:
+        if not self.path:
+            return
+        data = {
+            "version": 1,
+            "entries": [
+                {"key": key, "answers": answers, "created_at": created_at}
+                for key, (answers, created_at) in self._entries.items()
+            ],
+        }
+        tmp = f"{self.path}.tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp, self.path)
+        except OSError:
+            pass
+
+    def get(self, key: str) -> Optional[list]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._clock() - entry[1] >= self.ttl:
+                del self._entries[key]
+                self.expired += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return list(entry[0])
+
+    def put(self, key: str, answers: list) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (list(answers), self._clock())
+            self._entries.move_to_end(key)
+            self._evict()
+            self._save()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "expired": self.expired,
+            }
+
+
+def make_answer_memo(args: argparse.Namespace) -> Optional[AnswerMemo]:
+    """按 ``--answer-memo`` 创建答案缓存；未指定时返回 None（不缓存）。"""
+    path = getattr(args, "answer_memo", None)
+    if not path:
+        return None
+    return AnswerMemo(path, ttl=args.answer_memo_ttl, maxsize=args.answer_memo_size)
 
 
 # ============================================================================
@@ -609,6 +1431,7 @@ class Detector:
         self._path = Path(jsonl_path)
         self._stable_ms = stable_ms
         self._processed_ids: set = set()
+        self._tail = JsonlTail(self._path)
 
     def mark_processed(self, tool_use_id: str) -> None:
         self._processed_ids.add(tool_use_id)
@@ -623,11 +1446,8 @@ class Detector:
             if age_ms < self._stable_ms:
                 return None
 
-        records = parse_jsonl(self._path)
-        if not records:
-            return None
-
-        pending = extract_pending_tool_use(records)
+        self._tail.poll()
+        pending = self._tail.pending()
         if pending is None:
             return None
 
@@ -642,10 +1462,157 @@ class Detector:
 # ============================================================================
 
 
+TMUX_TRANSPORTS = ("control", "subprocess")
+TMUX_CONTROL_RETRY_SECONDS = 30.0
+
+
+def tmux_quote(arg: str) -> str:
+    """按 tmux 命令语法给参数加双引号（转义反斜杠、双引号、$ 与换行）。"""
+    escaped = arg.replace("\\", "\\\\").replace('"', '\\"').replace("$", "\\$").replace("\n", "\\n")
+    return f'"{escaped}"'
+
+
+class TmuxControl:
+    """常驻的 tmux 控制模式 (``tmux -C``) 连接，所有 pane 共用一个。
+
+    ``run()`` 把一组命令一次写入，再按 ``%begin``/``%end``（或 ``%error``）块逐个
+    确认结果。控制模式不可用（无法 attach，或连接在任何命令执行前已断开，例如
+    attach 的 session 被关闭）时返回 None，由调用方回退到逐条 subprocess；attach
+    失败后 ``retry`` 秒内不再尝试。命令开始执行后出错只返回 False，不会重发按键。
+    """
+
+    def __init__(self, tmux_bin: str = "tmux", timeout: float = 5.0, retry: float = TMUX_CONTROL_RETRY_SECONDS):
+        self._bin = tmux_bin
+        self._timeout = timeout
+        self._retry = retry
+        self._proc: Optional[subprocess.Popen] = None
+        self._buf = b""
+        self._eof = False
+        self._retry_at = 0.0
+        self._lock = threading.Lock()
+        self.connects = 0
+        self.batches = 0
+        self.commands = 0
+
+    @property
+    def connected(self) -> bool:
+        return self._proc is not None
+
+    def run(self, target: str, commands: list) -> Optional[bool]:
+        """执行一组 tmux 命令（每条是参数列表）；全部成功返回 True，无法使用控制模式返回 None。"""
+        with self._lock:
+            if self._proc is None and not self._connect(target):
+                return None
+            payload = "".join(cmd[0] + "".join(f" {tmux_quote(arg)}" for arg in cmd[1:]) + "\n" for cmd in commands)
+            try:
+                self._proc.stdin.write(payload.encode("utf-8"))
+                self._proc.stdin.flush()
+            except OSError:
+                self._disconnect()
+                return None
+            results, started = self._read_results(len(commands), time.monotonic() + self._timeout)
+            if results is None:
+                self._disconnect()
+                return False if started else None
+            self.batches += 1
+            self.commands += len(commands)
+            return all(results)
+
+    def _connect(self, target: str) -> bool:
+        if time.monotonic() < self._retry_at:
+            return False
+        session = target.split(":")[0]
+        cmd = [self._bin, "-C", "attach-session", "-t", session, "-f", "no-output,ignore-size"]
+        try:
+            self._proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        except OSError:
+            self._retry_at = time.monotonic() + self._retry
+            return False
+        self._buf = b""
+        self._eof = False
+        # attach 命令本身的结果块
+        if self._read_results(1, time.monotonic() + self._timeout)[0] != [True]:
+            self._disconnect()
+            self._retry_at = time.monotonic() + self._retry
+            return False
+        self.connects += 1
+        return True
+
+    def _read_results(self, count: int, deadline: float) -> tuple:
+        """读取 count 个结果块；返回 (结果列表或 None, 是否已有命令开始执行)。"""
+        results = []
+        in_block = False
+        started = False
+        while len(results) < count:
+            line = self._readline(deadline)
+            if line is None:
+                # 超时（而非连接关闭）时命令可能仍会执行，按已开始处理
+                return None, started or not self._eof
+            if line.startswith(b"%begin"):
+                in_block = started = True
+            elif in_block and line.startswith((b"%end", b"%error")):
+                results.append(line.startswith(b"%end"))
+                in_block = False
+            elif not in_block and line.startswith(b"%exit"):
+                return None, started
+        return results, started
+
+    def _readline(self, deadline: float) -> Optional[bytes]:
+        fd = self._proc.stdout.fileno()
+        while b"\n" not in self._buf:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            ready, _, _ = select.select([fd], [], [], remaining)
+            if not ready:
+                return None
+            chunk = os.read(fd, 65536)
+            if not chunk:
+                self._eof = True
+                return None
+            self._buf += chunk
+        line, self._buf = self._buf.split(b"\n", 1)
+        return line
+
+    def _disconnect(self) -> None:
+        proc, self._proc = self._proc, None
+        if proc is None:
+            return
+        try:
+            proc.stdin.close()
+        except OSError:
+            pass
+        try:
+            proc.wait(timeout=1)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+
+    def close(self) -> None:
+        with self._lock:
+            self._disconnect()
+
+    def stats(self) -> dict:
+        return {
+            "transport": "control" if self._proc is not None else "subprocess",
+            "connects": self.connects,
+            "batches": self.batches,
+            "commands": self.commands,
+        }
+
+
+def make_tmux_control(args: argparse.Namespace) -> Optional[TmuxControl]:
+    """按 ``--tmux-transport`` 创建控制模式连接；dry-run 或 subprocess 模式返回 None。"""
+    if args.dry_run or getattr(args, "tmux_transport", "subprocess") != "control":
+        return None
+    return TmuxControl()
+
+
 class TmuxSender:
-    def __init__(self, pane: str, dry_run: bool = False):
+    def __init__(self, pane: str, dry_run: bool = False, control: Optional[TmuxControl] = None):
         self._pane = pane
         self._dry_run = dry_run
+        self._control = control
 
     def _send_keys(self, text: str, literal: bool = True) -> bool:
         if self._dry_run:
@@ -660,26 +1627,40 @@ class TmuxSender:
         except (subprocess.TimeoutExpired, FileNotFoundError):
             return False
 
-    def send_answers(self, answers: list) -> bool:
-        for label in answers:
-            if not self._send_keys(label):
-                return False
-            if not self._send_keys("Enter", literal=False):
+    def _send_sequence(self, keys: list) -> bool:
+        """发送一组 (text, literal) 按键：控制模式下一次写入，否则逐条 subprocess。"""
+        if self._dry_run:
+            return True
+        if self._control is not None:
+            commands = [["send-keys", "-t", self._pane, *(["-l"] if literal else []), text] for text, literal in keys]
+            result = self._control.run(self._pane, commands)
+            if result is not None:
+                return result
+        for text, literal in keys:
+            if not self._send_keys(text, literal=literal):
                 return False
         return True
 
+    def send_answers(self, answers: list) -> bool:
+        keys = []
+        for label in answers:
+            keys += [(label, True), ("Enter", False)]
+        return self._send_sequence(keys)
+
     def send_permission(self, allow: bool) -> bool:
-        text = "Y" if allow else "n"
-        if not self._send_keys(text):
-            return False
-        return self._send_keys("Enter", literal=False)
+        return self._send_sequence([("Y" if allow else "n", True), ("Enter", False)])
 
     def pane_exists(self) -> bool:
         if self._dry_run:
             return True
+        session = self._pane.split(":")[0]
+        if self._control is not None:
+            result = self._control.run(self._pane, [["has-session", "-t", session]])
+            if result is not None:
+                return result
         try:
             result = subprocess.run(
-                ["tmux", "has-session", "-t", self._pane.split(":")[0]],
+                ["tmux", "has-session", "-t", session],
                 capture_output=True,
                 timeout=5,
             )
@@ -694,32 +1675,71 @@ class TmuxSender:
 
 
 class Router:
+    """context 可以是固定的上下文 dict，也可以是 ContextLoader（每次决策前检测文件变化）。"""
+
     def __init__(
         self,
         decider: ClaudeDecider,
         safety_engine: SafetyPolicyEngine,
-        context: dict,
+        context,
         system_prompt: Optional[str] = None,
+        memo: Optional[AnswerMemo] = None,
     ):
         self._decider = decider
         self._engine = safety_engine
         self._ctx = context
         self._system_prompt = system_prompt
+        self._memo = memo
+        # (上下文版本, 提示词前缀, 指纹)；多会话模式下同一项目的会话共用 Router 并在不同线程里决策，
+        # 在局部变量里构建好后整体在锁内替换，不会读到构建一半的缓存
+        self._cached: Optional[tuple] = None
+        self._lock = threading.Lock()
 
     def handle(self, pending: PendingToolUse) -> Optional[Response]:
         if pending.name == "AskUserQuestion":
             return self._handle_ask(pending)
         return self._handle_permission(pending)
 
+    def _context(self) -> tuple:
+        """返回 (上下文 dict, 缓存的提示词前缀, 上下文指纹)；上下文变化时重建缓存。"""
+        if isinstance(self._ctx, ContextLoader):
+            snapshot = self._ctx.refresh()
+            ctx, version = snapshot.ctx, snapshot.version
+        else:
+            ctx, version = self._ctx, None
+        with self._lock:
+            cached = self._cached
+        if cached is None or cached[0] != version:
+            cached = (
+                version,
+                build_context_prompt(self._system_prompt, ctx),
+                context_fingerprint(ctx, self._system_prompt),
+            )
+            with self._lock:
+                self._cached = cached
+        return ctx, cached[1], cached[2]
+
     def _handle_ask(self, pending: PendingToolUse) -> Optional[Response]:
         questions = pending.input.get("questions", [])
         if not questions:
             return None
         q = questions[0]
-        prompt = build_prompt(self._system_prompt, self._ctx, q)
-        answers = self._decider.decide(prompt, q)
+        _, context_prompt, fingerprint = self._context()
+        memo_key = None
+        if self._memo is not None:
+            memo_key = answer_memo_key(q, fingerprint)
+            answers = self._memo.get(memo_key)
+            if answers is not None:
+                return Response(response_type="answers", answers=answers, reason=ANSWER_MEMO_REASON)
+        if isinstance(self._decider, PersistentClaudeDecider):
+            # 常驻决策者只在 worker 首个问题时发送上下文
+            answers = self._decider.decide_with_context(context_prompt, q)
+        else:
+            answers = self._decider.decide(context_prompt + "\n\n" + build_question_prompt(q), q)
         if answers is None:
             return None
+        if memo_key is not None:
+            self._memo.put(memo_key, answers)
         return Response(response_type="answers", answers=answers, reason="claude -p 决策")
 
     def _handle_permission(self, pending: PendingToolUse) -> Response:
@@ -739,24 +1759,105 @@ def parse_args(argv: Optional[list] = None) -> argparse.Namespace:
         description="自动响应运行在 tmux 中的 Claude Code 的所有等待状态",
     )
     parser.add_argument("--version", action="version", version=f"%(prog)s {__version__}")
-    parser.add_argument("--jsonl", required=True, help="要监听的 jsonl 文件路径")
-    parser.add_argument("--tmux-pane", required=True, help="目标 tmux pane (session:window.pane)")
+    parser.add_argument("--jsonl", default=None, help="要监听的 jsonl 文件路径")
+    parser.add_argument("--tmux-pane", default=None, help="目标 tmux pane (session:window.pane)")
+    parser.add_argument(
+        "--supervise",
+        default=None,
+        metavar="CONFIG",
+        help="多会话模式: 从 JSON 配置文件读取多组 jsonl/pane，在一个进程内同时响应（配置文件修改后热加载）",
+    )
     parser.add_argument("--system-prompt-file", default=None, help="可选系统提示词文件路径")
     parser.add_argument("--safety-policy-file", default=None, help="可选安全策略 JSON 配置文件")
     parser.add_argument("--poll-interval", type=float, default=2.0, help="轮询间隔秒数 (默认 2.0)")
-    parser.add_argument("--stable-ms", type=int, default=1500, help="jsonl mtime 静止阈值毫秒 (默认 1500)")
+    parser.add_argument("--stable-ms", type=int, default=1500, help="轮询模式下 jsonl mtime 静止阈值毫秒 (默认 1500)")
+    parser.add_argument(
+        "--watch",
+        choices=WATCH_BACKENDS,
+        default="auto",
+        help="文件变化通知方式: auto 依次尝试 watchdog、inotify，都不可用时回退到轮询 (默认 auto)",
+    )
+    parser.add_argument(
+        "--debounce-ms",
+        type=int,
+        default=100,
+        help="事件模式下写入静止多少毫秒后再检测 (默认 100；持续写入时最多等 10 倍)",
+    )
     parser.add_argument("--project-root", default=None, help="项目根目录 (默认 CWD)")
     parser.add_argument("--claude-bin", default="claude", help="claude CLI 路径 (默认 claude)")
     parser.add_argument("--log-file", default=None, help="可选日志文件路径")
     parser.add_argument("--dry-run", action="store_true", help="仅决策不发送到 tmux")
+    parser.add_argument(
+        "--tmux-transport",
+        choices=TMUX_TRANSPORTS,
+        default="control",
+        help="按键发送方式: control 复用一个 tmux -C 连接批量发送（不可用时回退）; subprocess 逐条调用 (默认 control)",
+    )
     parser.add_argument("--decide-timeout", type=int, default=180, help="claude -p 超时秒数 (默认 180)")
+    parser.add_argument(
+        "--decider",
+        choices=("oneshot", "persistent"),
+        default="oneshot",
+        help="AskUserQuestion 决策方式: oneshot 每个问题启动一次 claude -p; persistent 复用常驻进程 (默认 oneshot)",
+    )
+    parser.add_argument(
+        "--decider-command", default=None, help="persistent 模式的 worker 命令 (默认 claude -p stream-json 模式)"
+    )
+    parser.add_argument("--decider-pool-size", type=int, default=1, help="persistent 模式同时运行的 worker 数 (默认 1)")
+    parser.add_argument(
+        "--decider-max-questions",
+        type=int,
+        default=DEFAULT_DECIDER_MAX_QUESTIONS,
+        help=f"persistent 模式每个 worker 回答多少个问题后重启 (默认 {DEFAULT_DECIDER_MAX_QUESTIONS})",
+    )
+    parser.add_argument(
+        "--context-budget",
+        type=int,
+        default=DEFAULT_CONTEXT_BUDGET,
+        help=f"项目上下文（CLAUDE.md、constitution、项目画像）总字节预算 (默认 {DEFAULT_CONTEXT_BUDGET})",
+    )
+    parser.add_argument(
+        "--answer-memo",
+        default=None,
+        metavar="FILE",
+        help="AskUserQuestion 答案缓存文件：相同问题 + 相同项目上下文直接复用已有答案 (默认不缓存)",
+    )
+    parser.add_argument(
+        "--answer-memo-ttl",
+        type=float,
+        default=DEFAULT_ANSWER_MEMO_TTL,
+        help=f"答案缓存有效期秒数 (默认 {DEFAULT_ANSWER_MEMO_TTL})",
+    )
+    parser.add_argument(
+        "--answer-memo-size",
+        type=int,
+        default=DEFAULT_ANSWER_MEMO_SIZE,
+        help=f"答案缓存条目上限，超出时淘汰最久未用的条目 (默认 {DEFAULT_ANSWER_MEMO_SIZE})",
+    )
+    parser.add_argument(
+        "--decision-cache-size",
+        type=int,
+        default=DEFAULT_DECISION_CACHE_SIZE,
+        help=f"安全策略判定 LRU 缓存条目数，0 表示不缓存 (默认 {DEFAULT_DECISION_CACHE_SIZE})",
+    )
+    parser.add_argument(
+        "--state-file", default=None, help="运行状态 JSON 文件：运行时写入缓存计数等，--health-check 时读取并输出"
+    )
     parser.add_argument("--health-check", action="store_true", help="运行健康检查并输出 JSON 报告")
-    return parser.parse_args(argv)
+    args = parser.parse_args(argv)
+    if (not args.supervise or args.health_check) and not (args.jsonl and args.tmux_pane):
+        parser.error("--jsonl 和 --tmux-pane 为必填参数（--supervise 模式除外）")
+    return args
 
 
 def validate_startup(args: argparse.Namespace, logger: Logger) -> bool:
-    jsonl_path = Path(args.jsonl)
-    if not jsonl_path.exists():
+    if getattr(args, "supervise", None):
+        try:
+            load_supervisor_config(args.supervise)
+        except SupervisorConfigError as e:
+            logger.error(f"会话配置文件错误: {e}")
+            return False
+    elif not Path(args.jsonl).exists():
         logger.error(f"jsonl 文件不存在: {args.jsonl}")
         return False
 
@@ -841,17 +1942,341 @@ def health_check(args: argparse.Namespace) -> int:
                 policy_check["status"] = "fail"
                 policy_check["message"] = f"安全策略文件加载失败: {args.safety_policy_file}"
                 overall_healthy = False
+            else:
+                CompiledPolicy(policy)
+                policy_check["version"] = policy_version(policy)
         except Exception as e:
             policy_check["status"] = "fail"
             policy_check["message"] = f"安全策略文件错误: {e}"
             overall_healthy = False
         checks.append(policy_check)
 
+    # Check 5: runtime state written by the running responder (if requested)
+    runtime = None
+    if getattr(args, "state_file", None):
+        state_check = {"name": "state_file", "status": "pass", "message": args.state_file}
+        runtime = read_state_file(args.state_file)
+        if runtime is None:
+            state_check["status"] = "fail"
+            state_check["message"] = f"运行状态文件不存在或无法解析: {args.state_file}"
+            overall_healthy = False
+        checks.append(state_check)
+
     report = {"overall": "healthy" if overall_healthy else "unhealthy", "checks": checks}
+    if runtime is not None:
+        report["runtime"] = runtime
     print(json.dumps(report, ensure_ascii=False, indent=2))
     return 0 if overall_healthy else 1
 
 
+# ============================================================================
+# FileWatcher (事件驱动模式)
+# ============================================================================
+
+WATCH_BACKENDS = ("auto", "watchdog", "inotify", "poll")
+# 持续写入时 debounce 最多累计等待 debounce 的这么多倍（从第一个事件算起），然后照常检测
+DEBOUNCE_MAX_FACTOR = 10
+
+# <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_IGNORED = 0x00008000
+IN_NONBLOCK = 0o00004000
+IN_CLOEXEC = 0o02000000
+_INOTIFY_EVENT = struct.Struct("iIII")  # wd, mask, cookie, len
+
+
+class FileWatcher:
+    """阻塞等待单个文件变化的通知源。
+
+    ``wait()`` 在 select 上阻塞，没有事件时不会唤醒进程；``wakeup()`` 通过
+    self-pipe 打断等待（可在信号处理函数或其他线程中调用）。子类提供事件 fd。
+    """
+
+    backend = ""
+
+    def __init__(self, path):
+        self._path = Path(path).absolute()
+        self._wake_r, self._wake_w = os.pipe()
+        os.set_blocking(self._wake_r, False)
+        os.set_blocking(self._wake_w, False)
+
+    def _event_fd(self) -> int:
+        raise NotImplementedError
+
+    def _drain_events(self) -> bool:
+        """读空事件 fd，返回其中是否有与目标文件相关的事件。"""
+        raise NotImplementedError
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """等待目标文件变化。timeout 为 None 时无限等待。
+
+        Returns:
+            True 表示文件有变化；超时或被 ``wakeup()`` 打断时返回 False
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            ready, _, _ = select.select([self._event_fd(), self._wake_r], [], [], remaining)
+            if not ready:
+                return False
+            if self._wake_r in ready:
+                _drain_fd(self._wake_r)
+                return False
+            if self._drain_events():
+                return True
+
+    def wakeup(self) -> None:
+        try:
+            os.write(self._wake_w, b"\0")
+        except OSError:
+            pass
+
+    def close(self) -> None:
+        for fd in (self._wake_r, self._wake_w):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+
+def _drain_fd(fd: int) -> bytes:
+    chunks = []
+    while True:
+        try:
+            chunk = os.read(fd, 4096)
+        except (BlockingIOError, InterruptedError):
+            break
+        if not chunk:
+            break
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+class _Inotify:
+    """inotify 实例的薄封装（ctypes 调用 libc，无第三方依赖）。"""
+
+    def __init__(self):
+        self._libc = _load_libc()
+        fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 失败")
+        self.fd = fd
+
+    def add_watch(self, path, mask: int) -> Optional[int]:
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(str(path)), mask)
+        return wd if wd >= 0 else None
+
+    def rm_watch(self, wd: int) -> None:
+        self._libc.inotify_rm_watch(self.fd, wd)
+
+    def read_events(self) -> list:
+        """读空 fd，返回 [(wd, mask, name), ...]。"""
+        data = _drain_fd(self.fd)
+        events = []
+        pos = 0
+        while pos + _INOTIFY_EVENT.size <= len(data):
+            wd, mask, _cookie, name_len = _INOTIFY_EVENT.unpack_from(data, pos)
+            name = data[pos + _INOTIFY_EVENT.size : pos + _INOTIFY_EVENT.size + name_len].rstrip(b"\0")
+            pos += _INOTIFY_EVENT.size + name_len
+            events.append((wd, mask, name))
+        return events
+
+    def close(self) -> None:
+        try:
+            os.close(self.fd)
+        except OSError:
+            pass
+
+
+INOTIFY_FILE_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_ATTRIB | IN_DELETE_SELF | IN_MOVE_SELF
+INOTIFY_DIR_MASK = IN_CREATE | IN_MOVED_TO
+# 与 INOTIFY_FILE_MASK 对应的 watchdog 事件类型；opened / closed_no_write 只是读取，
+# 自己（或 claude_monitor 等其他读者）打开文件不能唤醒监听
+WATCHDOG_EVENT_TYPES = frozenset(("modified", "created", "moved", "deleted", "closed"))
+
+
+def _is_write_event(event) -> bool:
+    """watchdog 事件是否表示文件内容或位置变化"""
+    return not event.is_directory and event.event_type in WATCHDOG_EVENT_TYPES
+
+
+class InotifyWatcher(FileWatcher):
+    """Linux inotify。
+
+    监听文件本身的写入，另外只监听所在目录的 create/moved_to，以便文件被替换
+    （轮转）后重新挂上监听；同目录其他会话文件的写入不会唤醒进程。
+    """
+
+    backend = "inotify"
+
+    def __init__(self, path):
+        super().__init__(path)
+        try:
+            self._inotify = _Inotify()
+        except OSError:
+            super().close()
+            raise
+        self._name = os.fsencode(self._path.name)
+        self._dir_wd = self._inotify.add_watch(self._path.parent, INOTIFY_DIR_MASK)
+        self._file_wd = self._inotify.add_watch(self._path, INOTIFY_FILE_MASK)
+
+    def _event_fd(self) -> int:
+        return self._inotify.fd
+
+    def _drain_events(self) -> bool:
+        changed = False
+        for wd, mask, name in self._inotify.read_events():
+            if wd == self._dir_wd:
+                if name == self._name:
+                    # 文件被新建或替换：监听新的 inode
+                    self._file_wd = self._inotify.add_watch(self._path, INOTIFY_FILE_MASK)
+                    changed = True
+            elif wd == self._file_wd:
+                if mask & (IN_DELETE_SELF | IN_MOVE_SELF | IN_IGNORED):
+                    self._file_wd = None
+                if not mask & IN_IGNORED:
+                    changed = True
+        return changed
+
+    def close(self) -> None:
+        self._inotify.close()
+        super().close()
+
+
+def _load_libc():
+    import ctypes.util
+
+    libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+    if not hasattr(libc, "inotify_init1"):
+        raise OSError("libc 不支持 inotify")
+    return libc
+
+
+class WatchdogWatcher(FileWatcher):
+    """watchdog Observer（跨平台）；事件经由内部 pipe 转交给 ``wait()``。"""
+
+    backend = "watchdog"
+
+    def __init__(self, path):
+        from watchdog.events import FileSystemEventHandler
+        from watchdog.observers import Observer
+
+        super().__init__(path)
+        self._event_r, self._event_w = os.pipe()
+        os.set_blocking(self._event_r, False)
+        os.set_blocking(self._event_w, False)
+        target = str(self._path)
+        event_w = self._event_w
+
+        class _Handler(FileSystemEventHandler):
+            def on_any_event(self, event):
+                if not _is_write_event(event):
+                    return
+                if target in (event.src_path, getattr(event, "dest_path", None)):
+                    try:
+                        os.write(event_w, b"\0")
+                    except OSError:
+                        pass
+
+        self._observer = Observer()
+        self._observer.schedule(_Handler(), str(self._path.parent), recursive=False)
+        self._observer.start()
+
+    def _event_fd(self) -> int:
+        return self._event_r
+
+    def _drain_events(self) -> bool:
+        return bool(_drain_fd(self._event_r))
+
+    def close(self) -> None:
+        self._observer.stop()
+        self._observer.join(timeout=2)
+        for fd in (self._event_r, self._event_w):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+        super().close()
+
+
+def create_watcher(path, backend: str = "auto") -> Optional[FileWatcher]:
+    """按 backend 创建文件监听器；auto 依次尝试 watchdog、inotify。
+
+    Returns:
+        FileWatcher；backend 为 poll 或没有可用的通知机制时返回 None（回退到轮询）
+    """
+    if backend == "poll":
+        return None
+    candidates = []
+    if backend in ("auto", "watchdog"):
+        candidates.append(WatchdogWatcher)
+    if backend in ("auto", "inotify") and sys.platform.startswith("linux"):
+        candidates.append(InotifyWatcher)
+    for cls in candidates:
+        try:
+            return cls(path)
+        except (ImportError, OSError, AttributeError):
+            continue
+    return None
+
+
+# ============================================================================
+# Runtime state file
+# ============================================================================
+
+
+def write_state_file(path: str, state: dict) -> bool:
+    """原子写入运行状态 JSON（先写临时文件再 rename）。"""
+    tmp = f"{path}.tmp"
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=False, indent=2)
+        os.replace(tmp, path)
+    except OSError:
+        return False
+    return True
+
+
+def read_state_file(path: str) -> Optional[dict]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+    return state if isinstance(state, dict) else None
+
+
+def _sum_cache_stats(engines) -> dict:
+    total = {"size": 0, "maxsize": 0, "hits": 0, "misses": 0, "invalidations": 0}
+    for engine in engines:
+        for key, value in engine.cache_stats().items():
+            total[key] += value
+    return total
+
+
+class StateWriter:
+    """运行状态写入器：内容有变化时才写文件，未配置 --state-file 时什么都不做。"""
+
+    def __init__(self, path: Optional[str]):
+        self._path = path
+        self._last: Optional[dict] = None
+
+    def update(self, state: dict) -> None:
+        if not self._path or state == self._last:
+            return
+        self._last = state
+        write_state_file(
+            self._path,
+            {"pid": os.getpid(), "updated_at": datetime.now().isoformat(timespec="seconds"), **state},
+        )
+
+
 # ============================================================================
 # MainLoop (Task 5.3)
 # ============================================================================
@@ -863,20 +2288,32 @@ class MainLoop:
         self._logger = logger
         self._running = True
         self._project_root = Path(args.project_root) if args.project_root else Path.cwd()
+        self._watcher: Optional[FileWatcher] = None
+        self._engine: Optional[SafetyPolicyEngine] = None
+        self._decider = None
+        self._memo: Optional[AnswerMemo] = None
+        self._context: Optional[ContextLoader] = None
+        self._tmux: Optional[TmuxControl] = None
+        self._state = StateWriter(getattr(args, "state_file", None))
 
     def _setup_signal(self) -> None:
         def handler(signum, frame):
-            self._running = False
+            self.stop()
 
         signal.signal(signal.SIGINT, handler)
 
+    def stop(self) -> None:
+        self._running = False
+        if self._watcher is not None:
+            self._watcher.wakeup()
+
     def run(self) -> int:
         self._setup_signal()
         args = self._args
         logger = self._logger
 
         try:
-            policy = load_safety_policy(args.safety_policy_file)
+            policy_source = PolicySource.load(args.safety_policy_file)
         except SafetyPolicyError as e:
             logger.error(f"安全策略文件错误: {e}")
             return EXIT_INVALID_ARGS
@@ -884,66 +2321,599 @@ class MainLoop:
         if args.system_prompt_file:
             system_prompt = Path(args.system_prompt_file).read_text(encoding="utf-8")
 
-        ctx = load_project_context(self._project_root)
-        detector = Detector(args.jsonl, stable_ms=args.stable_ms)
-        decider = ClaudeDecider(claude_bin=args.claude_bin, timeout=args.decide_timeout)
-        engine = SafetyPolicyEngine(self._project_root, policy=policy)
-        router = Router(decider=decider, safety_engine=engine, context=ctx, system_prompt=system_prompt)
-        sender = TmuxSender(args.tmux_pane, dry_run=args.dry_run)
-
-        policy_label = args.safety_policy_file or "内置策略"
+        self._context = ContextLoader(
+            self._project_root, budget=getattr(args, "context_budget", DEFAULT_CONTEXT_BUDGET)
+        )
+        self._watcher = create_watcher(args.jsonl, getattr(args, "watch", "poll"))
+        # 事件模式下由 debounce 取代 mtime 静止检查
+        stable_ms = 0 if self._watcher is not None else args.stable_ms
+        detector = Detector(args.jsonl, stable_ms=stable_ms)
+        decider = make_decider(args)
+        self._decider = decider
+        engine = SafetyPolicyEngine(
+            self._project_root,
+            cache_size=getattr(args, "decision_cache_size", DEFAULT_DECISION_CACHE_SIZE),
+            source=policy_source,
+        )
+        self._engine = engine
+        self._memo = make_answer_memo(args)
+        router = Router(
+            decider=decider, safety_engine=engine, context=self._context, system_prompt=system_prompt, memo=self._memo
+        )
+        self._tmux = make_tmux_control(args)
+        sender = TmuxSender(args.tmux_pane, dry_run=args.dry_run, control=self._tmux)
+
+        policy_label = f"{args.safety_policy_file or '内置策略'} ({policy_source.version})"
+        if self._watcher is not None:
+            mode = f"watch: {self._watcher.backend} | debounce: {args.debounce_ms}ms"
+        else:
+            mode = f"interval: {args.poll_interval}s"
         logger.startup(
             f"claude-auto-responder v{__version__} 启动",
-            f"jsonl: {args.jsonl} | pane: {args.tmux_pane} | interval: {args.poll_interval}s | safety: {policy_label}",
+            f"jsonl: {args.jsonl} | pane: {args.tmux_pane} | {mode} | safety: {policy_label}",
         )
 
+        try:
+            if self._watcher is not None:
+                self._run_events(detector, router, sender)
+            else:
+                self._run_polling(detector, router, sender)
+        finally:
+            if self._watcher is not None:
+                self._watcher.close()
+                self._watcher = None
+            if isinstance(decider, PersistentClaudeDecider):
+                decider.close()
+            if self._tmux is not None:
+                self._tmux.close()
+
+        logger.startup("claude-auto-responder 已停止")
+        return EXIT_SUCCESS
+
+    def _run_polling(self, detector: Detector, router: Router, sender: TmuxSender) -> None:
         while self._running:
+            self._tick(detector, router, sender)
+            if self._running:
+                time.sleep(self._args.poll_interval)
+
+    def _run_events(self, detector: Detector, router: Router, sender: TmuxSender) -> None:
+        watcher = self._watcher
+        debounce = self._args.debounce_ms / 1000
+        self._tick(detector, router, sender)
+        while self._running:
+            # 空闲时无限阻塞：没有文件事件就没有唤醒
+            if not watcher.wait(None):
+                continue
+            # debounce：持续有写入时继续等，直到静止 debounce 毫秒；
+            # 但从第一个事件起最多等 DEBOUNCE_MAX_FACTOR 倍，持续写入的会话也会被检测
+            deadline = time.monotonic() + debounce * DEBOUNCE_MAX_FACTOR
+            while self._running:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not watcher.wait(min(debounce, remaining)):
+                    break
+            if self._running:
+                self._tick(detector, router, sender)
+
+    def _tick(self, detector: Detector, router: Router, sender: TmuxSender) -> None:
+        reload_policy(self._engine.policy_source, self._logger)
+        respond_once(detector, router, sender, self._logger, self._args.tmux_pane)
+        self._state.update(self._runtime_state())
+
+    def _runtime_state(self) -> dict:
+        state = {
+            "mode": "single",
+            "jsonl": self._args.jsonl,
+            "policy": self._engine.policy_source.info(),
+            "decision_cache": self._engine.cache_stats(),
+            "context": self._context.info(),
+        }
+        if isinstance(self._decider, PersistentClaudeDecider):
+            state["decider"] = self._decider.stats()
+        if self._memo is not None:
+            state["answer_memo"] = self._memo.stats()
+        if self._tmux is not None:
+            state["tmux"] = self._tmux.stats()
+        return state
+
+
+def reload_policy(source: PolicySource, logger: Logger) -> Optional[bool]:
+    """策略文件有变化时热加载并记录日志；返回值同 ``PolicySource.reload_if_changed``。"""
+    result = source.reload_if_changed()
+    if result is True:
+        logger.policy("安全策略已重新加载", f"{source.path} | version: {source.version}")
+    elif result is False:
+        logger.error(f"安全策略文件无效，继续使用版本 {source.version}", source.last_error or "")
+    return result
+
+
+def respond_once(
+    detector: Detector, router: Router, sender: TmuxSender, logger: Logger, pane: str, label: str = ""
+) -> None:
+    """检测一次并响应最近的待处理请求；异常只记录日志不抛出。
+
+    label 非空时作为日志前缀（多会话模式下区分会话）。
+    """
+    prefix = f"[{label}] " if label else ""
+    try:
+        pending = detector.check()
+        if pending is None:
+            return
+        logger.pending(
+            f"{prefix}检测到待响应请求 {pending.tool_use_id} ({pending.name})",
+        )
+
+        if pending.name == "AskUserQuestion":
+            logger.decide(f"{prefix}调用决策者 (claude -p)")
+        else:
+            logger.policy(f"{prefix}安全策略判定 {pending.tool_use_id}")
+
+        resp = router.handle(pending)
+
+        if resp is None:
+            logger.warn(f"{prefix}决策失败，跳过 {pending.tool_use_id}")
+            detector.mark_processed(pending.tool_use_id)
+        elif resp.response_type == "answers":
+            memo_note = f" ({resp.reason})" if resp.reason == ANSWER_MEMO_REASON else ""
+            logger.policy_allow(f"{prefix}决策完成 answers={resp.answers}{memo_note}")
+            ok = sender.send_answers(resp.answers)
+            if ok:
+                logger.sent(f"{prefix}已发送到 tmux pane {pane}")
+            else:
+                logger.error(f"{prefix}发送失败到 tmux pane {pane}")
+            detector.mark_processed(pending.tool_use_id)
+        elif resp.response_type == "permission":
+            if resp.allow:
+                logger.policy_allow(f"{prefix}ALLOW ({resp.reason})")
+            else:
+                logger.policy_deny(f"{prefix}DENY ({resp.reason})")
+            ok = sender.send_permission(resp.allow)
+            if ok:
+                logger.sent(f"{prefix}已发送 {'Y' if resp.allow else 'n'} 到 tmux pane {pane}")
+            else:
+                logger.error(f"{prefix}发送失败到 tmux pane {pane}")
+            detector.mark_processed(pending.tool_use_id)
+
+    except Exception as e:
+        logger.error(f"{prefix}轮询异常: {e}")
+
+
+# ============================================================================
+# Supervisor (多会话模式)
+# ============================================================================
+
+
+def load_supervisor_config(path) -> list:
+    """读取 ``--supervise`` 会话配置文件。
+
+    格式::
+
+        {"sessions": [
+            {"name": "api", "jsonl": "~/.claude/projects/-x/a.jsonl", "tmux_pane": "claude:0.1",
+             "project_root": "/src/api"}
+        ]}
+
+    name 缺省为 jsonl 文件名（不含扩展名）；project_root 可省略（使用 --project-root / CWD）。
+
+    Returns:
+        会话列表 ``[{"name", "jsonl", "tmux_pane", "project_root"}, ...]``，jsonl 为绝对路径
+
+    Raises:
+        SupervisorConfigError: 文件不存在、格式错误或会话名重复
+    """
+    p = Path(path)
+    try:
+        data = json.loads(p.read_text(encoding="utf-8"))
+    except OSError as e:
+        raise SupervisorConfigError(f"会话配置文件读取失败: {e}") from e
+    except json.JSONDecodeError as e:
+        raise SupervisorConfigError(f"会话配置文件格式错误: {e}") from e
+    entries = data.get("sessions") if isinstance(data, dict) else None
+    if not isinstance(entries, list):
+        raise SupervisorConfigError("会话配置文件顶层必须是包含 sessions 数组的 JSON 对象")
+
+    sessions = []
+    names: set = set()
+    for i, entry in enumerate(entries):
+        if not isinstance(entry, dict) or not entry.get("jsonl") or not entry.get("tmux_pane"):
+            raise SupervisorConfigError(f"sessions[{i}] 缺少 jsonl 或 tmux_pane")
+        jsonl = os.path.abspath(os.path.expanduser(str(entry["jsonl"])))
+        name = str(entry.get("name") or Path(jsonl).stem)
+        if name in names:
+            raise SupervisorConfigError(f"会话名重复: {name}")
+        names.add(name)
+        root = entry.get("project_root")
+        sessions.append(
+            {
+                "name": name,
+                "jsonl": jsonl,
+                "tmux_pane": str(entry["tmux_pane"]),
+                "project_root": os.path.abspath(os.path.expanduser(str(root))) if root else None,
+            }
+        )
+    return sessions
+
+
+class WatchHub:
+    """asyncio 下的共享文件监听：一个通知源覆盖所有被监听的文件。
+
+    backend 为 inotify 时共用一个 inotify fd（文件 + 所在目录的 create/moved_to，
+    目录监听按引用计数共享）；watchdog 时共用一个 Observer；都不可用时每
+    ``poll_interval`` 秒比对一次文件签名。变化时在事件循环线程中调用
+    ``on_change(path)``。
+    """
+
+    def __init__(self, on_change, backend: str = "auto", poll_interval: float = 2.0):
+        self._on_change = on_change
+        self._poll_interval = poll_interval
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._paths: dict = {}  # path -> inotify file wd / poll signature / None
+        self._dirs: dict = {}  # dir -> [inotify wd 或 watchdog watch, 引用计数]
+        self._wd_files: dict = {}
+        self._wd_dirs: dict = {}
+        self._inotify: Optional[_Inotify] = None
+        self._observer = None
+        self._poll_task: Optional[asyncio.Task] = None
+        self.backend = self._open(backend)
+
+    def _open(self, backend: str) -> str:
+        if backend in ("auto", "watchdog"):
             try:
-                pending = detector.check()
-                if pending is not None:
-                    logger.pending(
-                        f"检测到待响应请求 {pending.tool_use_id} ({pending.name})",
-                    )
+                from watchdog.observers import Observer
 
-                    if pending.name == "AskUserQuestion":
-                        logger.decide("调用决策者 (claude -p)")
-                    else:
-                        logger.policy(f"安全策略判定 {pending.tool_use_id}")
-
-                    resp = router.handle(pending)
-
-                    if resp is None:
-                        logger.warn(f"决策失败，跳过 {pending.tool_use_id}")
-                        detector.mark_processed(pending.tool_use_id)
-                    elif resp.response_type == "answers":
-                        logger.policy_allow(f"决策完成 answers={resp.answers}")
-                        ok = sender.send_answers(resp.answers)
-                        if ok:
-                            logger.sent(f"已发送到 tmux pane {args.tmux_pane}")
-                        else:
-                            logger.error(f"发送失败到 tmux pane {args.tmux_pane}")
-                        detector.mark_processed(pending.tool_use_id)
-                    elif resp.response_type == "permission":
-                        if resp.allow:
-                            logger.policy_allow(f"ALLOW ({resp.reason})")
-                        else:
-                            logger.policy_deny(f"DENY ({resp.reason})")
-                        ok = sender.send_permission(resp.allow)
-                        if ok:
-                            logger.sent(f"已发送 {'Y' if resp.allow else 'n'} 到 tmux pane {args.tmux_pane}")
-                        else:
-                            logger.error(f"发送失败到 tmux pane {args.tmux_pane}")
-                        detector.mark_processed(pending.tool_use_id)
-
-            except Exception as e:
-                logger.error(f"轮询异常: {e}")
+                self._observer = Observer()
+                return "watchdog"
+            except ImportError:
+                pass
+        if backend in ("auto", "inotify") and sys.platform.startswith("linux"):
+            try:
+                self._inotify = _Inotify()
+                return "inotify"
+            except OSError:
+                pass
+        return "poll"
 
-            if self._running:
-                time.sleep(args.poll_interval)
+    def start(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        if self._inotify is not None:
+            self._loop.add_reader(self._inotify.fd, self._on_inotify)
+        elif self._observer is not None:
+            self._observer.start()
+        else:
+            self._poll_task = self._loop.create_task(self._poll())
 
-        logger.startup("claude-auto-responder 已停止")
+    def close(self) -> None:
+        if self._inotify is not None:
+            if self._loop is not None:
+                self._loop.remove_reader(self._inotify.fd)
+            self._inotify.close()
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join(timeout=2)
+        if self._poll_task is not None:
+            self._poll_task.cancel()
+
+    def watch(self, path: str) -> None:
+        if path in self._paths:
+            return
+        directory = os.path.dirname(path)
+        entry = self._dirs.get(directory)
+        if entry is None:
+            entry = self._dirs[directory] = [self._watch_dir(directory), 0]
+        entry[1] += 1
+        self._paths[path] = None
+        if self._inotify is not None:
+            self._add_file_wd(path)
+        elif self._observer is None:
+            self._paths[path] = _file_signature(path)
+
+    def unwatch(self, path: str) -> None:
+        if path not in self._paths:
+            return
+        wd = self._paths.pop(path)
+        if self._inotify is not None and wd is not None:
+            self._wd_files.pop(wd, None)
+            self._inotify.rm_watch(wd)
+        directory = os.path.dirname(path)
+        entry = self._dirs[directory]
+        entry[1] -= 1
+        if entry[1] == 0:
+            del self._dirs[directory]
+            if self._inotify is not None and entry[0] is not None:
+                self._wd_dirs.pop(entry[0], None)
+                self._inotify.rm_watch(entry[0])
+            elif self._observer is not None and entry[0] is not None:
+                self._observer.unschedule(entry[0])
+
+    def _watch_dir(self, directory: str):
+        if self._inotify is not None:
+            wd = self._inotify.add_watch(directory, INOTIFY_DIR_MASK)
+            if wd is not None:
+                self._wd_dirs[wd] = directory
+            return wd
+        if self._observer is not None:
+            from watchdog.events import FileSystemEventHandler
+
+            hub = self
+
+            class _Handler(FileSystemEventHandler):
+                def on_any_event(self, event):
+                    if not _is_write_event(event):
+                        return
+                    for p in (event.src_path, getattr(event, "dest_path", None)):
+                        if p and hub._loop is not None:
+                            hub._loop.call_soon_threadsafe(hub._notify, os.fsdecode(p))
+
+            try:
+                return self._observer.schedule(_Handler(), directory, recursive=False)
+            except OSError:
+                return None
+        return None
+
+    def _add_file_wd(self, path: str) -> None:
+        old = self._paths.get(path)
+        if old is not None:
+            self._wd_files.pop(old, None)
+        wd = self._inotify.add_watch(path, INOTIFY_FILE_MASK)
+        self._paths[path] = wd
+        if wd is not None:
+            self._wd_files[wd] = path
+
+    def _notify(self, path: str) -> None:
+        if path in self._paths:
+            self._on_change(path)
+
+    def _on_inotify(self) -> None:
+        changed = []
+        for wd, mask, name in self._inotify.read_events():
+            if wd in self._wd_dirs:
+                path = os.path.join(self._wd_dirs[wd], os.fsdecode(name))
+                if path in self._paths:
+                    # 文件被新建或替换：监听新的 inode
+                    self._add_file_wd(path)
+                    changed.append(path)
+            elif wd in self._wd_files:
+                path = self._wd_files[wd]
+                if mask & (IN_DELETE_SELF | IN_MOVE_SELF | IN_IGNORED):
+                    del self._wd_files[wd]
+                    self._paths[path] = None
+                if not mask & IN_IGNORED:
+                    changed.append(path)
+        for path in dict.fromkeys(changed):
+            self._on_change(path)
+
+    async def _poll(self) -> None:
+        while True:
+            await asyncio.sleep(self._poll_interval)
+            for path in list(self._paths):
+                sig = _file_signature(path)
+                if sig != self._paths.get(path, sig):
+                    self._paths[path] = sig
+                    self._on_change(path)
+
+
+class SupervisedSession:
+    """一个被监管的 jsonl/pane 组合；各自保有 Detector 状态。"""
+
+    def __init__(self, spec: dict, router: Router, dry_run: bool, control: Optional[TmuxControl] = None):
+        self.spec = spec
+        self.name = spec["name"]
+        self.jsonl = spec["jsonl"]
+        self.pane = spec["tmux_pane"]
+        self.detector = Detector(self.jsonl, stable_ms=0)
+        self.router = router
+        self.sender = TmuxSender(self.pane, dry_run=dry_run, control=control)
+        self.timer: Optional[asyncio.TimerHandle] = None
+        self.debounce_deadline = 0.0  # loop.time()：本轮 debounce 最晚的检测时间
+        self.busy = False
+        self.dirty = False
+
+
+class Supervisor:
+    """多会话模式：一个 asyncio 进程同时服务多组 jsonl/pane。
+
+    所有会话共用一个 WatchHub、一个 Logger；同一 project_root 的会话共用一个
+    SafetyPolicyEngine 与 Router。配置文件变化（或 SIGHUP）时热加载：新增的
+    会话开始监听，删除的会话停止，未变化的会话保留其 Detector 状态。
+    单次检测与决策（可能调用 claude -p）在线程中执行，同一会话串行。
+    """
+
+    def __init__(self, args: argparse.Namespace, logger: Logger):
+        self._args = args
+        self._logger = logger
+        self._config_path = os.path.abspath(args.supervise)
+        self._default_root = Path(args.project_root) if args.project_root else Path.cwd()
+        self._policy_source: Optional[PolicySource] = None
+        self._system_prompt: Optional[str] = None
+        self._decider = make_decider(args)
+        self._memo = make_answer_memo(args)
+        self._tmux = make_tmux_control(args)
+        self._engines: dict = {}
+        self._routers: dict = {}
+        self.sessions: dict = {}
+        self._by_path: dict = {}  # jsonl path -> {session name}
+        self._tasks: set = set()
+        self._hub: Optional[WatchHub] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stopped: Optional[asyncio.Event] = None
+        self._reload_timer: Optional[asyncio.TimerHandle] = None
+        self._policy_timer: Optional[asyncio.TimerHandle] = None
+        self._policy_path: Optional[str] = None
+        self._state = StateWriter(args.state_file)
+
+    def run(self) -> int:
+        try:
+            self._policy_source = PolicySource.load(self._args.safety_policy_file)
+        except SafetyPolicyError as e:
+            self._logger.error(f"安全策略文件错误: {e}")
+            return EXIT_INVALID_ARGS
+        if self._args.system_prompt_file:
+            self._system_prompt = Path(self._args.system_prompt_file).read_text(encoding="utf-8")
+        try:
+            asyncio.run(self.serve())
+        except SupervisorConfigError as e:
+            self._logger.error(f"会话配置文件错误: {e}")
+            return EXIT_INVALID_ARGS
         return EXIT_SUCCESS
 
+    async def serve(self) -> None:
+        """运行直到 ``stop()``；启动时配置无效则抛出 SupervisorConfigError。"""
+        specs = load_supervisor_config(self._config_path)
+        if self._policy_source is None:
+            self._policy_source = PolicySource.load(self._args.safety_policy_file)
+        self._loop = asyncio.get_running_loop()
+        self._stopped = asyncio.Event()
+        self._hub = WatchHub(self._on_change, self._args.watch, self._args.poll_interval)
+        self._hub.start()
+        self._hub.watch(self._config_path)
+        if self._policy_source.path:
+            self._policy_path = os.path.abspath(self._policy_source.path)
+            self._hub.watch(self._policy_path)
+        self._install_signals()
+        self._apply(specs)
+        self._logger.startup(
+            f"claude-auto-responder v{__version__} 多会话模式启动",
+            f"config: {self._config_path} | sessions: {len(self.sessions)} | watch: {self._hub.backend}",
+        )
+        try:
+            await self._stopped.wait()
+        finally:
+            for name in list(self.sessions):
+                self._remove(name)
+            self._hub.close()
+            if self._tasks:
+                await asyncio.gather(*self._tasks, return_exceptions=True)
+            if isinstance(self._decider, PersistentClaudeDecider):
+                self._decider.close()
+            if self._tmux is not None:
+                self._tmux.close()
+            self._logger.startup("claude-auto-responder 已停止")
+
+    def stop(self) -> None:
+        if self._loop is not None and self._stopped is not None:
+            self._loop.call_soon_threadsafe(self._stopped.set)
+
+    def reload(self) -> bool:
+        """重新读取配置文件并增删会话；配置无效时保留当前会话。"""
+        try:
+            specs = load_supervisor_config(self._config_path)
+        except SupervisorConfigError as e:
+            self._logger.error(f"会话配置文件错误，保留当前 {len(self.sessions)} 个会话: {e}")
+            return False
+        self._apply(specs)
+        return True
+
+    def _reload_policy(self) -> None:
+        if reload_policy(self._policy_source, self._logger) is not None:
+            self._state.update(self._runtime_state())
+
+    def _runtime_state(self) -> dict:
+        return {
+            "mode": "supervise",
+            "sessions": sorted(self.sessions),
+            "policy": self._policy_source.info(),
+            "decision_cache": _sum_cache_stats(self._engines.values()),
+            **({"decider": self._decider.stats()} if isinstance(self._decider, PersistentClaudeDecider) else {}),
+            **({"answer_memo": self._memo.stats()} if self._memo is not None else {}),
+            **({"tmux": self._tmux.stats()} if self._tmux is not None else {}),
+        }
+
+    def _install_signals(self) -> None:
+        for sig, callback in ((signal.SIGINT, self.stop), (signal.SIGTERM, self.stop), (signal.SIGHUP, self.reload)):
+            try:
+                self._loop.add_signal_handler(sig, callback)
+            except (NotImplementedError, RuntimeError, ValueError, AttributeError):
+                pass
+
+    def _apply(self, specs: list) -> None:
+        wanted = {spec["name"]: spec for spec in specs}
+        for name, session in list(self.sessions.items()):
+            if wanted.get(name) != session.spec:
+                self._remove(name)
+                self._logger.startup(f"[{name}] 会话已移除")
+        for name, spec in wanted.items():
+            if name not in self.sessions:
+                self._add(spec)
+                self._logger.startup(f"[{name}] 会话已加入", f"jsonl: {spec['jsonl']} | pane: {spec['tmux_pane']}")
+        self._state.update(self._runtime_state())
+
+    def _router_for(self, project_root: Optional[str]) -> Router:
+        root = Path(project_root) if project_root else self._default_root
+        key = str(root)
+        if key not in self._routers:
+            self._engines[key] = SafetyPolicyEngine(
+                root, cache_size=self._args.decision_cache_size, source=self._policy_source
+            )
+            self._routers[key] = Router(
+                decider=self._decider,
+                safety_engine=self._engines[key],
+                context=ContextLoader(root, budget=self._args.context_budget),
+                system_prompt=self._system_prompt,
+                memo=self._memo,
+            )
+        return self._routers[key]
+
+    def _add(self, spec: dict) -> None:
+        session = SupervisedSession(spec, self._router_for(spec["project_root"]), self._args.dry_run, self._tmux)
+        self.sessions[session.name] = session
+        self._by_path.setdefault(session.jsonl, set()).add(session.name)
+        self._hub.watch(session.jsonl)
+        self._start_tick(session)
+
+    def _remove(self, name: str) -> None:
+        session = self.sessions.pop(name)
+        if session.timer is not None:
+            session.timer.cancel()
+        names = self._by_path[session.jsonl]
+        names.discard(name)
+        if not names:
+            del self._by_path[session.jsonl]
+            if session.jsonl != self._config_path:
+                self._hub.unwatch(session.jsonl)
+
+    def _on_change(self, path: str) -> None:
+        debounce = self._args.debounce_ms / 1000
+        if path == self._config_path:
+            if self._reload_timer is not None:
+                self._reload_timer.cancel()
+            self._reload_timer = self._loop.call_later(debounce, self.reload)
+        if path == self._policy_path:
+            if self._policy_timer is not None:
+                self._policy_timer.cancel()
+            self._policy_timer = self._loop.call_later(debounce, self._reload_policy)
+        now = self._loop.time()
+        for name in self._by_path.get(path, ()):
+            session = self.sessions[name]
+            if session.timer is not None:
+                session.timer.cancel()
+            else:
+                session.debounce_deadline = now + debounce * DEBOUNCE_MAX_FACTOR
+            when = min(now + debounce, session.debounce_deadline)
+            session.timer = self._loop.call_at(when, self._start_tick, session)
+
+    def _start_tick(self, session: SupervisedSession) -> None:
+        session.timer = None
+        if self.sessions.get(session.name) is not session:
+            return
+        if session.busy:
+            session.dirty = True
+            return
+        session.busy = True
+        task = self._loop.create_task(self._tick(session))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _tick(self, session: SupervisedSession) -> None:
+        try:
+            await asyncio.to_thread(
+                respond_once, session.detector, session.router, session.sender, self._logger, session.pane, session.name
+            )
+        finally:
+            session.busy = False
+        self._state.update(self._runtime_state())
+        if session.dirty:
+            session.dirty = False
+            self._start_tick(session)
+
 
 def main() -> None:
     args = parse_args()
@@ -957,7 +2927,7 @@ def main() -> None:
     if not validate_startup(args, logger):
         sys.exit(EXIT_INVALID_ARGS)
 
-    loop = MainLoop(args, logger)
+    loop = Supervisor(args, logger) if args.supervise else MainLoop(args, logger)
     code = loop.run()
     logger.close()
     sys.exit(code)
@@ -10,8 +10,12 @@ Claude Code Controller (claude-ctl)
     claude-ctl --session <name> --reject
     claude-ctl --list-sessions
     claude-ctl --list-panes [--session <name>]
+    claude-ctl --batch < commands.ndjson
     claude-ctl --version
 
+按键默认通过一个 tmux 控制模式 (tmux -C) 连接一次发送，
+无法连接时回退为逐条 tmux send-keys；--tmux-transport subprocess 强制逐条调用。
+
 session 格式支持:
     claude-main              # session 级别
     claude-main:0            # window 级别
@@ -19,8 +23,13 @@ session 格式支持:
 """
 
 import argparse
+import json
+import os
+import select
 import subprocess
 import sys
+import time
+from typing import Optional
 
 # Version management
 try:
@@ -37,12 +46,151 @@ EXIT_INVALID_ARGS = 2
 EXIT_TMUX_ERROR = 3
 
 
+TMUX_TRANSPORTS = ("control", "subprocess")
+
+
+def tmux_quote(arg: str) -> str:
+    """按 tmux 命令语法给参数加双引号（转义反斜杠、双引号、$ 与换行）"""
+    escaped = arg.replace("\\", "\\\\").replace('"', '\\"').replace("$", "\\$").replace("\n", "\\n")
+    return f'"{escaped}"'
+
+
+class TmuxControl:
+    """tmux 控制模式 (tmux -C) 连接：一组命令一次写入，按 %begin/%end 块确认结果
+
+    控制模式不可用（tmux 不存在、无法 attach、连接在执行任何命令前已断开）时
+    run() 返回 None，调用方回退到逐条 subprocess；命令开始执行后出错只返回
+    False，不会重复发送按键。连接断开后下次 run() 会重新 attach。
+    """
+
+    def __init__(self, timeout: float = 5.0):
+        self._timeout = timeout
+        self._proc: Optional[subprocess.Popen] = None
+        self._buf = b""
+        self._eof = False
+        self._failed = False
+
+    @property
+    def connected(self) -> bool:
+        return self._proc is not None
+
+    def run(self, target: str, commands: list[list[str]], output: Optional[list[str]] = None) -> Optional[bool]:
+        """执行一组 tmux 命令；全部成功返回 True，控制模式不可用返回 None
+
+        Args:
+            target: 目标 session/window/pane，尚未连接时 attach 到它所在的 session
+            commands: tmux 命令，每条是参数列表
+            output: 可选，收集命令输出的行
+        """
+        if self._proc is None and not self._connect(target):
+            return None
+        payload = "".join(cmd[0] + "".join(f" {tmux_quote(arg)}" for arg in cmd[1:]) + "\n" for cmd in commands)
+        try:
+            self._proc.stdin.write(payload.encode("utf-8"))
+            self._proc.stdin.flush()
+        except OSError:
+            self.close()
+            return None
+        results, started = self._read_results(len(commands), output)
+        if results is None:
+            self.close()
+            # 连接在执行任何命令之前就断开了（例如 attach 的 session 已被关闭）
+            return False if started else None
+        return all(results)
+
+    def _connect(self, target: str) -> bool:
+        if self._failed:
+            return False
+        cmd = ["tmux", "-C", "attach-session", "-t", target.split(":")[0], "-f", "no-output,ignore-size"]
+        try:
+            self._proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        except OSError:
+            self._failed = True
+            return False
+        self._buf = b""
+        self._eof = False
+        if self._read_results(1)[0] != [True]:
+            self.close()
+            return False
+        return True
+
+    def _read_results(self, count: int, output: Optional[list[str]] = None) -> tuple[Optional[list[bool]], bool]:
+        """读取 count 个结果块；返回 (结果列表或 None, 是否已有命令开始执行)"""
+        deadline = time.monotonic() + self._timeout
+        results: list[bool] = []
+        in_block = False
+        started = False
+        while len(results) < count:
+            line = self._readline(deadline)
+            if line is None:
+                # 超时（而非连接关闭）时命令可能仍会执行，按已开始处理
+                return None, started or not self._eof
+            if line.startswith(b"%begin"):
+                in_block = started = True
+            elif in_block and line.startswith((b"%end", b"%error")):
+                results.append(line.startswith(b"%end"))
+                in_block = False
+            elif in_block and output is not None:
+                output.append(line.decode("utf-8", errors="replace"))
+            elif not in_block and line.startswith(b"%exit"):
+                return None, started
+        return results, started
+
+    def _readline(self, deadline: float) -> Optional[bytes]:
+        fd = self._proc.stdout.fileno()
+        while b"\n" not in self._buf:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            ready, _, _ = select.select([fd], [], [], remaining)
+            if not ready:
+                return None
+            chunk = os.read(fd, 65536)
+            if not chunk:
+                self._eof = True
+                return None
+            self._buf += chunk
+        line, self._buf = self._buf.split(b"\n", 1)
+        return line
+
+    def close(self) -> None:
+        proc, self._proc = self._proc, None
+        if proc is None:
+            return
+        try:
+            proc.stdin.close()
+        except OSError:
+            pass
+        try:
+            proc.wait(timeout=1)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+
+
 class TmuxClient:
-    """封装 tmux 命令调用"""
+    """封装 tmux 命令调用
 
-    @staticmethod
-    def session_exists(name: str) -> bool:
+    通过 use_control() 设置控制模式连接后，session_exists 与 send_sequence
+    复用同一个 tmux -C 连接；未设置或连接不可用时逐条启动 tmux 进程。
+    """
+
+    _control: Optional[TmuxControl] = None
+
+    @classmethod
+    def use_control(cls, control: Optional[TmuxControl]) -> None:
+        """设置（或用 None 清除）共用的控制模式连接"""
+        if cls._control is not None and cls._control is not control:
+            cls._control.close()
+        cls._control = control
+
+    @classmethod
+    def session_exists(cls, name: str) -> bool:
         """检查 tmux session 是否存在"""
+        if cls._control is not None:
+            result = cls._control.run(name, [["has-session", "-t", name]])
+            if result is not None:
+                return result
         try:
             result = subprocess.run(
                 ["tmux", "has-session", "-t", name],
@@ -95,6 +243,19 @@ class TmuxClient:
         except (subprocess.TimeoutExpired, FileNotFoundError):
             return False
 
+    @classmethod
+    def send_sequence(cls, session: str, keys: list[tuple[str, bool]]) -> bool:
+        """依次发送一组 (text, literal) 按键；有控制模式连接时一次写入"""
+        if cls._control is not None:
+            commands = [["send-keys", "-t", session, *(["-l"] if literal else []), text] for text, literal in keys]
+            result = cls._control.run(session, commands)
+            if result is not None:
+                return result
+        for text, literal in keys:
+            if not cls.send_keys(session, text, literal=literal):
+                return False
+        return True
+
     @staticmethod
     def list_panes(target: str = "") -> list[str]:
         """列出所有 pane，返回详细信息
@@ -127,6 +288,182 @@ class TmuxClient:
         except (subprocess.TimeoutExpired, FileNotFoundError):
             return []
 
+    @classmethod
+    def list_targets(cls) -> Optional[list[str]]:
+        """列出所有 pane 的 session:window.pane；tmux 调用失败返回 None"""
+        fmt = "#{session_name}:#{window_index}.#{pane_index}"
+        if cls._control is not None and cls._control.connected:
+            lines: list[str] = []
+            if cls._control.run("", [["list-panes", "-a", "-F", fmt]], output=lines):
+                return lines
+        try:
+            result = subprocess.run(["tmux", "list-panes", "-a", "-F", fmt], capture_output=True, text=True, timeout=5)
+        except (subprocess.TimeoutExpired, FileNotFoundError):
+            return None
+        if result.returncode != 0:
+            # 没有 tmux server 时视为空列表
+            return [] if "no server running" in result.stderr else None
+        return [line.strip() for line in result.stdout.splitlines() if line.strip()]
+
+
+# ============================================================================
+# 批量模式 (--batch)
+# ============================================================================
+
+DEFAULT_CACHE_TTL = 2.0
+
+
+class TargetCache:
+    """session / window / pane 列表缓存，TTL 内的存在性检查不再调用 tmux
+
+    缓存未命中时（可能是刚创建的 session，或 %id 等其它 target 写法）
+    直接用 has-session 确认，保证不会误报不存在。
+    """
+
+    def __init__(self, ttl: float = DEFAULT_CACHE_TTL, clock=time.monotonic):
+        self._ttl = ttl
+        self._clock = clock
+        self._targets: set[str] = set()
+        self._loaded_at: Optional[float] = None
+        self.refreshes = 0
+
+    def _refresh(self) -> None:
+        targets = TmuxClient.list_targets()
+        self.refreshes += 1
+        self._targets = set()
+        self._loaded_at = self._clock() if targets is not None else None
+        for pane in targets or []:
+            session, _, rest = pane.partition(":")
+            window = rest.partition(".")[0]
+            self._targets.update((session, f"{session}:{window}", pane))
+
+    def exists(self, target: str) -> bool:
+        if self._loaded_at is None or self._clock() - self._loaded_at >= self._ttl:
+            self._refresh()
+        if target in self._targets:
+            return True
+        return TmuxClient.session_exists(target)
+
+    def invalidate(self) -> None:
+        self._loaded_at = None
+
+
+def message_keys(text: str) -> list[tuple[str, bool]]:
+    """消息的按键序列；空消息只发送 Enter"""
+    return ([(text, True)] if text else []) + [("Enter", False)]
+
+
+def select_keys(options) -> Optional[list[tuple[str, bool]]]:
+    """选项的按键序列（每个选项 + Enter）；options 为逗号分隔字符串或字符串列表，类型不对或有空选项时返回 None"""
+    if isinstance(options, str):
+        option_list = [opt.strip() for opt in options.split(",")]
+    elif isinstance(options, list):
+        option_list = options
+    else:
+        return None
+    if not option_list or any(not isinstance(opt, str) or not opt.strip() for opt in option_list):
+        return None
+    keys: list[tuple[str, bool]] = []
+    for opt in option_list:
+        keys += [(opt.strip(), True), ("Enter", False)]
+    return keys
+
+
+# 权限请求的回答按键
+ANSWER_KEYS = {
+    "approve": [("Y", True), ("Enter", False)],
+    "reject": [("n", True), ("Enter", False)],
+}
+
+
+def batch_result(command, code: int, error: Optional[str] = None, **extra) -> dict:
+    """批量命令的结果对象；每行都带 id / action（命令不是对象时为 None），形状一致"""
+    if not isinstance(command, dict):
+        command = {}
+    return {
+        "id": command.get("id"),
+        "action": command.get("action"),
+        "ok": code == EXIT_SUCCESS,
+        "code": code,
+        "error": error,
+        **extra,
+    }
+
+
+def execute_batch_command(command, cache: TargetCache) -> dict:
+    """执行一条批量命令，返回结果对象（ok / code / error，列表类命令附带结果）"""
+    if not isinstance(command, dict):
+        return batch_result(command, EXIT_INVALID_ARGS, "command must be a JSON object")
+    action = command.get("action")
+    session = command.get("session")
+
+    def _done(code: int, error: Optional[str] = None, **extra) -> dict:
+        return batch_result(command, code, error, **extra)
+
+    if session is not None and not isinstance(session, str):
+        return _done(EXIT_INVALID_ARGS, "session must be a string")
+    if action == "list-sessions":
+        return _done(EXIT_SUCCESS, sessions=TmuxClient.list_sessions())
+    if action == "list-panes":
+        return _done(EXIT_SUCCESS, panes=TmuxClient.list_panes(session or ""))
+
+    if action == "message":
+        text = command.get("text", "")
+        if not isinstance(text, str):
+            return _done(EXIT_INVALID_ARGS, "text must be a string")
+        keys = message_keys(text)
+    elif action == "select":
+        options = command.get("options", "")
+        if not isinstance(options, (str, list)) or (
+            isinstance(options, list) and not all(isinstance(opt, str) for opt in options)
+        ):
+            return _done(EXIT_INVALID_ARGS, "options must be a string or a list of strings")
+        keys = select_keys(options)
+        if keys is None:
+            return _done(EXIT_INVALID_ARGS, "Option cannot be empty")
+    elif action in ANSWER_KEYS:
+        keys = ANSWER_KEYS[action]
+    else:
+        return _done(EXIT_INVALID_ARGS, f"unknown action: {action!r}")
+
+    if not isinstance(session, str) or not session:
+        return _done(EXIT_INVALID_ARGS, f"session is required for {action}")
+    if not cache.exists(session):
+        return _done(EXIT_SESSION_NOT_FOUND, f"Session '{session}' not found")
+    if not TmuxClient.send_sequence(session, keys):
+        cache.invalidate()
+        return _done(EXIT_TMUX_ERROR, f"Failed to send {action} to session '{session}'")
+    return _done(EXIT_SUCCESS)
+
+
+def run_batch(stdin, stdout, ttl: float = DEFAULT_CACHE_TTL) -> int:
+    """逐行读取 JSON 命令并执行，每条命令输出一行 JSON 结果
+
+    Returns:
+        全部成功返回 EXIT_SUCCESS，否则返回第一条失败命令的退出码
+    """
+    cache = TargetCache(ttl)
+    exit_code = EXIT_SUCCESS
+    for line in stdin:
+        if not line.strip():
+            continue
+        try:
+            command = json.loads(line)
+        except json.JSONDecodeError as e:
+            result = batch_result(None, EXIT_INVALID_ARGS, f"invalid JSON: {e.msg}")
+        else:
+            # 单条命令的意外异常只让这一条失败，不中断整个批次
+            try:
+                result = execute_batch_command(command, cache)
+            except Exception as e:
+                cache.invalidate()
+                result = batch_result(command, EXIT_TMUX_ERROR, f"{type(e).__name__}: {e}")
+        if not result["ok"] and exit_code == EXIT_SUCCESS:
+            exit_code = result["code"]
+        stdout.write(json.dumps(result, ensure_ascii=False) + "\n")
+        stdout.flush()
+    return exit_code
+
 
 def parse_args() -> argparse.Namespace:
     """解析命令行参数"""
@@ -144,6 +481,7 @@ def parse_args() -> argparse.Namespace:
     claude-ctl --list-panes
     claude-ctl --list-panes --session claude-main
     claude-ctl --session claude-main:0.1 --message "hello pane 1"
+    echo '{"action": "message", "session": "claude-main", "text": "继续工作"}' | claude-ctl --batch
         """,
     )
 
@@ -182,6 +520,23 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="列出所有 pane（可选 --session 指定范围）",
     )
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="批量模式：从 stdin 逐行读取 JSON 命令，每条命令向 stdout 输出一行 JSON 结果",
+    )
+    parser.add_argument(
+        "--cache-ttl",
+        type=float,
+        default=DEFAULT_CACHE_TTL,
+        help=f"批量模式下 session/pane 列表缓存秒数 (默认 {DEFAULT_CACHE_TTL})",
+    )
+    parser.add_argument(
+        "--tmux-transport",
+        choices=TMUX_TRANSPORTS,
+        default="control",
+        help="按键发送方式: control 通过一个 tmux -C 连接批量发送（不可用时回退）, subprocess 逐条调用 tmux",
+    )
     parser.add_argument(
         "--version",
         action="store_true",
@@ -200,6 +555,10 @@ def parse_args() -> argparse.Namespace:
         ]
     )
 
+    if args.batch and action_count:
+        print("Error: --batch reads commands from stdin and cannot be combined with an action", file=sys.stderr)
+        sys.exit(EXIT_INVALID_ARGS)
+
     if action_count > 1:
         # 找出冲突的参数
         actions = []
@@ -227,13 +586,8 @@ def handle_message(session: str, text: str) -> int:
         return EXIT_SESSION_NOT_FOUND
 
     # 空消息允许（仅发送 Enter）
-    if text:
-        if not TmuxClient.send_keys(session, text, literal=True):
-            print(f"Error: Failed to send message to session '{session}'", file=sys.stderr)
-            return EXIT_TMUX_ERROR
-
-    if not TmuxClient.send_enter(session):
-        print(f"Error: Failed to send Enter to session '{session}'", file=sys.stderr)
+    if not TmuxClient.send_sequence(session, message_keys(text)):
+        print(f"Error: Failed to send message to session '{session}'", file=sys.stderr)
         return EXIT_TMUX_ERROR
 
     print(f"Message sent to session: {session}")
@@ -250,23 +604,16 @@ def handle_select(session: str, options: str) -> int:
         print(f"Error: Session '{session}' not found", file=sys.stderr)
         return EXIT_SESSION_NOT_FOUND
 
-    # 解析逗号分隔的选项，去除每个选项的首尾空格
-    option_list = [opt.strip() for opt in options.split(",")]
-
-    # 检查是否有空选项
-    for opt in option_list:
-        if not opt:
-            print("Error: Option cannot be empty", file=sys.stderr)
-            return EXIT_INVALID_ARGS
+    # 解析逗号分隔的选项（去除首尾空格），有空选项时拒绝
+    keys = select_keys(options)
+    if keys is None:
+        print("Error: Option cannot be empty", file=sys.stderr)
+        return EXIT_INVALID_ARGS
 
-    # 依次发送每个选项
-    for opt in option_list:
-        if not TmuxClient.send_keys(session, opt, literal=True):
-            print(f"Error: Failed to send option '{opt}' to session '{session}'", file=sys.stderr)
-            return EXIT_TMUX_ERROR
-        if not TmuxClient.send_enter(session):
-            print(f"Error: Failed to send Enter to session '{session}'", file=sys.stderr)
-            return EXIT_TMUX_ERROR
+    # 依次发送每个选项（选项 + Enter）
+    if not TmuxClient.send_sequence(session, keys):
+        print(f"Error: Failed to send options to session '{session}'", file=sys.stderr)
+        return EXIT_TMUX_ERROR
 
     print(f"Message sent to session: {session}")
     return EXIT_SUCCESS
@@ -278,14 +625,10 @@ def handle_approve(session: str) -> int:
         print(f"Error: Session '{session}' not found", file=sys.stderr)
         return EXIT_SESSION_NOT_FOUND
 
-    if not TmuxClient.send_keys(session, "Y", literal=True):
+    if not TmuxClient.send_sequence(session, ANSWER_KEYS["approve"]):
         print(f"Error: Failed to send approval to session '{session}'", file=sys.stderr)
         return EXIT_TMUX_ERROR
 
-    if not TmuxClient.send_enter(session):
-        print(f"Error: Failed to send Enter to session '{session}'", file=sys.stderr)
-        return EXIT_TMUX_ERROR
-
     print(f"Message sent to session: {session}")
     return EXIT_SUCCESS
 
@@ -296,14 +639,10 @@ def handle_reject(session: str) -> int:
         print(f"Error: Session '{session}' not found", file=sys.stderr)
         return EXIT_SESSION_NOT_FOUND
 
-    if not TmuxClient.send_keys(session, "n", literal=True):
+    if not TmuxClient.send_sequence(session, ANSWER_KEYS["reject"]):
         print(f"Error: Failed to send rejection to session '{session}'", file=sys.stderr)
         return EXIT_TMUX_ERROR
 
-    if not TmuxClient.send_enter(session):
-        print(f"Error: Failed to send Enter to session '{session}'", file=sys.stderr)
-        return EXIT_TMUX_ERROR
-
     print(f"Message sent to session: {session}")
     return EXIT_SUCCESS
 
@@ -354,30 +693,30 @@ def main() -> None:
     if args.list_panes:
         sys.exit(handle_list_panes(args.session))
 
-    # 需要 --session 的操作
-    if args.message is not None:
-        if not args.session:
-            print("Error: --session is required for --message", file=sys.stderr)
-            sys.exit(EXIT_INVALID_ARGS)
-        sys.exit(handle_message(args.session, args.message))
-
-    if args.select is not None:
-        if not args.session:
-            print("Error: --session is required for --select", file=sys.stderr)
-            sys.exit(EXIT_INVALID_ARGS)
-        sys.exit(handle_select(args.session, args.select))
-
-    if args.approve:
-        if not args.session:
-            print("Error: --session is required for --approve", file=sys.stderr)
-            sys.exit(EXIT_INVALID_ARGS)
-        sys.exit(handle_approve(args.session))
-
-    if args.reject:
-        if not args.session:
-            print("Error: --session is required for --reject", file=sys.stderr)
-            sys.exit(EXIT_INVALID_ARGS)
-        sys.exit(handle_reject(args.session))
+    if args.tmux_transport == "control":
+        TmuxClient.use_control(TmuxControl())
+    try:
+        if args.batch:
+            sys.exit(run_batch(sys.stdin, sys.stdout, args.cache_ttl))
+        sys.exit(dispatch_action(args))
+    finally:
+        TmuxClient.use_control(None)
+
+
+def dispatch_action(args: argparse.Namespace) -> int:
+    """执行需要 --session 的操作，返回退出码"""
+    actions = (
+        ("--message", args.message is not None, lambda: handle_message(args.session, args.message)),
+        ("--select", args.select is not None, lambda: handle_select(args.session, args.select)),
+        ("--approve", args.approve, lambda: handle_approve(args.session)),
+        ("--reject", args.reject, lambda: handle_reject(args.session)),
+    )
+    for flag, requested, handler in actions:
+        if requested:
+            if not args.session:
+                print(f"Error: --session is required for {flag}", file=sys.stderr)
+                return EXIT_INVALID_ARGS
+            return handler()
 
     # 没有指定任何操作
     print(
@@ -385,7 +724,7 @@ def main() -> None:
         "--reject, --list-sessions, --list-panes, --version",
         file=sys.stderr,
     )
-    sys.exit(EXIT_INVALID_ARGS)
+    return EXIT_INVALID_ARGS
 
 
 if __name__ == "__main__":
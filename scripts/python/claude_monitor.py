@@ -5,17 +5,21 @@ Claude Code Session Monitor
 """
 
 import argparse
+import asyncio
 import atexit
+import importlib
 import json
 import os
 import signal
 import subprocess
 import sys
+import threading
 import time
+from collections import deque
 from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
-from typing import TYPE_CHECKING, Any, Optional
+from typing import TYPE_CHECKING, Any, Callable, ClassVar, Optional
 
 # 延迟导入 watchdog，避免在导入模块时就失败
 if TYPE_CHECKING:
@@ -140,6 +144,8 @@ class SessionState:
     questions: list[QuestionInfo] = field(default_factory=list)
     pending_tools: list[ToolUseInfo] = field(default_factory=list)
     error_info: Optional[ErrorInfo] = None
+    project: str = ""  # 所属项目目录名
+    last_activity: float = 0.0  # 最后一条消息的时间（用于淘汰空闲 session）
 
 
 # ============================================================================
@@ -561,6 +567,377 @@ class OutputFormatter:
         return "\n".join(lines)
 
 
+# ============================================================================
+# Session 文件尾部读取
+# ============================================================================
+
+# 反向读取 session 文件时每次 seek 的块大小
+TAIL_BLOCK_SIZE = 64 * 1024
+# 启动时默认只恢复最近修改的 N 个 session
+DEFAULT_MAX_SESSIONS = 20
+# 超过该时间（秒）没有新消息的 session 状态会被淘汰，0 表示不淘汰
+DEFAULT_IDLE_TTL = 3600.0
+
+
+def iter_lines_reversed(f, end: int, block_size: int = TAIL_BLOCK_SIZE):
+    """
+    从 end 处向前按块读取二进制文件，逐行逆序产出（不含换行符）
+
+    第一个产出的是最后一个换行符之后的片段（文件以换行结尾时为空）。
+    跨越多个块的长行按片段拼接，不会反复复制已读内容。
+
+    Args:
+        f: 以 "rb" 打开的文件对象
+        end: 读取的结束位置（通常为文件大小）
+        block_size: 每次读取的字节数
+    """
+    pos = end
+    pending: list[bytes] = []  # 当前行尚未遇到行首的片段（逆序）
+    while pos > 0:
+        start = max(0, pos - block_size)
+        f.seek(start)
+        parts = f.read(pos - start).split(b"\n")
+        pos = start
+        pending.append(parts[-1])
+        if len(parts) == 1:
+            continue
+        yield b"".join(reversed(pending))
+        for part in reversed(parts[1:-1]):
+            yield part
+        pending = [parts[0]]
+    yield b"".join(reversed(pending))
+
+
+def tail_session_file(session_file: Path, block_size: int = TAIL_BLOCK_SIZE) -> tuple[Optional[dict], int]:
+    """
+    从文件末尾反向查找最后一条完整的 assistant 记录，不把整个文件读入内存
+
+    Args:
+        session_file: session 文件路径
+        block_size: 每次读取的字节数
+
+    Returns:
+        (最后一条 assistant 记录或 None, 最后一条完整记录的结束偏移)。
+        末尾尚未写完的半行不计入偏移，补全后由增量读取处理。
+    """
+    record = None
+    with open(session_file, "rb") as f:
+        size = f.seek(0, os.SEEK_END)
+        offset = size
+        for index, line in enumerate(iter_lines_reversed(f, size, block_size)):
+            if not line.strip():
+                continue
+            # 预筛选：只解析可能是 assistant 的行，跳过大段的工具结果
+            if index > 0 and b'"assistant"' not in line:
+                continue
+            try:
+                data = json.loads(line)
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                if index == 0:
+                    offset = size - len(line)
+                continue
+            if isinstance(data, dict) and data.get("type") == "assistant":
+                record = data
+                break
+    return record, offset
+
+
+def complete_records_end(session_file: Path, size: int, block_size: int = TAIL_BLOCK_SIZE) -> int:
+    """
+    返回 size 之前最后一条完整记录的结束偏移（与 tail_session_file 的偏移一致）
+
+    末尾尚未写完的半行不计入，之后从行首增量读取，不会从记录中间开始而丢掉它。
+    文件无法读取时返回 size。
+    """
+    try:
+        with open(session_file, "rb") as f:
+            tail = next(iter_lines_reversed(f, size, block_size))
+    except OSError:
+        return size
+    if not tail.strip():
+        return size
+    try:
+        json.loads(tail)
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return size - len(tail)
+    return size
+
+
+def recent_session_files(paths) -> list[tuple[float, int, Path]]:
+    """返回 (mtime, size, path) 列表，按修改时间从新到旧排序，跳过无法 stat 的文件"""
+    files = []
+    for path in paths:
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        files.append((stat.st_mtime, stat.st_size, path))
+    files.sort(key=lambda item: item[0], reverse=True)
+    return files
+
+
+# ============================================================================
+# 事件总线
+# ============================================================================
+
+
+@dataclass
+class MonitorEvent:
+    """监听事件基类；to_dict() 即 --json 模式输出的一行"""
+
+    STATUS: ClassVar[SessionStatus]
+
+    session_id: str
+    project: str
+    timestamp: float
+
+    def to_dict(self) -> dict:
+        return {
+            "session_id": self.session_id,
+            "project": self.project,
+            "status": self.STATUS.value,
+            "timestamp": self.timestamp,
+            **self._payload(),
+        }
+
+    def _payload(self) -> dict:
+        return {}
+
+
+@dataclass
+class TaskCompleteEvent(MonitorEvent):
+    """执行完成"""
+
+    STATUS: ClassVar[SessionStatus] = SessionStatus.TASK_COMPLETE
+
+    stop_reason: Optional[str] = None
+    output: str = ""
+
+    def _payload(self) -> dict:
+        return {"stop_reason": self.stop_reason or "unknown", "output": self.output}
+
+
+@dataclass
+class UserQuestionEvent(MonitorEvent):
+    """等待用户回答 AskUserQuestion"""
+
+    STATUS: ClassVar[SessionStatus] = SessionStatus.USER_QUESTION
+
+    questions: list[QuestionInfo] = field(default_factory=list)
+
+    def _payload(self) -> dict:
+        return {
+            "questions": [
+                {
+                    "question": q.question,
+                    "header": q.header,
+                    "options": [{"label": opt.label, "description": opt.description} for opt in q.options],
+                    "multi_select": q.multi_select,
+                }
+                for q in self.questions
+            ]
+        }
+
+
+@dataclass
+class ErrorStopEvent(MonitorEvent):
+    """出错停止"""
+
+    STATUS: ClassVar[SessionStatus] = SessionStatus.ERROR_STOP
+
+    error: Optional[ErrorInfo] = None
+
+    def _payload(self) -> dict:
+        error = self.error or ErrorInfo(error_type="unknown", message="")
+        return {
+            "error": {
+                "type": error.error_type,
+                "message": error.message,
+                "tool_name": error.tool_name,
+                "tool_input": error.tool_input,
+            }
+        }
+
+
+@dataclass
+class ToolUseEvent(MonitorEvent):
+    """工具调用"""
+
+    STATUS: ClassVar[SessionStatus] = SessionStatus.TOOL_USE
+
+    tools: list[ToolUseInfo] = field(default_factory=list)
+
+    def _payload(self) -> dict:
+        return {
+            "tools": [
+                {
+                    "name": t.tool_name,
+                    "id": t.tool_id,
+                    "details": extract_tool_details(t.tool_name, t.tool_input or {}),
+                }
+                for t in self.tools
+            ]
+        }
+
+
+# 订阅者队列满时的处理策略
+SINK_POLICY_DROP_OLDEST = "drop-oldest"  # 丢弃最早的事件
+SINK_POLICY_BLOCK = "block"  # 阻塞发布方直到有空位
+SINK_POLICY_COALESCE = "coalesce"  # 同一 session 同类事件只保留最新一条，仍满时丢弃最早的
+SINK_POLICY_DROP_TOOL_USE = "drop-tool-use"  # 先丢弃最早的工具调用事件，没有时才丢弃最早的其他事件
+SINK_POLICIES = (SINK_POLICY_DROP_OLDEST, SINK_POLICY_BLOCK, SINK_POLICY_COALESCE, SINK_POLICY_DROP_TOOL_USE)
+DEFAULT_SINK_QUEUE_SIZE = 256
+
+
+class Subscription:
+    """一个订阅者：独立的有界队列与投递线程，慢订阅者不会阻塞文件处理"""
+
+    def __init__(
+        self,
+        handler: Callable[[MonitorEvent], None],
+        name: str,
+        maxsize: int = DEFAULT_SINK_QUEUE_SIZE,
+        policy: str = SINK_POLICY_DROP_OLDEST,
+        event_types: Optional[tuple[type, ...]] = None,
+    ):
+        if policy not in SINK_POLICIES:
+            raise ValueError(f"Unknown sink policy: {policy}")
+        self.handler = handler
+        self.name = name
+        self.maxsize = max(1, maxsize)
+        self.policy = policy
+        self.event_types = event_types
+        self.delivered = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.errors = 0
+        self._queue: deque[MonitorEvent] = deque()
+        self._cond = threading.Condition()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name=f"sink-{name}", daemon=True)
+        self._thread.start()
+
+    def offer(self, event: MonitorEvent) -> None:
+        """按策略把事件放入队列（在发布方线程中调用）"""
+        if self.event_types and not isinstance(event, self.event_types):
+            return
+        with self._cond:
+            if self._closed:
+                return
+            if self.policy == SINK_POLICY_COALESCE:
+                # 删掉旧的那条、新事件排到队尾，不越过之后到达的其他事件
+                for index, queued in enumerate(self._queue):
+                    if type(queued) is type(event) and queued.session_id == event.session_id:
+                        del self._queue[index]
+                        self.coalesced += 1
+                        break
+            while len(self._queue) >= self.maxsize:
+                if self.policy == SINK_POLICY_BLOCK and not self._closed:
+                    self._cond.wait()
+                    continue
+                if self.policy == SINK_POLICY_DROP_TOOL_USE:
+                    victim = next((queued for queued in self._queue if isinstance(queued, ToolUseEvent)), None)
+                    if victim is None and isinstance(event, ToolUseEvent):
+                        # 队列里都是更重要的事件，丢弃新到的工具调用
+                        self.dropped += 1
+                        return
+                    if victim is not None:
+                        self._queue.remove(victim)
+                        self.dropped += 1
+                        continue
+                self._queue.popleft()
+                self.dropped += 1
+            self._queue.append(event)
+            self._cond.notify_all()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._queue and not self._closed:
+                    self._cond.wait()
+                if not self._queue:
+                    return
+                event = self._queue.popleft()
+                self._cond.notify_all()
+            try:
+                self.handler(event)
+                self.delivered += 1
+            except Exception as e:
+                self.errors += 1
+                print(f"[WARN] Event sink '{self.name}' failed: {e}", file=sys.stderr)
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """投递完队列中剩余的事件后停止（最多等待 timeout 秒）"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+
+    def stats(self) -> dict:
+        with self._cond:
+            queued = len(self._queue)
+        return {
+            "queued": queued,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "coalesced": self.coalesced,
+            "errors": self.errors,
+        }
+
+
+class EventBus:
+    """把监听事件分发给多个订阅者，每个订阅者各自排队、各自投递"""
+
+    def __init__(self):
+        self._subscriptions: list[Subscription] = []
+        self._lock = threading.Lock()
+
+    def subscribe(
+        self,
+        handler: Callable[[MonitorEvent], None],
+        name: Optional[str] = None,
+        maxsize: int = DEFAULT_SINK_QUEUE_SIZE,
+        policy: str = SINK_POLICY_DROP_OLDEST,
+        event_types: Optional[tuple[type, ...]] = None,
+    ) -> Subscription:
+        """
+        注册订阅者
+
+        Args:
+            handler: 在订阅者自己的线程中对每个事件调用
+            name: 订阅者名称（用于日志与线程名）
+            maxsize: 队列容量
+            policy: 队列满时的策略（SINK_POLICIES）
+            event_types: 只接收这些事件类型，None 表示全部
+        """
+        subscription = Subscription(
+            handler, name or f"sink{len(self._subscriptions) + 1}", maxsize, policy, event_types
+        )
+        with self._lock:
+            self._subscriptions = [*self._subscriptions, subscription]
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription, timeout: Optional[float] = None) -> None:
+        with self._lock:
+            self._subscriptions = [s for s in self._subscriptions if s is not subscription]
+        subscription.close(timeout)
+
+    def publish(self, event: MonitorEvent) -> None:
+        """发布事件；只有 block 策略的订阅者队列满时才会等待"""
+        for subscription in self._subscriptions:
+            subscription.offer(event)
+
+    def close(self, timeout: Optional[float] = 5.0) -> None:
+        """关闭所有订阅者，各自投递完剩余事件"""
+        with self._lock:
+            subscriptions, self._subscriptions = self._subscriptions, []
+        for subscription in subscriptions:
+            subscription.close(timeout)
+
+    def stats(self) -> dict[str, dict]:
+        return {subscription.name: subscription.stats() for subscription in self._subscriptions}
+
+
 def _get_filesystem_event_handler():
     """延迟获取 FileSystemEventHandler 基类"""
     try:
@@ -578,7 +955,11 @@ def _get_filesystem_event_handler():
 
 
 class ClaudeSessionMonitor(_get_filesystem_event_handler()):
-    """监听 Claude Code session 文件变化"""
+    """监听 Claude Code session 文件变化
+
+    状态变化以类型化事件发布到 bus（可有多个订阅者）；on_complete 等回调是
+    兼容保留的单消费者入口，与 bus 同时生效。
+    """
 
     # 表示执行完成的 stop_reason
     STOP_REASONS_COMPLETE = ("end_turn", "stop_sequence", "max_tokens")
@@ -589,6 +970,8 @@ class ClaudeSessionMonitor(_get_filesystem_event_handler()):
 
     # 判断为活跃的时间窗口（秒）
     ACTIVE_THRESHOLD_SECONDS = 3.0
+    # 两次空闲 session 淘汰检查之间的最小间隔（秒）
+    EVICT_INTERVAL_SECONDS = 60.0
 
     def __init__(
         self,
@@ -598,9 +981,16 @@ class ClaudeSessionMonitor(_get_filesystem_event_handler()):
         on_user_question: Optional[callable] = None,
         on_error_stop: Optional[callable] = None,
         on_tool_use: Optional[callable] = None,
+        max_sessions: Optional[int] = DEFAULT_MAX_SESSIONS,
+        idle_ttl: float = DEFAULT_IDLE_TTL,
+        bus: Optional[EventBus] = None,
     ):
         self.project_dir = project_dir or self._detect_current_project()
         self.quiet = quiet
+        self.bus = bus
+        self.max_sessions = max_sessions  # None 或 0 表示恢复全部 session
+        self.idle_ttl = idle_ttl
+        self._last_evict = time.time()
         self.on_complete = on_complete
         self.on_user_question = on_user_question
         self.on_error_stop = on_error_stop
@@ -628,33 +1018,36 @@ class ClaudeSessionMonitor(_get_filesystem_event_handler()):
         return list(self.project_dir.glob("*.jsonl"))
 
     def _initialize_from_existing_files(self):
-        """初始化时读取现有文件的状态"""
-        for session_file in self._get_session_files():
-            self._process_existing_file(session_file)
+        """初始化时读取现有文件的状态
+
+        只恢复最近修改的 max_sessions 个 session；其余文件仅记录当前大小作为
+        读取位置，之后有新内容时从该位置增量处理。
+        """
+        files = recent_session_files(self._get_session_files())
+        limit = self.max_sessions or len(files)
+        for index, (mtime, size, session_file) in enumerate(files):
+            self._restore_file(session_file, mtime, size, full=index < limit)
+
+    def _restore_file(self, session_file: Path, mtime: float, size: int, full: bool):
+        """恢复单个现有文件：full 时读取最后状态，否则只记录读取位置"""
+        if not full:
+            self._file_positions[str(session_file)] = complete_records_end(session_file, size)
+            return
+        self._process_existing_file(session_file)
+        state = self.sessions.get(session_file.stem)
+        if state:
+            state.last_activity = mtime
 
     def _process_existing_file(self, session_file: Path):
         """处理现有文件，获取最后状态但不触发回调"""
-        session_id = session_file.stem
-
         try:
-            with open(session_file, "r") as f:
-                # 读取文件末尾，获取最后状态
-                lines = f.readlines()
-                self._file_positions[str(session_file)] = f.tell()
-        except (IOError, json.JSONDecodeError):
+            record, offset = tail_session_file(session_file)
+        except OSError:
             return
 
-        # 从后往前找到最后的 assistant 消息
-        for line in reversed(lines):
-            if not line.strip():
-                continue
-            try:
-                data = json.loads(line)
-                if data.get("type") == "assistant":
-                    self._update_session_state(session_id, data, silent=True)
-                    break
-            except json.JSONDecodeError:
-                continue
+        self._file_positions[str(session_file)] = offset
+        if record is not None:
+            self._update_session_state(session_file.stem, record, silent=True)
 
     def on_modified(self, event):
         """文件修改事件处理"""
@@ -665,6 +1058,7 @@ class ClaudeSessionMonitor(_get_filesystem_event_handler()):
             return
 
         self.process_session_file(Path(event.src_path))
+        self._maybe_evict()
 
     def on_created(self, event):
         """文件创建事件处理"""
@@ -725,9 +1119,10 @@ class ClaudeSessionMonitor(_get_filesystem_event_handler()):
 
         # 更新 session 状态
         if session_id not in self.sessions:
-            self.sessions[session_id] = SessionState(session_id=session_id)
+            self.sessions[session_id] = SessionState(session_id=session_id, project=self.project_dir.name)
 
         state = self.sessions[session_id]
+        state.last_activity = time.time()
         _ = state.status  # Track for future use
         previous_executing = state.is_executing
 
@@ -791,6 +1186,31 @@ class ClaudeSessionMonitor(_get_filesystem_event_handler()):
         except OSError:
             return False
 
+    def evict_idle_sessions(self, max_idle: float, now: Optional[float] = None) -> list[str]:
+        """
+        移除超过 max_idle 秒没有新消息的 session 状态
+
+        文件读取位置保留，session 再次写入时从原位置继续增量处理。
+
+        Returns:
+            被淘汰的 session ID 列表
+        """
+        if not max_idle:
+            return []
+        cutoff = (now if now is not None else time.time()) - max_idle
+        idle = [session_id for session_id, state in self.sessions.items() if state.last_activity < cutoff]
+        for session_id in idle:
+            del self.sessions[session_id]
+        return idle
+
+    def _maybe_evict(self):
+        """在文件事件线程中按间隔淘汰空闲 session，避免与事件处理并发修改"""
+        now = time.time()
+        if now - self._last_evict < self.EVICT_INTERVAL_SECONDS:
+            return
+        self._last_evict = now
+        self.evict_idle_sessions(self.idle_ttl, now)
+
     def _extract_text(self, content: list) -> str:
         """提取消息中的文本内容"""
         texts = []
@@ -804,8 +1224,16 @@ class ClaudeSessionMonitor(_get_filesystem_event_handler()):
                     texts.append(f"[Thinking]\n{thinking_text}")
         return "\n".join(texts)
 
+    def _publish(self, event_class: type, session_id: str, **payload) -> None:
+        """向事件总线发布事件"""
+        if self.bus is not None:
+            self.bus.publish(
+                event_class(session_id=session_id, project=self.project_dir.name, timestamp=time.time(), **payload)
+            )
+
     def _on_execution_complete(self, session_id: str, state: SessionState):
         """执行完成时的回调"""
+        self._publish(TaskCompleteEvent, session_id, stop_reason=state.last_stop_reason, output=state.last_output or "")
         # 调用自定义回调（即使在 quiet 模式下也调用）
         if self.on_complete:
             self.on_complete(session_id, state)
@@ -820,6 +1248,7 @@ class ClaudeSessionMonitor(_get_filesystem_event_handler()):
 
     def _on_user_question(self, session_id: str, questions: list[QuestionInfo]):
         """用户询问时的回调"""
+        self._publish(UserQuestionEvent, session_id, questions=list(questions))
         # 调用自定义回调（即使在 quiet 模式下也调用）
         if self.on_user_question:
             self.on_user_question(session_id, questions)
@@ -835,6 +1264,7 @@ class ClaudeSessionMonitor(_get_filesystem_event_handler()):
 
     def _on_error_stop(self, session_id: str, error_info: ErrorInfo):
         """出错停止时的回调"""
+        self._publish(ErrorStopEvent, session_id, error=error_info)
         # 调用自定义回调（即使在 quiet 模式下也调用）
         if self.on_error_stop:
             self.on_error_stop(session_id, error_info)
@@ -850,6 +1280,7 @@ class ClaudeSessionMonitor(_get_filesystem_event_handler()):
 
     def _on_tool_use(self, session_id: str, tools: list[ToolUseInfo]):
         """工具调用时的回调"""
+        self._publish(ToolUseEvent, session_id, tools=list(tools))
         # 调用自定义回调（即使在 quiet 模式下也调用）
         if self.on_tool_use:
             self.on_tool_use(session_id, tools)
@@ -980,6 +1411,173 @@ class ClaudeSessionMonitor(_get_filesystem_event_handler()):
         return [s for s in self.sessions.values() if s.is_executing]
 
 
+class MultiProjectMonitor(_get_filesystem_event_handler()):
+    """
+    用一个递归 observer 同时监听 ~/.claude/projects 下的所有项目
+
+    每个项目目录对应一个 ClaudeSessionMonitor（各自维护 SessionState 与文件读取位置），
+    文件事件按所在目录路由到对应项目；新出现的项目目录在首次事件时自动加入。
+    """
+
+    EVICT_INTERVAL_SECONDS = ClaudeSessionMonitor.EVICT_INTERVAL_SECONDS
+
+    def __init__(
+        self,
+        projects_root: Optional[Path] = None,
+        quiet: bool = False,
+        on_complete: Optional[callable] = None,
+        on_user_question: Optional[callable] = None,
+        on_error_stop: Optional[callable] = None,
+        on_tool_use: Optional[callable] = None,
+        max_sessions: Optional[int] = DEFAULT_MAX_SESSIONS,
+        idle_ttl: float = DEFAULT_IDLE_TTL,
+        bus: Optional[EventBus] = None,
+    ):
+        self.projects_root = projects_root or Path.home() / ".claude" / "projects"
+        if not self.projects_root.is_dir():
+            raise FileNotFoundError(f"Claude projects directory not found: {self.projects_root}")
+        self.quiet = quiet
+        self.on_complete = on_complete
+        self.on_user_question = on_user_question
+        self.on_error_stop = on_error_stop
+        self.on_tool_use = on_tool_use
+        self.max_sessions = max_sessions  # 所有项目合计，None 或 0 表示全部
+        self.idle_ttl = idle_ttl
+        self.bus = bus  # 所有项目共用
+        self.monitors: dict[str, ClaudeSessionMonitor] = {}  # 项目目录名 -> monitor
+        self._last_evict = time.time()
+        self._observer: "Optional[Observer]" = None
+
+    def _monitor_for(self, project_dir: Path) -> ClaudeSessionMonitor:
+        """获取（必要时创建）项目对应的 monitor"""
+        monitor = self.monitors.get(project_dir.name)
+        if monitor is None:
+            monitor = ClaudeSessionMonitor(
+                project_dir=project_dir,
+                quiet=self.quiet,
+                on_complete=self.on_complete,
+                on_user_question=self.on_user_question,
+                on_error_stop=self.on_error_stop,
+                on_tool_use=self.on_tool_use,
+                max_sessions=self.max_sessions,
+                idle_ttl=self.idle_ttl,
+                bus=self.bus,
+            )
+            self.monitors[project_dir.name] = monitor
+        return monitor
+
+    def _route(self, event) -> Optional[ClaudeSessionMonitor]:
+        """返回事件所属项目的 monitor；子目录中的文件（如 subagent 日志）不处理"""
+        if event.is_directory or not event.src_path.endswith(".jsonl"):
+            return None
+        project_dir = Path(event.src_path).parent
+        if project_dir.parent != self.projects_root:
+            return None
+        return self._monitor_for(project_dir)
+
+    def _initialize_from_existing_files(self):
+        """初始化所有项目：只恢复全局最近修改的 max_sessions 个 session"""
+        paths = []
+        for project_dir in self.projects_root.iterdir():
+            if project_dir.is_dir():
+                self._monitor_for(project_dir)
+                paths.extend(project_dir.glob("*.jsonl"))
+        files = recent_session_files(paths)
+        limit = self.max_sessions or len(files)
+        for index, (mtime, size, session_file) in enumerate(files):
+            self._monitor_for(session_file.parent)._restore_file(session_file, mtime, size, full=index < limit)
+
+    def on_modified(self, event):
+        """文件修改事件处理"""
+        monitor = self._route(event)
+        if monitor is None:
+            return
+        monitor.process_session_file(Path(event.src_path))
+        self._maybe_evict()
+
+    def on_created(self, event):
+        """文件创建事件处理"""
+        monitor = self._route(event)
+        if monitor is not None:
+            monitor.on_created(event)
+
+    def evict_idle_sessions(self, now: Optional[float] = None) -> list[str]:
+        """淘汰所有项目中超过 idle_ttl 没有新消息的 session"""
+        evicted = []
+        for monitor in self.monitors.values():
+            evicted.extend(monitor.evict_idle_sessions(self.idle_ttl, now))
+        return evicted
+
+    def _maybe_evict(self):
+        """在文件事件线程中按间隔淘汰空闲 session"""
+        now = time.time()
+        if now - self._last_evict < self.EVICT_INTERVAL_SECONDS:
+            return
+        self._last_evict = now
+        self.evict_idle_sessions(now)
+
+    def start(self, json_mode: bool = False):
+        """启动监听"""
+        if not _check_watchdog_available():
+            print("Error: watchdog is required. Install with: pip install watchdog", file=sys.stderr)
+            sys.exit(1)
+
+        self._initialize_from_existing_files()
+
+        from watchdog.observers import Observer
+
+        self._observer = Observer()
+        self._observer.schedule(self, str(self.projects_root), recursive=True)
+        self._observer.start()
+
+        if json_mode:
+            output = {
+                "type": "startup",
+                "projects_root": str(self.projects_root),
+                "projects": len(self.monitors),
+                "sessions": sum(len(monitor.sessions) for monitor in self.monitors.values()),
+                "timestamp": time.time(),
+            }
+            print(json.dumps(output, ensure_ascii=False), flush=True)
+        elif not self.quiet:
+            print(f"Monitoring {len(self.monitors)} projects under: {self.projects_root}")
+            executing = self.get_executing_sessions()
+            print(f"Executing sessions: {len(executing)}")
+            print("Press Ctrl+C to stop\n")
+
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            self.stop()
+
+    def stop(self):
+        """停止监听"""
+        if self._observer:
+            self._observer.stop()
+            self._observer.join()
+            self._observer = None
+
+    def get_session_state(self, session_id: str) -> Optional[SessionState]:
+        """获取指定 session 的状态（session ID 在各项目间唯一）"""
+        for monitor in list(self.monitors.values()):
+            state = monitor.get_session_state(session_id)
+            if state:
+                return state
+        return None
+
+    def get_all_sessions(self) -> dict[str, SessionState]:
+        """获取所有项目的 session 状态"""
+        sessions = {}
+        for monitor in list(self.monitors.values()):
+            sessions.update(monitor.get_all_sessions())
+        return sessions
+
+    def get_executing_sessions(self) -> list[SessionState]:
+        """获取所有项目中正在执行的 sessions"""
+        return [state for monitor in list(self.monitors.values()) for state in monitor.get_executing_sessions()]
+
+
 def list_projects():
     """列出所有可用的 Claude 项目"""
     projects_dir = Path.home() / ".claude" / "projects"
@@ -1032,12 +1630,18 @@ class TeeNotifier:
             print(f"[ERROR] Failed to start notify_telegram: {e}", file=sys.stderr)
             return False
 
+    def notify(self, data: dict) -> None:
+        """Serialize an event and write it to the subprocess only."""
+        self.send(json.dumps(data, ensure_ascii=False))
+
     def write(self, line: str) -> None:
         """Write a line to both stdout and subprocess."""
         # Always write to stdout for observation
         print(line, flush=True)
+        self.send(line)
 
-        # Write to subprocess if running
+    def send(self, line: str) -> None:
+        """Write a line to the subprocess if it is running."""
         if self._process and self._process.stdin:
             try:
                 self._process.stdin.write(line + "\n")
@@ -1058,6 +1662,111 @@ class TeeNotifier:
                 self._process = None
 
 
+# tee-notify 的通知方式：进程内 sink（默认）或 notify_telegram.py 子进程
+NOTIFY_MODES = ("inprocess", "subprocess")
+
+
+def _load_notify_module():
+    """导入同目录下的 notify_telegram 模块"""
+    script_dir = str(Path(__file__).parent)
+    if script_dir not in sys.path:
+        sys.path.insert(0, script_dir)
+    return importlib.import_module("notify_telegram")
+
+
+class InProcessNotifier:
+    """Runs notify_telegram's AsyncTelegramNotifier in-process on a background asyncio loop.
+
+    Events are handed over as dicts, so notify_telegram formats them directly
+    instead of re-parsing the JSON lines written to stdout. Same interface as
+    TeeNotifier; use the subprocess mode when the notifier should be isolated.
+    """
+
+    # Seconds to wait for the sink to come up on start and to drain on stop
+    START_TIMEOUT = 5.0
+    STOP_TIMEOUT = 5.0
+
+    def __init__(self):
+        self._notifier = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._ready = threading.Event()
+
+    def start(self) -> bool:
+        """Load notify_telegram and start the sender loop."""
+        try:
+            module = _load_notify_module()
+            config = module.Config
+            logger = module.Logger(config)
+            logger.log_startup(
+                chat_id=config.CHAT_ID or "未配置",
+                proxy=config.PROXY or "无",
+                log_path=str(logger._log_path) if logger._log_path else None,
+            )
+            self._notifier = module.AsyncTelegramNotifier(config, logger, spool=module.make_spool(config))
+        except Exception as e:
+            print(f"[ERROR] Failed to load notify_telegram: {e}", file=sys.stderr)
+            return False
+
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run, name="tee-notify", daemon=True)
+        self._thread.start()
+        if not self._ready.wait(self.START_TIMEOUT):
+            print("[ERROR] notify_telegram sink did not start", file=sys.stderr)
+            self.stop()
+            return False
+        return True
+
+    def _run(self) -> None:
+        try:
+            self._loop.run_until_complete(self._serve())
+        except Exception as e:
+            print(f"[ERROR] notify_telegram sink stopped: {e}", file=sys.stderr)
+        finally:
+            self._ready.clear()
+            self._loop.close()
+
+    async def _serve(self) -> None:
+        async with self._notifier:
+            self._ready.set()
+            await self._notifier.run()
+        self._notifier.logger.log_queue(self._notifier.stats())
+
+    def notify(self, data: dict) -> None:
+        """Queue an event for Telegram."""
+        if not self._ready.is_set():
+            return
+        try:
+            self._loop.call_soon_threadsafe(self._notifier.submit, data)
+        except RuntimeError:
+            # Loop already closed: the sink died, continue with stdout only
+            self._ready.clear()
+
+    def stop(self) -> None:
+        """Send what is queued (up to STOP_TIMEOUT) and stop the loop."""
+        if self._thread is None:
+            return
+        if self._thread.is_alive():
+            try:
+                self._loop.call_soon_threadsafe(self._notifier.close)
+            except RuntimeError:
+                pass
+            self._thread.join(self.STOP_TIMEOUT)
+        self._thread = None
+
+
+def default_sink_policy(notifier: TeeNotifier | InProcessNotifier) -> str:
+    """
+    Telegram 订阅者默认的队列策略
+
+    本进程内的 notify() 只是把事件交给 notify_telegram 的事件循环，从不阻塞，
+    用 block 不会拖慢监听；丢弃哪条通知、失败后落盘重发都交给 notify_telegram
+    自己的发送队列（先丢工具调用）与 spool。子进程模式写管道可能阻塞，
+    队列满时先丢工具调用，问题与完成事件不被丢弃。
+    """
+    return SINK_POLICY_BLOCK if isinstance(notifier, InProcessNotifier) else SINK_POLICY_DROP_TOOL_USE
+
+
 def main():
     # 确保只有一个实例运行
     atexit.register(_cleanup_pid_file)
@@ -1074,11 +1783,17 @@ Examples:
   # Monitor a specific project
   python claude_monitor.py -p -Users-xiaoming-code-myproject
 
+  # Monitor every project under ~/.claude/projects with one watcher
+  python claude_monitor.py --all-projects --json
+
   # Quiet mode (no output, useful for scripting)
   python claude_monitor.py -q
 
   # List all available projects
   python claude_monitor.py --list
+
+  # Restore state from every session at startup (default: 20 most recent)
+  python claude_monitor.py --max-sessions 0
         """,
     )
 
@@ -1088,6 +1803,12 @@ Examples:
         type=Path,
         help="Project directory to monitor (default: most recent)",
     )
+    parser.add_argument(
+        "--all-projects",
+        "-a",
+        action="store_true",
+        help="Monitor every project under ~/.claude/projects (JSON events include a project field)",
+    )
     parser.add_argument(
         "--quiet",
         "-q",
@@ -1105,10 +1826,37 @@ Examples:
         action="store_true",
         help="Output completion events as JSON (one per line)",
     )
+    parser.add_argument(
+        "--max-sessions",
+        type=int,
+        default=DEFAULT_MAX_SESSIONS,
+        help=f"Restore state of only the N most recently modified sessions at startup, 0 = all "
+        f"(default: {DEFAULT_MAX_SESSIONS})",
+    )
+    parser.add_argument(
+        "--idle-ttl",
+        type=float,
+        default=DEFAULT_IDLE_TTL,
+        help=f"Forget sessions with no new messages for this many seconds, 0 = never (default: {DEFAULT_IDLE_TTL:.0f})",
+    )
     parser.add_argument(
         "--tee-notify",
         action="store_true",
-        help="Send JSON events to both stdout and notify_telegram.py subprocess (requires --json)",
+        help="Send JSON events to both stdout and the Telegram notifier (requires --json)",
+    )
+    parser.add_argument(
+        "--notify-mode",
+        choices=NOTIFY_MODES,
+        default="inprocess",
+        help="How --tee-notify runs notify_telegram: in this process (default) or as an isolated 'uv run' subprocess",
+    )
+    parser.add_argument(
+        "--sink-policy",
+        choices=SINK_POLICIES,
+        default=None,
+        help="What the Telegram sink does when its queue is full: drop the oldest event, block the monitor, "
+        "coalesce events of the same session and type, or drop tool-use events first "
+        "(default: block for --notify-mode inprocess, drop-tool-use for subprocess)",
     )
 
     args = parser.parse_args()
@@ -1117,114 +1865,59 @@ Examples:
         list_projects()
         return
 
+    if args.all_projects and args.project:
+        print("[ERROR] --all-projects cannot be combined with --project", file=sys.stderr)
+        sys.exit(1)
+
     # Validate --tee-notify requires --json
     if args.tee_notify and not args.json:
         print("[ERROR] --tee-notify requires --json mode", file=sys.stderr)
         sys.exit(1)
 
     # Handle tee-notify mode
-    tee_notifier: Optional[TeeNotifier] = None
+    tee_notifier: Optional[TeeNotifier | InProcessNotifier] = None
     if args.tee_notify:
-        tee_notifier = TeeNotifier()
+        tee_notifier = TeeNotifier() if args.notify_mode == "subprocess" else InProcessNotifier()
         if not tee_notifier.start():
             print("[WARN] Falling back to stdout-only mode", file=sys.stderr)
             tee_notifier = None
 
-    # 创建自定义回调用于 JSON 输出
-    on_complete = None
-    on_user_question = None
-    on_error_stop = None
-    on_tool_use = None
-
+    # JSON 模式：stdout 与 Telegram 各自作为事件总线的订阅者，互不阻塞
+    bus: Optional[EventBus] = None
     if args.json:
-        # Output function: use tee_notifier if available, otherwise print directly
-        def output_json(data: dict) -> None:
-            line = json.dumps(data, ensure_ascii=False)
-            if tee_notifier:
-                tee_notifier.write(line)
-            else:
-                print(line, flush=True)
-
-        def json_complete_callback(session_id: str, state: SessionState):
-            output = {
-                "session_id": session_id,
-                "status": state.status.value,
-                "stop_reason": state.last_stop_reason or "unknown",
-                "timestamp": time.time(),
-                "output": state.last_output or "",
-            }
-            output_json(output)
+        bus = EventBus()
 
-        def json_user_question_callback(session_id: str, questions: list[QuestionInfo]):
-            output = {
-                "session_id": session_id,
-                "status": SessionStatus.USER_QUESTION.value,
-                "timestamp": time.time(),
-                "questions": [
-                    {
-                        "question": q.question,
-                        "header": q.header,
-                        "options": [{"label": opt.label, "description": opt.description} for opt in q.options],
-                        "multi_select": q.multi_select,
-                    }
-                    for q in questions
-                ],
-            }
-            output_json(output)
+        def print_event(event: MonitorEvent) -> None:
+            print(json.dumps(event.to_dict(), ensure_ascii=False), flush=True)
 
-        def json_error_stop_callback(session_id: str, error_info: ErrorInfo):
-            output = {
-                "session_id": session_id,
-                "status": SessionStatus.ERROR_STOP.value,
-                "timestamp": time.time(),
-                "error": {
-                    "type": error_info.error_type,
-                    "message": error_info.message,
-                    "tool_name": error_info.tool_name,
-                    "tool_input": error_info.tool_input,
-                },
-            }
-            output_json(output)
-
-        def json_tool_use_callback(session_id: str, tools: list[ToolUseInfo]):
-            output = {
-                "session_id": session_id,
-                "status": SessionStatus.TOOL_USE.value,
-                "timestamp": time.time(),
-                "tools": [
-                    {
-                        "name": t.tool_name,
-                        "id": t.tool_id,
-                        "details": extract_tool_details(t.tool_name, t.tool_input or {}),
-                    }
-                    for t in tools
-                ],
-            }
-            output_json(output)
-
-        on_complete = json_complete_callback
-        on_user_question = json_user_question_callback
-        on_error_stop = json_error_stop_callback
-        on_tool_use = json_tool_use_callback
+        # stdout 是主输出，不丢事件
+        bus.subscribe(print_event, name="stdout", policy=SINK_POLICY_BLOCK)
+        if tee_notifier:
+            notifier = tee_notifier
+            bus.subscribe(
+                lambda event: notifier.notify(event.to_dict()),
+                name="telegram",
+                policy=args.sink_policy or default_sink_policy(notifier),
+            )
 
-    # Setup signal handler for graceful shutdown
+    # Setup signal handler for graceful shutdown (cleanup happens in finally)
     def signal_handler(signum, frame):
-        if tee_notifier:
-            tee_notifier.stop()
         sys.exit(0)
 
     signal.signal(signal.SIGINT, signal_handler)
     signal.signal(signal.SIGTERM, signal_handler)
 
     try:
-        monitor = ClaudeSessionMonitor(
-            project_dir=args.project,
-            quiet=args.quiet or args.json,
-            on_complete=on_complete,
-            on_user_question=on_user_question,
-            on_error_stop=on_error_stop,
-            on_tool_use=on_tool_use,
-        )
+        monitor_options = {
+            "quiet": args.quiet or args.json,
+            "max_sessions": args.max_sessions,
+            "idle_ttl": args.idle_ttl,
+            "bus": bus,
+        }
+        if args.all_projects:
+            monitor = MultiProjectMonitor(**monitor_options)
+        else:
+            monitor = ClaudeSessionMonitor(project_dir=args.project, **monitor_options)
         monitor.start(json_mode=args.json)
     except FileNotFoundError as e:
         print(f"Error: {e}")
@@ -1232,6 +1925,9 @@ Examples:
     except KeyboardInterrupt:
         print("\nMonitoring stopped")
     finally:
+        # 先让订阅者投递完已排队的事件，再关闭通知器
+        if bus:
+            bus.close()
         if tee_notifier:
             tee_notifier.stop()
 
@@ -5,18 +5,28 @@ Telegram Notifier for Claude Monitor
 
 Usage:
     python claude_monitor.py --json | python notify_telegram.py
+
+stdin 由独立线程读取并放入有界队列，发送由 asyncio 任务通过一个保持连接的
+httpx 客户端完成；重试使用非阻塞的指数退避，同一 session 排队中的工具调用
+通知合并为一条消息。尚未送达的事件记录在磁盘 spool 中，重启后重新发送。
 """
 
+import asyncio
+import hashlib
 import json
 import os
 import sys
+import threading
 import time
 import urllib.error
 import urllib.request
+from collections import deque
+from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Callable, Optional, Tuple
+from typing import Callable, Iterable, Optional, TextIO, Tuple
 
+import httpx
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -33,6 +43,7 @@ class Config:
     BOT_TOKEN: Optional[str] = os.environ.get("TELEGRAM_BOT_TOKEN")
     CHAT_ID: Optional[str] = os.environ.get("TELEGRAM_CHAT_ID")
     PROXY: str = os.environ.get("TELEGRAM_PROXY", "http://127.0.0.1:7890")
+    API_BASE: str = os.environ.get("TELEGRAM_API_BASE", "https://api.telegram.org")
 
     # 日志配置
     LOG_FILE: Optional[str] = os.environ.get("TELEGRAM_LOG_FILE")
@@ -40,6 +51,19 @@ class Config:
     # 重试配置
     RETRY_COUNT: int = int(os.environ.get("TELEGRAM_RETRY_COUNT", "3"))
     RETRY_INTERVAL: int = int(os.environ.get("TELEGRAM_RETRY_INTERVAL", "1"))
+    RETRY_MAX_INTERVAL: float = float(os.environ.get("TELEGRAM_RETRY_MAX_INTERVAL", "30"))
+
+    # 发送队列配置
+    QUEUE_SIZE: int = int(os.environ.get("TELEGRAM_QUEUE_SIZE", "100"))
+
+    # 未送达事件的 spool 目录（默认: 脚本目录下的 spool/，设为 off 关闭）
+    SPOOL_DIR: Optional[str] = os.environ.get("TELEGRAM_SPOOL_DIR")
+
+    # 发送速率限制（条/秒，0 表示不限制）；Telegram 对单个聊天约 1 条/秒，全局约 30 条/秒
+    CHAT_RATE: float = float(os.environ.get("TELEGRAM_CHAT_RATE", "1"))
+    CHAT_BURST: int = int(os.environ.get("TELEGRAM_CHAT_BURST", "3"))
+    GLOBAL_RATE: float = float(os.environ.get("TELEGRAM_GLOBAL_RATE", "30"))
+    GLOBAL_BURST: int = int(os.environ.get("TELEGRAM_GLOBAL_BURST", "30"))
 
     # 通知开关
     NOTIFY_ON_COMPLETE: bool = os.environ.get("NOTIFY_ON_COMPLETE", "true").lower() == "true"
@@ -68,6 +92,17 @@ class Logger:
     # 轮转配置
     MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
 
+    # 发送队列统计项的显示名称
+    STATS_LABELS = {
+        "queued": "队列",
+        "sent": "已发送",
+        "failed": "失败",
+        "dropped": "丢弃",
+        "coalesced": "合并",
+        "rate_limited": "限流",
+        "spooled": "待确认",
+    }
+
     def __init__(self, config: Config):
         """初始化 Logger
 
@@ -424,6 +459,48 @@ class Logger:
         entry = self._format_log_entry(emoji=self.EMOJI["failure"], message="发送最终失败", details=details)
         self._write(entry)
 
+    def log_dropped(self, event_type: str, session_id: str, reason: str, stats: Optional[dict] = None) -> None:
+        """输出通知被丢弃的日志
+
+        Args:
+            event_type: 事件类型
+            session_id: Session ID
+            reason: 丢弃原因
+            stats: 发送队列统计（队列深度与各计数器）
+        """
+        details = {"类型": event_type, "Session": session_id[:8], "原因": reason}
+        details.update(self._stats_details(stats or {}))
+        entry = self._format_log_entry(emoji=self.EMOJI["failure"], message="通知已丢弃", details=details)
+        self._write(entry)
+
+    def log_queue(self, stats: dict) -> None:
+        """输出发送队列统计
+
+        Args:
+            stats: 发送队列统计（队列深度与各计数器）
+        """
+        entry = self._format_log_entry(
+            emoji=self.EMOJI["waiting"], message="发送队列状态", details=self._stats_details(stats)
+        )
+        self._write(entry)
+
+    def log_replay(self, count: int, stats: dict) -> None:
+        """输出从 spool 恢复未送达事件的日志
+
+        Args:
+            count: 恢复的事件数
+            stats: 发送队列统计
+        """
+        entry = self._format_log_entry(
+            emoji=self.EMOJI["retry"],
+            message=f"从 spool 恢复 {count} 条未送达事件",
+            details=self._stats_details(stats),
+        )
+        self._write(entry)
+
+    def _stats_details(self, stats: dict) -> dict:
+        return {self.STATS_LABELS.get(key, key): value for key, value in stats.items()}
+
     def _truncate_error(self, error: str, max_length: int = 500) -> str:
         """截断错误消息 (EC-004)
 
@@ -459,6 +536,22 @@ class Logger:
 # ============================================================================
 
 
+class RateLimitError(Exception):
+    """Telegram 返回 429，retry_after 为服务端要求的等待秒数"""
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def _rate_limit_error(result: dict) -> Optional[RateLimitError]:
+    """从 Bot API 响应中识别 429 限流"""
+    if result.get("error_code") != 429:
+        return None
+    retry_after = (result.get("parameters") or {}).get("retry_after", 1)
+    return RateLimitError(f"Telegram API 限流: {result.get('description', 'Too Many Requests')}", retry_after)
+
+
 class RetryHandler:
     """重试处理器，封装重试逻辑"""
 
@@ -497,13 +590,17 @@ class RetryHandler:
                     last_error = "Function returned False"
             except Exception as e:
                 last_error = str(e)
+                # 429 限流时按服务端给出的 retry_after 等待
+                wait = getattr(e, "retry_after", None) or self.interval
+            else:
+                wait = self.interval
 
             # 如果不是最后一次尝试，则等待并重试
             if attempt < self.max_retries:
                 retry_count += 1
                 if on_retry:
                     on_retry(retry_count, last_error or "Unknown error")
-                time.sleep(self.interval)
+                time.sleep(wait)
 
         return False, retry_count, last_error
 
@@ -533,7 +630,7 @@ def send_telegram_message(text: str, parse_mode: str = "HTML") -> bool:
     if not Config.CHAT_ID:
         raise ValueError("TELEGRAM_CHAT_ID 未设置")
 
-    url = f"https://api.telegram.org/bot{Config.BOT_TOKEN}/sendMessage"
+    url = f"{Config.API_BASE}/bot{Config.BOT_TOKEN}/sendMessage"
 
     payload = {
         "chat_id": Config.CHAT_ID,
@@ -561,6 +658,14 @@ def send_telegram_message(text: str, parse_mode: str = "HTML") -> bool:
             else:
                 error_desc = result.get("description", "Unknown API error")
                 raise Exception(f"Telegram API 错误: {error_desc}")
+    except urllib.error.HTTPError as e:
+        try:
+            error = _rate_limit_error(json.loads(e.read().decode("utf-8")))
+        except (ValueError, OSError):
+            error = None
+        if error:
+            raise error
+        raise Exception(f"网络错误: {e}")
     except urllib.error.URLError as e:
         raise Exception(f"网络错误: {e}")
     except json.JSONDecodeError as e:
@@ -851,99 +956,665 @@ def process_event(line: str) -> Optional[str]:
     return None
 
 
-def main():
-    """主循环 - 从 stdin 读取 JSON 行并发送通知
+# ============================================================================
+# RateLimitScheduler - 发送速率调度
+# ============================================================================
+
+
+class TokenBucket:
+    """令牌桶：平均 rate 条/秒，最多连续 burst 条；rate <= 0 表示不限制"""
+
+    def __init__(self, rate: float, burst: int, clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.capacity = float(max(1, burst))
+        self.tokens = self.capacity
+        self._clock = clock
+        self._updated = clock()
+
+    def delay(self) -> float:
+        """距离下一个令牌可用还需等待的秒数"""
+        if self.rate <= 0:
+            return 0.0
+        now = self._clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def take(self) -> None:
+        if self.rate > 0:
+            self.tokens -= 1
+
+
+class RateLimitScheduler:
+    """按聊天与全局两级令牌桶限速，并遵守 429 响应中的 retry_after"""
+
+    def __init__(
+        self,
+        chat_rate: float,
+        chat_burst: int,
+        global_rate: float,
+        global_burst: int,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.chat_rate = chat_rate
+        self.chat_burst = chat_burst
+        self._clock = clock
+        self._global = TokenBucket(global_rate, global_burst, clock)
+        self._chats: dict[str, TokenBucket] = {}
+        self._blocked_until: dict[str, float] = {}  # chat -> retry_after 截止时间
+
+    @classmethod
+    def from_config(cls, config: Config) -> "RateLimitScheduler":
+        return cls(config.CHAT_RATE, config.CHAT_BURST, config.GLOBAL_RATE, config.GLOBAL_BURST)
+
+    def acquire(self, chat_id: str) -> float:
+        """尝试获取一次发送机会
+
+        Returns:
+            0 表示可以立即发送（已扣除令牌），否则为需要等待的秒数
+        """
+        chat = self._chats.get(chat_id)
+        if chat is None:
+            chat = self._chats[chat_id] = TokenBucket(self.chat_rate, self.chat_burst, self._clock)
+        blocked = self._blocked_until.get(chat_id, 0.0) - self._clock()
+        wait = max(blocked, chat.delay(), self._global.delay())
+        if wait > 0:
+            return wait
+        chat.take()
+        self._global.take()
+        return 0.0
+
+    def retry_after(self, chat_id: str, seconds: float) -> None:
+        """记录服务端要求的等待时间，在此之前不再向该聊天发送"""
+        until = self._clock() + max(0.0, seconds)
+        self._blocked_until[chat_id] = max(self._blocked_until.get(chat_id, 0.0), until)
+
+
+# ============================================================================
+# NotificationSpool - 未送达事件的磁盘 spool
+# ============================================================================
+
+
+def event_id(data: dict) -> str:
+    """事件 ID：优先使用事件自带的 event_id，否则为事件内容的哈希"""
+    if data.get("event_id"):
+        return str(data["event_id"])
+    canonical = json.dumps(data, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16]
+
 
-    重构版本使用 Logger 类和 RetryHandler
+class NotificationSpool:
+    """追加写入的分段 JSONL spool，保存尚未确认送达的事件
+
+    每行是 {"op": "add", "id", "event"} 或 {"op": "ack", "id"}。启动时 open()
+    按顺序重放所有分段，未确认的事件重新发送（至少一次）；之后把它们重写到新
+    分段并删除旧分段。运行中某个旧分段的事件全部确认后即删除该分段；全部
+    事件都已确认且活动分段已写满时，整个 spool 重置。写入只 flush 到操作系统，
+    由调用方批量 sync()。
     """
-    # 初始化 Logger 和 RetryHandler
-    logger = Logger(Config)
-    retry_handler = RetryHandler(max_retries=Config.RETRY_COUNT, interval=Config.RETRY_INTERVAL)
 
-    # 输出启动日志
-    logger.log_startup(
-        chat_id=Config.CHAT_ID or "未配置",
-        proxy=Config.PROXY or "无",
-        log_path=str(logger._log_path) if logger._log_path else None,
-    )
+    SEGMENT_PREFIX = "spool-"
+    SEGMENT_BYTES = 1024 * 1024
+    ACKED_MEMORY = 1024  # 记住最近确认的 ID 数量，用于去重
 
-    # 输出等待日志
-    logger.log_waiting()
+    def __init__(self, directory: Path, segment_bytes: int = SEGMENT_BYTES):
+        """初始化 spool
+
+        Args:
+            directory: spool 目录
+            segment_bytes: 活动分段超过该大小后切换到新分段
+        """
+        self.directory = Path(directory)
+        self.segment_bytes = segment_bytes
+        self._pending: dict[str, tuple[Path, dict]] = {}  # id -> (所在分段, 事件)
+        self._segment_ids: dict[Path, set[str]] = {}  # 分段 -> 其中未确认的 ID
+        self._acked: deque[str] = deque(maxlen=self.ACKED_MEMORY)
+        self._active: Optional[Path] = None
+        self._file = None
+        self._dirty = False
+        self._next_index = 1
+
+    # ------------------------------------------------------------------
+    # 启动重放
+    # ------------------------------------------------------------------
+
+    def open(self) -> list[dict]:
+        """重放已有分段并压缩
+
+        Returns:
+            未确认的事件，按写入顺序
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        segments = sorted(self.directory.glob(f"{self.SEGMENT_PREFIX}*.jsonl"))
+        pending: dict[str, dict] = {}
+        for segment in segments:
+            for record in self._read_records(segment):
+                record_id = record.get("id")
+                if record.get("op") == "add" and record_id not in pending and isinstance(record.get("event"), dict):
+                    pending[record_id] = record["event"]
+                elif record.get("op") == "ack":
+                    pending.pop(record_id, None)
+            self._next_index = max(self._next_index, self._segment_index(segment) + 1)
+
+        # 压缩：未确认事件写入新分段后删除旧分段
+        self._rotate()
+        for record_id, event in pending.items():
+            self._append({"op": "add", "id": record_id, "event": event})
+            self._track(record_id, event)
+        self.sync()
+        for segment in segments:
+            segment.unlink(missing_ok=True)
+        return list(pending.values())
+
+    @staticmethod
+    def _read_records(segment: Path) -> Iterable[dict]:
+        try:
+            with open(segment, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # 崩溃时写了一半的行
+                    if isinstance(record, dict):
+                        yield record
+        except OSError:
+            return
+
+    def _segment_index(self, segment: Path) -> int:
+        try:
+            return int(segment.stem[len(self.SEGMENT_PREFIX) :])
+        except ValueError:
+            return 0
 
-    for line in sys.stdin:
+    # ------------------------------------------------------------------
+    # 写入
+    # ------------------------------------------------------------------
+
+    def add(self, record_id: str, event: dict) -> bool:
+        """记录一个待送达事件；ID 已在 spool 中或刚确认过时返回 False"""
+        if record_id in self._pending or record_id in self._acked:
+            return False
+        if self._file is None:
+            raise RuntimeError("NotificationSpool 需要先 open()")
+        if self._active.stat().st_size >= self.segment_bytes:
+            self._rotate()
+        self._append({"op": "add", "id": record_id, "event": event})
+        self._track(record_id, event)
+        return True
+
+    def ack(self, record_ids: Iterable[str]) -> None:
+        """确认事件已送达（或被有意丢弃），并删除已全部确认的旧分段"""
+        for record_id in record_ids:
+            entry = self._pending.pop(record_id, None)
+            if entry is None:
+                continue
+            self._acked.append(record_id)
+            self._append({"op": "ack", "id": record_id})
+            segment = entry[0]
+            remaining = self._segment_ids[segment]
+            remaining.discard(record_id)
+            if not remaining and segment != self._active:
+                del self._segment_ids[segment]
+                segment.unlink(missing_ok=True)
+        if not self._pending and self._active is not None and self._active.stat().st_size >= self.segment_bytes:
+            # 全部确认：丢弃只剩 ack 记录的分段
+            self._reset()
+
+    def _track(self, record_id: str, event: dict) -> None:
+        self._pending[record_id] = (self._active, event)
+        self._segment_ids.setdefault(self._active, set()).add(record_id)
+
+    def _append(self, record: dict) -> None:
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._file.flush()
+        self._dirty = True
+
+    def _rotate(self) -> None:
+        """切换到新的活动分段；旧分段中已无未确认事件时直接删除"""
+        previous = self._active
+        if self._file is not None:
+            self.sync()
+            self._file.close()
+        self._active = self.directory / f"{self.SEGMENT_PREFIX}{self._next_index:06d}.jsonl"
+        self._next_index += 1
+        self._file = open(self._active, "a", encoding="utf-8")
+        if previous is not None and not self._segment_ids.get(previous):
+            self._segment_ids.pop(previous, None)
+            previous.unlink(missing_ok=True)
+
+    def _reset(self) -> None:
+        for segment in list(self._segment_ids):
+            if segment != self._active:
+                segment.unlink(missing_ok=True)
+        self._segment_ids.clear()
+        self._rotate()
+
+    def sync(self) -> None:
+        """把已写入的记录 fsync 到磁盘（批量调用）"""
+        if self._file is not None and self._dirty:
+            os.fsync(self._file.fileno())
+            self._dirty = False
+
+    def close(self) -> None:
+        if self._file is not None:
+            self.sync()
+            self._file.close()
+            self._file = None
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+
+def make_spool(config: Config = Config) -> Optional[NotificationSpool]:
+    """按配置创建 spool；TELEGRAM_SPOOL_DIR=off 时返回 None"""
+    if config.SPOOL_DIR and config.SPOOL_DIR.lower() == "off":
+        return None
+    directory = os.path.expanduser(config.SPOOL_DIR) if config.SPOOL_DIR else Path(__file__).parent / "spool"
+    return NotificationSpool(Path(directory))
+
+
+# ============================================================================
+# AsyncNotifier - 异步通知器
+# ============================================================================
+
+# 状态 -> (日志中的事件类型, 格式化函数, 通知开关配置项)
+EVENT_TYPES = {
+    "TASK_COMPLETE": ("任务完成", format_task_complete, "NOTIFY_ON_COMPLETE"),
+    "USER_QUESTION": ("用户询问", format_user_question, "NOTIFY_ON_USER_QUESTION"),
+    "ERROR_STOP": ("错误通知", format_error, "NOTIFY_ON_ERROR"),
+    "TOOL_USE": ("工具调用", format_tool_use, "NOTIFY_ON_TOOL_USE"),
+}
+
+# 低优先级事件：同一 session 排队中的通知合并为一条；该 session 出现其他事件时
+# 被取代丢弃；队列满时最先丢弃
+LOW_PRIORITY_STATUSES = ("TOOL_USE",)
+# 一条通知因 429 限流而重新排队等待的最多次数（不占用普通重试次数）
+MAX_RATE_LIMIT_WAITS = 5
+
+
+@dataclass(eq=False)
+class Notification:
+    """一条待发送的通知，发送时才格式化，以便合并后重新生成消息"""
+
+    status: str
+    session_id: str
+    data: dict
+    merged: int = 1  # 合并进来的事件数
+    event_ids: list[str] = field(default_factory=list)  # 对应的 spool 事件 ID
+
+    @property
+    def event_type(self) -> str:
+        return EVENT_TYPES[self.status][0]
+
+    def render(self) -> str:
+        return EVENT_TYPES[self.status][1](self.data)
+
+    def merge(self, data: dict, record_id: str) -> None:
+        """合并同一 session 的后续工具调用事件"""
+        self.data = {**self.data, "tools": self.data.get("tools", []) + data.get("tools", [])}
+        self.merged += 1
+        self.event_ids.append(record_id)
+
+    def log_details(self) -> dict:
+        details = {}
+        if self.status == "TASK_COMPLETE":
+            details["原因"] = self.data.get("stop_reason", "unknown")
+        elif self.status == "ERROR_STOP":
+            details["错误类型"] = self.data.get("error", {}).get("type", "unknown")
+        if self.merged > 1:
+            details["合并"] = self.merged
+        return details
+
+
+def build_notification(data: dict, config: Config = Config) -> Optional[Notification]:
+    """根据事件构建通知；未知状态或对应通知开关关闭时返回 None"""
+    status = data.get("status")
+    event = EVENT_TYPES.get(status)
+    if event is None or not getattr(config, event[2]):
+        return None
+    return Notification(status=status, session_id=data.get("session_id", "unknown"), data=data)
+
+
+class AsyncTelegramNotifier:
+    """异步 Telegram 通知器
+
+    submit() 只做入队（在事件循环线程中调用，不会阻塞），run() 中的发送任务
+    通过一个保持连接的 httpx.AsyncClient 逐条发送，发送前由 RateLimitScheduler
+    限速；失败时以指数退避重试，429 时按 retry_after 等待，等待期间新事件仍可
+    入队与合并。队列已满时先丢弃低优先级（工具调用）通知。
+
+    提供 spool 时，事件入队前先写入 spool，送达（或被后续事件取代）后才确认；
+    重试耗尽或因队列已满丢弃的事件留在 spool 中，下次启动时重新发送。
+    """
+
+    def __init__(
+        self,
+        config: Config = Config,
+        logger: Optional[Logger] = None,
+        client: Optional[httpx.AsyncClient] = None,
+        queue_size: Optional[int] = None,
+        max_retries: Optional[int] = None,
+        retry_interval: Optional[float] = None,
+        max_interval: Optional[float] = None,
+        scheduler: Optional[RateLimitScheduler] = None,
+        spool: Optional[NotificationSpool] = None,
+    ):
+        """初始化通知器
+
+        Args:
+            config: 配置对象
+            logger: 日志处理器（默认按 config 创建）
+            client: 外部提供的 httpx 客户端（默认在 async with 中创建并关闭）
+            queue_size: 队列容量
+            max_retries: 最大重试次数
+            retry_interval: 首次重试间隔（秒），之后每次翻倍
+            max_interval: 重试间隔上限（秒）
+            scheduler: 发送速率调度器（默认按 config 创建）
+            spool: 未送达事件的磁盘 spool（在 async with 中打开并重放）
+        """
+        self.config = config
+        self.logger = logger or Logger(config)
+        self.queue_size = queue_size if queue_size is not None else config.QUEUE_SIZE
+        self.max_retries = max_retries if max_retries is not None else config.RETRY_COUNT
+        self.retry_interval = retry_interval if retry_interval is not None else config.RETRY_INTERVAL
+        self.max_interval = max_interval if max_interval is not None else config.RETRY_MAX_INTERVAL
+        self.scheduler = scheduler or RateLimitScheduler.from_config(config)
+        self.spool = spool
+        self._sync_scheduled = False
+        self._client = client
+        self._owns_client = client is None
+        self._queue: deque[Notification] = deque()
+        self._coalescing: dict[str, Notification] = {}  # session -> 队列中可合并的通知
+        self._ready = asyncio.Event()
+        self._closed = False
+        self.sent = 0
+        self.failed = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.rate_limited = 0
+
+    async def __aenter__(self) -> "AsyncTelegramNotifier":
+        if self._client is None:
+            transport = httpx.AsyncHTTPTransport(proxy=self.config.PROXY or None)
+            self._client = httpx.AsyncClient(base_url=self.config.API_BASE, transport=transport, timeout=30)
+        if self.spool is not None:
+            replayed = self.spool.open()
+            for data in replayed:
+                self.submit(data, replay=True)
+            if replayed:
+                self.logger.log_replay(len(replayed), self.stats())
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        if self.spool is not None:
+            self.spool.close()
+        if self._owns_client and self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    # ------------------------------------------------------------------
+    # 入队
+    # ------------------------------------------------------------------
+
+    def submit_line(self, line: str) -> bool:
+        """解析一行 JSON 事件并入队"""
         line = line.strip()
         if not line:
-            continue
-
+            return False
         try:
             data = json.loads(line)
         except json.JSONDecodeError:
-            continue
-
-        # 获取事件信息
-        status = data.get("status", "")
-        session_id = data.get("session_id", "unknown")
-
-        # 处理不同事件类型
-        message = None
-        event_type = ""
-
-        if status == "TASK_COMPLETE" and Config.NOTIFY_ON_COMPLETE:
-            message = format_task_complete(data)
-            event_type = "任务完成"
-        elif status == "USER_QUESTION" and Config.NOTIFY_ON_USER_QUESTION:
-            message = format_user_question(data)
-            event_type = "用户询问"
-        elif status == "ERROR_STOP" and Config.NOTIFY_ON_ERROR:
-            message = format_error(data)
-            event_type = "错误通知"
-        elif status == "TOOL_USE" and Config.NOTIFY_ON_TOOL_USE:
-            message = format_tool_use(data)
-            event_type = "工具调用"
-
-        if message and event_type:
-            final_message = message  # Capture for closure
-
-            # 使用重试机制发送
-            def send_func():
-                return send_telegram_message(final_message)
-
-            final_event_type = event_type  # Capture for closure
-            final_session_id = session_id  # Capture for closure
-
-            def on_retry(attempt: int, error_msg: str) -> None:
-                logger.log_retry(
-                    event_type=final_event_type,
-                    session_id=final_session_id,
-                    error=error_msg,
-                    attempt=attempt,
-                    max_attempts=Config.RETRY_COUNT,
-                )
+            return False
+        return isinstance(data, dict) and self.submit(data)
+
+    def submit(self, data: dict, replay: bool = False) -> bool:
+        """事件入队；返回是否产生了通知（含合并）
+
+        Args:
+            data: 事件
+            replay: 事件来自 spool 重放（已在 spool 中，不再写入）
+        """
+        notification = build_notification(data, self.config)
+        if notification is None:
+            return False
 
-            success, retry_count, last_error = retry_handler.execute_with_retry(send_func, on_retry=on_retry)
+        record_id = event_id(data)
+        if self.spool is not None and not replay:
+            if not self.spool.add(record_id, data):
+                return False  # 重复事件
+            self._schedule_sync()
+        notification.event_ids.append(record_id)
+
+        session_id = notification.session_id
+        if notification.status in LOW_PRIORITY_STATUSES:
+            pending = self._coalescing.get(session_id)
+            if pending is not None:
+                pending.merge(data, record_id)
+                self.coalesced += 1
+                return True
+            self._coalescing[session_id] = notification
+        else:
+            # 同一 session 尚未发送的工具调用已过时，由当前事件取代
+            pending = self._coalescing.pop(session_id, None)
+            if pending is not None:
+                self._queue.remove(pending)
+                self._drop(pending, "已被后续事件取代")
+                self._ack(pending)
+
+        if len(self._queue) >= self.queue_size:
+            victim = next((item for item in self._queue if item.status in LOW_PRIORITY_STATUSES), None)
+            if victim is None and notification.status in LOW_PRIORITY_STATUSES:
+                self._forget(notification)
+                self._drop(notification, "发送队列已满")
+                return True
+            victim = victim or self._queue[0]
+            self._queue.remove(victim)
+            self._forget(victim)
+            self._drop(victim, "发送队列已满")
+        self._queue.append(notification)
+        self._ready.set()
+        return True
+
+    def _drop(self, notification: Notification, reason: str) -> None:
+        self.dropped += 1
+        self.logger.log_dropped(notification.event_type, notification.session_id, reason, self.stats())
+
+    def _ack(self, notification: Notification) -> None:
+        if self.spool is not None:
+            self.spool.ack(notification.event_ids)
+            self._schedule_sync()
+
+    def _schedule_sync(self) -> None:
+        """同一轮事件循环中的多次写入合并为一次 fsync"""
+        if self._sync_scheduled:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.spool.sync()
+            return
+        self._sync_scheduled = True
+        loop.call_soon(self._sync)
 
-            if success:
-                # 获取附加详情
-                details = {}
-                if status == "TASK_COMPLETE":
-                    details["原因"] = data.get("stop_reason", "unknown")
-                elif status == "ERROR_STOP":
-                    error = data.get("error", {})
-                    details["错误类型"] = error.get("type", "unknown")
+    def _sync(self) -> None:
+        self._sync_scheduled = False
+        if self.spool is not None:
+            self.spool.sync()
 
-                logger.log_success(
-                    event_type=event_type,
-                    session_id=session_id,
-                    details=details,
-                    retry_count=retry_count,
-                )
+    def close(self) -> None:
+        """输入结束：run() 发送完队列中剩余的通知后返回"""
+        self._closed = True
+        self._ready.set()
+
+    def _forget(self, notification: Notification) -> None:
+        if self._coalescing.get(notification.session_id) is notification:
+            del self._coalescing[notification.session_id]
+
+    # ------------------------------------------------------------------
+    # 发送
+    # ------------------------------------------------------------------
+
+    async def run(self) -> None:
+        """逐条发送队列中的通知，直到 close() 且队列为空"""
+        while True:
+            if not self._queue:
+                if self._closed:
+                    return
+                self._ready.clear()
+                await self._ready.wait()
+                continue
+            notification = self._queue.popleft()
+            self._forget(notification)
+            await self._deliver(notification)
+
+    async def _throttle(self) -> None:
+        """等待速率限制允许向当前聊天发送"""
+        chat_id = str(self.config.CHAT_ID)
+        while (wait := self.scheduler.acquire(chat_id)) > 0:
+            await asyncio.sleep(wait)
+
+    async def _deliver(self, notification: Notification) -> bool:
+        """发送一条通知，失败时以指数退避重试，429 时按 retry_after 等待"""
+        text = notification.render()
+        delay = self.retry_interval
+        last_error = "Unknown error"
+        attempt = 0
+        rate_limit_waits = 0
+        while True:
+            await self._throttle()
+            try:
+                await self.send(text)
+            except RateLimitError as e:
+                last_error = str(e)
+                self.rate_limited += 1
+                self.scheduler.retry_after(str(self.config.CHAT_ID), e.retry_after)
+                if rate_limit_waits < MAX_RATE_LIMIT_WAITS:
+                    rate_limit_waits += 1
+                    self.logger.log_retry(
+                        event_type=notification.event_type,
+                        session_id=notification.session_id,
+                        error=f"{last_error} (retry_after={e.retry_after}s, 队列={len(self._queue)})",
+                        attempt=attempt,
+                        max_attempts=self.max_retries,
+                    )
+                    continue
+            except Exception as e:
+                last_error = str(e)
             else:
-                logger.log_failure(
-                    event_type=event_type,
-                    session_id=session_id,
-                    error=last_error or "Unknown error",
-                    retry_count=retry_count,
+                self.sent += 1
+                self._ack(notification)
+                details = notification.log_details()
+                if self._queue:
+                    details["队列"] = len(self._queue)
+                self.logger.log_success(
+                    event_type=notification.event_type,
+                    session_id=notification.session_id,
+                    details=details,
+                    retry_count=attempt,
                 )
+                return True
+            if attempt >= self.max_retries or rate_limit_waits >= MAX_RATE_LIMIT_WAITS:
+                break
+            attempt += 1
+            self.logger.log_retry(
+                event_type=notification.event_type,
+                session_id=notification.session_id,
+                error=last_error,
+                attempt=attempt,
+                max_attempts=self.max_retries,
+            )
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.max_interval)
+
+        self.failed += 1
+        if self.spool is not None:
+            last_error += " (已保留在 spool，重启后重新发送)"
+        self.logger.log_failure(
+            event_type=notification.event_type,
+            session_id=notification.session_id,
+            error=last_error,
+            retry_count=attempt,
+        )
+        return False
+
+    async def send(self, text: str, parse_mode: str = "HTML") -> None:
+        """通过保持的连接发送一条消息
+
+        Raises:
+            Exception: 发送失败时抛出异常，包含错误信息
+        """
+        if not self.config.BOT_TOKEN:
+            raise ValueError("TELEGRAM_BOT_TOKEN 未设置")
+        if not self.config.CHAT_ID:
+            raise ValueError("TELEGRAM_CHAT_ID 未设置")
+        if self._client is None:
+            raise RuntimeError("AsyncTelegramNotifier 需要在 async with 中使用")
+
+        payload = {"chat_id": self.config.CHAT_ID, "text": text, "parse_mode": parse_mode}
+        try:
+            response = await self._client.post(f"/bot{self.config.BOT_TOKEN}/sendMessage", json=payload)
+            result = response.json()
+        except httpx.HTTPError as e:
+            raise Exception(f"网络错误: {e}")
+        except ValueError as e:
+            raise Exception(f"响应解析错误: {e}")
+        rate_limited = _rate_limit_error(result)
+        if rate_limited:
+            raise rate_limited
+        if not result.get("ok"):
+            raise Exception(f"Telegram API 错误: {result.get('description', 'Unknown API error')}")
+
+    def stats(self) -> dict:
+        """发送统计"""
+        return {
+            "queued": len(self._queue),
+            "sent": self.sent,
+            "failed": self.failed,
+            "dropped": self.dropped,
+            "coalesced": self.coalesced,
+            "rate_limited": self.rate_limited,
+            **({"spooled": len(self.spool)} if self.spool is not None else {}),
+        }
+
+
+async def run_notifier(stream: TextIO, notifier: AsyncTelegramNotifier) -> None:
+    """从 stream 读取事件并发送，直到输入结束且队列发送完毕
+
+    stream 在独立线程中读取，发送变慢时管道仍会被及时读空，不会反压上游。
+    """
+    loop = asyncio.get_running_loop()
+
+    def pump() -> None:
+        try:
+            for line in stream:
+                loop.call_soon_threadsafe(notifier.submit_line, line)
+        finally:
+            loop.call_soon_threadsafe(notifier.close)
+
+    threading.Thread(target=pump, name="notify-stdin", daemon=True).start()
+    async with notifier:
+        await notifier.run()
+    notifier.logger.log_queue(notifier.stats())
+
+
+def main():
+    """主循环 - 从 stdin 读取 JSON 行并异步发送通知"""
+    logger = Logger(Config)
+
+    # 输出启动日志
+    logger.log_startup(
+        chat_id=Config.CHAT_ID or "未配置",
+        proxy=Config.PROXY or "无",
+        log_path=str(logger._log_path) if logger._log_path else None,
+    )
+
+    # 输出等待日志
+    logger.log_waiting()
+
+    try:
+        asyncio.run(run_notifier(sys.stdin, AsyncTelegramNotifier(Config, logger, spool=make_spool(Config))))
+    except KeyboardInterrupt:
+        pass
 
 
 if __name__ == "__main__":
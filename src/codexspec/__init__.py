@@ -6,32 +6,13 @@ This toolkit provides a structured approach to software development using
 executable specifications that guide AI-assisted implementation.
 """
 
-import re
-import subprocess
 import sys
-from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
 import typer
-from rich.console import Console
-from rich.panel import Panel
-from rich.prompt import Confirm, Prompt
-from rich.table import Table
-
-from .commands.installer import (
-    COMMANDS_SUBDIR,
-    detect_old_structure,
-    get_commands_metadata,
-    get_installed_commands_metadata,
-    install_commands_to_subdir,
-    migrate_old_commands,
-    should_update_commands,
-    update_installed_command_frontmatter,
-)
+
 from .i18n import (
-    generate_config_content,
-    get_explicit_language_key,
     get_interaction_language,
     get_language_name,
     get_supported_languages,
@@ -39,9 +20,12 @@ from .i18n import (
     normalize_locale,
     update_language_field,
 )
-from .integrations import get_integrations
-from .profile import ensure_profile_scaffold, inject_profile_block
-from .translator import SUPPORTED_LANGUAGES, translate
+
+# Startup cost: only typer and the lightweight i18n helpers are imported at
+# module load. rich, subprocess, yaml and the installer/integration/translator
+# modules are imported inside the commands that need them, so `codexspec
+# version`, `config` and `list-commands` do not pay for `init`'s dependencies.
+# tests/test_cli_startup.py enforces this with `python -X importtime`.
 
 # Version info
 __version__ = "0.7.12"
@@ -52,12 +36,37 @@ CONSTITUTION_IMPORT_PATH = "@.codexspec/memory/constitution.md"
 CONSTITUTION_FILE_PATH = ".codexspec/memory/constitution.md"
 MARKDOWNLINT_DISABLE_MD041 = "<!-- markdownlint-disable MD041 -->\n"
 
+# Threads used to write rendered commands when init installs several integrations
+INSTALL_WRITE_WORKERS = 4
+# Projects installed concurrently by `init --batch` unless --jobs says otherwise
+BATCH_DEFAULT_JOBS = 8
+
 app = typer.Typer(
     name="codexspec",
     help="CodexSpec - A Requirements-First SDD toolkit for Claude Code",
     add_completion=False,
 )
-console = Console()
+
+
+class _LazyConsole:
+    """Shared rich Console, created on first use.
+
+    Importing ``rich.console`` and probing the terminal is a large share of
+    CLI cold start, so it is deferred until a command actually prints.
+    """
+
+    def __init__(self) -> None:
+        self._console = None
+
+    def __getattr__(self, name: str):
+        if self._console is None:
+            from rich.console import Console
+
+            self._console = Console()
+        return getattr(self._console, name)
+
+
+console = _LazyConsole()
 
 
 def get_version() -> str:
@@ -115,6 +124,8 @@ def get_scripts_dir() -> Path:
 
 def check_command_exists(command: str) -> bool:
     """Check if a command is available in PATH."""
+    import subprocess
+
     try:
         subprocess.run(
             ["which", command] if sys.platform != "win32" else ["where", command],
@@ -129,6 +140,8 @@ def check_command_exists(command: str) -> bool:
 @app.command()
 def version() -> None:
     """Display version and system information."""
+    from rich.panel import Panel
+
     console.print(
         Panel.fit(
             f"[bold blue]CodexSpec[/bold blue] version [green]{__version__}[/green]\n"
@@ -142,6 +155,10 @@ def version() -> None:
 @app.command()
 def check() -> None:
     """Check for installed tools and dependencies."""
+    import subprocess
+
+    from rich.table import Table
+
     table = Table(title="Tool Check")
     table.add_column("Tool", style="cyan")
     table.add_column("Status", style="green")
@@ -251,6 +268,8 @@ def config(
     """
     # Handle list languages
     if list_langs:
+        from rich.table import Table
+
         table = Table(title="Supported Languages")
         table.add_column("Code", style="cyan")
         table.add_column("Name", style="green")
@@ -448,6 +467,8 @@ def config(
         return
 
     # Display current configuration
+    from rich.panel import Panel
+
     console.print(
         Panel(
             config_file.read_text(encoding="utf-8"),
@@ -464,6 +485,8 @@ def list_commands() -> None:
     This command displays all available CodexSpec slash commands grouped by category,
     showing their display names and descriptions.
     """
+    from .commands.installer import get_installed_commands_metadata
+    from .translator import translate
 
     # Get user's language preference (CLI terminal output uses the interaction language)
     language = get_interaction_language()
@@ -563,6 +586,21 @@ def init(
         "-d",
         help="Enable detailed debug output",
     ),
+    batch: Optional[str] = typer.Option(
+        None,
+        "--batch",
+        help=(
+            "Install into many existing projects in one process: a file listing one directory per line, "
+            "or a glob (e.g. 'repos/*'). Never prompts; prints a JSON summary."
+        ),
+    ),
+    jobs: int = typer.Option(
+        BATCH_DEFAULT_JOBS,
+        "--jobs",
+        "-j",
+        min=1,
+        help="Maximum number of projects installed concurrently with --batch",
+    ),
 ) -> None:
     """
     Initialize a new CodexSpec project.
@@ -578,7 +616,20 @@ def init(
         codexspec init --here --ai claude
         codexspec init . --force --ai claude
         codexspec init my-project --interaction-lang en --document-lang zh-CN --commit-lang en
+        codexspec init --batch 'repos/*' --force --jobs 16
     """
+    from datetime import datetime
+
+    from rich.panel import Panel
+    from rich.prompt import Confirm
+
+    from .commands import project_setup as setup
+    from .commands.installer import COMMANDS_SUBDIR, render_templates
+    from .commands.manifest import InstallManifest
+    from .integrations import get_integrations
+    from .project_config import ProjectConfig
+    from .translator import translate
+
     # When init() is invoked directly (not via the Typer CLI), typer.Option defaults
     # arrive as OptionInfo sentinels rather than None. Coerce the language params to
     # Optional[str] so the resolution logic below is robust in both call paths.
@@ -595,6 +646,30 @@ def init(
         raise typer.Exit(1) from exc
     integration_keys = {integration.key for integration in integrations}
 
+    if isinstance(batch, str):
+        if project_name or here:
+            console.print("[red]Error:[/red] --batch cannot be combined with a project name or --here")
+            raise typer.Exit(1)
+        _init_batch(
+            batch,
+            integrations,
+            ai=ai,
+            lang=lang,
+            lang_overrides={
+                key: value
+                for key, value in (
+                    ("interaction", interaction_lang),
+                    ("document", document_lang),
+                    ("commit", commit_lang),
+                )
+                if value is not None
+            },
+            force=force,
+            no_git=no_git,
+            jobs=jobs if isinstance(jobs, int) else BATCH_DEFAULT_JOBS,
+        )
+        return
+
     # Determine target directory first — needed to detect an existing config.yml
     # before resolving the language base (REQ-007).
     if here or project_name == ".":
@@ -605,19 +680,9 @@ def init(
         console.print(f"[red]{translate('cli.init.error_no_project_name', 'en')}[/red]")
         raise typer.Exit(1)
 
-    config_file = target_dir / ".codexspec" / "config.yml"
-    config_exists = config_file.exists()
-
-    def _normalize_lang_option(raw: str) -> str:
-        """Normalize a language flag value; warn (do not error) if unsupported."""
-        normalized = normalize_locale(raw)
-        if not is_supported_language(normalized):
-            console.print(f"[yellow]Warning: '{raw}' is not in the list of commonly supported languages.[/yellow]")
-            console.print(
-                "It may still work if Claude supports it. "
-                "Run [cyan]codexspec config --list-langs[/cyan] to see supported languages."
-            )
-        return normalized
+    # Parsed once; every language query and the final config edits use it.
+    project_config = ProjectConfig.load(target_dir / ".codexspec" / "config.yml")
+    config_exists = project_config.exists
 
     # Per-dimension overrides: each flag maps to exactly one config key, with no
     # CLI-level precedence between them (DEC-001).
@@ -636,16 +701,10 @@ def init(
     output_value: Optional[str] = None
     if lang is not None:
         output_value = _normalize_lang_option(lang)
-    base_determinable = output_value is not None or (
-        "interaction" in lang_overrides and "document" in lang_overrides and "commit" in lang_overrides
-    )
     prompted_base = False
-    if base_determinable:
+    if not setup.needs_output_language(project_config, output_value, lang_overrides):
         # Output base already resolved (or None when only dimension flags were
-        # given); no prompt needed to resolve it.
-        pass
-    elif config_exists:
-        # Existing project: preserve every unspecified key (REQ-007); no prompt.
+        # given), or an existing project whose unspecified keys are preserved.
         pass
     elif sys.stdin.isatty():
         try:
@@ -666,16 +725,7 @@ def init(
     # base) -> explicitly-configured output -> "en". Existing interaction is
     # deliberately stronger than --lang; existing output is only a fallback when
     # this run did not provide a new base.
-    if "interaction" in lang_overrides:
-        normalized_lang = lang_overrides["interaction"]
-    elif config_exists and (explicit_interaction := get_explicit_language_key(config_file, "interaction")) is not None:
-        normalized_lang = explicit_interaction
-    elif output_value is not None:
-        normalized_lang = output_value
-    elif config_exists and (explicit_output := get_explicit_language_key(config_file, "output")) is not None:
-        normalized_lang = explicit_output
-    else:
-        normalized_lang = "en"
+    normalized_lang = setup.resolve_message_language(project_config, lang_overrides, output_value)
 
     if debug:
         console.print(f"[dim]Target directory: {target_dir}[/dim]")
@@ -696,61 +746,43 @@ def init(
         target_dir.mkdir(parents=True)
         console.print(f"[green]Created directory:[/green] {target_dir}")
 
-    # Create .codexspec directory structure
-    codexspec_dir = target_dir / ".codexspec"
-    codexspec_dir.mkdir(exist_ok=True)
-
-    # Create subdirectories
-    (codexspec_dir / "memory").mkdir(exist_ok=True)
-    (codexspec_dir / "specs").mkdir(exist_ok=True)
-    (codexspec_dir / "templates").mkdir(exist_ok=True)
-    (codexspec_dir / "templates" / "docs").mkdir(exist_ok=True)
-    (codexspec_dir / "scripts").mkdir(exist_ok=True)
+    def confirm_step(step: str, **context) -> bool:
+        """Answer a confirm-only setup step: always under --force, otherwise prompt."""
+        if step == setup.STEP_MIGRATE_COMMANDS:
+            console.print()
+            console.print(
+                f"[yellow]{translate('cli.init.migration_found', normalized_lang, count=context['count'])}[/yellow]"
+            )
+            console.print(f"[dim]{translate('cli.init.migration_old_structure', normalized_lang)}[/dim]")
+            console.print(f"[dim]{translate('cli.init.migration_new_structure', normalized_lang)}[/dim]")
+        elif step == setup.STEP_UPDATE_COMMANDS and not context["migrated"]:
+            console.print()
+        if force:
+            return True
+        if step == setup.STEP_ADD_COMPLIANCE:
+            return confirm_add_compliance(normalized_lang)
+        key = "cli.init.migration_confirm" if step == setup.STEP_MIGRATE_COMMANDS else "cli.init.update_confirm"
+        return Confirm.ask(translate(key, normalized_lang), default=True)
 
-    # Ensure the profile scaffold unconditionally (independent of integrations),
-    # so knowledge distilled later is effective immediately with no re-init and
-    # no dangling reference. Non-destructive: existing profile files are kept.
-    ensure_profile_scaffold(target_dir)
+    # Scripts, docs templates and command templates are read once up front.
+    assets = setup.InstallAssets(get_templates_dir(), get_scripts_dir())
+    script_names, doc_names = setup.create_layout(target_dir, assets)
 
     # Copy helper scripts based on platform
-    scripts_source_dir = get_scripts_dir()
-    if scripts_source_dir.exists():
-        if sys.platform == "win32":
-            # Windows: copy PowerShell scripts
-            ps_scripts = scripts_source_dir / "powershell"
-            if ps_scripts.exists():
-                for script_file in ps_scripts.glob("*.ps1"):
-                    dest_file = codexspec_dir / "scripts" / script_file.name
-                    dest_file.write_text(script_file.read_text(encoding="utf-8"), encoding="utf-8")
-                    console.print(f"[green]Copied script:[/green] {script_file.name}")
-            else:
-                console.print("[yellow]Warning: PowerShell scripts directory not found[/yellow]")
-        else:
-            # macOS/Linux: copy Bash scripts
-            bash_scripts = scripts_source_dir / "bash"
-            if bash_scripts.exists():
-                for script_file in bash_scripts.glob("*.sh"):
-                    dest_file = codexspec_dir / "scripts" / script_file.name
-                    dest_file.write_text(script_file.read_text(encoding="utf-8"), encoding="utf-8")
-                    console.print(f"[green]Copied script:[/green] {script_file.name}")
-            else:
-                console.print("[yellow]Warning: Bash scripts directory not found[/yellow]")
-    else:
-        console.print("[yellow]Warning: Scripts directory not found[/yellow]")
+    for script_name in script_names:
+        console.print(f"[green]Copied script:[/green] {script_name}")
+    if assets.scripts_warning:
+        console.print(f"[yellow]Warning: {assets.scripts_warning}[/yellow]")
 
     # Copy docs templates
-    docs_templates_dir = get_templates_dir() / "docs"
-    if docs_templates_dir.exists():
-        for template_file in docs_templates_dir.glob("*.md"):
-            dest_file = codexspec_dir / "templates" / "docs" / template_file.name
-            dest_file.write_text(template_file.read_text(encoding="utf-8"), encoding="utf-8")
-            console.print(f"[green]Copied template:[/green] {template_file.name}")
-    else:
-        console.print("[yellow]Warning: Docs templates directory not found[/yellow]")
+    for template_name in doc_names:
+        console.print(f"[green]Copied template:[/green] {template_name}")
+    if assets.docs_warning:
+        console.print(f"[yellow]Warning: {assets.docs_warning}[/yellow]")
 
     # Get templates directory
-    templates_dir = get_templates_dir() / "commands"
-    if not templates_dir.exists():
+    templates_dir = assets.commands.templates_dir
+    if not assets.commands.available:
         # Templates directory is part of the wheel; if it's missing the
         # install is broken and we cannot recover.
         console.print(
@@ -758,110 +790,74 @@ def init(
         )
         raise typer.Exit(1)
 
+    # Forced re-installs consult the manifest to skip files that are already
+    # current and to keep command files the user edited since installation.
+    manifest = InstallManifest.load(target_dir)
+
+    # How Claude commands are written, or None to leave them as they are
+    claude_mode: Optional[str] = None
     if "claude" in integration_keys:
-        # Create .claude/commands directory for slash commands
-        claude_dir = target_dir / ".claude"
-        claude_commands_dir = claude_dir / "commands"
-        claude_commands_dir.mkdir(parents=True, exist_ok=True)
-
-        # Target subdirectory for CodexSpec commands
-        codexspec_commands_dir = claude_commands_dir / COMMANDS_SUBDIR
-
-        # Check for old structure and migrate if needed
-        old_files = detect_old_structure(claude_dir)
-        migration_happened = False
-        if old_files:
-            console.print()
-            console.print(
-                f"[yellow]{translate('cli.init.migration_found', normalized_lang, count=len(old_files))}[/yellow]"
-            )
-            console.print(f"[dim]{translate('cli.init.migration_old_structure', normalized_lang)}[/dim]")
-            console.print(f"[dim]{translate('cli.init.migration_new_structure', normalized_lang)}[/dim]")
+        migration = setup.migrate_claude_commands(target_dir, confirm_step)
+        if migration == setup.MIGRATION_DONE:
+            console.print(f"[green]{translate('cli.init.migration_complete', normalized_lang)}[/green]")
+        elif migration == setup.MIGRATION_FAILED:
+            console.print(f"[red]{translate('cli.init.migration_failed', normalized_lang)}[/red]")
+        elif migration == setup.MIGRATION_DECLINED:
+            console.print(f"[dim]{translate('cli.init.migration_skipped', normalized_lang)}[/dim]")
+        claude_mode = setup.claude_commands_mode(target_dir, migration, confirm_step)
+
+    # One pass over the templates renders every selected integration; with
+    # several targets the writes go through a small thread pool.
+    targets = setup.render_targets(integrations, target_dir, force, claude_mode)
+    counts = render_templates(
+        templates_dir,
+        targets,
+        language=normalized_lang,
+        manifest=manifest,
+        workers=INSTALL_WRITE_WORKERS if len(targets) > 1 else 1,
+        template_set=assets.commands,
+    )
 
-            if force or Confirm.ask(translate("cli.init.migration_confirm", normalized_lang), default=True):
-                if migrate_old_commands(claude_dir, old_files):
-                    console.print(f"[green]{translate('cli.init.migration_complete', normalized_lang)}[/green]")
-                    migration_happened = True
-                else:
-                    console.print(f"[red]{translate('cli.init.migration_failed', normalized_lang)}[/red]")
-            else:
-                console.print(f"[dim]{translate('cli.init.migration_skipped', normalized_lang)}[/dim]")
-
-        # Install or update commands (translate after migration if user wants)
-        if migration_happened:
-            # Migration moved files, ask if user wants to update/translate them
-            if force or Confirm.ask(translate("cli.init.update_confirm", normalized_lang), default=True):
-                count = install_commands_to_subdir(
-                    codexspec_commands_dir, templates_dir, force=True, language=normalized_lang
-                )
-                console.print(f"[green]{translate('cli.init.commands_updated', normalized_lang, count=count)}[/green]")
-        elif should_update_commands(codexspec_dir):
-            console.print()
-            if force or Confirm.ask(translate("cli.init.update_confirm", normalized_lang), default=True):
-                count = install_commands_to_subdir(
-                    codexspec_commands_dir, templates_dir, force=True, language=normalized_lang
-                )
-                console.print(f"[green]{translate('cli.init.commands_updated', normalized_lang, count=count)}[/green]")
+    for integration in integrations:
+        if integration.key not in counts:
+            continue
+        integration.post_install(target_dir)
+        count = counts[integration.key]
+        if integration.key == "claude" and claude_mode == setup.COMMANDS_UPDATE:
+            msg = translate("cli.init.commands_updated", normalized_lang, count=count)
         else:
-            count = install_commands_to_subdir(codexspec_commands_dir, templates_dir, language=normalized_lang)
-            cmd_path = f".claude/commands/{COMMANDS_SUBDIR}/"
+            cmd_path = f".claude/commands/{COMMANDS_SUBDIR}/" if integration.key == "claude" else ".agents/skills/"
             msg = translate("cli.init.commands_installed", normalized_lang, count=count, path=cmd_path)
-            console.print(f"[green]{msg}[/green]")
+        console.print(f"[green]{msg}[/green]")
 
-    for integration in integrations:
-        if integration.key == "claude":
-            continue
-        count = integration.install(target_dir, templates_dir, force=force, language=normalized_lang)
+    manifest.save()
+    if manifest.preserved:
         console.print(
-            f"[green]{translate('cli.init.commands_installed', normalized_lang, count=count, path='.agents/skills/')}"
-            "[/green]"
+            f"[yellow]Kept {len(manifest.preserved)} locally modified command file(s); "
+            "delete them and re-run init to restore the shipped version:[/yellow]"
         )
+        for preserved_path in manifest.preserved:
+            console.print(f"  [dim]{preserved_path}[/dim]")
 
     # Create constitution template
-    constitution_file = codexspec_dir / "memory" / "constitution.md"
-    if not constitution_file.exists():
-        constitution_file.write_text(_get_default_constitution(), encoding="utf-8")
+    if setup.write_default_constitution(target_dir):
         msg = translate("cli.init.created_file", normalized_lang, file=".codexspec/memory/constitution.md")
         console.print(f"[green]{msg}[/green]")
 
     # Apply language settings surgically (DEC-001 / CON-005 / REQ-005 / REQ-010).
-    # Build the full {key: value} map to write: the output base (if resolved) plus
-    # the per-dimension overrides. config.yml is never fully regenerated -- not
-    # even under --force -- and keys the user did not specify are always preserved.
-    config_file = codexspec_dir / "config.yml"
-    keys_to_write: dict[str, str] = {}
-    if output_value is not None:
-        keys_to_write["output"] = output_value
-    keys_to_write.update(lang_overrides)
-
-    wrote_keys: list[str] = []
-    if keys_to_write:
-        if not config_exists:
-            # Fresh project: emit only the chosen keys (sparse config).
-            config_content = generate_config_content(
-                output=keys_to_write.get("output"),
-                interaction=keys_to_write.get("interaction"),
-                document=keys_to_write.get("document"),
-                commit=keys_to_write.get("commit"),
-                created=datetime.now().strftime("%Y-%m-%d"),
-            )
-            config_content = _set_config_ai_content(config_content, ai)
-            config_file.write_text(config_content, encoding="utf-8")
-            wrote_keys = list(keys_to_write.keys())
-            lang_name = get_language_name(normalized_lang)
-            msg = translate(
-                "cli.init.created_file",
-                normalized_lang,
-                file=f".codexspec/config.yml (language: {lang_name})",
-            )
-            console.print(f"[green]{msg}[/green]")
-        else:
-            # Existing project: update each chosen key in place, preserving the rest.
-            for key, value in keys_to_write.items():
-                if update_language_field(config_file, key, value):
-                    wrote_keys.append(key)
-    if config_file.exists():
-        _update_project_ai(config_file, ai)
+    # The output base (if resolved) plus the per-dimension overrides are written;
+    # config.yml is never fully regenerated -- not even under --force -- and keys
+    # the user did not specify are always preserved. All edits go out in a single write.
+    keys_to_write = setup.language_keys(output_value, lang_overrides)
+    wrote_keys = project_config.apply_init_settings(keys_to_write, ai, created=datetime.now().strftime("%Y-%m-%d"))
+    if wrote_keys and not config_exists:
+        lang_name = get_language_name(normalized_lang)
+        msg = translate(
+            "cli.init.created_file",
+            normalized_lang,
+            file=f".codexspec/config.yml (language: {lang_name})",
+        )
+        console.print(f"[green]{msg}[/green]")
 
     # Non-blocking notice of which language keys were set (REQ-010).
     if wrote_keys:
@@ -873,33 +869,21 @@ def init(
         console.print(f"[dim]{translate('cli.init.language_dimensions_hint', normalized_lang)}[/dim]")
 
     if "claude" in integration_keys:
-        # Create CLAUDE.md
         # CLAUDE.md is user-authored content (like the constitution), not a
-        # regenerable artifact (like commands/scripts). Never overwrite an existing
-        # body -- even under --force. --force only auto-confirms the one safe,
-        # idempotent change: prepending the constitution @import if it is missing.
-        claude_md = target_dir / "CLAUDE.md"
-        if not claude_md.exists():
-            project_name = target_dir.name
-            claude_md.write_text(_get_claude_md_content(project_name), encoding="utf-8")
+        # regenerable artifact (like commands/scripts): an existing body is never
+        # overwritten, even under --force.
+        claude_md_result = setup.setup_claude_md(target_dir, confirm_step)
+        if claude_md_result == setup.CLAUDE_MD_CREATED:
             console.print(f"[green]{translate('cli.init.created_file', normalized_lang, file='CLAUDE.md')}[/green]")
-        else:
-            # Existing CLAUDE.md: ensure the compliance @import, never clobber the body.
-            if not has_compliance_section(claude_md):
-                if force or confirm_add_compliance(normalized_lang):
-                    prepend_compliance_section(claude_md)
-                    console.print(f"[green]{translate('cli.init.compliance_added', normalized_lang)}[/green]")
-
-        # Inject the profile block AFTER creation/compliance so it never clobbers
-        # the compliance @import or the user's body (bounded, idempotent).
-        inject_profile_block(claude_md)
+        elif claude_md_result == setup.CLAUDE_MD_COMPLIANCE_ADDED:
+            console.print(f"[green]{translate('cli.init.compliance_added', normalized_lang)}[/green]")
 
     # Initialize git if requested
-    if not no_git and not (target_dir / ".git").exists():
-        try:
-            subprocess.run(["git", "init"], cwd=target_dir, check=True, capture_output=True)
+    if not no_git:
+        git_result = setup.init_git(target_dir)
+        if git_result:
             console.print(f"[green]{translate('cli.init.git_initialized', normalized_lang)}[/green]")
-        except subprocess.CalledProcessError:
+        elif git_result is False:
             console.print(f"[yellow]{translate('cli.init.git_failed', normalized_lang)}[/yellow]")
 
     # Print success message with command summary
@@ -935,6 +919,72 @@ def init(
     console.print(f"[yellow]{_important_action(integrations, normalized_lang)}[/yellow]")
 
 
+def _normalize_lang_option(raw: str, out=console) -> str:
+    """Normalize a language flag value; warn (do not error) on ``out`` if unsupported."""
+    normalized = normalize_locale(raw)
+    if not is_supported_language(normalized):
+        out.print(f"[yellow]Warning: '{raw}' is not in the list of commonly supported languages.[/yellow]")
+        out.print(
+            "It may still work if Claude supports it. "
+            "Run [cyan]codexspec config --list-langs[/cyan] to see supported languages."
+        )
+    return normalized
+
+
+def _init_batch(
+    spec: str,
+    integrations: list,
+    *,
+    ai: str,
+    lang: Optional[str],
+    lang_overrides: dict[str, str],
+    force: bool,
+    no_git: bool,
+    jobs: int,
+) -> None:
+    """Run ``init --batch``: install into every matched project and print a JSON summary.
+
+    Language flags are validated once, before any project is touched; warnings
+    go to stderr so stdout stays valid JSON. Exits with status 1 when no
+    project matches or any project fails.
+    """
+    import json
+
+    from rich.console import Console
+
+    from .commands.batch import resolve_batch_targets, run_batch, summarize
+    from .commands.project_setup import InstallAssets
+
+    stderr_console = Console(stderr=True)
+    output_value = _normalize_lang_option(lang, stderr_console) if lang is not None else None
+    lang_overrides = {key: _normalize_lang_option(value, stderr_console) for key, value in lang_overrides.items()}
+
+    project_dirs = resolve_batch_targets(spec)
+    if not project_dirs:
+        console.print(f"[red]Error:[/red] --batch matched no project directories: {spec}")
+        raise typer.Exit(1)
+
+    assets = InstallAssets(get_templates_dir(), get_scripts_dir())
+    if not assets.commands.available:
+        console.print(f"[red]Error:[/red] command templates not found: {assets.commands.templates_dir}")
+        raise typer.Exit(1)
+    results = run_batch(
+        project_dirs,
+        assets,
+        integrations,
+        workers=jobs,
+        ai=ai,
+        output_value=output_value,
+        lang_overrides=lang_overrides,
+        force=force,
+        no_git=no_git,
+    )
+    summary = summarize(results)
+    typer.echo(json.dumps(summary, indent=2, ensure_ascii=False))
+    if summary["failed"]:
+        raise typer.Exit(1)
+
+
 def _rerender_command_frontmatter(config_file: Path) -> None:
     """Re-render installed command frontmatter in the current interaction language.
 
@@ -944,6 +994,10 @@ def _rerender_command_frontmatter(config_file: Path) -> None:
     pre-translated cache are not re-rendered here (that path would invoke the
     ``claude`` CLI once per command); the user is advised to run ``codexspec init``.
     """
+    from .commands.installer import COMMANDS_SUBDIR, update_installed_command_frontmatter
+    from .commands.manifest import InstallManifest
+    from .translator import SUPPORTED_LANGUAGES
+
     commands_subdir = Path.cwd() / ".claude" / "commands" / COMMANDS_SUBDIR
     if not commands_subdir.exists():
         return
@@ -954,31 +1008,12 @@ def _rerender_command_frontmatter(config_file: Path) -> None:
     templates_dir = get_templates_dir() / "commands"
     if not templates_dir.exists():
         return
-    update_installed_command_frontmatter(commands_subdir, templates_dir, language=language)
+    manifest = InstallManifest.load(Path.cwd())
+    update_installed_command_frontmatter(commands_subdir, templates_dir, language=language, manifest=manifest)
+    manifest.save()
     console.print(f"[dim]Updated command descriptions to: {get_language_name(language)}[/dim]")
 
 
-def _set_config_ai_content(content: str, ai: str) -> str:
-    """Set project.ai in freshly generated config content."""
-    return content.replace('  ai: "claude"', f'  ai: "{ai}"')
-
-
-def _update_project_ai(config_file: Path, ai: str) -> None:
-    """Update the project.ai field in config.yml when present."""
-    try:
-        content = config_file.read_text(encoding="utf-8")
-        updated, count = re.subn(
-            r'^(\s*ai:\s*)["\']?[^"\'\n]+["\']?\s*$',
-            rf'\g<1>"{ai}"',
-            content,
-            flags=re.MULTILINE,
-        )
-        if count:
-            config_file.write_text(updated, encoding="utf-8")
-    except OSError:
-        return
-
-
 # --- workflow.auto_next toggle helpers -------------------------------------
 
 
@@ -1004,23 +1039,9 @@ def _read_auto_next(config_file: Path) -> bool:
     ``False`` — matching the runtime rule that only literal ``true`` enables
     auto-next.
     """
-    try:
-        content = config_file.read_text(encoding="utf-8")
-    except OSError:
-        return False
-    in_workflow = False
-    for line in content.splitlines():
-        if not line.strip():
-            continue
-        if not line[0].isspace():  # top-level key (or comment)
-            key = line.split("#", 1)[0].strip()
-            in_workflow = key == "workflow:"
-            continue
-        if in_workflow:
-            match = re.match(r"^\s*auto_next:\s*(\S+?)\s*(?:#.*)?$", line)
-            if match:
-                return match.group(1) == "true"
-    return False
+    from .project_config import ProjectConfig
+
+    return ProjectConfig.load(config_file).auto_next
 
 
 def _write_auto_next(config_file: Path, value: bool) -> bool:
@@ -1033,55 +1054,13 @@ def _write_auto_next(config_file: Path, value: bool) -> bool:
     comments are preserved; the inserted line is bare (no reconstructed
     comment). Returns ``False`` on I/O error.
     """
-    try:
-        content = config_file.read_text(encoding="utf-8")
-    except OSError:
-        return False
+    from .project_config import ProjectConfig
 
-    token = "true" if value else "false"
-    lines = content.split("\n")
-
-    workflow_idx: Optional[int] = None
-    in_workflow = False
-    for i, line in enumerate(lines):
-        if not line.strip():
-            continue
-        if not line[0].isspace():
-            key = line.split("#", 1)[0].strip()
-            in_workflow = key == "workflow:"
-            if in_workflow:
-                workflow_idx = i
-            continue
-        if in_workflow and re.match(r"^\s*auto_next:\s*\S+", line):
-            indent = line[: len(line) - len(line.lstrip())]
-            lines[i] = f"{indent}auto_next: {token}"
-            return _dump_lines(config_file, lines)
-
-    if workflow_idx is not None:
-        lines.insert(workflow_idx + 1, f"  auto_next: {token}")
-        return _dump_lines(config_file, lines)
-
-    section = f"workflow:\n  auto_next: {token}"
-    if not content:
-        new_content = section + "\n"
-    elif content.endswith("\n"):
-        new_content = content + "\n" + section + "\n"
-    else:
-        new_content = content + "\n\n" + section + "\n"
-    try:
-        config_file.write_text(new_content, encoding="utf-8")
-    except OSError:
-        return False
-    return True
-
-
-def _dump_lines(path: Path, lines: list[str]) -> bool:
-    """Write ``lines`` joined by newlines; return False on I/O error."""
-    try:
-        path.write_text("\n".join(lines), encoding="utf-8")
-    except OSError:
+    project_config = ProjectConfig.load(config_file)
+    if not project_config.exists:
         return False
-    return True
+    project_config.set_workflow_flag("auto_next", value)
+    return project_config.save()
 
 
 # --- workflow.auto_distill toggle helpers ----------------------------------
@@ -1109,23 +1088,9 @@ def _read_auto_distill(config_file: Path) -> bool:
     explicit ``true``, or any non-``false`` value enables it; only the literal
     ``false`` disables it. A missing file also reads as enabled.
     """
-    try:
-        content = config_file.read_text(encoding="utf-8")
-    except OSError:
-        return True
-    in_workflow = False
-    for line in content.splitlines():
-        if not line.strip():
-            continue
-        if not line[0].isspace():  # top-level key (or comment)
-            key = line.split("#", 1)[0].strip()
-            in_workflow = key == "workflow:"
-            continue
-        if in_workflow:
-            match = re.match(r"^\s*auto_distill:\s*(\S+?)\s*(?:#.*)?$", line)
-            if match:
-                return match.group(1) != "false"
-    return True
+    from .project_config import ProjectConfig
+
+    return ProjectConfig.load(config_file).auto_distill
 
 
 def _write_auto_distill(config_file: Path, value: bool) -> bool:
@@ -1137,50 +1102,19 @@ def _write_auto_distill(config_file: Path, value: bool) -> bool:
     when absent. Preserves all other lines/comments. Returns ``False`` on I/O
     error.
     """
-    try:
-        content = config_file.read_text(encoding="utf-8")
-    except OSError:
-        return False
-
-    token = "true" if value else "false"
-    lines = content.split("\n")
+    from .project_config import ProjectConfig
 
-    workflow_idx: Optional[int] = None
-    in_workflow = False
-    for i, line in enumerate(lines):
-        if not line.strip():
-            continue
-        if not line[0].isspace():
-            key = line.split("#", 1)[0].strip()
-            in_workflow = key == "workflow:"
-            if in_workflow:
-                workflow_idx = i
-            continue
-        if in_workflow and re.match(r"^\s*auto_distill:\s*\S+", line):
-            indent = line[: len(line) - len(line.lstrip())]
-            lines[i] = f"{indent}auto_distill: {token}"
-            return _dump_lines(config_file, lines)
-
-    if workflow_idx is not None:
-        lines.insert(workflow_idx + 1, f"  auto_distill: {token}")
-        return _dump_lines(config_file, lines)
-
-    section = f"workflow:\n  auto_distill: {token}"
-    if not content:
-        new_content = section + "\n"
-    elif content.endswith("\n"):
-        new_content = content + "\n" + section + "\n"
-    else:
-        new_content = content + "\n\n" + section + "\n"
-    try:
-        config_file.write_text(new_content, encoding="utf-8")
-    except OSError:
+    project_config = ProjectConfig.load(config_file)
+    if not project_config.exists:
         return False
-    return True
+    project_config.set_workflow_flag("auto_distill", value)
+    return project_config.save()
 
 
 def _next_step_start(integration_keys: set[str], language: str) -> str:
     """Return a target-aware start instruction."""
+    from .translator import translate
+
     if integration_keys == {"codex"}:
         return "Start Codex in this project directory: codex"
     if integration_keys == {"claude", "codex"}:
@@ -1198,6 +1132,8 @@ def _next_step_invocation(integrations: list, command_name: str) -> str:
 
 def _git_tip(integration_keys: set[str], language: str) -> str:
     """Return a target-aware git management tip."""
+    from .translator import translate
+
     if integration_keys == {"codex"}:
         return "Add .agents/ to Git if you want Codex skills versioned: git add .agents/"
     if integration_keys == {"claude", "codex"}:
@@ -1207,6 +1143,8 @@ def _git_tip(integration_keys: set[str], language: str) -> str:
 
 def _important_action(integrations: list, language: str) -> str:
     """Return target-aware constitution command reminder."""
+    from .translator import translate
+
     if integrations and integrations[0].key == "codex":
         return f"Run {integrations[0].invocation_for('constitution')} to customize it for your project."
     return translate("cli.init.important_action", language)
@@ -1214,6 +1152,10 @@ def _important_action(integrations: list, language: str) -> str:
 
 def _print_command_summary(language: str = "en", ai: str = "claude") -> None:
     """Print a summary of installed commands grouped by category."""
+    from .commands.installer import COMMANDS_SUBDIR, get_commands_metadata
+    from .integrations import get_integrations
+    from .translator import translate
+
     metadata = get_commands_metadata()
     integrations = get_integrations(ai)
     primary = integrations[0]
@@ -1370,6 +1312,8 @@ def prompt_language_selection(default: str = "en") -> str:
     Raises:
         KeyboardInterrupt: If user presses Ctrl+C
     """
+    from rich.prompt import Prompt
+
     from .i18n import get_all_supported_languages, normalize_locale
 
     # Get all supported languages
@@ -1444,6 +1388,8 @@ def confirm_add_compliance(language: str = "en") -> bool:
     Returns:
         True if user confirms, False otherwise
     """
+    from .translator import translate
+
     return typer.confirm(
         translate("cli.init.compliance_confirm", language),
         default=False,
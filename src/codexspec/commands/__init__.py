@@ -13,11 +13,13 @@ from .installer import (
     migrate_old_commands,
     should_update_commands,
 )
+from .manifest import InstallManifest
 
 __all__ = [
     "COMMANDS_SUBDIR",
     "OLD_COMMAND_PREFIX",
     "CommandMetadata",
+    "InstallManifest",
     "detect_old_structure",
     "get_commands_metadata",
     "install_commands_to_subdir",
@@ -0,0 +1,234 @@
+"""Fleet-wide installs for ``codexspec init --batch``.
+
+Upgrading many repositories by running ``codexspec init . --force`` in each
+one pays interpreter startup and template loading every time. ``--batch``
+instead loads the command templates, helper scripts, docs templates and
+translation caches once (:class:`InstallAssets`) and applies the install to
+every target directory on a bounded thread pool (:func:`run_batch`).
+
+Batch installs never prompt. With ``--force`` every confirmation is accepted,
+exactly as ``init --force`` does; without it the confirm-only steps (migrating
+old command files, updating existing commands, prepending the constitution
+import to CLAUDE.md) are skipped. Each project yields one
+:class:`ProjectResult` for the JSON summary.
+"""
+
+import glob
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional, TypedDict
+
+from codexspec.project_config import ProjectConfig
+
+from .installer import render_templates
+from .manifest import InstallManifest
+from .project_setup import (
+    MIGRATION_FAILED,
+    InstallAssets,
+    claude_commands_mode,
+    create_layout,
+    init_git,
+    language_keys,
+    migrate_claude_commands,
+    needs_output_language,
+    render_targets,
+    resolve_message_language,
+    setup_claude_md,
+    write_default_constitution,
+)
+
+STATUS_OK = "ok"
+STATUS_ERROR = "error"
+
+
+class ProjectResult(TypedDict):
+    """Outcome of installing CodexSpec into one project.
+
+    Attributes:
+        path: Project directory
+        status: STATUS_OK or STATUS_ERROR
+        error: Error message when status is STATUS_ERROR, else None
+        commands: Installed command count per integration key
+        preserved: Locally modified command files that were kept
+        config_keys: Language keys written to config.yml
+        skipped: Confirm-only steps skipped because --force was not given
+        duration_ms: Wall-clock time spent on this project
+    """
+
+    path: str
+    status: str
+    error: Optional[str]
+    commands: dict[str, int]
+    preserved: list[str]
+    config_keys: list[str]
+    skipped: list[str]
+    duration_ms: int
+
+
+def resolve_batch_targets(spec: str) -> list[Path]:
+    """Expand ``--batch`` into project directories.
+
+    Args:
+        spec: Either a file listing one directory per line (blank lines and
+            ``#`` comments ignored) or a glob pattern (``**`` supported)
+
+    Returns:
+        Absolute paths, de-duplicated, in the order given (list file) or sorted
+        (glob). Glob matches that are not directories are dropped; listed paths
+        are kept so a missing project shows up as an error in the summary.
+    """
+    list_file = Path(spec).expanduser()
+    if list_file.is_file():
+        lines = [line.strip() for line in list_file.read_text(encoding="utf-8").splitlines()]
+        candidates = [Path(line).expanduser() for line in lines if line and not line.startswith("#")]
+    else:
+        matches = sorted(glob.glob(str(list_file), recursive=True))
+        candidates = [Path(match) for match in matches if Path(match).is_dir()]
+
+    targets: list[Path] = []
+    seen: set[Path] = set()
+    for candidate in candidates:
+        resolved = candidate.resolve()
+        if resolved in seen:
+            continue
+        seen.add(resolved)
+        targets.append(resolved)
+    return targets
+
+
+def install_project(
+    target_dir: Path,
+    assets: InstallAssets,
+    integrations: list,
+    *,
+    ai: str,
+    output_value: Optional[str] = None,
+    lang_overrides: Optional[dict[str, str]] = None,
+    force: bool = False,
+    no_git: bool = False,
+) -> ProjectResult:
+    """Install CodexSpec into an existing project directory without prompting.
+
+    Performs the same steps as ``init`` (see the module docstring for how
+    confirmations are resolved). Errors are reported in the result rather than
+    raised, so one broken repository does not stop a batch.
+
+    Args:
+        target_dir: Project directory; must already exist
+        assets: Preloaded templates and scripts
+        integrations: Integrations resolved from ``ai``
+        ai: ``--ai`` value written to ``project.ai``
+        output_value: Normalized ``--lang`` value, if given
+        lang_overrides: Normalized per-dimension language flags
+        force: Accept every confirmation, as ``init --force`` does
+        no_git: Skip ``git init``
+
+    Returns:
+        ProjectResult for the JSON summary
+    """
+    started = time.monotonic()
+    result: ProjectResult = {
+        "path": str(target_dir),
+        "status": STATUS_OK,
+        "error": None,
+        "commands": {},
+        "preserved": [],
+        "config_keys": [],
+        "skipped": [],
+        "duration_ms": 0,
+    }
+    lang_overrides = lang_overrides or {}
+
+    def confirm(step: str, **context) -> bool:
+        if not force:
+            result["skipped"].append(step)
+        return force
+
+    try:
+        if not target_dir.is_dir():
+            raise NotADirectoryError(f"not a directory: {target_dir}")
+
+        project_config = ProjectConfig.load(target_dir / ".codexspec" / "config.yml")
+        # Batch is non-interactive: a first-time install without --lang defaults to "en".
+        if needs_output_language(project_config, output_value, lang_overrides):
+            output_value = "en"
+        language = resolve_message_language(project_config, lang_overrides, output_value)
+
+        create_layout(target_dir, assets)
+        manifest = InstallManifest.load(target_dir)
+        claude_mode = None
+        if any(integration.key == "claude" for integration in integrations):
+            migration = migrate_claude_commands(target_dir, confirm)
+            if migration == MIGRATION_FAILED:
+                raise OSError(f"failed to migrate old command files in {target_dir / '.claude' / 'commands'}")
+            claude_mode = claude_commands_mode(target_dir, migration, confirm)
+
+        result["commands"] = render_templates(
+            assets.commands.templates_dir,
+            render_targets(integrations, target_dir, force, claude_mode),
+            language=language,
+            manifest=manifest,
+            template_set=assets.commands,
+        )
+        for integration in integrations:
+            if integration.key in result["commands"]:
+                integration.post_install(target_dir)
+        manifest.save()
+        result["preserved"] = manifest.preserved
+
+        write_default_constitution(target_dir)
+        result["config_keys"] = project_config.apply_init_settings(language_keys(output_value, lang_overrides), ai)
+        if any(integration.key == "claude" for integration in integrations):
+            setup_claude_md(target_dir, confirm)
+        if not no_git and init_git(target_dir) is False:
+            raise OSError("git init failed")
+    except Exception as exc:
+        result["status"] = STATUS_ERROR
+        result["error"] = f"{type(exc).__name__}: {exc}"
+    result["duration_ms"] = round((time.monotonic() - started) * 1000)
+    return result
+
+
+def run_batch(
+    project_dirs: list[Path],
+    assets: InstallAssets,
+    integrations: list,
+    *,
+    workers: int,
+    **options,
+) -> list[ProjectResult]:
+    """Install into every directory on a pool of at most ``workers`` threads.
+
+    Args:
+        project_dirs: Target directories (see :func:`resolve_batch_targets`)
+        assets: Preloaded templates and scripts shared by all projects
+        integrations: Integrations resolved from ``--ai``
+        workers: Maximum number of projects installed concurrently
+        **options: Keyword arguments forwarded to :func:`install_project`
+
+    Returns:
+        One ProjectResult per directory, in input order
+    """
+    if not project_dirs:
+        return []
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(project_dirs)))) as executor:
+        return list(
+            executor.map(
+                lambda project_dir: install_project(project_dir, assets, integrations, **options), project_dirs
+            )
+        )
+
+
+def summarize(results: list[ProjectResult]) -> dict:
+    """Build the JSON document printed by ``init --batch``."""
+    from codexspec import __version__
+
+    failed = sum(1 for result in results if result["status"] != STATUS_OK)
+    return {
+        "codexspec_version": __version__,
+        "total": len(results),
+        "succeeded": len(results) - failed,
+        "failed": failed,
+        "results": results,
+    }
@@ -6,7 +6,7 @@ CodexSpec slash commands.
 
 import shutil
 from pathlib import Path
-from typing import Optional, TypedDict
+from typing import Callable, Optional, TypedDict
 
 from codexspec.translator import (
     apply_translations_to_template,
@@ -15,6 +15,8 @@ from codexspec.translator import (
     translate_template_frontmatter,
 )
 
+from .manifest import STATUS_CURRENT, STATUS_MODIFIED, STATUS_STALE, InstallManifest, content_hash
+
 # Constants
 COMMANDS_SUBDIR = "codexspec"  # Subdirectory name for commands
 OLD_COMMAND_PREFIX = "codexspec."  # Prefix for old structure command files
@@ -38,6 +40,26 @@ class CommandMetadata(TypedDict):
     file_name: str
 
 
+class RenderTarget(TypedDict):
+    """One destination for rendered command templates.
+
+    Integrations declare a target instead of running their own install loop;
+    :func:`render_templates` reads and translates each template once and fans
+    the result out to every target.
+
+    Attributes:
+        key: Integration key ("claude", "codex"), used to report counts
+        force: Whether existing files at this target may be overwritten
+        path_for: Maps a command name (e.g., "specify") to its output file
+        render: Turns (command name, translated template) into file content
+    """
+
+    key: str
+    force: bool
+    path_for: Callable[[str], Path]
+    render: Callable[[str, str], str]
+
+
 def get_commands_metadata() -> list[CommandMetadata]:
     """Get metadata for all available CodexSpec commands.
 
@@ -342,18 +364,148 @@ def migrate_old_commands(
         return False
 
 
+class TemplateSet:
+    """Command templates read once, with translated frontmatter memoized per language.
+
+    :func:`render_templates` builds a throwaway set per call; ``init --batch``
+    shares one set across every project it installs, so each template is read
+    and translated once per process rather than once per project.
+    """
+
+    def __init__(self, templates_dir: Path, translations_dir: Optional[Path] = None):
+        self.templates_dir = templates_dir
+        self.translations_dir = translations_dir
+        # (template name, content, content hash), sorted by name
+        self.templates: list[tuple[str, str, str]] = []
+        if templates_dir.exists():
+            for template_file in sorted(templates_dir.glob("*.md")):
+                content = template_file.read_text(encoding="utf-8")
+                self.templates.append((template_file.stem, content, content_hash(content)))
+        # Plain dicts: concurrent fills compute identical values, so a race only
+        # repeats work.
+        self._caches: dict[str, Optional[dict]] = {}
+        self._translated: dict[tuple[str, str], str] = {}
+
+    @property
+    def available(self) -> bool:
+        """Whether the templates directory exists."""
+        return self.templates_dir.exists()
+
+    def translated(self, template_name: str, content: str, language: str) -> str:
+        """Return ``content`` with its frontmatter translated to ``language``."""
+        key = (template_name, language)
+        if key not in self._translated:
+            if language not in self._caches:
+                self._caches[language] = (
+                    load_translation_cache(language, self.translations_dir) if language != "en" else None
+                )
+            self._translated[key] = translate_template_frontmatter(
+                content, template_name, language, self._caches[language]
+            )
+        return self._translated[key]
+
+
+def render_templates(
+    templates_dir: Path,
+    targets: list[RenderTarget],
+    language: str = "en",
+    translations_dir: Optional[Path] = None,
+    manifest: Optional[InstallManifest] = None,
+    workers: int = 1,
+    template_set: Optional[TemplateSet] = None,
+) -> dict[str, int]:
+    """Render every command template into all targets in a single pass.
+
+    Each template is read, hashed and frontmatter-translated once, however many
+    targets it is written to. Translation is skipped entirely for templates
+    that no target needs to rewrite.
+
+    With a ``manifest``, forced re-installs are incremental: files that are
+    already current are left untouched, and files the user edited since they
+    were installed are kept (and listed in ``manifest.preserved``).
+
+    Args:
+        templates_dir: Source templates directory
+        targets: Destinations to render into
+        language: Target language for frontmatter translation (default: "en")
+        translations_dir: Custom translations directory (for testing)
+        manifest: Install manifest to consult and update (optional)
+        workers: Number of threads for file writes; 1 writes serially
+        template_set: Preloaded templates to use instead of reading ``templates_dir``
+
+    Returns:
+        Mapping of target key to number of commands installed there
+        (including ones already up to date)
+    """
+    counts = {target["key"]: 0 for target in targets}
+    if template_set is None:
+        template_set = TemplateSet(templates_dir, translations_dir)
+    if not template_set.available:
+        return counts
+
+    # (path, content, source_hash) for every file that needs writing
+    writes: list[tuple[Path, str, str]] = []
+    for template_name, content, source_hash in template_set.templates:
+        translated: Optional[str] = None
+
+        for target in targets:
+            target_path = target["path_for"](template_name)
+
+            # Skip if exists and not forcing
+            if not target["force"] and target_path.exists():
+                continue
+
+            if manifest is not None:
+                status = manifest.status(target_path, source_hash, language)
+                if status == STATUS_CURRENT:
+                    counts[target["key"]] += 1
+                    continue
+                if status == STATUS_MODIFIED:
+                    manifest.preserve(target_path)
+                    continue
+
+            if translated is None:
+                translated = template_set.translated(template_name, content, language)
+            writes.append((target_path, target["render"](template_name, translated), source_hash))
+            counts[target["key"]] += 1
+
+    if workers > 1 and len(writes) > 1:
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # list() re-raises the first write error, if any
+            list(executor.map(lambda write: _write_rendered(write[0], write[1]), writes))
+    else:
+        for target_path, rendered, _ in writes:
+            _write_rendered(target_path, rendered)
+
+    # The manifest is updated on this thread only, after all writes succeeded.
+    if manifest is not None:
+        for target_path, rendered, source_hash in writes:
+            manifest.record(target_path, rendered, source_hash, language)
+
+    return counts
+
+
+def _write_rendered(target_path: Path, content: str) -> None:
+    target_path.parent.mkdir(parents=True, exist_ok=True)
+    target_path.write_text(content, encoding="utf-8")
+
+
 def install_commands_to_subdir(
     target_dir: Path,
     templates_dir: Path,
     force: bool = False,
     language: str = "en",
     translations_dir: Optional[Path] = None,
+    manifest: Optional[InstallManifest] = None,
 ) -> int:
     """Install command templates to subdirectory with optional translation.
 
     Pure file operation without user interaction. Copies template files
     from the templates directory to the target subdirectory, applying
     frontmatter translation if a non-English language is specified.
+    See :func:`render_templates` for how a ``manifest`` is used.
 
     Args:
         target_dir: Target directory (.claude/commands/codexspec)
@@ -361,9 +513,10 @@ def install_commands_to_subdir(
         force: If True, overwrite existing files; if False, skip existing
         language: Target language for frontmatter translation (default: "en")
         translations_dir: Custom translations directory (for testing)
+        manifest: Install manifest to consult and update (optional)
 
     Returns:
-        Number of commands installed
+        Number of commands installed (including ones already up to date)
 
     Note:
         This function performs pure file operations. User confirmation
@@ -375,31 +528,30 @@ def install_commands_to_subdir(
     # Ensure target directory exists
     target_dir.mkdir(parents=True, exist_ok=True)
 
-    # Load translation cache if needed
-    translation_cache = None
-    if language != "en":
-        translation_cache = load_translation_cache(language, translations_dir)
-
-    installed_count = 0
-    for template_file in templates_dir.glob("*.md"):
-        target_path = target_dir / template_file.name
+    target = command_dir_target("commands", target_dir, force=force)
+    counts = render_templates(
+        templates_dir, [target], language=language, translations_dir=translations_dir, manifest=manifest
+    )
+    return counts["commands"]
 
-        # Skip if exists and not forcing
-        if target_path.exists() and not force:
-            continue
-
-        # Read template content
-        content = template_file.read_text(encoding="utf-8")
 
-        # Apply translation if available
-        template_name = template_file.stem  # filename without extension
-        content = translate_template_frontmatter(content, template_name, language, translation_cache)
+def command_dir_target(key: str, commands_dir: Path, force: bool = False) -> RenderTarget:
+    """Build a target that copies translated templates into ``commands_dir`` as-is.
 
-        # Write to target
-        target_path.write_text(content, encoding="utf-8")
-        installed_count += 1
+    Args:
+        key: Key to report the installed count under
+        commands_dir: Destination directory (e.g., .claude/commands/codexspec)
+        force: Whether existing files may be overwritten
 
-    return installed_count
+    Returns:
+        RenderTarget writing ``<commands_dir>/<name>.md``
+    """
+    return {
+        "key": key,
+        "force": force,
+        "path_for": lambda name: commands_dir / f"{name}.md",
+        "render": lambda name, content: content,
+    }
 
 
 def update_installed_command_frontmatter(
@@ -407,12 +559,16 @@ def update_installed_command_frontmatter(
     templates_dir: Path,
     language: str = "en",
     translations_dir: Optional[Path] = None,
+    manifest: Optional[InstallManifest] = None,
 ) -> int:
     """Update frontmatter translations for already-installed command files.
 
     This preserves command bodies and any non-translated frontmatter while
     refreshing the language-specific ``description`` and ``argument-hint`` fields.
-    Missing installed commands are intentionally skipped.
+    Missing installed commands are intentionally skipped. With a ``manifest``,
+    files that were untouched before the update are re-recorded so the rewrite
+    is not later mistaken for a user edit; outdated files keep their recorded
+    template hash and version, so a later forced install still upgrades them.
     """
     if not target_dir.exists() or not templates_dir.exists():
         return 0
@@ -439,7 +595,15 @@ def update_installed_command_frontmatter(
         current_content = target_path.read_text(encoding="utf-8")
         updated_content = apply_translations_to_template(current_content, fields)
         if updated_content != current_content:
-            target_path.write_text(updated_content, encoding="utf-8")
+            source_hash = content_hash(template_content)
+            status = manifest.status(target_path, source_hash, language) if manifest is not None else None
+            if status == STATUS_CURRENT:
+                manifest.write(target_path, updated_content, source_hash, language)
+            elif status == STATUS_STALE:
+                # The body is still the old template's: keep it due for an upgrade.
+                manifest.rewrite(target_path, updated_content, language)
+            else:
+                target_path.write_text(updated_content, encoding="utf-8")
             updated_count += 1
 
     return updated_count
@@ -0,0 +1,175 @@
+"""Install manifest for incremental command installation.
+
+``.codexspec/install-manifest.json`` records, for every file CodexSpec renders
+into a project (Claude commands, Codex skills), the hash of the source
+template, the language it was rendered in, the codexspec version, and the hash
+of the written output. Re-installs use it to:
+
+- skip files whose source, language and version are unchanged and whose output
+  is still byte-identical on disk (no read-translate-write cycle), and
+- detect files the user edited after installation (on-disk hash differs from
+  the recorded output hash) and keep them instead of overwriting.
+
+Files without a manifest entry (installs predating the manifest) are treated
+as before: overwritten when forced.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Optional, TypedDict
+
+MANIFEST_FILE = Path(".codexspec") / "install-manifest.json"
+MANIFEST_VERSION = 1
+
+# Results of InstallManifest.status()
+STATUS_MISSING = "missing"  # target file does not exist
+STATUS_UNTRACKED = "untracked"  # file exists but was never recorded
+STATUS_CURRENT = "current"  # up to date, untouched since it was written
+STATUS_STALE = "stale"  # untouched, but source/language/version changed
+STATUS_MODIFIED = "modified"  # edited on disk after it was written
+
+
+class ManifestEntry(TypedDict):
+    """One installed file.
+
+    Attributes:
+        source_hash: SHA-256 of the source template text
+        language: Language the frontmatter was rendered in
+        codexspec_version: codexspec version that wrote the file
+        output_hash: SHA-256 of the bytes written to disk
+    """
+
+    source_hash: str
+    language: str
+    codexspec_version: str
+    output_hash: str
+
+
+def content_hash(text: str) -> str:
+    """Return the SHA-256 hex digest of ``text`` encoded as UTF-8."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _disk_bytes(content: str) -> bytes:
+    # Mirrors Path.write_text(content, encoding="utf-8"): "\n" becomes os.linesep.
+    return content.replace("\n", os.linesep).encode("utf-8")
+
+
+class InstallManifest:
+    """Manifest of rendered files for one project directory."""
+
+    def __init__(self, project_dir: Path, entries: Optional[dict[str, ManifestEntry]] = None):
+        from codexspec import __version__
+
+        self.project_dir = project_dir
+        self.entries: dict[str, ManifestEntry] = entries or {}
+        self.version = __version__
+        # Relative paths of user-modified files kept during this install.
+        self.preserved: list[str] = []
+        self._dirty = False
+
+    @property
+    def path(self) -> Path:
+        """Location of the manifest file."""
+        return self.project_dir / MANIFEST_FILE
+
+    @classmethod
+    def load(cls, project_dir: Path) -> "InstallManifest":
+        """Load the manifest for ``project_dir``.
+
+        A missing, unreadable, or incompatible manifest yields an empty one, so
+        every existing file is treated as untracked.
+        """
+        manifest_path = project_dir / MANIFEST_FILE
+        try:
+            data = json.loads(manifest_path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return cls(project_dir)
+        if not isinstance(data, dict) or data.get("version") != MANIFEST_VERSION:
+            return cls(project_dir)
+        files = data.get("files")
+        return cls(project_dir, files if isinstance(files, dict) else None)
+
+    def save(self) -> None:
+        """Write the manifest atomically if anything was recorded."""
+        if not self._dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {"version": MANIFEST_VERSION, "files": dict(sorted(self.entries.items()))}
+        tmp_path = self.path.with_suffix(".json.tmp")
+        tmp_path.write_text(json.dumps(payload, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+        os.replace(tmp_path, self.path)
+        self._dirty = False
+
+    def key(self, path: Path) -> str:
+        """Return the manifest key for ``path`` (POSIX path relative to the project)."""
+        try:
+            return path.relative_to(self.project_dir).as_posix()
+        except ValueError:
+            return path.as_posix()
+
+    def status(self, path: Path, source_hash: str, language: str) -> str:
+        """Classify an install target against its manifest entry.
+
+        Args:
+            path: Target file path
+            source_hash: :func:`content_hash` of the source template
+            language: Language the file would be rendered in
+
+        Returns:
+            One of the ``STATUS_*`` constants
+        """
+        try:
+            current = path.read_bytes()
+        except OSError:
+            return STATUS_MISSING
+        entry = self.entries.get(self.key(path))
+        if entry is None:
+            return STATUS_UNTRACKED
+        if hashlib.sha256(current).hexdigest() != entry.get("output_hash"):
+            return STATUS_MODIFIED
+        if (
+            entry.get("source_hash") == source_hash
+            and entry.get("language") == language
+            and entry.get("codexspec_version") == self.version
+        ):
+            return STATUS_CURRENT
+        return STATUS_STALE
+
+    def write(self, path: Path, content: str, source_hash: str, language: str) -> None:
+        """Write ``content`` to ``path`` and record it."""
+        path.write_text(content, encoding="utf-8")
+        self.record(path, content, source_hash, language)
+
+    def record(self, path: Path, content: str, source_hash: str, language: str) -> None:
+        """Record that ``content`` was written to ``path``."""
+        self.entries[self.key(path)] = {
+            "source_hash": source_hash,
+            "language": language,
+            "codexspec_version": self.version,
+            "output_hash": hashlib.sha256(_disk_bytes(content)).hexdigest(),
+        }
+        self._dirty = True
+
+    def rewrite(self, path: Path, content: str, language: str) -> None:
+        """Write an in-place edit of a recorded file, keeping its source hash and version.
+
+        Used when only the frontmatter of an installed file is re-rendered: the
+        body still comes from the template it was installed from, so a stale
+        file must stay stale for the next forced install.
+        """
+        path.write_text(content, encoding="utf-8")
+        entry = self.entries[self.key(path)]
+        self.entries[self.key(path)] = {
+            "source_hash": entry["source_hash"],
+            "language": language,
+            "codexspec_version": entry["codexspec_version"],
+            "output_hash": hashlib.sha256(_disk_bytes(content)).hexdigest(),
+        }
+        self._dirty = True
+
+    def preserve(self, path: Path) -> None:
+        """Note that a user-modified file was kept rather than overwritten."""
+        self.preserved.append(self.key(path))
@@ -0,0 +1,270 @@
+"""Project setup steps shared by ``codexspec init`` and ``init --batch``.
+
+Interactive ``init`` and the non-interactive batch install run the same
+sequence: resolve the languages, lay out ``.codexspec``, migrate and render
+the commands, write the constitution, config and CLAUDE.md, and run
+``git init``. The steps live here so both paths stay in step; the callers
+only differ in how they report progress and how confirm-only steps are
+answered.
+
+Confirm-only steps (``STEP_*``) are answered by a :data:`ConfirmStep`
+callback: ``init`` prompts (or accepts everything under ``--force``), the batch
+install accepts them only with ``--force`` and records the rest as skipped.
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+from typing import Callable, Optional
+
+from codexspec.project_config import ProjectConfig
+
+from .installer import (
+    RenderTarget,
+    TemplateSet,
+    detect_old_structure,
+    migrate_old_commands,
+    should_update_commands,
+)
+
+# Confirm-only steps
+STEP_MIGRATE_COMMANDS = "migrate_old_commands"
+STEP_UPDATE_COMMANDS = "update_commands"
+STEP_ADD_COMPLIANCE = "add_compliance"
+
+# Called as confirm(step, **context) before a confirm-only step; returns
+# whether to perform it. Context: ``count`` (old command files) for
+# STEP_MIGRATE_COMMANDS, ``migrated`` for STEP_UPDATE_COMMANDS.
+ConfirmStep = Callable[..., bool]
+
+# Results of migrate_claude_commands()
+MIGRATION_NONE = "none"  # no old-structure command files
+MIGRATION_DONE = "done"
+MIGRATION_FAILED = "failed"
+MIGRATION_DECLINED = "declined"
+
+# Results of claude_commands_mode(); None means the update was declined
+COMMANDS_INSTALL = "install"  # first install
+COMMANDS_UPDATE = "update"  # existing commands are overwritten
+
+# Results of setup_claude_md()
+CLAUDE_MD_CREATED = "created"
+CLAUDE_MD_COMPLIANCE_ADDED = "compliance_added"
+
+
+class InstallAssets:
+    """Files ``init`` copies into every project, read once.
+
+    Args:
+        templates_root: Package templates directory (``get_templates_dir()``)
+        scripts_root: Package scripts directory (``get_scripts_dir()``)
+        platform: Platform whose helper scripts are installed (default: ``sys.platform``)
+    """
+
+    def __init__(self, templates_root: Path, scripts_root: Path, platform: Optional[str] = None):
+        if platform is None:
+            platform = sys.platform
+        self.commands = TemplateSet(templates_root / "commands")
+        # Warnings mirror init's console output when a source directory is missing.
+        self.scripts_warning: Optional[str] = None
+        self.docs_warning: Optional[str] = None
+
+        self.scripts: dict[str, str] = {}
+        if platform == "win32":
+            script_dir, pattern, label = scripts_root / "powershell", "*.ps1", "PowerShell"
+        else:
+            script_dir, pattern, label = scripts_root / "bash", "*.sh", "Bash"
+        if not scripts_root.exists():
+            self.scripts_warning = "Scripts directory not found"
+        elif not script_dir.exists():
+            self.scripts_warning = f"{label} scripts directory not found"
+        else:
+            self.scripts = _read_files(script_dir, pattern)
+
+        docs_dir = templates_root / "docs"
+        self.docs: dict[str, str] = {}
+        if docs_dir.exists():
+            self.docs = _read_files(docs_dir, "*.md")
+        else:
+            self.docs_warning = "Docs templates directory not found"
+
+    def copy_scripts(self, codexspec_dir: Path) -> list[str]:
+        """Write the helper scripts into ``.codexspec/scripts``; return their names."""
+        return _write_files(codexspec_dir / "scripts", self.scripts)
+
+    def copy_docs(self, codexspec_dir: Path) -> list[str]:
+        """Write the docs templates into ``.codexspec/templates/docs``; return their names."""
+        return _write_files(codexspec_dir / "templates" / "docs", self.docs)
+
+
+def _read_files(directory: Path, pattern: str) -> dict[str, str]:
+    return {path.name: path.read_text(encoding="utf-8") for path in directory.glob(pattern)}
+
+
+def _write_files(directory: Path, files: dict[str, str]) -> list[str]:
+    for name, content in files.items():
+        (directory / name).write_text(content, encoding="utf-8")
+    return list(files)
+
+
+def needs_output_language(
+    project_config: ProjectConfig, output_value: Optional[str], lang_overrides: dict[str, str]
+) -> bool:
+    """Whether the output (base) language must be prompted for or defaulted.
+
+    It is determinable when ``--lang`` was given or all three specific
+    dimensions are explicit (output is then irrelevant). On an existing config
+    with no flag every key is preserved (REQ-007), so only a first-time init
+    needs one.
+    """
+    if output_value is not None or len(lang_overrides) >= 3:
+        return False
+    return not project_config.exists
+
+
+def resolve_message_language(
+    project_config: ProjectConfig,
+    lang_overrides: dict[str, str],
+    output_value: Optional[str],
+) -> str:
+    """Resolve the language commands are rendered in for one init run.
+
+    Precedence: explicit ``--interaction-lang`` -> explicitly-configured
+    interaction -> ``--lang`` (output base) -> explicitly-configured output ->
+    ``"en"``.
+    """
+    if "interaction" in lang_overrides:
+        return lang_overrides["interaction"]
+    if (explicit_interaction := project_config.language("interaction")) is not None:
+        return explicit_interaction
+    if output_value is not None:
+        return output_value
+    if (explicit_output := project_config.language("output")) is not None:
+        return explicit_output
+    return "en"
+
+
+def language_keys(output_value: Optional[str], lang_overrides: dict[str, str]) -> dict[str, str]:
+    """Build the ``language.<key>`` values init writes: the output base plus the overrides."""
+    keys: dict[str, str] = {}
+    if output_value is not None:
+        keys["output"] = output_value
+    keys.update(lang_overrides)
+    return keys
+
+
+def create_layout(target_dir: Path, assets: InstallAssets) -> tuple[list[str], list[str]]:
+    """Create ``.codexspec`` and the profile scaffold, and copy scripts and docs templates.
+
+    Returns:
+        Names of the copied helper scripts and docs templates
+    """
+    from codexspec.profile import ensure_profile_scaffold
+
+    codexspec_dir = target_dir / ".codexspec"
+    for subdir in ("memory", "specs", "templates/docs", "scripts"):
+        (codexspec_dir / subdir).mkdir(parents=True, exist_ok=True)
+    # Unconditional (independent of integrations), so knowledge distilled later
+    # is effective immediately. Non-destructive: existing profile files are kept.
+    ensure_profile_scaffold(target_dir)
+    return assets.copy_scripts(codexspec_dir), assets.copy_docs(codexspec_dir)
+
+
+def migrate_claude_commands(target_dir: Path, confirm: ConfirmStep) -> str:
+    """Move old-structure ``.claude/commands/codexspec.*.md`` files into the subdirectory.
+
+    Returns:
+        One of the ``MIGRATION_*`` constants
+    """
+    claude_dir = target_dir / ".claude"
+    (claude_dir / "commands").mkdir(parents=True, exist_ok=True)
+    old_files = detect_old_structure(claude_dir)
+    if not old_files:
+        return MIGRATION_NONE
+    if not confirm(STEP_MIGRATE_COMMANDS, count=len(old_files)):
+        return MIGRATION_DECLINED
+    return MIGRATION_DONE if migrate_old_commands(claude_dir, old_files) else MIGRATION_FAILED
+
+
+def claude_commands_mode(target_dir: Path, migration: str, confirm: ConfirmStep) -> Optional[str]:
+    """Decide how Claude commands are written after :func:`migrate_claude_commands`.
+
+    Returns:
+        COMMANDS_INSTALL for a first install, COMMANDS_UPDATE when existing
+        commands are overwritten, or None when the update was declined
+    """
+    migrated = migration == MIGRATION_DONE
+    if migrated or should_update_commands(target_dir / ".codexspec"):
+        return COMMANDS_UPDATE if confirm(STEP_UPDATE_COMMANDS, migrated=migrated) else None
+    return COMMANDS_INSTALL
+
+
+def render_targets(integrations: list, target_dir: Path, force: bool, claude_mode: Optional[str]) -> list[RenderTarget]:
+    """Collect the render targets of the selected integrations.
+
+    Updating existing Claude commands always overwrites (the manifest keeps
+    user edits); a declined update (``claude_mode`` None) leaves them alone.
+    """
+    targets = []
+    for integration in integrations:
+        if integration.key != "claude":
+            targets.append(integration.render_target(target_dir, force=force))
+        elif claude_mode is not None:
+            targets.append(integration.render_target(target_dir, force=claude_mode == COMMANDS_UPDATE))
+    return targets
+
+
+def write_default_constitution(target_dir: Path) -> bool:
+    """Create ``.codexspec/memory/constitution.md`` if missing; return whether it was created."""
+    from codexspec import _get_default_constitution
+
+    constitution_file = target_dir / ".codexspec" / "memory" / "constitution.md"
+    if constitution_file.exists():
+        return False
+    constitution_file.write_text(_get_default_constitution(), encoding="utf-8")
+    return True
+
+
+def setup_claude_md(target_dir: Path, confirm: ConfirmStep) -> Optional[str]:
+    """Create CLAUDE.md or add the constitution import, then inject the profile block.
+
+    CLAUDE.md is user-authored content: an existing body is never overwritten.
+    The only change to it is prepending the constitution ``@import`` when
+    missing (STEP_ADD_COMPLIANCE).
+
+    Returns:
+        CLAUDE_MD_CREATED, CLAUDE_MD_COMPLIANCE_ADDED, or None if nothing was added
+    """
+    from codexspec import (
+        _get_claude_md_content,
+        has_compliance_section,
+        prepend_compliance_section,
+    )
+    from codexspec.profile import inject_profile_block
+
+    claude_md = target_dir / "CLAUDE.md"
+    result = None
+    if not claude_md.exists():
+        claude_md.write_text(_get_claude_md_content(target_dir.name), encoding="utf-8")
+        result = CLAUDE_MD_CREATED
+    elif not has_compliance_section(claude_md) and confirm(STEP_ADD_COMPLIANCE):
+        prepend_compliance_section(claude_md)
+        result = CLAUDE_MD_COMPLIANCE_ADDED
+    # After creation/compliance so it never clobbers the @import or the user's body.
+    inject_profile_block(claude_md)
+    return result
+
+
+def init_git(target_dir: Path) -> Optional[bool]:
+    """Run ``git init`` unless the project already is a repository.
+
+    Returns:
+        None if it already was one, else whether ``git init`` succeeded
+    """
+    if (target_dir / ".git").exists():
+        return None
+    try:
+        subprocess.run(["git", "init"], cwd=target_dir, check=True, capture_output=True)
+    except (OSError, subprocess.CalledProcessError):
+        return False
+    return True
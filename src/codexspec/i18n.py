@@ -8,7 +8,6 @@ at runtime.
 """
 
 import os
-import re
 from pathlib import Path
 from typing import Optional
 
@@ -258,15 +257,6 @@ def generate_config_content(
     return CONFIG_TEMPLATE.format(language_lines=language_lines, created=created)
 
 
-def _read_language_key(content: str, key: str) -> Optional[str]:
-    """Read a `key: value` language setting from config content (YAML-like regex).
-
-    Returns the raw value (quotes stripped) or None if the key is absent.
-    """
-    match = re.search(rf"^\s*{re.escape(key)}:\s*['\"]?(\S+?)['\"]?\s*$", content, re.MULTILINE)
-    return match.group(1) if match else None
-
-
 def _resolve_language(config_file: Path, primary_key: str) -> str:
     """Resolve a language setting: primary_key -> output (legacy) -> 'en'.
 
@@ -277,17 +267,9 @@ def _resolve_language(config_file: Path, primary_key: str) -> str:
     Returns:
         The normalized language code, defaulting to 'en'.
     """
-    if not config_file.exists():
-        return "en"
-    try:
-        content = config_file.read_text(encoding="utf-8")
-        for key in (primary_key, "output"):
-            value = _read_language_key(content, key)
-            if value:
-                return normalize_locale(value) or "en"
-    except (OSError, re.error):
-        pass
-    return "en"
+    from codexspec.project_config import ProjectConfig
+
+    return ProjectConfig.load(config_file).resolve_language(primary_key)
 
 
 def get_explicit_language_key(config_file: Optional[Path], key: str) -> Optional[str]:
@@ -296,16 +278,9 @@ def get_explicit_language_key(config_file: Optional[Path], key: str) -> Optional
     This differs from the public language-resolution helpers because it never
     falls back to ``language.output`` or ``"en"``.
     """
-    path = config_file or _default_config_path()
-    if not path.exists():
-        return None
-    try:
-        value = _read_language_key(path.read_text(encoding="utf-8"), key)
-        if value:
-            return normalize_locale(value) or None
-    except (OSError, re.error):
-        pass
-    return None
+    from codexspec.project_config import ProjectConfig
+
+    return ProjectConfig.load(config_file or _default_config_path()).language(key)
 
 
 def _default_config_path() -> Path:
@@ -385,7 +360,8 @@ def update_language_field(config_file: Path, key: str, language: str) -> bool:
 
     Updates the value in place when ``key`` already exists; otherwise inserts
     ``<indent>{key}: "{language}"`` immediately after the ``language:`` line.
-    The value is normalized via :func:`normalize_locale`.
+    The value is normalized via :func:`normalize_locale`. To change several
+    keys with one write, use :class:`codexspec.project_config.ProjectConfig`.
 
     Args:
         config_file: Path to the project's config.yml.
@@ -396,23 +372,7 @@ def update_language_field(config_file: Path, key: str, language: str) -> bool:
         True if updated or inserted; False if there is no ``language:`` section
         to insert into or the file cannot be written.
     """
-    normalized = normalize_locale(language)
-    try:
-        content = config_file.read_text(encoding="utf-8")
-        pattern = rf'^(\s*{re.escape(key)}:\s*)["\']?\S+?["\']?\s*$'
-        new_content, count = re.subn(pattern, rf'\g<1>"{normalized}"', content, flags=re.MULTILINE)
-        if count:
-            config_file.write_text(new_content, encoding="utf-8")
-            return True
-
-        # Key absent: insert under the `language:` section.
-        lang_match = re.search(r"^(\s*)language:\s*$", content, re.MULTILINE)
-        if not lang_match:
-            return False
-        indent = lang_match.group(1) + "  "
-        insert_line = f'{indent}{key}: "{normalized}"'
-        end = lang_match.end()
-        config_file.write_text(content[:end] + "\n" + insert_line + content[end:], encoding="utf-8")
-        return True
-    except (OSError, re.error):
-        return False
+    from codexspec.project_config import ProjectConfig
+
+    project_config = ProjectConfig.load(config_file)
+    return project_config.set_language(key, language) and project_config.save()
@@ -1,7 +1,10 @@
 """Shared integration protocol."""
 
 from pathlib import Path
-from typing import Protocol
+from typing import Optional, Protocol
+
+from codexspec.commands.installer import RenderTarget
+from codexspec.commands.manifest import InstallManifest
 
 
 class Integration(Protocol):
@@ -15,6 +18,30 @@ class Integration(Protocol):
         """Return the user-facing invocation for a CodexSpec command."""
         ...
 
-    def install(self, target_dir: Path, templates_dir: Path, *, force: bool = False, language: str = "en") -> int:
-        """Install this integration into target_dir."""
+    def render_target(self, target_dir: Path, *, force: bool = False) -> RenderTarget:
+        """Describe where and how rendered command templates are written.
+
+        ``init`` passes the targets of every selected integration to
+        ``render_templates`` so each template is translated only once.
+        """
+        ...
+
+    def post_install(self, target_dir: Path) -> None:
+        """Write integration files that are not rendered from templates."""
+        ...
+
+    def install(
+        self,
+        target_dir: Path,
+        templates_dir: Path,
+        *,
+        force: bool = False,
+        language: str = "en",
+        manifest: Optional[InstallManifest] = None,
+    ) -> int:
+        """Install this integration into target_dir.
+
+        When ``manifest`` is None the integration loads and saves the project's
+        install manifest itself.
+        """
         ...
@@ -1,8 +1,15 @@
 """Claude Code integration."""
 
 from pathlib import Path
+from typing import Optional
 
-from codexspec.commands.installer import COMMANDS_SUBDIR, install_commands_to_subdir
+from codexspec.commands.installer import (
+    COMMANDS_SUBDIR,
+    RenderTarget,
+    command_dir_target,
+    install_commands_to_subdir,
+)
+from codexspec.commands.manifest import InstallManifest
 
 
 class ClaudeIntegration:
@@ -20,6 +27,29 @@ class ClaudeIntegration:
         """Return the Claude command destination."""
         return target_dir / ".claude" / "commands" / COMMANDS_SUBDIR
 
-    def install(self, target_dir: Path, templates_dir: Path, *, force: bool = False, language: str = "en") -> int:
+    def render_target(self, target_dir: Path, *, force: bool = False) -> RenderTarget:
+        """Return the render target for Claude command files."""
+        return command_dir_target(self.key, self.commands_dir(target_dir), force=force)
+
+    def post_install(self, target_dir: Path) -> None:
+        """Claude commands need no extra files beyond the rendered templates."""
+
+    def install(
+        self,
+        target_dir: Path,
+        templates_dir: Path,
+        *,
+        force: bool = False,
+        language: str = "en",
+        manifest: Optional[InstallManifest] = None,
+    ) -> int:
         """Install Claude slash command templates."""
-        return install_commands_to_subdir(self.commands_dir(target_dir), templates_dir, force=force, language=language)
+        owns_manifest = manifest is None
+        if manifest is None:
+            manifest = InstallManifest.load(target_dir)
+        count = install_commands_to_subdir(
+            self.commands_dir(target_dir), templates_dir, force=force, language=language, manifest=manifest
+        )
+        if owns_manifest:
+            manifest.save()
+        return count
@@ -9,9 +9,9 @@ from typing import Any
 
 import yaml
 
-from codexspec.commands.installer import get_commands_metadata
+from codexspec.commands.installer import RenderTarget, get_commands_metadata, render_templates
+from codexspec.commands.manifest import InstallManifest
 from codexspec.profile import inject_profile_block
-from codexspec.translator import load_translation_cache, translate_template_frontmatter
 
 CODEXSPEC_CONTEXT_START = "<!-- CODEXSPEC START -->"
 CODEXSPEC_CONTEXT_END = "<!-- CODEXSPEC END -->"
@@ -32,10 +32,23 @@ class CodexIntegration:
         """Return the Codex skills destination."""
         return target_dir / ".agents" / "skills"
 
-    def install(self, target_dir: Path, templates_dir: Path, *, force: bool = False, language: str = "en") -> int:
+    def install(
+        self,
+        target_dir: Path,
+        templates_dir: Path,
+        *,
+        force: bool = False,
+        language: str = "en",
+        manifest: InstallManifest | None = None,
+    ) -> int:
         """Install Codex skills and the Codex context file."""
-        count = self.install_skills(target_dir, templates_dir, force=force, language=language)
-        self.ensure_context_file(target_dir)
+        owns_manifest = manifest is None
+        if manifest is None:
+            manifest = InstallManifest.load(target_dir)
+        count = self.install_skills(target_dir, templates_dir, force=force, language=language, manifest=manifest)
+        if owns_manifest:
+            manifest.save()
+        self.post_install(target_dir)
         return count
 
     def install_skills(
@@ -45,32 +58,32 @@ class CodexIntegration:
         *,
         force: bool = False,
         language: str = "en",
+        manifest: InstallManifest | None = None,
     ) -> int:
-        """Render command templates into Codex SKILL.md files."""
-        if not templates_dir.exists():
-            return 0
-
-        descriptions = {cmd["file_name"]: cmd["description"] for cmd in get_commands_metadata()}
-        translation_cache = None
-        if language != "en":
-            translation_cache = load_translation_cache(language)
-
-        installed_count = 0
-        for template_file in sorted(templates_dir.glob("*.md")):
-            command_name = template_file.stem
-            skill_dir = self.skills_dir(target_dir) / f"codexspec-{command_name}"
-            skill_file = skill_dir / "SKILL.md"
-            if skill_file.exists() and not force:
-                continue
-
-            content = template_file.read_text(encoding="utf-8")
-            content = translate_template_frontmatter(content, command_name, language, translation_cache)
-            skill_content = self.render_skill(command_name, content, descriptions.get(template_file.name, ""))
-            skill_dir.mkdir(parents=True, exist_ok=True)
-            skill_file.write_text(skill_content, encoding="utf-8")
-            installed_count += 1
-
-        return installed_count
+        """Render command templates into Codex SKILL.md files.
+
+        With a ``manifest``, up-to-date skills are skipped and skills the user
+        edited since installation are kept (see ``render_templates``).
+        """
+        counts = render_templates(
+            templates_dir, [self.render_target(target_dir, force=force)], language=language, manifest=manifest
+        )
+        return counts[self.key]
+
+    def render_target(self, target_dir: Path, *, force: bool = False) -> RenderTarget:
+        """Return the render target for Codex SKILL.md files."""
+        skills_dir = self.skills_dir(target_dir)
+        descriptions = {cmd["name"]: cmd["description"] for cmd in get_commands_metadata()}
+        return {
+            "key": self.key,
+            "force": force,
+            "path_for": lambda name: skills_dir / f"codexspec-{name}" / "SKILL.md",
+            "render": lambda name, content: self.render_skill(name, content, descriptions.get(name, "")),
+        }
+
+    def post_install(self, target_dir: Path) -> None:
+        """Write the Codex context file after skills are rendered."""
+        self.ensure_context_file(target_dir)
 
     def ensure_context_file(self, target_dir: Path) -> None:
         """Create or update AGENTS.md with a managed CodexSpec section."""
@@ -0,0 +1,236 @@
+"""Project configuration (``.codexspec/config.yml``) parsed once.
+
+``config.yml`` is a shallow two-level YAML file (``language:``, ``workflow:``,
+``project:`` sections with scalar children). :class:`ProjectConfig` reads it
+once into a ``(section, key) -> value`` index and answers every language and
+workflow query from memory. Edits rewrite only the affected lines, keep every
+other line and comment verbatim, and are written back in one atomic
+:meth:`ProjectConfig.save`, so ``init`` applies all of its language and
+``project.ai`` changes with a single write.
+
+The parser is line-based rather than a YAML load on purpose: it preserves the
+file byte-for-byte outside edited lines, and it keeps ``yaml`` off the startup
+path of light commands such as ``codexspec config``.
+"""
+
+import os
+import re
+from pathlib import Path
+from typing import Optional
+
+from codexspec.i18n import generate_config_content, normalize_locale
+
+_KEY_LINE = re.compile(r"^(\s*)([A-Za-z0-9_.-]+):(.*)$")
+
+
+def _strip_comment(raw: str) -> str:
+    """Return a scalar token with any inline ``# comment`` removed (quotes kept)."""
+    value = raw.strip()
+    if value[:1] in ("'", '"'):
+        end = value.find(value[0], 1)
+        if end != -1:
+            return value[: end + 1]
+    # A value that starts with `#` is all comment (`workflow:  # toggles` is a header).
+    return re.split(r"(?:^|\s+)#", value, maxsplit=1)[0].strip()
+
+
+def _unquote(token: str) -> str:
+    if len(token) >= 2 and token[0] == token[-1] and token[0] in ("'", '"'):
+        return token[1:-1]
+    return token
+
+
+class ProjectConfig:
+    """In-memory view of one ``config.yml`` with batched, comment-preserving edits.
+
+    Args:
+        path: Location of ``config.yml``
+        text: File content; empty for a missing file
+        exists: Whether the file existed when loaded
+    """
+
+    def __init__(self, path: Path, text: str = "", exists: bool = False):
+        self.path = path
+        self.exists = exists
+        self._lines = text.split("\n") if text else []
+        self._dirty = False
+        self._index()
+
+    @classmethod
+    def load(cls, path: Path) -> "ProjectConfig":
+        """Read and parse ``path``; a missing or unreadable file yields an empty config."""
+        try:
+            return cls(path, path.read_text(encoding="utf-8"), exists=True)
+        except OSError:
+            return cls(path)
+
+    def _index(self) -> None:
+        # section -> header line index; (section, key) -> (line index, token).
+        # The first occurrence of a key wins, as it does for a YAML reader that
+        # tolerates duplicates.
+        self._sections: dict[str, int] = {}
+        self._entries: dict[tuple[str, str], tuple[int, str]] = {}
+        section: Optional[str] = None
+        for i, raw_line in enumerate(self._lines):
+            line = raw_line.rstrip("\r")
+            stripped = line.strip()
+            if not stripped or stripped.startswith("#"):
+                continue
+            match = _KEY_LINE.match(line)
+            if not line[0].isspace():
+                # Only a bare `name:` opens a section; `version: "1.0"` is a scalar.
+                section = match.group(2) if match and not _strip_comment(match.group(3)) else None
+                if section is not None:
+                    self._sections.setdefault(section, i)
+                continue
+            if section is not None and match:
+                self._entries.setdefault((section, match.group(2)), (i, _strip_comment(match.group(3))))
+
+    # --- queries ---------------------------------------------------------
+
+    def get(self, section: str, key: str) -> Optional[str]:
+        """Return the scalar value of ``section.key`` (unquoted), or None when absent."""
+        entry = self._entries.get((section, key))
+        return _unquote(entry[1]) if entry else None
+
+    def _token(self, section: str, key: str) -> Optional[str]:
+        # The literal token, quotes included: a quoted "true" is a YAML string.
+        entry = self._entries.get((section, key))
+        return entry[1] if entry else None
+
+    def has_section(self, section: str) -> bool:
+        """Whether a top-level ``section:`` exists."""
+        return section in self._sections
+
+    def language(self, key: str) -> Optional[str]:
+        """Return the explicitly configured ``language.<key>``, normalized, or None."""
+        value = self.get("language", key)
+        return (normalize_locale(value) or None) if value else None
+
+    def resolve_language(self, primary_key: str) -> str:
+        """Resolve a language dimension: ``primary_key`` -> ``output`` -> ``"en"``."""
+        for key in (primary_key, "output"):
+            value = self.language(key)
+            if value:
+                return value
+        return "en"
+
+    @property
+    def auto_next(self) -> bool:
+        """``workflow.auto_next``: enabled only by the literal ``true``."""
+        return self._token("workflow", "auto_next") == "true"
+
+    @property
+    def auto_distill(self) -> bool:
+        """``workflow.auto_distill``: enabled unless it is the literal ``false``."""
+        return self._token("workflow", "auto_distill") != "false"
+
+    # --- edits -----------------------------------------------------------
+
+    def set(self, section: str, key: str, value: str, *, create_section: bool = False) -> bool:
+        """Set ``section.key`` to the literal YAML ``value`` (quote it yourself if needed).
+
+        An existing key line is rewritten in place (keeping its indentation but
+        not an inline comment); a missing key is inserted as the section's first
+        child. A missing section is appended at the end of the file only when
+        ``create_section`` is True.
+
+        Returns:
+            True if the config now holds the value; False when the section is
+            absent and ``create_section`` is False
+        """
+        entry = self._entries.get((section, key))
+        if entry is not None:
+            line_index = entry[0]
+            line = self._lines[line_index]
+            indent = line[: len(line) - len(line.lstrip())]
+            if line == f"{indent}{key}: {value}":
+                return True  # unchanged: nothing to write
+            self._lines[line_index] = f"{indent}{key}: {value}"
+        elif section in self._sections:
+            header = self._lines[self._sections[section]]
+            indent = header[: len(header) - len(header.lstrip())] + "  "
+            self._lines.insert(self._sections[section] + 1, f"{indent}{key}: {value}")
+        elif create_section:
+            block = [f"{section}:", f"  {key}: {value}", ""]
+            if not self._lines:
+                self._lines = block
+            elif self._lines[-1] == "":
+                self._lines[-1:] = ["", *block]
+            else:
+                self._lines.extend(["", *block])
+        else:
+            return False
+        self._dirty = True
+        self._index()
+        return True
+
+    def set_language(self, key: str, language: str) -> bool:
+        """Set ``language.<key>`` to the normalized, quoted ``language``."""
+        return self.set("language", key, f'"{normalize_locale(language)}"')
+
+    def set_workflow_flag(self, key: str, value: bool) -> bool:
+        """Set ``workflow.<key>`` to an unquoted boolean, creating the section if needed."""
+        return self.set("workflow", key, "true" if value else "false", create_section=True)
+
+    def set_project_ai(self, ai: str) -> bool:
+        """Set ``project.ai`` when the key already exists; never inserts it."""
+        if self.get("project", "ai") is None:
+            return False
+        return self.set("project", "ai", f'"{ai}"')
+
+    def apply_init_settings(self, language_keys: dict[str, str], ai: str, created: Optional[str] = None) -> list[str]:
+        """Apply ``init``'s language keys and ``project.ai``, then save once.
+
+        A missing config is generated fresh with only ``language_keys`` (sparse
+        config); an existing one is edited in place and keys the user did not
+        specify are preserved.
+
+        Args:
+            language_keys: ``language.<key>`` values to set
+            ai: ``--ai`` value for ``project.ai``
+            created: Creation date for a fresh config (defaults to today)
+
+        Returns:
+            The language keys that were written (empty if the write failed)
+        """
+        if not self.exists:
+            if not language_keys:
+                return []
+            self._lines = generate_config_content(
+                output=language_keys.get("output"),
+                interaction=language_keys.get("interaction"),
+                document=language_keys.get("document"),
+                commit=language_keys.get("commit"),
+                created=created,
+            ).split("\n")
+            self._dirty = True
+            self._index()
+            written = list(language_keys)
+        else:
+            written = [key for key, value in language_keys.items() if self.set_language(key, value)]
+        self.set_project_ai(ai)
+        return written if self.save() else []
+
+    def render(self) -> str:
+        """Return the config text including pending edits."""
+        return "\n".join(self._lines)
+
+    def save(self) -> bool:
+        """Atomically write pending edits; a no-op when nothing changed.
+
+        Returns:
+            False if the file could not be written, True otherwise
+        """
+        if not self._dirty:
+            return True
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        try:
+            tmp_path.write_text(self.render(), encoding="utf-8")
+            os.replace(tmp_path, self.path)
+        except OSError:
+            tmp_path.unlink(missing_ok=True)
+            return False
+        self._dirty = False
+        self.exists = True
+        return True
@@ -7,8 +7,9 @@ frontmatter fields (description, argument-hint).
 import json
 import logging
 import re
+import string
 from pathlib import Path
-from typing import Optional
+from typing import Any, Optional
 
 from codexspec.i18n import normalize_locale
 
@@ -161,6 +162,39 @@ def get_translation_cache_path(language: str) -> Path:
     return get_translations_dir() / f"{language}.json"
 
 
+# Parsed translation files, keyed by path. Each entry remembers the file's
+# (mtime_ns, size) signature so an edited or swapped file is re-read on the next
+# access instead of being served stale.
+_JSON_CACHE: dict[Path, tuple[tuple[int, int], Any]] = {}
+
+
+def _file_signature(path: Path) -> Optional[tuple[int, int]]:
+    """Return ``(mtime_ns, size)`` for ``path``, or None if it cannot be stat'ed."""
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def _read_json_cached(path: Path) -> Any:
+    """Parse a JSON file at most once per on-disk version.
+
+    The returned object is shared between callers and must be treated as
+    read-only. Raises ``OSError`` / ``json.JSONDecodeError`` like a direct
+    ``json.loads(path.read_text())`` would.
+    """
+    signature = _file_signature(path)
+    if signature is None:
+        raise FileNotFoundError(path)
+    cached = _JSON_CACHE.get(path)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+    data = json.loads(path.read_text(encoding="utf-8"))
+    _JSON_CACHE[path] = (signature, data)
+    return data
+
+
 def load_translation_cache(language: str, translations_dir: Optional[Path] = None) -> Optional[dict]:
     """Load translation cache for a language.
 
@@ -180,7 +214,7 @@ def load_translation_cache(language: str, translations_dir: Optional[Path] = Non
         return None
 
     try:
-        return json.loads(cache_path.read_text(encoding="utf-8"))
+        return _read_json_cached(cache_path)
     except (json.JSONDecodeError, OSError):
         return None
 
@@ -216,7 +250,7 @@ def load_cli_translations(lang: str, translations_dir: Optional[Path] = None) ->
         return _CLI_MESSAGES_EN
 
     try:
-        data = json.loads(cache_path.read_text(encoding="utf-8"))
+        data = _read_json_cached(cache_path)
         # Extract CLI messages from the "cli" namespace
         if isinstance(data, dict) and "cli" in data:
             return data["cli"]
@@ -228,6 +262,133 @@ def load_cli_translations(lang: str, translations_dir: Optional[Path] = None) ->
         return _CLI_MESSAGES_EN
 
 
+class MessageCatalog:
+    """CLI messages for one locale, flattened for O(1) lookup.
+
+    Keys are stored without the leading namespace (``"init.migration_found"``
+    for ``"cli.init.migration_found"``) and every message template is pre-split
+    into ``(literal, field)`` pairs, so :meth:`format` is a dict lookup plus a
+    join instead of a nested walk and a ``str.format`` parse per call.
+    """
+
+    def __init__(self, messages: dict):
+        self.messages = messages
+        self._templates: dict[str, str] = {}
+        self._parts: dict[str, Optional[tuple[tuple[str, Optional[str]], ...]]] = {}
+        self._flatten(messages, "")
+
+    def _flatten(self, node: dict, prefix: str) -> None:
+        for name, value in node.items():
+            path = f"{prefix}{name}"
+            if isinstance(value, dict):
+                self._flatten(value, f"{path}.")
+            else:
+                template = str(value)
+                self._templates[path] = template
+                self._parts[path] = _split_template(template)
+
+    def __contains__(self, key: str) -> bool:
+        return _catalog_path(key) in self._templates
+
+    def format(self, key: str, **kwargs) -> str:
+        """Return the formatted message for ``key`` (``"cli.{command}.{message_key}"``).
+
+        Mirrors :func:`translate`: unknown keys return the key itself and a
+        missing format parameter returns the raw template.
+        """
+        path = _catalog_path(key)
+        template = self._templates.get(path) if path else None
+        if template is None:
+            return key
+
+        parts = self._parts[path]
+        try:
+            if parts is None:
+                return template.format(**kwargs)
+            return "".join(literal if field is None else literal + format(kwargs[field]) for literal, field in parts)
+        except KeyError:
+            # Missing parameter - return original template string
+            logger.debug(f"Missing parameter in message template: {key}")
+            return template
+
+
+def _catalog_path(key: str) -> Optional[str]:
+    """Strip the ``cli.`` namespace from a message key; None if it is too short."""
+    parts = key.split(".", 1)
+    if len(parts) < 2 or "." not in parts[1]:
+        return None
+    return parts[1]
+
+
+_FORMATTER = string.Formatter()
+
+
+def _split_template(template: str) -> Optional[tuple[tuple[str, Optional[str]], ...]]:
+    """Pre-split a message template into ``(literal, field_name)`` pairs.
+
+    Returns None for templates that use anything beyond plain ``{name}``
+    fields (format specs, conversions, attribute/index access, positional or
+    malformed braces); those are formatted with ``str.format`` at call time so
+    their behavior is unchanged.
+    """
+    try:
+        parsed = list(_FORMATTER.parse(template))
+    except ValueError:
+        return None
+    parts: list[tuple[str, Optional[str]]] = []
+    for literal, field, spec, conversion in parsed:
+        if field is not None and (spec or conversion or not field.isidentifier()):
+            return None
+        parts.append((literal, field))
+    return tuple(parts)
+
+
+# Memoized catalogs keyed by (translations_dir, language). The stored signature
+# is that of the locale file (None when it is missing), so a catalog is rebuilt
+# only when the file appears, disappears, or changes on disk.
+_CATALOG_CACHE: dict[tuple[Path, str], tuple[Optional[tuple[int, int]], MessageCatalog]] = {}
+_BASELINE_CATALOG: Optional[MessageCatalog] = None
+
+
+def _baseline_catalog() -> MessageCatalog:
+    global _BASELINE_CATALOG
+
+    if _BASELINE_CATALOG is None:
+        _BASELINE_CATALOG = MessageCatalog(_CLI_MESSAGES_EN)
+    return _BASELINE_CATALOG
+
+
+def get_message_catalog(lang: str, translations_dir: Optional[Path] = None) -> MessageCatalog:
+    """Return the process-wide message catalog for a language.
+
+    Each locale file is parsed once per process and re-read only when its
+    mtime or size changes, so swapping ``translations_dir`` (or editing the
+    file) in tests is picked up automatically.
+
+    Args:
+        lang: Target language code
+        translations_dir: Custom translations directory (for testing)
+
+    Returns:
+        The MessageCatalog for ``lang``; the code baseline catalog when the
+        translation file is missing or unusable.
+    """
+    normalized_lang = normalize_locale(lang)
+    if translations_dir is None:
+        translations_dir = get_translations_dir()
+
+    cache_key = (translations_dir, normalized_lang)
+    signature = _file_signature(translations_dir / f"{normalized_lang}.json")
+    cached = _CATALOG_CACHE.get(cache_key)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    messages = load_cli_translations(normalized_lang, translations_dir)
+    catalog = _baseline_catalog() if messages is _CLI_MESSAGES_EN else MessageCatalog(messages)
+    _CATALOG_CACHE[cache_key] = (signature, catalog)
+    return catalog
+
+
 def translate(key: str, language: str = "en", **kwargs) -> str:
     """Translate a CLI message to the target language.
 
@@ -246,36 +407,7 @@ def translate(key: str, language: str = "en", **kwargs) -> str:
         >>> translate("cli.init.migration_found", "en", count=3)
         'Found 3 old structure command files'
     """
-    # Normalize language code
-    normalized_lang = normalize_locale(language)
-
-    # Load translations for the language
-    translations = load_cli_translations(normalized_lang)
-
-    # Extract message from translations dict
-    # Key format: "cli.{command}.{message_key}"
-    parts = key.split(".")
-    if len(parts) < 3:
-        return key
-
-    # Navigate to nested key
-    current = translations
-    for part in parts[1:]:
-        if part not in current:
-            # Key not found, return the key itself
-            return key
-        current = current[part]
-
-    # Get message template
-    message_template = str(current)
-
-    # Format message with kwargs
-    try:
-        return message_template.format(**kwargs)
-    except KeyError:
-        # Missing parameter - return original template string
-        logger.debug(f"Missing parameter in message template: {key}")
-        return message_template
+    return get_message_catalog(language).format(key, **kwargs)
 
 
 def extract_frontmatter_fields(content: str) -> dict[str, Optional[str]]:
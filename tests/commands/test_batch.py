@@ -0,0 +1,162 @@
+"""Tests for fleet-wide `codexspec init --batch`."""
+
+import json
+from pathlib import Path
+from unittest.mock import patch
+
+from typer.testing import CliRunner
+
+from codexspec import app, get_scripts_dir, get_templates_dir
+from codexspec.commands.batch import (
+    STATUS_ERROR,
+    STATUS_OK,
+    install_project,
+    resolve_batch_targets,
+    run_batch,
+)
+from codexspec.commands.installer import COMMANDS_SUBDIR
+from codexspec.commands.project_setup import InstallAssets
+from codexspec.integrations import get_integrations
+from codexspec.translator import translate_template_frontmatter
+
+TEMPLATE_COUNT = len(list((get_templates_dir() / "commands").glob("*.md")))
+
+
+def _repos(tmp_path: Path, count: int) -> list[Path]:
+    repos = []
+    for index in range(count):
+        repo = tmp_path / "repos" / f"repo-{index}"
+        repo.mkdir(parents=True)
+        repos.append(repo)
+    return repos
+
+
+def _assets() -> InstallAssets:
+    return InstallAssets(get_templates_dir(), get_scripts_dir())
+
+
+class TestResolveBatchTargets:
+    """Tests for --batch target expansion."""
+
+    def test_glob_matches_directories_only(self, tmp_path: Path) -> None:
+        repos = _repos(tmp_path, 2)
+        (tmp_path / "repos" / "notes.txt").write_text("x", encoding="utf-8")
+
+        assert resolve_batch_targets(str(tmp_path / "repos" / "*")) == [repo.resolve() for repo in repos]
+
+    def test_list_file_keeps_order_and_skips_comments(self, tmp_path: Path) -> None:
+        repos = _repos(tmp_path, 2)
+        list_file = tmp_path / "repos.txt"
+        list_file.write_text(f"# fleet\n{repos[1]}\n\n{repos[0]}\n{repos[1]}\n", encoding="utf-8")
+
+        assert resolve_batch_targets(str(list_file)) == [repos[1].resolve(), repos[0].resolve()]
+
+
+class TestRunBatch:
+    """Tests for installing into many projects in one process."""
+
+    def test_installs_every_project(self, tmp_path: Path) -> None:
+        repos = _repos(tmp_path, 3)
+
+        results = run_batch(repos, _assets(), get_integrations("both"), workers=2, ai="both", no_git=True)
+
+        assert [result["path"] for result in results] == [str(repo) for repo in repos]
+        for repo, result in zip(repos, results):
+            assert result["status"] == STATUS_OK, result["error"]
+            assert result["commands"] == {"claude": TEMPLATE_COUNT, "codex": TEMPLATE_COUNT}
+            assert (repo / ".claude" / "commands" / COMMANDS_SUBDIR / "specify.md").exists()
+            assert (repo / ".agents" / "skills" / "codexspec-specify" / "SKILL.md").exists()
+            assert (repo / ".codexspec" / "config.yml").exists()
+            assert (repo / "CLAUDE.md").exists()
+            assert (repo / "AGENTS.md").exists()
+
+    def test_templates_translated_once_per_process(self, tmp_path: Path) -> None:
+        repos = _repos(tmp_path, 3)
+
+        with patch(
+            "codexspec.commands.installer.translate_template_frontmatter", wraps=translate_template_frontmatter
+        ) as mock_translate:
+            run_batch(
+                repos, _assets(), get_integrations("claude"), workers=1, ai="claude", output_value="ja", no_git=True
+            )
+
+        assert mock_translate.call_count == TEMPLATE_COUNT
+
+    def test_failed_project_is_reported_not_raised(self, tmp_path: Path) -> None:
+        repos = _repos(tmp_path, 1) + [tmp_path / "missing"]
+
+        results = run_batch(repos, _assets(), get_integrations("claude"), workers=2, ai="claude", no_git=True)
+
+        assert results[0]["status"] == STATUS_OK
+        assert results[1]["status"] == STATUS_ERROR
+        assert "not a directory" in results[1]["error"]
+
+    def test_existing_commands_need_force(self, tmp_path: Path) -> None:
+        repo = _repos(tmp_path, 1)[0]
+        assets = _assets()
+        integrations = get_integrations("claude")
+        install_project(repo, assets, integrations, ai="claude", no_git=True)
+        command_file = repo / ".claude" / "commands" / COMMANDS_SUBDIR / "specify.md"
+        command_file.write_text("stale", encoding="utf-8")
+        (repo / ".codexspec" / "install-manifest.json").unlink()
+
+        result = install_project(repo, assets, integrations, ai="claude", no_git=True)
+        assert result["skipped"] == ["update_commands"]
+        assert command_file.read_text(encoding="utf-8") == "stale"
+
+        result = install_project(repo, assets, integrations, ai="claude", force=True, no_git=True)
+        assert result["skipped"] == []
+        assert command_file.read_text(encoding="utf-8") != "stale"
+
+
+def test_init_batch_prints_json_summary(tmp_path: Path) -> None:
+    """`init --batch` prints a JSON summary instead of the interactive panels."""
+    repos = _repos(tmp_path, 2)
+
+    result = CliRunner().invoke(
+        app, ["init", "--batch", str(tmp_path / "repos" / "*"), "--force", "--no-git", "--jobs", "2"]
+    )
+
+    assert result.exit_code == 0, result.output
+    summary = json.loads(result.output)
+    assert summary["total"] == 2
+    assert summary["failed"] == 0
+    assert [entry["path"] for entry in summary["results"]] == [str(repo.resolve()) for repo in repos]
+
+
+def test_init_batch_without_matches_fails(tmp_path: Path) -> None:
+    result = CliRunner().invoke(app, ["init", "--batch", str(tmp_path / "nothing-*")])
+
+    assert result.exit_code == 1
+    assert "matched no project directories" in result.output
+
+
+def test_batch_and_init_produce_the_same_project(tmp_path: Path) -> None:
+    """Both paths run the shared setup steps, so their output must not drift apart."""
+    runner = CliRunner()
+    interactive = tmp_path / "interactive" / "proj"
+    batched = tmp_path / "batched" / "proj"
+    batched.mkdir(parents=True)
+
+    result = runner.invoke(app, ["init", str(interactive), "--no-git", "--ai", "both", "--lang", "ja"])
+    assert result.exit_code == 0, result.output
+    result = runner.invoke(app, ["init", "--batch", str(batched), "--no-git", "--ai", "both", "--lang", "ja"])
+    assert result.exit_code == 0, result.output
+
+    def tree(root: Path) -> dict[str, bytes]:
+        return {path.relative_to(root).as_posix(): path.read_bytes() for path in root.rglob("*") if path.is_file()}
+
+    assert tree(batched) == tree(interactive)
+
+
+def test_init_batch_warns_about_unsupported_language_on_stderr(tmp_path: Path) -> None:
+    _repos(tmp_path, 1)
+
+    result = CliRunner().invoke(
+        app, ["init", "--batch", str(tmp_path / "repos" / "*"), "--no-git", "--commit-lang", "tlh"]
+    )
+
+    assert result.exit_code == 0, result.output
+    assert "'tlh' is not in the list" in result.stderr
+    summary = json.loads(result.stdout)
+    assert summary["results"][0]["config_keys"] == ["output", "commit"]
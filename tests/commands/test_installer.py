@@ -1,16 +1,21 @@
 """Tests for the command installer module."""
 
 from pathlib import Path
+from unittest.mock import patch
 
 from codexspec.commands.installer import (
     COMMANDS_SUBDIR,
     OLD_COMMAND_PREFIX,
+    command_dir_target,
     detect_old_structure,
     get_commands_metadata,
     install_commands_to_subdir,
     migrate_old_commands,
+    render_templates,
     should_update_commands,
 )
+from codexspec.integrations import get_integrations
+from codexspec.translator import translate_template_frontmatter
 
 ROOT = Path(__file__).parent.parent.parent
 COMMANDS = ROOT / "templates" / "commands"
@@ -384,6 +389,62 @@ class TestInstallCommandsToSubdir:
         assert "INCONCLUSIVE" in content
 
 
+class TestRenderTemplates:
+    """Tests for the shared multi-target render pipeline."""
+
+    def test_translates_each_template_once_for_all_targets(self, tmp_path: Path) -> None:
+        """`--ai both` should translate a template once and write it to every target."""
+        targets = [integration.render_target(tmp_path, force=True) for integration in get_integrations("both")]
+
+        with patch(
+            "codexspec.commands.installer.translate_template_frontmatter", wraps=translate_template_frontmatter
+        ) as mock_translate:
+            counts = render_templates(COMMANDS, targets, language="zh-CN")
+
+        template_count = len(list(COMMANDS.glob("*.md")))
+        assert counts == {"claude": template_count, "codex": template_count}
+        assert mock_translate.call_count == template_count
+        assert (tmp_path / ".claude" / "commands" / COMMANDS_SUBDIR / "specify.md").exists()
+        assert (tmp_path / ".agents" / "skills" / "codexspec-specify" / "SKILL.md").exists()
+
+    def test_threaded_writes_match_serial_writes(self, tmp_path: Path) -> None:
+        """Thread-pool writes should produce byte-identical output."""
+        outputs = {}
+        for workers in (1, 4):
+            project = tmp_path / f"workers-{workers}"
+            targets = [integration.render_target(project) for integration in get_integrations("both")]
+            render_templates(COMMANDS, targets, language="ja", workers=workers)
+            outputs[workers] = {
+                path.relative_to(project).as_posix(): path.read_bytes() for path in project.rglob("*") if path.is_file()
+            }
+
+        assert outputs[1]
+        assert outputs[1] == outputs[4]
+
+    def test_force_is_per_target(self, tmp_path: Path) -> None:
+        """A non-forced target keeps existing files while a forced one rewrites them."""
+        kept_dir = tmp_path / "kept"
+        forced_dir = tmp_path / "forced"
+        for directory in (kept_dir, forced_dir):
+            directory.mkdir()
+            (directory / "specify.md").write_text("old", encoding="utf-8")
+
+        counts = render_templates(
+            COMMANDS, [command_dir_target("kept", kept_dir), command_dir_target("forced", forced_dir, force=True)]
+        )
+
+        assert (kept_dir / "specify.md").read_text(encoding="utf-8") == "old"
+        assert (forced_dir / "specify.md").read_text(encoding="utf-8") != "old"
+        assert counts["forced"] == counts["kept"] + 1
+
+    def test_missing_templates_dir(self, tmp_path: Path) -> None:
+        """A missing templates directory installs nothing."""
+        counts = render_templates(tmp_path / "missing", [command_dir_target("claude", tmp_path / "out")])
+
+        assert counts == {"claude": 0}
+        assert not (tmp_path / "out").exists()
+
+
 class TestShouldUpdateCommands:
     """Tests for should_update_commands function."""
 
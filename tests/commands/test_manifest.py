@@ -0,0 +1,243 @@
+"""Tests for the install manifest (incremental command installation)."""
+
+import json
+from pathlib import Path
+from unittest.mock import patch
+
+from typer.testing import CliRunner
+
+from codexspec import __version__, app
+from codexspec.commands.installer import (
+    COMMANDS_SUBDIR,
+    install_commands_to_subdir,
+    update_installed_command_frontmatter,
+)
+from codexspec.commands.manifest import (
+    MANIFEST_FILE,
+    STATUS_CURRENT,
+    STATUS_MISSING,
+    STATUS_MODIFIED,
+    STATUS_STALE,
+    STATUS_UNTRACKED,
+    InstallManifest,
+    content_hash,
+)
+from codexspec.integrations.codex import CodexIntegration
+
+TEMPLATE = """---
+description: Test command
+argument-hint: "Describe it"
+---
+
+# Body
+"""
+
+
+def _templates(tmp_path: Path) -> Path:
+    templates_dir = tmp_path / "templates"
+    templates_dir.mkdir()
+    (templates_dir / "alpha.md").write_text(TEMPLATE, encoding="utf-8")
+    (templates_dir / "beta.md").write_text(TEMPLATE.replace("Test command", "Beta command"), encoding="utf-8")
+    return templates_dir
+
+
+def _commands_dir(project: Path) -> Path:
+    return project / ".claude" / "commands" / COMMANDS_SUBDIR
+
+
+class TestInstallManifest:
+    """Tests for InstallManifest bookkeeping."""
+
+    def test_status_transitions(self, tmp_path: Path) -> None:
+        manifest = InstallManifest(tmp_path)
+        target = tmp_path / "out.md"
+        source_hash = content_hash(TEMPLATE)
+
+        assert manifest.status(target, source_hash, "en") == STATUS_MISSING
+        target.write_text("hand written", encoding="utf-8")
+        assert manifest.status(target, source_hash, "en") == STATUS_UNTRACKED
+
+        manifest.write(target, TEMPLATE, source_hash, "en")
+        assert manifest.status(target, source_hash, "en") == STATUS_CURRENT
+        assert manifest.status(target, source_hash, "ja") == STATUS_STALE
+        assert manifest.status(target, content_hash("other"), "en") == STATUS_STALE
+
+        target.write_text(TEMPLATE + "user edit\n", encoding="utf-8")
+        assert manifest.status(target, source_hash, "en") == STATUS_MODIFIED
+
+    def test_save_and_load_round_trip(self, tmp_path: Path) -> None:
+        manifest = InstallManifest(tmp_path)
+        target = tmp_path / "sub" / "out.md"
+        target.parent.mkdir()
+        manifest.write(target, TEMPLATE, content_hash(TEMPLATE), "zh-CN")
+        manifest.save()
+
+        data = json.loads((tmp_path / MANIFEST_FILE).read_text(encoding="utf-8"))
+        entry = data["files"]["sub/out.md"]
+        assert entry["language"] == "zh-CN"
+        assert entry["codexspec_version"] == __version__
+        assert entry["source_hash"] == content_hash(TEMPLATE)
+
+        reloaded = InstallManifest.load(tmp_path)
+        assert reloaded.status(target, content_hash(TEMPLATE), "zh-CN") == STATUS_CURRENT
+
+    def test_corrupt_manifest_loads_empty(self, tmp_path: Path) -> None:
+        (tmp_path / MANIFEST_FILE).parent.mkdir(parents=True)
+        (tmp_path / MANIFEST_FILE).write_text("{broken", encoding="utf-8")
+
+        assert InstallManifest.load(tmp_path).entries == {}
+
+    def test_version_change_marks_stale(self, tmp_path: Path) -> None:
+        manifest = InstallManifest(tmp_path)
+        target = tmp_path / "out.md"
+        manifest.write(target, TEMPLATE, content_hash(TEMPLATE), "en")
+        manifest.version = "0.0.0"
+
+        assert manifest.status(target, content_hash(TEMPLATE), "en") == STATUS_STALE
+
+
+class TestIncrementalInstall:
+    """Tests for manifest-aware command installation."""
+
+    def test_reinstall_skips_current_files(self, tmp_path: Path) -> None:
+        templates_dir = _templates(tmp_path)
+        project = tmp_path / "project"
+        manifest = InstallManifest(project)
+        assert install_commands_to_subdir(_commands_dir(project), templates_dir, manifest=manifest) == 2
+
+        with patch("codexspec.commands.installer.translate_template_frontmatter") as mock_translate:
+            count = install_commands_to_subdir(_commands_dir(project), templates_dir, force=True, manifest=manifest)
+        assert count == 2
+        mock_translate.assert_not_called()
+
+    def test_reinstall_keeps_user_modified_file(self, tmp_path: Path) -> None:
+        templates_dir = _templates(tmp_path)
+        project = tmp_path / "project"
+        manifest = InstallManifest(project)
+        install_commands_to_subdir(_commands_dir(project), templates_dir, manifest=manifest)
+        edited = _commands_dir(project) / "alpha.md"
+        edited.write_text(TEMPLATE + "\n## My customization\n", encoding="utf-8")
+
+        manifest = InstallManifest(project, manifest.entries)
+        count = install_commands_to_subdir(_commands_dir(project), templates_dir, force=True, manifest=manifest)
+
+        assert count == 1
+        assert "## My customization" in edited.read_text(encoding="utf-8")
+        assert manifest.preserved == [f".claude/commands/{COMMANDS_SUBDIR}/alpha.md"]
+
+    def test_untracked_files_overwritten_when_forced(self, tmp_path: Path) -> None:
+        templates_dir = _templates(tmp_path)
+        project = tmp_path / "project"
+        _commands_dir(project).mkdir(parents=True)
+        legacy = _commands_dir(project) / "alpha.md"
+        legacy.write_text("legacy install", encoding="utf-8")
+
+        install_commands_to_subdir(_commands_dir(project), templates_dir, force=True, manifest=InstallManifest(project))
+
+        assert legacy.read_text(encoding="utf-8") == TEMPLATE
+
+    def test_frontmatter_rerender_is_not_a_user_edit(self, tmp_path: Path) -> None:
+        templates_dir = _templates(tmp_path)
+        translations_dir = tmp_path / "translations"
+        translations_dir.mkdir()
+        (translations_dir / "zh-CN.json").write_text(
+            json.dumps({"alpha": {"description": "测试命令"}}, ensure_ascii=False), encoding="utf-8"
+        )
+        project = tmp_path / "project"
+        manifest = InstallManifest(project)
+        install_commands_to_subdir(_commands_dir(project), templates_dir, manifest=manifest)
+
+        update_installed_command_frontmatter(
+            _commands_dir(project),
+            templates_dir,
+            language="zh-CN",
+            translations_dir=translations_dir,
+            manifest=manifest,
+        )
+
+        alpha = _commands_dir(project) / "alpha.md"
+        assert "测试命令" in alpha.read_text(encoding="utf-8")
+        assert manifest.status(alpha, content_hash(TEMPLATE), "zh-CN") == STATUS_CURRENT
+
+    def test_set_lang_then_upgrade_installs_new_body(self, tmp_path: Path) -> None:
+        """A frontmatter-only rewrite must not mark an outdated command as current."""
+        templates_dir = _templates(tmp_path)
+        translations_dir = tmp_path / "translations"
+        translations_dir.mkdir()
+        (translations_dir / "ja.json").write_text(
+            json.dumps({"alpha": {"description": "テスト"}}, ensure_ascii=False), encoding="utf-8"
+        )
+        project = tmp_path / "project"
+        manifest = InstallManifest(project)
+        install_commands_to_subdir(_commands_dir(project), templates_dir, manifest=manifest)
+        # A newer codexspec ships a changed template body.
+        (templates_dir / "alpha.md").write_text(TEMPLATE.replace("# Body", "# New body"), encoding="utf-8")
+
+        update_installed_command_frontmatter(
+            _commands_dir(project), templates_dir, language="ja", translations_dir=translations_dir, manifest=manifest
+        )
+        alpha = _commands_dir(project) / "alpha.md"
+        assert "テスト" in alpha.read_text(encoding="utf-8")
+        assert manifest.status(alpha, content_hash(TEMPLATE.replace("# Body", "# New body")), "ja") == STATUS_STALE
+
+        install_commands_to_subdir(
+            _commands_dir(project),
+            templates_dir,
+            force=True,
+            language="ja",
+            translations_dir=translations_dir,
+            manifest=manifest,
+        )
+
+        content = alpha.read_text(encoding="utf-8")
+        assert "# New body" in content
+        assert "テスト" in content
+        assert manifest.preserved == []
+
+    def test_frontmatter_rerender_leaves_untracked_file_untracked(self, tmp_path: Path) -> None:
+        templates_dir = _templates(tmp_path)
+        project = tmp_path / "project"
+        _commands_dir(project).mkdir(parents=True)
+        legacy = _commands_dir(project) / "alpha.md"
+        legacy.write_text(TEMPLATE.replace("Test command", "Old description"), encoding="utf-8")
+        manifest = InstallManifest(project)
+
+        update_installed_command_frontmatter(_commands_dir(project), templates_dir, manifest=manifest)
+
+        assert "Test command" in legacy.read_text(encoding="utf-8")
+        assert manifest.status(legacy, content_hash(TEMPLATE), "en") == STATUS_UNTRACKED
+
+    def test_codex_skills_keep_user_modified_file(self, tmp_path: Path) -> None:
+        templates_dir = _templates(tmp_path)
+        project = tmp_path / "project"
+        project.mkdir()
+        integration = CodexIntegration()
+        integration.install(project, templates_dir)
+        skill = project / ".agents" / "skills" / "codexspec-alpha" / "SKILL.md"
+        skill.write_text("custom skill\n", encoding="utf-8")
+
+        manifest = InstallManifest.load(project)
+        count = integration.install(project, templates_dir, force=True, manifest=manifest)
+
+        assert count == 1
+        assert skill.read_text(encoding="utf-8") == "custom skill\n"
+        assert manifest.preserved == [".agents/skills/codexspec-alpha/SKILL.md"]
+
+
+def test_init_force_preserves_modified_command(tmp_path: Path) -> None:
+    """`init --force` keeps a command the user edited and reports it."""
+    runner = CliRunner()
+    project = tmp_path / "p"
+    result = runner.invoke(app, ["init", str(project), "--no-git", "--lang", "en"])
+    assert result.exit_code == 0, result.output
+    assert (project / MANIFEST_FILE).exists()
+
+    command_file = _commands_dir(project) / "constitution.md"
+    command_file.write_text(command_file.read_text(encoding="utf-8") + "\n## Team rules\n", encoding="utf-8")
+
+    result = runner.invoke(app, ["init", str(project), "--no-git", "--force"])
+
+    assert result.exit_code == 0, result.output
+    assert "## Team rules" in command_file.read_text(encoding="utf-8")
+    assert "locally modified" in result.output
+    assert f".claude/commands/{COMMANDS_SUBDIR}/constitution.md" in result.output
@@ -7,8 +7,13 @@ depending on the real environment during testing.
 """
 
 import json
+import shutil
+import subprocess
 import sys
 import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from io import StringIO
 from pathlib import Path
 from unittest.mock import MagicMock, patch
@@ -287,3 +292,98 @@ def sample_session_state() -> SessionState:
         last_output="Task completed successfully",
         is_executing=False,
     )
+
+
+# ============================================================================
+# tmux Fixtures
+# ============================================================================
+
+
+class TmuxServer:
+    """A private tmux server (own TMUX_TMPDIR) with one session running ``cat``."""
+
+    def __init__(self, session: str):
+        self.session = session
+        self.pane = f"{session}:0.0"
+
+    def capture(self) -> list[str]:
+        result = subprocess.run(["tmux", "capture-pane", "-p", "-t", self.pane], capture_output=True, text=True)
+        return [line for line in result.stdout.splitlines() if line]
+
+    def wait_for_lines(self, count: int, timeout: float = 3.0) -> list[str]:
+        deadline = time.monotonic() + timeout
+        lines = self.capture()
+        # cat echoes every submitted line, so each Enter shows up twice
+        while len(lines) < count and time.monotonic() < deadline:
+            time.sleep(0.02)
+            lines = self.capture()
+        return lines
+
+
+@pytest.fixture
+def tmux_server(monkeypatch):
+    """Start an isolated tmux server; tmux commands in the test talk to it only."""
+    if shutil.which("tmux") is None:
+        pytest.skip("tmux not installed")
+    socket_dir = tempfile.mkdtemp(prefix="tmx", dir="/tmp")
+    monkeypatch.setenv("TMUX_TMPDIR", socket_dir)
+    monkeypatch.delenv("TMUX", raising=False)
+    server = TmuxServer("ctl")
+    subprocess.run(["tmux", "new-session", "-d", "-s", server.session, "-x", "200", "-y", "50", "cat"], check=True)
+    yield server
+    subprocess.run(["tmux", "kill-server"], capture_output=True)
+    shutil.rmtree(socket_dir, ignore_errors=True)
+
+
+# ============================================================================
+# Telegram Bot API Stub
+# ============================================================================
+
+
+class StubTelegram:
+    """本地 Bot API 替身：记录请求与 TCP 连接，可按顺序返回预设响应"""
+
+    def __init__(self):
+        self.requests: list[dict] = []
+        self.connections: set[tuple] = set()
+        self.responses: list[tuple[int, dict]] = []  # 预设响应，用完后返回 ok
+        self.delay = 0.0
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                body = json.loads(self.rfile.read(length))
+                stub.connections.add(self.client_address)
+                stub.requests.append({"path": self.path, **body})
+                if stub.delay:
+                    time.sleep(stub.delay)
+                status, payload = stub.responses.pop(0) if stub.responses else (200, {"ok": True})
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.thread = threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True)
+        self.thread.start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def telegram_stub():
+    """本地 Telegram Bot API 替身（真实 HTTP 服务器）"""
+    server = StubTelegram()
+    yield server
+    server.close()
@@ -1,8 +1,16 @@
 """Tests for claude_auto_responder.py"""
 
+import asyncio
+import importlib.util
 import json
+import os
+import random
+import re
 import subprocess
 import sys
+import threading
+import time
+from fnmatch import fnmatch
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
@@ -11,20 +19,53 @@ import pytest
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent.parent / "scripts" / "python"))
 
 from claude_auto_responder import (
+    ANSWER_MEMO_REASON,
+    DANGEROUS_PATTERNS,
+    SAFE_COMMANDS,
+    SAFE_PREFIXES,
+    AnswerMemo,
     ClaudeDecider,
+    CompiledPolicy,
+    ContextLoader,
+    DecisionCache,
     Detector,
+    InotifyWatcher,
+    JsonlTail,
+    Logger,
+    MainLoop,
     PendingToolUse,
+    PersistentClaudeDecider,
+    PolicyDecision,
+    PolicySource,
+    PrefixTrie,
     Router,
     SafetyPolicyEngine,
+    Supervisor,
+    SupervisorConfigError,
+    TmuxControl,
     TmuxSender,
+    WatchdogWatcher,
+    WatchHub,
+    allocate_budget,
+    answer_memo_key,
+    build_context_prompt,
     build_prompt,
     classify_bash_command,
+    context_fingerprint,
+    create_watcher,
     extract_pending_tool_use,
     health_check,
     is_path_within_project,
     load_project_context,
+    load_supervisor_config,
+    make_answer_memo,
+    make_decider,
+    make_tmux_control,
     parse_args,
     parse_jsonl,
+    policy_version,
+    tmux_quote,
+    write_state_file,
 )
 
 
@@ -248,6 +289,103 @@ class TestExtractPendingToolUse:
         assert pending is None
 
 
+class TestJsonlTail:
+    def _append(self, path, *records):
+        with open(path, "a") as f:
+            for rec in records:
+                f.write(json.dumps(rec) + "\n")
+
+    def test_reads_only_appended_bytes(self, make_jsonl, ask_tool_use, tool_result):
+        p = make_jsonl([ask_tool_use(tool_id="toolu_01")])
+        tail = JsonlTail(p)
+        assert tail.poll() == 1
+        assert tail.pending().tool_use_id == "toolu_01"
+        assert tail.poll() == 0
+
+        self._append(p, tool_result(tool_id="toolu_01"), ask_tool_use(tool_id="toolu_02"))
+        assert tail.poll() == 2
+        assert tail.offset == p.stat().st_size
+        assert tail.pending().tool_use_id == "toolu_02"
+
+        self._append(p, tool_result(tool_id="toolu_02"))
+        tail.poll()
+        assert tail.pending() is None
+
+    def test_partial_trailing_line_buffered(self, tmp_path, bash_tool_use):
+        p = tmp_path / "s.jsonl"
+        line = json.dumps(bash_tool_use(tool_id="toolu_half")) + "\n"
+        p.write_text(line[:20])
+        tail = JsonlTail(p)
+        assert tail.poll() == 0
+        assert tail.pending() is None
+
+        with open(p, "a") as f:
+            f.write(line[20:])
+        assert tail.poll() == 1
+        assert tail.pending().tool_use_id == "toolu_half"
+
+    def test_truncation_rereads_from_start(self, make_jsonl, ask_tool_use, bash_tool_use):
+        p = make_jsonl([ask_tool_use(tool_id="toolu_old"), ask_tool_use(tool_id="toolu_old2")])
+        tail = JsonlTail(p)
+        tail.poll()
+        p.write_text(json.dumps(bash_tool_use(tool_id="toolu_new")) + "\n")
+        tail.poll()
+        assert tail.pending().tool_use_id == "toolu_new"
+        assert tail.offset == p.stat().st_size
+
+    def test_rotation_rereads_new_file(self, tmp_path, make_jsonl, ask_tool_use, bash_tool_use):
+        p = make_jsonl([ask_tool_use(tool_id="toolu_old")])
+        tail = JsonlTail(p)
+        tail.poll()
+        rotated = make_jsonl([bash_tool_use(tool_id="toolu_rot"), ask_tool_use(tool_id="x", question="padding")], "n")
+        rotated.replace(p)
+        tail.poll()
+        assert tail.pending().tool_use_id == "x"
+
+    def test_matches_full_parse(self, make_jsonl, ask_tool_use, bash_tool_use, tool_result):
+        records = [
+            tool_result(tool_id="toolu_early"),
+            ask_tool_use(tool_id="toolu_early"),
+            bash_tool_use(tool_id="toolu_a"),
+            ask_tool_use(tool_id="toolu_b"),
+            tool_result(tool_id="toolu_b"),
+        ]
+        p = make_jsonl([])
+        tail = JsonlTail(p)
+        for i in range(len(records)):
+            self._append(p, records[i])
+            tail.poll()
+            expected = extract_pending_tool_use(parse_jsonl(p))
+            assert tail.pending() == expected
+
+    def test_malformed_record_does_not_drop_rest_of_chunk(self, make_jsonl, ask_tool_use, tool_result):
+        p = make_jsonl([ask_tool_use(tool_id="toolu_01")])
+        tail = JsonlTail(p)
+        tail.poll()
+
+        no_id = {"type": "assistant", "message": {"content": [{"type": "tool_use", "name": "Bash"}]}}
+        bad_message = {"type": "assistant", "message": "not a dict"}
+        self._append(p, no_id, bad_message, tool_result(tool_id="toolu_01"), ask_tool_use(tool_id="toolu_02"))
+
+        assert tail.poll() == 4
+        assert tail.offset == p.stat().st_size
+        assert tail.pending().tool_use_id == "toolu_02"
+
+    def test_offset_stops_at_last_complete_line(self, make_jsonl, ask_tool_use):
+        p = make_jsonl([ask_tool_use(tool_id="toolu_01")])
+        complete = p.stat().st_size
+        with open(p, "a") as f:
+            f.write('{"type": "assist')
+        tail = JsonlTail(p)
+        tail.poll()
+        assert tail.offset == complete
+
+    def test_missing_file(self, tmp_path):
+        tail = JsonlTail(tmp_path / "missing.jsonl")
+        assert tail.poll() == 0
+        assert tail.pending() is None
+
+
 # ============================================================================
 # Task 2.3: Detector tests
 # ============================================================================
@@ -291,6 +429,17 @@ class TestDetector:
         d = Detector(p, stable_ms=0)
         assert d.check() is None
 
+    def test_incremental_check(self, make_jsonl, ask_tool_use, tool_result):
+        """Appended records are picked up without re-reading the whole file."""
+        p = make_jsonl([ask_tool_use(tool_id="toolu_01")])
+        d = Detector(p, stable_ms=0)
+        assert d.check().tool_use_id == "toolu_01"
+        with open(p, "a") as f:
+            f.write(json.dumps(tool_result(tool_id="toolu_01")) + "\n")
+            f.write(json.dumps(ask_tool_use(tool_id="toolu_02")) + "\n")
+        with patch("claude_auto_responder.parse_jsonl", side_effect=AssertionError("full re-parse")):
+            assert d.check().tool_use_id == "toolu_02"
+
 
 # ============================================================================
 # Task 3.1: PathChecker tests
@@ -426,6 +575,272 @@ class TestBashClassifier:
         assert cat == "DANGEROUS"
 
 
+class TestDecisionCache:
+    def test_lru_eviction_and_counters(self):
+        cache = DecisionCache(maxsize=2)
+        allow = PolicyDecision("ALLOW", "ok")
+        cache.put("a", allow)
+        cache.put("b", allow)
+        assert cache.get("a") is allow  # a is now most recent
+        cache.put("c", allow)
+        assert cache.get("b") is None
+        assert cache.stats() == {"size": 2, "maxsize": 2, "hits": 1, "misses": 1, "invalidations": 0}
+
+    def test_concurrent_access_keeps_counters_consistent(self):
+        cache = DecisionCache(maxsize=8)
+        allow = PolicyDecision("ALLOW", "ok")
+
+        def _worker(offset):
+            for i in range(2000):
+                key = (offset + i) % 16
+                if cache.get(key) is None:
+                    cache.put(key, allow)
+
+        threads = [threading.Thread(target=_worker, args=(n,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        stats = cache.stats()
+        assert stats["hits"] + stats["misses"] == 8 * 2000
+        assert stats["size"] <= 8
+
+    def test_repeated_requests_hit_cache(self, tmp_project):
+        engine = SafetyPolicyEngine(tmp_project)
+        first = engine.evaluate("Edit", {"file_path": str(tmp_project / "a.py"), "old_string": "x"})
+        with (
+            patch("claude_auto_responder.is_path_within_project", side_effect=AssertionError("not cached")),
+            patch("claude_auto_responder.classify_bash_command", side_effect=AssertionError("not cached")),
+        ):
+            # Only decision-relevant fields form the key
+            assert engine.evaluate("Edit", {"file_path": str(tmp_project / "a.py"), "old_string": "y"}) == first
+        engine.evaluate("Bash", {"command": "uv run pytest"})
+        engine.evaluate("Bash", {"command": "uv run pytest", "description": "again"})
+        stats = engine.cache_stats()
+        assert (stats["hits"], stats["misses"]) == (2, 2)
+
+    def test_cache_disabled(self, tmp_project):
+        engine = SafetyPolicyEngine(tmp_project, cache_size=0)
+        engine.evaluate("Bash", {"command": "ls"})
+        engine.evaluate("Bash", {"command": "ls"})
+        assert engine.cache_stats()["size"] == 0
+        assert engine.cache_stats()["hits"] == 0
+
+    def test_policy_file_mtime_invalidates(self, tmp_path, tmp_project):
+        policy_file = tmp_path / "policy.json"
+        policy_file.write_text("{}")
+        engine = SafetyPolicyEngine(tmp_project, policy={}, policy_file=str(policy_file))
+        engine.evaluate("Bash", {"command": "ls"})
+        engine.evaluate("Bash", {"command": "ls"})
+        assert engine.cache_stats()["hits"] == 1
+
+        st = policy_file.stat()
+        os.utime(policy_file, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+        engine.evaluate("Bash", {"command": "ls"})
+        stats = engine.cache_stats()
+        assert stats["invalidations"] == 1
+        assert stats["hits"] == 1
+
+    def test_health_check_reports_runtime_counters(self, tmp_path, make_jsonl, capsys):
+        state_file = tmp_path / "state.json"
+        write_state_file(str(state_file), {"decision_cache": {"hits": 7, "misses": 3}})
+        args = parse_args(
+            ["--jsonl", str(make_jsonl([])), "--tmux-pane", "t:0.0", "--state-file", str(state_file), "--health-check"]
+        )
+        with patch("subprocess.run") as mock_run:
+            mock_run.return_value = MagicMock(returncode=0, stdout="claude version 1.0")
+            assert health_check(args) == 0
+
+        report = json.loads(capsys.readouterr().out)
+        assert report["runtime"]["decision_cache"] == {"hits": 7, "misses": 3}
+
+    def test_health_check_missing_state_file_fails(self, tmp_path, make_jsonl):
+        args = parse_args(
+            ["--jsonl", str(make_jsonl([])), "--tmux-pane", "t:0.0", "--state-file", str(tmp_path / "no.json")]
+        )
+        with patch("subprocess.run") as mock_run:
+            mock_run.return_value = MagicMock(returncode=0, stdout="claude version 1.0")
+            assert health_check(args) == 1
+
+
+def _rewrite(path, text):
+    """Replace a file atomically (new inode), as editors and config tools do."""
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(text)
+    tmp.replace(path)
+
+
+class TestPolicyHotReload:
+    def test_engine_picks_up_changed_policy(self, tmp_path, tmp_project):
+        policy_file = tmp_path / "policy.json"
+        policy_file.write_text("{}")
+        source = PolicySource.load(str(policy_file))
+        engine = SafetyPolicyEngine(tmp_project, source=source)
+        assert engine.evaluate("Bash", {"command": "docker ps"}).action == "DENY"
+        old_version = source.version
+
+        _rewrite(policy_file, '{"allow_commands": ["docker"]}')
+        assert engine.evaluate("Bash", {"command": "docker ps"}).action == "ALLOW"
+        info = source.info()
+        assert info["version"] != old_version
+        assert info["version"] == policy_version({"allow_commands": ["docker"]})
+        assert info["generation"] == 2
+        assert info["loaded_at"]
+
+    @pytest.mark.parametrize("bad", ["{broken", "[]", '{"deny_commands": [1]}'])
+    def test_invalid_policy_keeps_last_good(self, tmp_path, tmp_project, bad):
+        policy_file = tmp_path / "policy.json"
+        policy_file.write_text('{"allow_commands": ["docker"]}')
+        source = PolicySource.load(str(policy_file))
+        engine = SafetyPolicyEngine(tmp_project, source=source)
+        version = source.version
+
+        _rewrite(policy_file, bad)
+        assert source.reload_if_changed() is False
+        assert source.reload_if_changed() is None  # not retried until the file changes again
+        assert engine.evaluate("Bash", {"command": "docker ps"}).action == "ALLOW"
+        assert source.info()["version"] == version
+        assert source.info()["last_error"]
+
+        _rewrite(policy_file, "{}")
+        assert source.reload_if_changed() is True
+        assert source.info()["last_error"] is None
+        assert engine.evaluate("Bash", {"command": "docker ps"}).action == "DENY"
+
+    def test_builtin_policy_never_reloads(self, tmp_project):
+        source = PolicySource.load(None)
+        assert source.version == "builtin"
+        assert source.reload_if_changed() is None
+
+    def test_health_check_reports_policy_version(self, tmp_path, make_jsonl, capsys):
+        policy_file = tmp_path / "policy.json"
+        policy_file.write_text('{"allow_commands": ["docker"]}')
+        args = parse_args(
+            ["--jsonl", str(make_jsonl([])), "--tmux-pane", "t:0.0", "--safety-policy-file", str(policy_file)]
+        )
+        with patch("subprocess.run") as mock_run:
+            mock_run.return_value = MagicMock(returncode=0, stdout="claude version 1.0")
+            assert health_check(args) == 0
+
+        (policy_check,) = [
+            c for c in json.loads(capsys.readouterr().out)["checks"] if c["name"] == "safety_policy_file"
+        ]
+        assert policy_check["version"] == policy_version({"allow_commands": ["docker"]})
+
+
+# ----------------------------------------------------------------------------
+# Compiled matcher: differential test against the original linear scan
+# ----------------------------------------------------------------------------
+
+
+def _reference_classify_segment(segment, project_root, policy=None):
+    """The pre-compilation implementation, kept verbatim as the oracle."""
+    segment = segment.strip()
+    if not segment:
+        return ("DANGEROUS", "空命令")
+    policy = policy or {}
+    for pat in policy.get("deny_commands", []):
+        if segment.startswith(pat):
+            return ("DANGEROUS", f"策略拒绝: {pat}")
+    for pat in policy.get("allow_commands", []):
+        if segment.startswith(pat):
+            return ("SAFE", f"策略允许: {pat}")
+    for pat in DANGEROUS_PATTERNS:
+        if pat in segment:
+            return ("DANGEROUS", f"黑名单: {pat.strip()}")
+    if ">" in segment:
+        allow_outside = policy.get("allow_paths_outside_project", [])
+        for part in segment.split(">")[1:]:
+            redir_path = part.strip().split()[0] if part.strip() else ""
+            if redir_path.startswith("/") and not is_path_within_project(redir_path, project_root):
+                if any(fnmatch(redir_path, pat) for pat in allow_outside):
+                    continue
+                return ("DANGEROUS", f"重定向到项目外: {redir_path}")
+    for prefix in SAFE_PREFIXES:
+        if segment.startswith(prefix):
+            return ("SAFE", f"白名单前缀: {prefix}")
+    first_token = segment.split()[0] if segment.split() else ""
+    if first_token in SAFE_COMMANDS:
+        return ("SAFE", f"白名单命令: {first_token}")
+    return ("UNKNOWN", f"未知命令: {first_token}")
+
+
+def _reference_classify(command, project_root, policy=None):
+    if not command or not command.strip():
+        return ("DANGEROUS", "空命令")
+    all_segments = []
+    for seg in re.split(r"\s*(?:&&|\|\||;)\s*", command):
+        all_segments.extend(p.strip() for p in seg.split("|"))
+    has_unknown = False
+    for seg in all_segments:
+        if not seg.strip():
+            continue
+        cat, reason = _reference_classify_segment(seg.strip(), project_root, policy)
+        if cat == "DANGEROUS":
+            return ("DANGEROUS", reason)
+        if cat == "UNKNOWN":
+            has_unknown = True
+    return ("UNKNOWN", "含未知命令") if has_unknown else ("SAFE", "全部安全")
+
+
+def _command_corpus(rng, tmp_project, size):
+    words = sorted(SAFE_COMMANDS) + list(SAFE_PREFIXES) + [p.strip() for p in DANGEROUS_PATTERNS]
+    words += ["docker", "docker run", "kubectl get", "npm publish", "terraform", "ls", "l", "", "x" * 40]
+    args = ["-la", "src/", ".", "--force", "*.py", "'a b'", "${HOME}", "rm", "-rf"]
+    redirects = ["", "", f"> {tmp_project}/out.txt", "> /tmp/build/out.log", "> /etc/passwd", ">> /var/log/x", ">"]
+    separators = [" && ", " || ", "; ", " | ", "|", ";"]
+    corpus = ["", "   ", "&&", "|", "rm\tfile", "cat a>b"]
+    for _ in range(size):
+        parts = []
+        for _ in range(rng.randint(1, 4)):
+            segment = " ".join([rng.choice(words)] + rng.sample(args, rng.randint(0, 3)) + [rng.choice(redirects)])
+            parts.append(segment)
+        command = parts[0]
+        for part in parts[1:]:
+            command += rng.choice(separators) + part
+        corpus.append(command)
+    return corpus
+
+
+def _large_policy(rng):
+    deny = [f"tool{i} --danger" for i in range(2000)] + ["docker run", "npm publish", "git push", "ls -la src/"]
+    allow = [f"tool{i}" for i in range(2000)] + ["docker", "npm", "terraform plan", "l"]
+    rng.shuffle(deny)
+    rng.shuffle(allow)
+    return {"deny_commands": deny, "allow_commands": allow, "allow_paths_outside_project": ["/tmp/build/*"]}
+
+
+class TestCompiledPolicy:
+    def test_prefix_trie_prefers_earliest_pattern(self):
+        trie = PrefixTrie(["git status --short", "git", "git status"])
+        assert trie.first_match("git status --short") == "git status --short"
+        assert trie.first_match("git log") == "git"
+        assert trie.first_match("gi") is None
+        assert PrefixTrie(["", "ls"]).first_match("ls") == ""
+
+    @pytest.mark.parametrize("policy_kind", ["none", "small", "large"])
+    def test_matches_linear_scan(self, tmp_project, policy_kind):
+        rng = random.Random(1234)
+        policy = {
+            "none": None,
+            "small": {"deny_commands": ["docker run"], "allow_commands": ["docker", "rm -i"]},
+            "large": _large_policy(rng),
+        }[policy_kind]
+        compiled = CompiledPolicy(policy)
+
+        for command in _command_corpus(rng, tmp_project, 2000):
+            expected = _reference_classify(command, tmp_project, policy)
+            assert classify_bash_command(command, tmp_project, compiled) == expected, command
+            if policy_kind != "large":  # a dict is compiled per call
+                assert classify_bash_command(command, tmp_project, policy) == expected, command
+
+    def test_engine_compiles_once(self, tmp_project):
+        engine = SafetyPolicyEngine(tmp_project, policy=_large_policy(random.Random(0)))
+        with patch("claude_auto_responder.PrefixTrie", side_effect=AssertionError("recompiled")):
+            assert engine.evaluate("Bash", {"command": "docker ps"}).action == "ALLOW"
+            assert engine.evaluate("Bash", {"command": "docker run x"}).action == "DENY"
+
+
 # ============================================================================
 # Task 3.5: SafetyPolicyEngine tests
 # ============================================================================
@@ -547,6 +962,114 @@ class TestLoadProjectContext:
         assert len(ctx["claude_md"]) == 30000
 
 
+class TestContextLoader:
+    def test_unchanged_files_are_not_reread(self, tmp_project):
+        loader = ContextLoader(tmp_project)
+        first = loader.refresh()
+        assert loader.reads == 2
+        assert loader.refresh() is first
+        assert loader.reads == 2
+
+    def test_only_changed_source_is_reread(self, tmp_project):
+        loader = ContextLoader(tmp_project)
+        first = loader.refresh()
+        (tmp_project / "CLAUDE.md").write_text("# Test Project\nNew rules, longer.")
+        second = loader.refresh()
+        assert loader.reads == 3
+        assert second.version != first.version
+        assert "New rules" in second.ctx["claude_md"]
+        assert second.ctx["constitution"] == first.ctx["constitution"]
+
+    def test_touch_without_content_change_keeps_snapshot(self, tmp_project):
+        loader = ContextLoader(tmp_project)
+        first = loader.refresh()
+        claude_md = tmp_project / "CLAUDE.md"
+        stat = claude_md.stat()
+        os.utime(claude_md, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        assert loader.refresh() is first
+        assert loader.rebuilds == 1
+
+    def test_profile_records_included(self, tmp_project):
+        profile = tmp_project / ".codexspec" / "profile"
+        for category in ("constraints", "decisions", "runbooks"):
+            (profile / category).mkdir(parents=True)
+            (profile / category / "a.md").write_text(f"# {category} record")
+        (profile / "constraints" / ".gitkeep").write_text("")
+        loader = ContextLoader(tmp_project)
+        ctx = loader.refresh().ctx
+        assert '<record path="constraints/a.md">' in ctx["profile"]
+        assert "# decisions record" in ctx["profile"]
+        assert "runbooks" not in ctx["profile"]
+        assert "<project_profile>" in build_context_prompt(None, ctx)
+
+        (profile / "constraints" / "a.md").unlink()
+        assert "constraints" not in loader.refresh().ctx["profile"]
+
+    def test_budget_shared_across_sources(self, tmp_project):
+        (tmp_project / "CLAUDE.md").write_text("x" * 5000)
+        (tmp_project / ".codexspec" / "memory" / "constitution.md").write_text("y" * 500)
+        ctx = ContextLoader(tmp_project, budget=2000).refresh().ctx
+        # 小来源完整保留，剩余预算给大来源
+        assert ctx["constitution"] == "y" * 500
+        assert ctx["claude_md"] == "x" * 1500
+
+    def test_truncation_keeps_utf8_boundary(self, tmp_path):
+        (tmp_path / "CLAUDE.md").write_text("中" * 100)
+        ctx = ContextLoader(tmp_path, budget=10).refresh().ctx
+        assert ctx["claude_md"] == "中" * 3
+
+    def test_allocate_budget(self):
+        assert allocate_budget([100, 10, 100], 150) == [70, 10, 70]
+        assert allocate_budget([5, 5], 100) == [5, 5]
+        assert allocate_budget([], 100) == []
+
+    def test_router_picks_up_context_change(self, tmp_project):
+        decider = MagicMock()
+        decider.decide.return_value = ["JWT"]
+        router = Router(
+            decider=decider, safety_engine=SafetyPolicyEngine(tmp_project), context=ContextLoader(tmp_project)
+        )
+        pending = PendingToolUse("toolu_01", "AskUserQuestion", {"questions": [AUTH_QUESTION]})
+        router.handle(pending)
+        assert "Some rules here." in decider.decide.call_args.args[0]
+        assert decider.decide.call_args.args[0] == build_prompt(None, load_project_context(tmp_project), AUTH_QUESTION)
+
+        (tmp_project / "CLAUDE.md").write_text("# Test Project\nPrefer OAuth.")
+        router.handle(pending)
+        assert "Prefer OAuth." in decider.decide.call_args.args[0]
+
+    def test_shared_router_survives_concurrent_context_changes(self, tmp_project):
+        """多会话共用的 Router：上下文变化时并发决策不会拿到构建一半的缓存"""
+        decider = MagicMock()
+        decider.decide.return_value = ["JWT"]
+        router = Router(
+            decider=decider, safety_engine=SafetyPolicyEngine(tmp_project), context=ContextLoader(tmp_project)
+        )
+        pending = PendingToolUse("toolu_01", "AskUserQuestion", {"questions": [AUTH_QUESTION]})
+        errors = []
+        stop = threading.Event()
+
+        def _decide():
+            while not stop.is_set():
+                try:
+                    router.handle(pending)
+                except Exception as e:
+                    errors.append(e)
+                    return
+
+        threads = [threading.Thread(target=_decide) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for i in range(50):
+            (tmp_project / "CLAUDE.md").write_text(f"# Test Project\nrevision {i}" + "x" * i)
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+        assert all(isinstance(c.args[0], str) for c in decider.decide.call_args_list)
+
+
 class TestBuildPrompt:
     def test_basic_prompt(self, tmp_project):
         ctx = load_project_context(tmp_project)
@@ -696,6 +1219,258 @@ class TestClaudeDecider:
         assert result is None
 
 
+STUB_WORKER = """
+import json, os, sys, time
+mode, log = sys.argv[1], sys.argv[2]
+count = 0
+for line in sys.stdin:
+    message = json.loads(line)
+    text = message["message"]["content"][0]["text"]
+    count += 1
+    with open(log, "a") as f:
+        f.write(json.dumps({"pid": os.getpid(), "chars": len(text), "context": "<project_claude_md>" in text}) + "\\n")
+    if mode == "hang":
+        time.sleep(60)
+    print(json.dumps({"type": "system", "subtype": "init"}), flush=True)
+    answer = "Nope" if mode == "invalid" else "JWT"
+    print(json.dumps({"type": "result", "result": json.dumps({"answers": [answer]})}), flush=True)
+    if mode == "exit-after-1":
+        break
+"""
+
+
+@pytest.fixture
+def stub_worker(tmp_path):
+    """Command for a local stand-in that speaks the stream-json worker protocol."""
+    script = tmp_path / "stub_worker.py"
+    script.write_text(STUB_WORKER)
+    log = tmp_path / "worker.log"
+
+    def _command(mode="ok"):
+        return [sys.executable, str(script), mode, str(log)]
+
+    def _calls():
+        if not log.exists():
+            return []
+        return [json.loads(line) for line in log.read_text().splitlines()]
+
+    _command.calls = _calls
+    return _command
+
+
+AUTH_QUESTION = {
+    "question": "Which auth?",
+    "options": [{"label": "JWT"}, {"label": "OAuth"}],
+    "multiSelect": False,
+}
+
+
+class TestPersistentClaudeDecider:
+    def test_worker_reused_and_context_sent_once(self, stub_worker):
+        decider = PersistentClaudeDecider(command=stub_worker(), timeout=10)
+        try:
+            assert decider.decide_with_context("<project_claude_md>\nrules\n</project_claude_md>", AUTH_QUESTION) == [
+                "JWT"
+            ]
+            assert decider.decide_with_context("<project_claude_md>\nrules\n</project_claude_md>", AUTH_QUESTION) == [
+                "JWT"
+            ]
+        finally:
+            decider.close()
+
+        first, second = stub_worker.calls()
+        assert first["pid"] == second["pid"]
+        assert first["context"] is True
+        assert second["context"] is False
+        assert decider.stats()["workers_started"] == 1
+        assert decider.stats()["warm_questions"] == 1
+
+    def test_different_context_uses_new_worker(self, stub_worker):
+        decider = PersistentClaudeDecider(command=stub_worker(), timeout=10, pool_size=2)
+        try:
+            decider.decide_with_context("<project_claude_md>a</project_claude_md>", AUTH_QUESTION)
+            decider.decide_with_context("<project_claude_md>b</project_claude_md>", AUTH_QUESTION)
+        finally:
+            decider.close()
+        first, second = stub_worker.calls()
+        assert first["pid"] != second["pid"]
+        assert second["context"] is True
+
+    def test_dead_worker_is_restarted_with_context(self, stub_worker):
+        decider = PersistentClaudeDecider(command=stub_worker("exit-after-1"), timeout=10)
+        try:
+            assert decider.decide_with_context("<project_claude_md></project_claude_md>", AUTH_QUESTION) == ["JWT"]
+            time.sleep(0.2)
+            assert decider.decide_with_context("<project_claude_md></project_claude_md>", AUTH_QUESTION) == ["JWT"]
+        finally:
+            decider.close()
+        first, second = stub_worker.calls()
+        assert first["pid"] != second["pid"]
+        assert second["context"] is True
+
+    def test_worker_recycled_after_max_questions(self, stub_worker):
+        decider = PersistentClaudeDecider(command=stub_worker(), timeout=10, max_questions=1)
+        try:
+            decider.decide_with_context("ctx", AUTH_QUESTION)
+            decider.decide_with_context("ctx", AUTH_QUESTION)
+        finally:
+            decider.close()
+        assert decider.stats()["workers_started"] == 2
+
+    def test_timeout_returns_none(self, stub_worker):
+        decider = PersistentClaudeDecider(command=stub_worker("hang"), timeout=0.3)
+        started = time.monotonic()
+        assert decider.decide_with_context("ctx", AUTH_QUESTION) is None
+        assert time.monotonic() - started < 5
+        assert decider.stats()["idle_workers"] == 0
+
+    def test_invalid_answer_rejected(self, stub_worker):
+        decider = PersistentClaudeDecider(command=stub_worker("invalid"), timeout=10)
+        try:
+            assert decider.decide_with_context("ctx", AUTH_QUESTION) is None
+        finally:
+            decider.close()
+
+    def test_missing_binary_returns_none(self, tmp_path):
+        decider = PersistentClaudeDecider(command=[str(tmp_path / "no-such-claude")], timeout=1)
+        assert decider.decide_with_context("ctx", AUTH_QUESTION) is None
+
+    def test_router_uses_persistent_decider(self, tmp_project, stub_worker):
+        args = parse_args(
+            ["--jsonl", "x.jsonl", "--tmux-pane", "t:0.0", "--decider", "persistent", "--decider-command", "stub"]
+        )
+        assert isinstance(make_decider(args), PersistentClaudeDecider)
+
+        decider = PersistentClaudeDecider(command=stub_worker(), timeout=10)
+        router = Router(
+            decider=decider,
+            safety_engine=SafetyPolicyEngine(tmp_project),
+            context=load_project_context(tmp_project),
+        )
+        pending = PendingToolUse("toolu_01", "AskUserQuestion", {"questions": [AUTH_QUESTION]})
+        try:
+            for _ in range(2):
+                resp = router.handle(pending)
+                assert resp.response_type == "answers"
+                assert resp.answers == ["JWT"]
+        finally:
+            decider.close()
+        assert [call["context"] for call in stub_worker.calls()] == [True, False]
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class TestAnswerMemo:
+    def test_key_ignores_whitespace_and_option_order(self):
+        reordered = {
+            "question": "  Which   auth? ",
+            "header": "Auth",
+            "options": [{"label": "OAuth"}, {"label": "JWT"}],
+            "multiSelect": False,
+        }
+        assert answer_memo_key(AUTH_QUESTION, "fp") == answer_memo_key(reordered, "fp")
+        assert answer_memo_key(AUTH_QUESTION, "fp") != answer_memo_key({**AUTH_QUESTION, "multiSelect": True}, "fp")
+        assert answer_memo_key(AUTH_QUESTION, "fp") != answer_memo_key(AUTH_QUESTION, "other")
+
+    def test_fingerprint_tracks_project_context(self):
+        ctx = {"claude_md": "rules", "constitution": "laws"}
+        assert context_fingerprint(ctx) == context_fingerprint(dict(ctx))
+        assert context_fingerprint(ctx) != context_fingerprint({**ctx, "claude_md": "new rules"})
+        assert context_fingerprint(ctx) != context_fingerprint({**ctx, "constitution": "new laws"})
+        assert context_fingerprint(ctx) != context_fingerprint(ctx, "prompt")
+
+    def test_ttl_expiry(self):
+        clock = FakeClock()
+        memo = AnswerMemo(ttl=60, clock=clock)
+        memo.put("k", ["JWT"])
+        clock.now += 59
+        assert memo.get("k") == ["JWT"]
+        clock.now += 1
+        assert memo.get("k") is None
+        assert memo.stats() == {"size": 0, "maxsize": 256, "hits": 1, "misses": 1, "expired": 1}
+
+    def test_lru_eviction(self):
+        memo = AnswerMemo(maxsize=2)
+        memo.put("a", ["1"])
+        memo.put("b", ["2"])
+        memo.get("a")
+        memo.put("c", ["3"])
+        assert memo.get("b") is None
+        assert memo.get("a") == ["1"]
+        assert memo.get("c") == ["3"]
+
+    def test_persists_across_instances(self, tmp_path):
+        path = str(tmp_path / "memo.json")
+        clock = FakeClock()
+        AnswerMemo(path, ttl=60, clock=clock).put("k", ["JWT"])
+        assert AnswerMemo(path, ttl=60, clock=clock).get("k") == ["JWT"]
+        clock.now += 120
+        assert AnswerMemo(path, ttl=60, clock=clock).stats()["size"] == 0
+
+    def test_corrupt_file_starts_empty(self, tmp_path):
+        path = tmp_path / "memo.json"
+        path.write_text("{not json")
+        memo = AnswerMemo(str(path))
+        assert memo.get("k") is None
+        memo.put("k", ["JWT"])
+        assert json.loads(path.read_text())["entries"][0]["answers"] == ["JWT"]
+
+    def test_router_consults_memo_before_decider(self, tmp_project, tmp_path):
+        decider = MagicMock()
+        decider.decide.return_value = ["JWT"]
+        memo = AnswerMemo(str(tmp_path / "memo.json"))
+        ctx = load_project_context(tmp_project)
+        router = Router(decider=decider, safety_engine=SafetyPolicyEngine(tmp_project), context=ctx, memo=memo)
+        pending = PendingToolUse("toolu_01", "AskUserQuestion", {"questions": [AUTH_QUESTION]})
+
+        first = router.handle(pending)
+        second = router.handle(pending)
+
+        assert first.answers == second.answers == ["JWT"]
+        assert second.reason == ANSWER_MEMO_REASON
+        assert decider.decide.call_count == 1
+
+        # 项目上下文变化后不复用旧答案
+        changed = Router(
+            decider=decider,
+            safety_engine=SafetyPolicyEngine(tmp_project),
+            context={**ctx, "claude_md": "changed"},
+            memo=memo,
+        )
+        assert changed.handle(pending).reason != ANSWER_MEMO_REASON
+        assert decider.decide.call_count == 2
+
+    def test_failed_decision_not_memoized(self, tmp_project):
+        decider = MagicMock()
+        decider.decide.return_value = None
+        memo = AnswerMemo()
+        router = Router(
+            decider=decider,
+            safety_engine=SafetyPolicyEngine(tmp_project),
+            context=load_project_context(tmp_project),
+            memo=memo,
+        )
+        pending = PendingToolUse("toolu_01", "AskUserQuestion", {"questions": [AUTH_QUESTION]})
+        assert router.handle(pending) is None
+        assert router.handle(pending) is None
+        assert decider.decide.call_count == 2
+        assert memo.stats()["size"] == 0
+
+    def test_cli_flags(self, tmp_path):
+        base = ["--jsonl", "x.jsonl", "--tmux-pane", "t:0.0"]
+        assert make_answer_memo(parse_args(base)) is None
+        args = parse_args(base + ["--answer-memo", str(tmp_path / "m.json"), "--answer-memo-size", "8"])
+        memo = make_answer_memo(args)
+        assert memo.maxsize == 8
+        assert memo.path == str(tmp_path / "m.json")
+
+
 # ============================================================================
 # Task 5.1: TmuxSender + Router tests
 # ============================================================================
@@ -761,6 +1536,54 @@ class TestTmuxSender:
             assert sender.pane_exists() is False
 
 
+class TestTmuxControl:
+    def test_quote(self):
+        assert tmux_quote('say "hi" $HOME \\ ;') == '"say \\"hi\\" \\$HOME \\\\ ;"'
+
+    def test_answers_pipelined_over_one_connection(self, tmux_server):
+        control = TmuxControl()
+        sender = TmuxSender(tmux_server.pane, control=control)
+        tricky = 'JWT "token" $HOME \\ ; #{pane_id} 中文'
+        try:
+            with patch("subprocess.run") as mock_run:
+                assert sender.send_answers([tricky, "B"]) is True
+                assert sender.send_permission(allow=True) is True
+                assert sender.pane_exists() is True
+            mock_run.assert_not_called()
+            assert control.stats() == {"transport": "control", "connects": 1, "batches": 3, "commands": 7}
+        finally:
+            control.close()
+        # 终端回显与 cat 输出可能交错，只比较内容
+        assert sorted(tmux_server.wait_for_lines(6)) == sorted([tricky, tricky, "B", "B", "Y", "Y"])
+
+    def test_missing_pane_reports_failure(self, tmux_server):
+        control = TmuxControl()
+        try:
+            assert control.run(tmux_server.pane, [["send-keys", "-t", "ctl:7.0", "x"]]) is False
+            assert TmuxSender("ctl:7.0", control=control).send_permission(allow=True) is False
+            assert control.connected
+        finally:
+            control.close()
+
+    def test_falls_back_to_subprocess(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("TMUX_TMPDIR", str(tmp_path))
+        monkeypatch.delenv("TMUX", raising=False)
+        control = TmuxControl(retry=60)
+        sender = TmuxSender("nosuch:0.0", control=control)
+        with patch("subprocess.run") as mock_run:
+            mock_run.return_value = MagicMock(returncode=0)
+            assert sender.send_answers(["A", "B"]) is True
+            assert sender.send_answers(["C"]) is True
+        assert mock_run.call_count == 6
+        assert control.stats()["connects"] == 0
+
+    def test_transport_flag(self):
+        base = ["--jsonl", "x.jsonl", "--tmux-pane", "t:0.0"]
+        assert isinstance(make_tmux_control(parse_args(base)), TmuxControl)
+        assert make_tmux_control(parse_args(base + ["--tmux-transport", "subprocess"])) is None
+        assert make_tmux_control(parse_args(base + ["--dry-run"])) is None
+
+
 class TestRouter:
     def test_ask_user_question_routed_to_decider(self, tmp_project):
         """AskUserQuestion → ClaudeDecider path."""
@@ -1142,3 +1965,433 @@ class TestHealthCheck:
         assert result["overall"] in ["healthy", "unhealthy"]
         assert "checks" in result
         assert isinstance(result["checks"], list)
+
+
+# ============================================================================
+# FileWatcher / event-driven MainLoop tests
+# ============================================================================
+
+linux_only = pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify is Linux-only")
+needs_watchdog = pytest.mark.skipif(importlib.util.find_spec("watchdog") is None, reason="watchdog not installed")
+
+
+def _append_later(path, text, delay=0.05):
+    def _write():
+        time.sleep(delay)
+        with open(path, "a") as f:
+            f.write(text)
+
+    thread = threading.Thread(target=_write)
+    thread.start()
+    return thread
+
+
+@linux_only
+class TestInotifyWatcher:
+    def test_append_wakes_waiter(self, make_jsonl):
+        p = make_jsonl([])
+        watcher = InotifyWatcher(p)
+        try:
+            thread = _append_later(p, "{}\n")
+            started = time.monotonic()
+            assert watcher.wait(5) is True
+            assert time.monotonic() - started < 1
+            thread.join()
+        finally:
+            watcher.close()
+
+    def test_idle_wait_times_out(self, make_jsonl):
+        p = make_jsonl([])
+        watcher = InotifyWatcher(p)
+        try:
+            assert watcher.wait(0.05) is False
+        finally:
+            watcher.close()
+
+    def test_sibling_file_is_ignored(self, tmp_path, make_jsonl):
+        p = make_jsonl([])
+        watcher = InotifyWatcher(p)
+        try:
+            thread = _append_later(tmp_path / "other.jsonl", "{}\n", delay=0)
+            thread.join()
+            assert watcher.wait(0.1) is False
+        finally:
+            watcher.close()
+
+    def test_replaced_file_is_rewatched(self, tmp_path, make_jsonl):
+        p = make_jsonl([])
+        watcher = InotifyWatcher(p)
+        try:
+            make_jsonl([{}], "new.jsonl").replace(p)
+            assert watcher.wait(1) is True
+            while watcher.wait(0.05):
+                pass
+            thread = _append_later(p, "{}\n")
+            assert watcher.wait(5) is True
+            thread.join()
+        finally:
+            watcher.close()
+
+    def test_wakeup_interrupts_wait(self, make_jsonl):
+        p = make_jsonl([])
+        watcher = InotifyWatcher(p)
+        try:
+            threading.Timer(0.05, watcher.wakeup).start()
+            assert watcher.wait(None) is False
+        finally:
+            watcher.close()
+
+
+@needs_watchdog
+class TestWatchdogWatcher:
+    def test_append_wakes_waiter(self, make_jsonl):
+        p = make_jsonl([])
+        watcher = WatchdogWatcher(p)
+        try:
+            thread = _append_later(p, "{}\n")
+            assert watcher.wait(5) is True
+            thread.join()
+        finally:
+            watcher.close()
+
+    def test_reading_does_not_wake_waiter(self, make_jsonl):
+        """打开/读取文件（Detector 自己或其他读者）不算变化"""
+        p = make_jsonl([{}])
+        watcher = WatchdogWatcher(p)
+        try:
+            for _ in range(5):
+                with open(p) as f:
+                    f.read()
+            assert watcher.wait(0.3) is False
+        finally:
+            watcher.close()
+
+
+class TestCreateWatcher:
+    def test_poll_disables_notifications(self, make_jsonl):
+        assert create_watcher(make_jsonl([]), "poll") is None
+
+    def test_auto_falls_back_to_none(self, make_jsonl):
+        with (
+            patch("claude_auto_responder.WatchdogWatcher", side_effect=ImportError),
+            patch("claude_auto_responder.InotifyWatcher", side_effect=OSError),
+        ):
+            assert create_watcher(make_jsonl([]), "auto") is None
+
+    @linux_only
+    def test_auto_uses_inotify_without_watchdog(self, make_jsonl):
+        with patch("claude_auto_responder.WatchdogWatcher", side_effect=ImportError):
+            watcher = create_watcher(make_jsonl([]), "auto")
+        try:
+            assert watcher.backend == "inotify"
+        finally:
+            watcher.close()
+
+
+@linux_only
+def test_event_mode_reacts_without_sleeping(tmp_project, make_jsonl, bash_tool_use):
+    """Event mode answers a new permission request well under the poll interval."""
+    jsonl_path = make_jsonl([])
+    args = parse_args(
+        [
+            "--jsonl",
+            str(jsonl_path),
+            "--tmux-pane",
+            "fake:0.1",
+            "--project-root",
+            str(tmp_project),
+            "--dry-run",
+            "--watch",
+            "inotify",
+            "--debounce-ms",
+            "20",
+            "--poll-interval",
+            "30",
+            "--state-file",
+            str(tmp_project / "state.json"),
+        ]
+    )
+    logger = MagicMock(spec=Logger)
+    loop = MainLoop(args, logger)
+    reacted = []
+    logger.sent.side_effect = lambda *a: (reacted.append(time.monotonic()), loop.stop())
+    written = []
+
+    def _write():
+        time.sleep(0.1)
+        written.append(time.monotonic())
+        with open(jsonl_path, "a") as f:
+            f.write(json.dumps(bash_tool_use(tool_id="toolu_evt")) + "\n")
+
+    threading.Thread(target=_write).start()
+    threading.Timer(10, loop.stop).start()
+    assert loop.run() == 0
+
+    assert reacted, "no response was sent"
+    assert reacted[0] - written[0] < 1
+    state = json.loads((tmp_project / "state.json").read_text())
+    assert state["decision_cache"]["misses"] == 1
+
+
+@linux_only
+def test_event_mode_debounce_is_capped_under_continuous_writes(tmp_project, make_jsonl, bash_tool_use):
+    """A session writing more often than the debounce interval is still checked."""
+    jsonl_path = make_jsonl([])
+    args = parse_args(
+        [
+            "--jsonl",
+            str(jsonl_path),
+            "--tmux-pane",
+            "fake:0.1",
+            "--project-root",
+            str(tmp_project),
+            "--dry-run",
+            "--watch",
+            "inotify",
+            "--debounce-ms",
+            "50",
+            "--state-file",
+            str(tmp_project / "state.json"),
+        ]
+    )
+    logger = MagicMock(spec=Logger)
+    loop = MainLoop(args, logger)
+    writing = threading.Event()
+    writing.set()
+    sent_while_writing = []
+    logger.sent.side_effect = lambda *a: (sent_while_writing.append(writing.is_set()), loop.stop())
+
+    def _write():
+        time.sleep(0.1)
+        with open(jsonl_path, "a") as f:
+            f.write(json.dumps(bash_tool_use(tool_id="toolu_busy")) + "\n")
+        deadline = time.monotonic() + 3
+        while time.monotonic() < deadline and not sent_while_writing:
+            with open(jsonl_path, "a") as f:
+                f.write(json.dumps({"type": "progress"}) + "\n")
+            time.sleep(0.02)
+        writing.clear()
+
+    writer = threading.Thread(target=_write)
+    writer.start()
+    threading.Timer(10, loop.stop).start()
+    assert loop.run() == 0
+    writer.join()
+
+    assert sent_while_writing == [True]
+
+
+# ============================================================================
+# Supervisor (multi-session) tests
+# ============================================================================
+
+
+def _write_sessions(path, sessions):
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps({"sessions": sessions}))
+    tmp.replace(path)
+
+
+class TestLoadSupervisorConfig:
+    def test_defaults_and_absolute_paths(self, tmp_path):
+        cfg = tmp_path / "sessions.json"
+        _write_sessions(cfg, [{"jsonl": str(tmp_path / "abc.jsonl"), "tmux_pane": "c:0.1"}])
+
+        (session,) = load_supervisor_config(cfg)
+        assert session == {
+            "name": "abc",
+            "jsonl": str(tmp_path / "abc.jsonl"),
+            "tmux_pane": "c:0.1",
+            "project_root": None,
+        }
+
+    @pytest.mark.parametrize(
+        "body",
+        [
+            "not json",
+            "[]",
+            '{"sessions": [{"jsonl": "a.jsonl"}]}',
+            '{"sessions": [{"jsonl": "a.jsonl", "tmux_pane": "p"}, {"jsonl": "b/a.jsonl", "tmux_pane": "q"}]}',
+        ],
+    )
+    def test_invalid_config(self, tmp_path, body):
+        cfg = tmp_path / "sessions.json"
+        cfg.write_text(body)
+        with pytest.raises(SupervisorConfigError):
+            load_supervisor_config(cfg)
+
+    def test_supervise_makes_jsonl_optional(self, tmp_path):
+        args = parse_args(["--supervise", str(tmp_path / "s.json")])
+        assert args.jsonl is None
+        with pytest.raises(SystemExit):
+            parse_args([])
+
+
+async def _until(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "condition not met in time"
+        await asyncio.sleep(0.01)
+
+
+def _supervisor(tmp_path, tmp_project, watch, *extra):
+    cfg = tmp_path / "sessions.json"
+    args = parse_args(
+        [
+            "--supervise",
+            str(cfg),
+            "--project-root",
+            str(tmp_project),
+            "--dry-run",
+            "--watch",
+            watch,
+            "--debounce-ms",
+            "20",
+            "--poll-interval",
+            "0.05",
+            *extra,
+        ]
+    )
+    logger = MagicMock(spec=Logger)
+    return cfg, Supervisor(args, logger), logger
+
+
+@pytest.mark.parametrize(
+    "backend",
+    [pytest.param("watchdog", marks=needs_watchdog), pytest.param("inotify", marks=linux_only)],
+)
+def test_watch_hub_reading_in_callback_does_not_retrigger(make_jsonl, backend):
+    """on_change 里读取被监听的文件（reload / tick 都会读）不会再次触发 on_change"""
+    p = make_jsonl([])
+    calls = []
+
+    def on_change(path):
+        calls.append(path)
+        with open(path) as f:
+            f.read()
+
+    async def scenario():
+        hub = WatchHub(on_change, backend=backend)
+        assert hub.backend == backend
+        hub.start()
+        hub.watch(str(p))
+        try:
+            with open(p, "a") as f:
+                f.write("{}\n")
+            await _until(lambda: calls)
+            await asyncio.sleep(0.3)
+            settled = len(calls)
+            await asyncio.sleep(0.3)
+            assert len(calls) == settled
+        finally:
+            hub.close()
+
+    asyncio.run(scenario())
+    assert 1 <= len(calls) <= 3
+
+
+def _sent_to(logger, name):
+    return [c for c in logger.sent.call_args_list if c.args[0].startswith(f"[{name}]")]
+
+
+@pytest.mark.parametrize(
+    "watch",
+    [pytest.param("inotify", marks=linux_only), "poll"],
+)
+def test_supervisor_hot_adds_and_removes_sessions(tmp_path, tmp_project, make_jsonl, bash_tool_use, watch):
+    """Sessions share one process and are added/removed when the config changes."""
+    a = make_jsonl([], "a.jsonl")
+    b = make_jsonl([], "b.jsonl")
+    cfg, supervisor, logger = _supervisor(tmp_path, tmp_project, watch)
+    _write_sessions(cfg, [{"name": "a", "jsonl": str(a), "tmux_pane": "x:0.1"}])
+
+    def _append(path, tool_id):
+        with open(path, "a") as f:
+            f.write(json.dumps(bash_tool_use(tool_id=tool_id)) + "\n")
+
+    async def scenario():
+        task = asyncio.create_task(supervisor.serve())
+        await _until(lambda: "a" in supervisor.sessions)
+
+        _append(a, "toolu_a1")
+        await _until(lambda: len(_sent_to(logger, "a")) == 1)
+
+        _write_sessions(
+            cfg,
+            [
+                {"name": "a", "jsonl": str(a), "tmux_pane": "x:0.1"},
+                {"name": "b", "jsonl": str(b), "tmux_pane": "x:0.2"},
+            ],
+        )
+        await _until(lambda: "b" in supervisor.sessions)
+        session_a = supervisor.sessions["a"]
+        _append(b, "toolu_b1")
+        await _until(lambda: len(_sent_to(logger, "b")) == 1)
+        assert supervisor.sessions["a"] is session_a
+        # Same project root -> one shared SafetyPolicyEngine/Router
+        assert supervisor.sessions["b"].router is session_a.router
+
+        _write_sessions(cfg, [{"name": "b", "jsonl": str(b), "tmux_pane": "x:0.2"}])
+        await _until(lambda: "a" not in supervisor.sessions)
+        _append(a, "toolu_a2")
+        _append(b, "toolu_b2")
+        await _until(lambda: len(_sent_to(logger, "b")) == 2)
+        assert len(_sent_to(logger, "a")) == 1
+
+        supervisor.stop()
+        await task
+
+    asyncio.run(scenario())
+    assert supervisor.sessions == {}
+
+
+def test_supervisor_keeps_sessions_on_invalid_reload(tmp_path, tmp_project, make_jsonl):
+    a = make_jsonl([], "a.jsonl")
+    cfg, supervisor, logger = _supervisor(tmp_path, tmp_project, "poll")
+    _write_sessions(cfg, [{"name": "a", "jsonl": str(a), "tmux_pane": "x:0.1"}])
+
+    async def scenario():
+        task = asyncio.create_task(supervisor.serve())
+        await _until(lambda: "a" in supervisor.sessions)
+        cfg.write_text("{broken")
+        assert supervisor.reload() is False
+        assert list(supervisor.sessions) == ["a"]
+        supervisor.stop()
+        await task
+
+    asyncio.run(scenario())
+    assert logger.error.called
+
+
+def test_supervisor_reloads_policy_file(tmp_path, tmp_project, make_jsonl):
+    """A policy edit is recompiled once for every session, without a restart."""
+    a = make_jsonl([], "a.jsonl")
+    policy_file = tmp_path / "policy.json"
+    policy_file.write_text("{}")
+    cfg, supervisor, logger = _supervisor(
+        tmp_path,
+        tmp_project,
+        "poll",
+        "--safety-policy-file",
+        str(policy_file),
+        "--state-file",
+        str(tmp_path / "state.json"),
+    )
+    _write_sessions(cfg, [{"name": "a", "jsonl": str(a), "tmux_pane": "x:0.1"}])
+
+    async def scenario():
+        task = asyncio.create_task(supervisor.serve())
+        await _until(lambda: "a" in supervisor.sessions)
+        engine = supervisor.sessions["a"].router._engine
+        assert engine.evaluate("Bash", {"command": "docker ps"}).action == "DENY"
+
+        _rewrite(policy_file, '{"allow_commands": ["docker"]}')
+        await _until(lambda: logger.policy.called)
+        assert engine.policy_source.snapshot[0] == 2
+        assert engine.evaluate("Bash", {"command": "docker ps"}).action == "ALLOW"
+        supervisor.stop()
+        await task
+
+    asyncio.run(scenario())
+    state = json.loads((tmp_path / "state.json").read_text())
+    assert state["policy"]["version"] == policy_version({"allow_commands": ["docker"]})
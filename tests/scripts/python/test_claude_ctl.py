@@ -10,8 +10,10 @@ Tests for claude_ctl.py
 - 边界场景
 """
 
+import json
 import subprocess
 import sys
+from io import StringIO
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
@@ -30,7 +32,8 @@ import claude_ctl
 @pytest.fixture
 def mock_subprocess_run():
     """Mock subprocess.run for tmux commands"""
-    with patch("claude_ctl.subprocess.run") as mock_run:
+    # 控制模式连接同样不可用，回退到（被 mock 的）逐条调用
+    with patch("claude_ctl.subprocess.run") as mock_run, patch("claude_ctl.subprocess.Popen", side_effect=OSError):
         mock_run.return_value = MagicMock(returncode=0, stdout="", stderr="")
         yield mock_run
 
@@ -637,5 +640,210 @@ class TestEdgeCases:
         assert result == claude_ctl.EXIT_SUCCESS
 
 
+# ============================================================================
+# tmux 控制模式
+# ============================================================================
+
+
+class TestTmuxControl:
+    """测试通过 tmux -C 连接批量发送按键（使用隔离的 tmux server）"""
+
+    @pytest.fixture(autouse=True)
+    def _reset_control(self):
+        yield
+        claude_ctl.TmuxClient.use_control(None)
+
+    def test_select_uses_one_connection(self, tmux_server):
+        """多选的所有按键通过一个控制模式连接发送，不再逐条启动 tmux"""
+        claude_ctl.TmuxClient.use_control(claude_ctl.TmuxControl())
+        with patch("claude_ctl.subprocess.run") as mock_run:
+            result = claude_ctl.handle_select(tmux_server.session, 'A, B "$x"')
+        assert result == claude_ctl.EXIT_SUCCESS
+        mock_run.assert_not_called()
+        assert sorted(tmux_server.wait_for_lines(4)) == sorted(["A", "A", 'B "$x"', 'B "$x"'])
+
+    def test_missing_session_via_control(self, tmux_server):
+        claude_ctl.TmuxClient.use_control(claude_ctl.TmuxControl())
+        assert claude_ctl.TmuxClient.session_exists(tmux_server.session) is True
+        with patch("claude_ctl.subprocess.run") as mock_run:
+            mock_run.return_value = MagicMock(returncode=1)
+            assert claude_ctl.handle_approve("nonexistent") == claude_ctl.EXIT_SESSION_NOT_FOUND
+
+    def test_message_with_newline_via_control(self, tmux_server):
+        claude_ctl.TmuxClient.use_control(claude_ctl.TmuxControl())
+        assert claude_ctl.handle_message(tmux_server.session, "第一行\n第二行") == claude_ctl.EXIT_SUCCESS
+        assert "第二行" in tmux_server.wait_for_lines(2)[-1]
+
+    def test_quote(self):
+        assert claude_ctl.tmux_quote('a "b" $c') == '"a \\"b\\" \\$c"'
+
+
+# ============================================================================
+# 批量模式 (--batch)
+# ============================================================================
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def _batch(lines, ttl=2.0):
+    out = StringIO()
+    code = claude_ctl.run_batch(StringIO("".join(line + "\n" for line in lines)), out, ttl)
+    return code, [json.loads(line) for line in out.getvalue().splitlines()]
+
+
+class TestTargetCache:
+    """测试 session/pane 列表缓存"""
+
+    def test_listing_reused_within_ttl(self):
+        clock = FakeClock()
+        cache = claude_ctl.TargetCache(ttl=2.0, clock=clock)
+        with (
+            patch("claude_ctl.TmuxClient.list_targets", return_value=["main:0.0", "main:1.2"]) as mock_list,
+            patch("claude_ctl.TmuxClient.session_exists") as mock_exists,
+        ):
+            assert cache.exists("main")
+            assert cache.exists("main:1")
+            assert cache.exists("main:1.2")
+            assert mock_list.call_count == 1
+            clock.now += 2.0
+            assert cache.exists("main:0.0")
+            assert mock_list.call_count == 2
+            mock_exists.assert_not_called()
+
+    def test_miss_is_confirmed_with_tmux(self):
+        cache = claude_ctl.TargetCache(clock=FakeClock())
+        with (
+            patch("claude_ctl.TmuxClient.list_targets", return_value=["main:0.0"]),
+            patch("claude_ctl.TmuxClient.session_exists", side_effect=lambda name: name == "%3") as mock_exists,
+        ):
+            assert cache.exists("%3") is True
+            assert cache.exists("other") is False
+            assert mock_exists.call_count == 2
+
+
+class TestRunBatch:
+    """测试 --batch 命令解析与结果输出"""
+
+    def test_one_result_per_command(self, mock_subprocess_run):
+        with (
+            patch("claude_ctl.TmuxClient.list_targets", return_value=["main:0.0"]),
+            patch("claude_ctl.TmuxClient.session_exists", return_value=False),
+        ):
+            code, results = _batch(
+                [
+                    '{"id": 1, "action": "message", "session": "main", "text": "继续"}',
+                    "",
+                    '{"id": 2, "action": "select", "session": "main:0.0", "options": ["A", "B"]}',
+                    '{"id": 3, "action": "approve", "session": "gone"}',
+                    "not json",
+                    '{"id": 5, "action": "select", "session": "main", "options": "A,,B"}',
+                    '{"id": 6, "action": "explode", "session": "main"}',
+                    '{"id": 7, "action": "reject"}',
+                ]
+            )
+        assert [r.get("id") for r in results] == [1, 2, 3, None, 5, 6, 7]
+        assert [r["code"] for r in results] == [
+            claude_ctl.EXIT_SUCCESS,
+            claude_ctl.EXIT_SUCCESS,
+            claude_ctl.EXIT_SESSION_NOT_FOUND,
+            claude_ctl.EXIT_INVALID_ARGS,
+            claude_ctl.EXIT_INVALID_ARGS,
+            claude_ctl.EXIT_INVALID_ARGS,
+            claude_ctl.EXIT_INVALID_ARGS,
+        ]
+        assert results[0]["ok"] is True and results[0]["error"] is None
+        assert "not found" in results[2]["error"]
+        assert code == claude_ctl.EXIT_SESSION_NOT_FOUND
+        # 消息 (文本 + Enter) 与两个选项 (各自文本 + Enter)
+        assert mock_subprocess_run.call_count == 6
+
+    def test_malformed_fields_fail_only_their_line(self, mock_subprocess_run):
+        with patch("claude_ctl.TmuxClient.list_targets", return_value=["s:0.0"]):
+            code, results = _batch(
+                [
+                    '{"id": 1, "action": "select", "session": "s", "options": 5}',
+                    '{"id": 2, "action": "select", "session": "s", "options": ["A", 1]}',
+                    '{"id": 3, "action": "list-panes", "session": 5}',
+                    '{"id": 4, "action": "approve", "session": ["s"]}',
+                    "[1, 2]",
+                    "not json",
+                    '{"id": 7, "action": "approve", "session": "s"}',
+                ]
+            )
+        assert [r["id"] for r in results] == [1, 2, 3, 4, None, None, 7]
+        assert [r["code"] for r in results] == [claude_ctl.EXIT_INVALID_ARGS] * 6 + [claude_ctl.EXIT_SUCCESS]
+        assert "options must be" in results[0]["error"]
+        assert "session must be" in results[2]["error"]
+        # 每行结果形状一致
+        assert all(set(r) == {"id", "action", "ok", "code", "error"} for r in results[:-1])
+        assert results[4]["action"] is None
+        assert code == claude_ctl.EXIT_INVALID_ARGS
+
+    def test_unexpected_exception_fails_only_its_line(self, mock_subprocess_run):
+        with (
+            patch("claude_ctl.TmuxClient.list_targets", return_value=["s:0.0"]),
+            patch("claude_ctl.TmuxClient.list_sessions", side_effect=RuntimeError("boom")),
+        ):
+            code, results = _batch(
+                [
+                    '{"id": 1, "action": "list-sessions"}',
+                    '{"id": 2, "action": "approve", "session": "s"}',
+                ]
+            )
+        assert results[0] == {
+            "id": 1,
+            "action": "list-sessions",
+            "ok": False,
+            "code": claude_ctl.EXIT_TMUX_ERROR,
+            "error": "RuntimeError: boom",
+        }
+        assert results[1]["ok"] is True
+        assert code == claude_ctl.EXIT_TMUX_ERROR
+
+    def test_list_actions(self, mock_subprocess_run):
+        with patch("claude_ctl.TmuxClient.list_sessions", return_value=["a", "b"]):
+            code, results = _batch(['{"action": "list-sessions"}'])
+        assert code == claude_ctl.EXIT_SUCCESS
+        assert results[0]["sessions"] == ["a", "b"]
+
+    def test_batch_rejects_inline_action(self):
+        with patch("sys.argv", ["claude-ctl", "--batch", "--approve", "--session", "x"]):
+            with pytest.raises(SystemExit) as exc_info:
+                claude_ctl.parse_args()
+        assert exc_info.value.code == claude_ctl.EXIT_INVALID_ARGS
+
+    def test_batch_over_control_connection(self, tmux_server):
+        """批量命令复用一个控制模式连接，session 列表只查询一次"""
+        claude_ctl.TmuxClient.use_control(claude_ctl.TmuxControl())
+        try:
+            with patch("claude_ctl.subprocess.run", wraps=subprocess.run) as mock_run:
+                code, results = _batch(
+                    [
+                        '{"action": "message", "session": "ctl", "text": "one"}',
+                        '{"action": "select", "session": "ctl:0.0", "options": "two, three"}',
+                        '{"action": "approve", "session": "ctl:0"}',
+                    ]
+                )
+            assert code == claude_ctl.EXIT_SUCCESS
+            assert all(result["ok"] for result in results)
+            assert mock_run.call_count == 1  # 首次 list-panes，之后都走控制模式连接
+            lines = tmux_server.wait_for_lines(8)
+            assert sorted(lines) == sorted(["one", "one", "two", "two", "three", "three", "Y", "Y"])
+
+            # 连接所在的 session 被关闭后，下一条命令重新连接到目标 session
+            subprocess.run(["tmux", "new-session", "-d", "-s", "other", "cat"], check=True)
+            subprocess.run(["tmux", "kill-session", "-t", "ctl"], check=True)
+            code, results = _batch(['{"action": "message", "session": "other", "text": "again"}'], ttl=0)
+            assert code == claude_ctl.EXIT_SUCCESS, results
+        finally:
+            claude_ctl.TmuxClient.use_control(None)
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
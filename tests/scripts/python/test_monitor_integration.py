@@ -5,9 +5,12 @@ Task 5.2: 编写端到端集成测试
 """
 
 import json
+import os
 import sys
+import threading
 from pathlib import Path
-from unittest.mock import MagicMock
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
 
 import pytest
 
@@ -16,11 +19,23 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "scripts" /
 from claude_monitor import (
     ClaudeSessionMonitor,
     ErrorInfo,
+    ErrorStopEvent,
+    EventBus,
+    InProcessNotifier,
+    MultiProjectMonitor,
     OutputFormatter,
     QuestionInfo,
     QuestionOption,
     SessionStatus,
     StateDetector,
+    TaskCompleteEvent,
+    TeeNotifier,
+    ToolUseEvent,
+    ToolUseInfo,
+    UserQuestionEvent,
+    default_sink_policy,
+    iter_lines_reversed,
+    tail_session_file,
 )
 
 FIXTURES_DIR = Path(__file__).parent / "fixtures"
@@ -315,5 +330,374 @@ class TestBackwardCompatibilityIntegration:
         assert callback.called
 
 
+def _record(kind: str, text: str, stop_reason="end_turn") -> str:
+    message = {"content": [{"type": "text", "text": text}], "stop_reason": stop_reason}
+    return json.dumps({"type": kind, "message": message}, ensure_ascii=False) + "\n"
+
+
+class TestStartupTailing:
+    """测试启动时反向读取 session 文件尾部"""
+
+    def test_iter_lines_reversed_across_blocks(self, tmp_path):
+        """行跨越多个块时按逆序完整产出"""
+        content = b"first\n" + b"x" * 50 + b"\n\nlast\npartial"
+        session_file = tmp_path / "s.jsonl"
+        session_file.write_bytes(content)
+
+        with open(session_file, "rb") as f:
+            lines = list(iter_lines_reversed(f, len(content), block_size=7))
+
+        assert lines == list(reversed(content.split(b"\n")))
+
+    def test_finds_last_assistant_without_parsing_whole_file(self, tmp_path):
+        """从末尾找到最后一条 assistant 记录即停止，不解析更早的记录"""
+        session_file = tmp_path / "s.jsonl"
+        body = _record("assistant", "old") * 2000 + _record("assistant", "最后的回复") + _record("user", "y" * 5000)
+        session_file.write_text(body, encoding="utf-8")
+
+        with patch("claude_monitor.json.loads", wraps=json.loads) as mock_loads:
+            record, offset = tail_session_file(session_file, block_size=4096)
+
+        assert record["message"]["content"][0]["text"] == "最后的回复"
+        assert offset == session_file.stat().st_size
+        # 末尾的 user 记录被预筛选跳过，只解析找到的 assistant 记录
+        assert mock_loads.call_count == 1
+
+    def test_partial_last_line_is_left_for_incremental_read(self, tmp_path):
+        """末尾未写完的记录不计入偏移，补全后由增量读取触发回调"""
+        callback = MagicMock()
+        session_file = tmp_path / "abc.jsonl"
+        complete = _record("assistant", "done")
+        pending = _record("assistant", "next")
+        session_file.write_text(complete + pending[:20], encoding="utf-8")
+
+        monitor = ClaudeSessionMonitor(project_dir=tmp_path, quiet=True, on_complete=callback)
+        monitor._initialize_from_existing_files()
+
+        assert monitor.sessions["abc"].last_output == "done"
+        assert monitor._file_positions[str(session_file)] == len(complete.encode())
+        callback.assert_not_called()
+
+        session_file.write_text(complete + pending, encoding="utf-8")
+        monitor.process_session_file(session_file)
+        assert monitor.sessions["abc"].last_output == "next"
+        callback.assert_called_once()
+
+    def test_only_most_recent_sessions_are_restored(self, tmp_path):
+        """只恢复最近修改的 N 个 session，其余文件从末尾开始增量读取"""
+        callback = MagicMock()
+        for index in range(4):
+            session_file = tmp_path / f"s{index}.jsonl"
+            session_file.write_text(_record("assistant", f"reply {index}"), encoding="utf-8")
+            os.utime(session_file, (1000 + index, 1000 + index))
+
+        monitor = ClaudeSessionMonitor(project_dir=tmp_path, quiet=True, on_complete=callback, max_sessions=2)
+        monitor._initialize_from_existing_files()
+
+        assert sorted(monitor.sessions) == ["s2", "s3"]
+        old_file = tmp_path / "s0.jsonl"
+        assert monitor._file_positions[str(old_file)] == old_file.stat().st_size
+
+        with open(old_file, "a", encoding="utf-8") as f:
+            f.write(_record("assistant", "resumed"))
+        monitor.process_session_file(old_file)
+        assert monitor.sessions["s0"].last_output == "resumed"
+        callback.assert_called_once()
+
+    def test_unrestored_session_keeps_half_written_record(self, tmp_path):
+        """未恢复的文件以半行结尾时，读取位置停在行首，补全后不丢这条记录"""
+        callback = MagicMock()
+        complete = _record("assistant", "old")
+        pending = _record("assistant", "finished later")
+        old_file = tmp_path / "s0.jsonl"
+        old_file.write_text(complete + pending[:20], encoding="utf-8")
+        os.utime(old_file, (1000, 1000))
+        (tmp_path / "s1.jsonl").write_text(_record("assistant", "recent"), encoding="utf-8")
+
+        monitor = ClaudeSessionMonitor(project_dir=tmp_path, quiet=True, on_complete=callback, max_sessions=1)
+        monitor._initialize_from_existing_files()
+
+        assert "s0" not in monitor.sessions
+        assert monitor._file_positions[str(old_file)] == len(complete.encode())
+
+        old_file.write_text(complete + pending, encoding="utf-8")
+        monitor.process_session_file(old_file)
+        assert monitor.sessions["s0"].last_output == "finished later"
+        callback.assert_called_once()
+
+    def test_max_sessions_zero_restores_all(self, tmp_path):
+        for index in range(3):
+            (tmp_path / f"s{index}.jsonl").write_text(_record("assistant", "x"), encoding="utf-8")
+
+        monitor = ClaudeSessionMonitor(project_dir=tmp_path, quiet=True, max_sessions=0)
+        monitor._initialize_from_existing_files()
+
+        assert len(monitor.sessions) == 3
+
+
+def _event(path: Path, is_directory: bool = False) -> SimpleNamespace:
+    return SimpleNamespace(src_path=str(path), is_directory=is_directory)
+
+
+class TestMultiProjectMonitor:
+    """测试多项目监听：事件路由、项目字段与空闲淘汰"""
+
+    def _root(self, tmp_path: Path) -> Path:
+        root = tmp_path / "projects"
+        for project in ("-work-a", "-work-b"):
+            (root / project).mkdir(parents=True)
+            (root / project / f"{project[-1]}1.jsonl").write_text(_record("assistant", "idle"), encoding="utf-8")
+        return root
+
+    def test_events_are_routed_to_their_project(self, tmp_path):
+        callback = MagicMock()
+        root = self._root(tmp_path)
+        monitor = MultiProjectMonitor(projects_root=root, quiet=True, on_complete=callback)
+        monitor._initialize_from_existing_files()
+
+        assert sorted(monitor.monitors) == ["-work-a", "-work-b"]
+        assert monitor.get_session_state("a1").project == "-work-a"
+        callback.assert_not_called()
+
+        session_file = root / "-work-b" / "b1.jsonl"
+        with open(session_file, "a", encoding="utf-8") as f:
+            f.write(_record("assistant", "done in b"))
+        monitor.on_modified(_event(session_file))
+
+        callback.assert_called_once()
+        session_id, state = callback.call_args.args
+        assert session_id == "b1"
+        assert state.project == "-work-b"
+        assert state.last_output == "done in b"
+        assert "b1" not in monitor.monitors["-work-a"].sessions
+
+    def test_new_project_and_nested_files(self, tmp_path):
+        callback = MagicMock()
+        root = self._root(tmp_path)
+        monitor = MultiProjectMonitor(projects_root=root, quiet=True, on_complete=callback)
+        monitor._initialize_from_existing_files()
+
+        # 子目录中的文件（如 subagent 日志）不属于项目 session
+        nested = root / "-work-a" / "a1" / "subagents" / "agent.jsonl"
+        nested.parent.mkdir(parents=True)
+        nested.write_text(_record("assistant", "sub"), encoding="utf-8")
+        monitor.on_created(_event(nested))
+        monitor.on_modified(_event(nested))
+        callback.assert_not_called()
+
+        new_file = root / "-work-c" / "c1.jsonl"
+        new_file.parent.mkdir()
+        monitor.on_created(_event(new_file.parent, is_directory=True))
+        new_file.write_text(_record("assistant", "hello"), encoding="utf-8")
+        monitor.on_created(_event(new_file))
+        monitor.on_modified(_event(new_file))
+
+        assert monitor.get_session_state("c1").project == "-work-c"
+        callback.assert_called_once()
+
+    def test_max_sessions_is_global(self, tmp_path):
+        root = self._root(tmp_path)
+        os.utime(root / "-work-a" / "a1.jsonl", (1000, 1000))
+        os.utime(root / "-work-b" / "b1.jsonl", (2000, 2000))
+
+        monitor = MultiProjectMonitor(projects_root=root, quiet=True, max_sessions=1)
+        monitor._initialize_from_existing_files()
+
+        assert list(monitor.get_all_sessions()) == ["b1"]
+        assert monitor.get_session_state("b1").last_activity == 2000
+
+    def test_idle_sessions_are_evicted(self, tmp_path):
+        callback = MagicMock()
+        root = self._root(tmp_path)
+        monitor = MultiProjectMonitor(projects_root=root, quiet=True, on_complete=callback, idle_ttl=60)
+        monitor._initialize_from_existing_files()
+        monitor.get_session_state("a1").last_activity = 1000
+        monitor.get_session_state("b1").last_activity = 1050
+
+        assert monitor.evict_idle_sessions(now=1100) == ["a1"]
+        assert sorted(monitor.get_all_sessions()) == ["b1"]
+
+        # 读取位置保留：再次写入只处理新内容
+        session_file = root / "-work-a" / "a1.jsonl"
+        with open(session_file, "a", encoding="utf-8") as f:
+            f.write(_record("assistant", "back"))
+        monitor.on_modified(_event(session_file))
+        assert monitor.get_session_state("a1").last_output == "back"
+        callback.assert_called_once()
+
+    def test_missing_root(self, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            MultiProjectMonitor(projects_root=tmp_path / "missing")
+
+
+def _tool_use(session_id: str, command: str) -> ToolUseEvent:
+    tool = ToolUseInfo(tool_name="Bash", tool_id=command, tool_input={"command": command})
+    return ToolUseEvent(session_id=session_id, project="-work", timestamp=0.0, tools=[tool])
+
+
+class TestEventBus:
+    """测试事件总线：多订阅者、独立队列与背压策略"""
+
+    def _blocked_sink(self, bus: EventBus, **options):
+        """返回一个在 release 之前卡住的订阅者及其收到的事件"""
+        received, started, release = [], threading.Event(), threading.Event()
+
+        def handler(event):
+            started.set()
+            release.wait(5)
+            received.append(event)
+
+        subscription = bus.subscribe(handler, name="slow", **options)
+        return subscription, received, started, release
+
+    def test_monitor_publishes_to_every_subscriber(self, tmp_path):
+        bus = EventBus()
+        first, second = [], []
+        subscription = bus.subscribe(first.append, name="first")
+        bus.subscribe(second.append, name="second", event_types=(ErrorStopEvent,))
+        legacy = MagicMock()
+        monitor = ClaudeSessionMonitor(project_dir=tmp_path, quiet=True, on_complete=legacy, bus=bus)
+
+        monitor._process_message("s1", json.loads(_record("assistant", "done")))
+        bus.close()
+
+        legacy.assert_called_once()
+        assert second == []
+        assert [type(event) for event in first] == [TaskCompleteEvent]
+        data = first[0].to_dict()
+        assert data["session_id"] == "s1"
+        assert data["project"] == tmp_path.name
+        assert data["status"] == SessionStatus.TASK_COMPLETE.value
+        assert data["stop_reason"] == "end_turn"
+        assert data["output"] == "done"
+        assert subscription.stats()["delivered"] == 1
+
+    def test_event_dict_shapes(self):
+        data = _tool_use("s1", "ls").to_dict()
+        assert data["status"] == SessionStatus.TOOL_USE.value
+        assert data["tools"] == [{"name": "Bash", "id": "ls", "details": {"command": "ls"}}]
+
+        error = ErrorInfo(error_type="api_error", message="boom")
+        data = ErrorStopEvent(session_id="s1", project="-work", timestamp=1.0, error=error).to_dict()
+        assert data["error"] == {"type": "api_error", "message": "boom", "tool_name": None, "tool_input": None}
+
+    def test_slow_sink_drops_oldest_without_blocking(self):
+        bus = EventBus()
+        fast = []
+        bus.subscribe(fast.append, name="fast")
+        slow, received, started, release = self._blocked_sink(bus, maxsize=2)
+
+        bus.publish(_tool_use("s1", "cmd0"))
+        assert started.wait(5)
+        for index in range(1, 6):
+            bus.publish(_tool_use("s1", f"cmd{index}"))
+
+        assert slow.stats()["queued"] == 2
+        assert slow.stats()["dropped"] == 3
+        release.set()
+        bus.close()
+
+        assert [event.tools[0].tool_id for event in received] == ["cmd0", "cmd4", "cmd5"]
+        assert len(fast) == 6
+
+    def test_coalesce_keeps_latest_per_session_and_type(self):
+        bus = EventBus()
+        slow, received, started, release = self._blocked_sink(bus, policy="coalesce")
+
+        bus.publish(_tool_use("s1", "cmd0"))
+        assert started.wait(5)
+        bus.publish(_tool_use("s1", "cmd1"))
+        bus.publish(_tool_use("s2", "other"))
+        bus.publish(_tool_use("s1", "cmd2"))
+        bus.publish(TaskCompleteEvent(session_id="s1", project="-work", timestamp=0.0))
+        release.set()
+        bus.close()
+
+        assert [(event.session_id, type(event).__name__) for event in received] == [
+            ("s1", "ToolUseEvent"),
+            ("s2", "ToolUseEvent"),
+            ("s1", "ToolUseEvent"),
+            ("s1", "TaskCompleteEvent"),
+        ]
+        assert received[2].tools[0].tool_id == "cmd2"
+        assert slow.stats()["coalesced"] == 1
+
+    def test_coalesced_event_does_not_jump_ahead(self):
+        """被合并的新事件排到队尾，不会越过在它之前发布的其他事件"""
+        bus = EventBus()
+        slow, received, started, release = self._blocked_sink(bus, policy="coalesce")
+
+        def question(text):
+            info = QuestionInfo(question=text, header="Q", options=[QuestionOption(label="A", description="")])
+            return UserQuestionEvent(session_id="s1", project="-work", timestamp=0.0, questions=[info])
+
+        bus.publish(_tool_use("s1", "cmd0"))
+        assert started.wait(5)
+        bus.publish(question("Q1"))
+        bus.publish(TaskCompleteEvent(session_id="s1", project="-work", timestamp=0.0))
+        bus.publish(question("Q2"))
+        release.set()
+        bus.close()
+
+        assert [type(event).__name__ for event in received[1:]] == ["TaskCompleteEvent", "UserQuestionEvent"]
+        assert received[2].questions[0].question == "Q2"
+
+    def test_block_policy_waits_for_space(self):
+        bus = EventBus()
+        slow, received, started, release = self._blocked_sink(bus, maxsize=1, policy="block")
+        bus.publish(_tool_use("s1", "cmd0"))
+        assert started.wait(5)
+        bus.publish(_tool_use("s1", "cmd1"))
+
+        publisher = threading.Thread(target=bus.publish, args=(_tool_use("s1", "cmd2"),))
+        publisher.start()
+        publisher.join(0.2)
+        assert publisher.is_alive()
+
+        release.set()
+        publisher.join(5)
+        bus.close()
+        assert [event.tools[0].tool_id for event in received] == ["cmd0", "cmd1", "cmd2"]
+        assert slow.stats()["dropped"] == 0
+
+    def test_drop_tool_use_policy_keeps_important_events(self):
+        """队列满时先丢工具调用，问题与完成事件不被丢弃"""
+        bus = EventBus()
+        slow, received, started, release = self._blocked_sink(bus, maxsize=2, policy="drop-tool-use")
+
+        bus.publish(_tool_use("s1", "cmd0"))
+        assert started.wait(5)
+        bus.publish(TaskCompleteEvent(session_id="s1", project="-work", timestamp=0.0))
+        bus.publish(_tool_use("s1", "cmd1"))
+        bus.publish(ErrorStopEvent(session_id="s2", project="-work", timestamp=0.0, error=ErrorInfo("api_error", "x")))
+        bus.publish(_tool_use("s1", "cmd2"))
+        release.set()
+        bus.close()
+
+        assert [type(event).__name__ for event in received] == ["ToolUseEvent", "TaskCompleteEvent", "ErrorStopEvent"]
+        assert slow.stats()["dropped"] == 2
+
+    def test_default_telegram_sink_policy(self):
+        assert default_sink_policy(MagicMock(spec=InProcessNotifier)) == "block"
+        assert default_sink_policy(MagicMock(spec=TeeNotifier)) == "drop-tool-use"
+
+    def test_failing_sink_does_not_affect_others(self, capsys):
+        bus = EventBus()
+        received = []
+        broken = bus.subscribe(MagicMock(side_effect=RuntimeError("down")), name="broken")
+        bus.subscribe(received.append, name="ok")
+
+        bus.publish(_tool_use("s1", "ls"))
+        bus.close()
+
+        assert len(received) == 1
+        assert broken.stats()["errors"] == 1
+        assert "broken" in capsys.readouterr().err
+
+    def test_unknown_policy(self):
+        with pytest.raises(ValueError):
+            EventBus().subscribe(print, policy="spill")
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
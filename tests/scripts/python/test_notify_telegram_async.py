@@ -0,0 +1,418 @@
+#!/usr/bin/env python3
+"""
+Tests for the asyncio Telegram notifier in notify_telegram.py
+
+A local stub HTTP server stands in for the Telegram Bot API, so these tests
+exercise the real httpx client: connection reuse, retries with backoff,
+coalescing of queued TOOL_USE events, the bounded queue and rate limiting.
+"""
+
+import asyncio
+import json
+import sys
+import time
+import urllib.error
+from io import BytesIO, StringIO
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "scripts" / "python"))
+
+import notify_telegram
+from notify_telegram import (
+    AsyncTelegramNotifier,
+    Config,
+    Logger,
+    NotificationSpool,
+    RateLimitError,
+    RateLimitScheduler,
+    RetryHandler,
+    TokenBucket,
+    build_notification,
+    event_id,
+    run_notifier,
+)
+
+
+@pytest.fixture
+def stub(telegram_stub):
+    return telegram_stub
+
+
+@pytest.fixture
+def config(stub, tmp_path):
+    class StubConfig(Config):
+        BOT_TOKEN = "test-token"
+        CHAT_ID = "42"
+        PROXY = ""
+        API_BASE = stub.url
+        LOG_FILE = str(tmp_path / "notify.log")
+        RETRY_COUNT = 3
+        RETRY_INTERVAL = 0.01
+        RETRY_MAX_INTERVAL = 0.05
+        QUEUE_SIZE = 100
+        CHAT_RATE = 0
+        GLOBAL_RATE = 0
+
+    return StubConfig
+
+
+def _tool_use(session_id: str, name: str) -> dict:
+    return {"session_id": session_id, "status": "TOOL_USE", "tools": [{"name": name, "details": {}}]}
+
+
+def _complete(session_id: str) -> dict:
+    return {"session_id": session_id, "status": "TASK_COMPLETE", "stop_reason": "end_turn", "output": "done"}
+
+
+def _run(notifier: AsyncTelegramNotifier, events: list[dict]) -> None:
+    async def scenario():
+        async with notifier:
+            for event in events:
+                notifier.submit(event)
+            notifier.close()
+            await notifier.run()
+
+    asyncio.run(scenario())
+
+
+class TestAsyncTelegramNotifier:
+    """测试异步通知器"""
+
+    def test_messages_share_one_connection(self, stub, config):
+        notifier = AsyncTelegramNotifier(config)
+        _run(notifier, [_complete(f"session-{i}") for i in range(5)])
+
+        assert len(stub.requests) == 5
+        assert len(stub.connections) == 1
+        assert stub.requests[0]["path"] == "/bottest-token/sendMessage"
+        assert stub.requests[0]["chat_id"] == "42"
+        assert stub.requests[0]["parse_mode"] == "HTML"
+        assert notifier.stats()["sent"] == 5
+
+    def test_queued_tool_use_is_coalesced_per_session(self, stub, config):
+        notifier = AsyncTelegramNotifier(config)
+        events = [
+            _tool_use("aaaa1111", "Read"),
+            _tool_use("bbbb2222", "Grep"),
+            _tool_use("aaaa1111", "Edit"),
+            _complete("aaaa1111"),
+            _tool_use("aaaa1111", "Bash"),
+            _tool_use("aaaa1111", "Write"),
+        ]
+        _run(notifier, events)
+
+        texts = [request["text"] for request in stub.requests]
+        assert len(texts) == 3
+        assert "Grep" in texts[0]
+        # 尚未发送的 Read/Edit 被随后的完成通知取代
+        assert "任务完成" in texts[1]
+        # 完成通知之后的工具调用不会合并进更早的消息
+        assert "Bash" in texts[2] and "Write" in texts[2]
+        assert notifier.stats()["coalesced"] == 2
+        assert notifier.stats()["dropped"] == 1
+
+    def test_retries_with_backoff_without_blocking_submit(self, stub, config):
+        stub.responses = [(500, {"ok": False, "description": "busy"}), (200, {"ok": False, "description": "flood"})]
+        notifier = AsyncTelegramNotifier(config, retry_interval=0.2, max_interval=0.2)
+
+        async def scenario():
+            async with notifier:
+                notifier.submit(_complete("aaaa1111"))
+                sender = asyncio.create_task(notifier.run())
+                await asyncio.sleep(0.1)  # 第一次发送已失败，正在退避
+                started = time.monotonic()
+                for name in ("Read", "Edit", "Bash"):
+                    notifier.submit(_tool_use("bbbb2222", name))
+                submit_time = time.monotonic() - started
+                notifier.close()
+                await sender
+            return submit_time
+
+        submit_time = asyncio.run(scenario())
+
+        assert submit_time < 0.05
+        assert len(stub.requests) == 4  # 2 次失败 + 成功 + 合并后的工具调用
+        assert stub.requests[2]["text"] == stub.requests[0]["text"]
+        assert all(name in stub.requests[3]["text"] for name in ("Read", "Edit", "Bash"))
+        log = Path(config.LOG_FILE).read_text(encoding="utf-8")
+        assert "Telegram API 错误: busy" in log
+        assert "重试后" in log
+
+    def test_gives_up_after_max_retries(self, stub, config):
+        stub.responses = [(500, {"ok": False, "description": "down"})] * 3
+        notifier = AsyncTelegramNotifier(config, max_retries=2)
+        _run(notifier, [_complete("aaaa1111")])
+
+        assert len(stub.requests) == 3
+        assert notifier.stats()["failed"] == 1
+        assert "发送最终失败" in Path(config.LOG_FILE).read_text(encoding="utf-8")
+
+    def test_full_queue_drops_oldest(self, stub, config):
+        notifier = AsyncTelegramNotifier(config, queue_size=2)
+        _run(notifier, [_complete("aaaa1111"), _complete("bbbb2222"), _complete("cccc3333")])
+
+        assert [r["text"].count("aaaa1111") for r in stub.requests] == [0, 0]
+        assert notifier.stats()["dropped"] == 1
+        assert "通知已丢弃" in Path(config.LOG_FILE).read_text(encoding="utf-8")
+
+    def test_disabled_and_unknown_events_are_ignored(self, config):
+        with patch.object(config, "NOTIFY_ON_TOOL_USE", False):
+            assert build_notification(_tool_use("a", "Read"), config) is None
+        assert build_notification({"status": "STREAMING"}, config) is None
+        notifier = AsyncTelegramNotifier(config, logger=Logger(config))
+        assert notifier.submit_line("not json\n") is False
+        assert notifier.submit_line(json.dumps(_complete("a"))) is True
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestRateLimitScheduler:
+    """测试令牌桶与 retry_after 调度"""
+
+    def test_token_bucket(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=1, burst=2, clock=clock)
+        for _ in range(2):
+            assert bucket.delay() == 0
+            bucket.take()
+        assert bucket.delay() == pytest.approx(1.0)
+        clock.now += 0.5
+        assert bucket.delay() == pytest.approx(0.5)
+        assert TokenBucket(rate=0, burst=1, clock=clock).delay() == 0
+
+    def test_chat_and_global_limits(self):
+        clock = FakeClock()
+        scheduler = RateLimitScheduler(chat_rate=1, chat_burst=1, global_rate=2, global_burst=2, clock=clock)
+        assert scheduler.acquire("a") == 0
+        assert scheduler.acquire("a") == pytest.approx(1.0)  # 单个聊天限速
+        assert scheduler.acquire("b") == 0
+        assert scheduler.acquire("c") == pytest.approx(0.5)  # 全局令牌已用完
+        clock.now += 1
+        assert scheduler.acquire("c") == 0
+
+    def test_retry_after_blocks_chat(self):
+        clock = FakeClock()
+        scheduler = RateLimitScheduler(chat_rate=0, chat_burst=1, global_rate=0, global_burst=1, clock=clock)
+        scheduler.retry_after("a", 7)
+        assert scheduler.acquire("a") == pytest.approx(7)
+        assert scheduler.acquire("b") == 0
+        clock.now += 7
+        assert scheduler.acquire("a") == 0
+
+    def test_sync_retry_handler_honors_retry_after(self):
+        calls = iter([RateLimitError("Telegram API 限流", retry_after=4), True])
+
+        def func():
+            result = next(calls)
+            if isinstance(result, Exception):
+                raise result
+            return result
+
+        with patch("notify_telegram.time.sleep") as mock_sleep:
+            success, retry_count, _ = RetryHandler(max_retries=3, interval=1).execute_with_retry(func)
+        assert success and retry_count == 1
+        mock_sleep.assert_called_once_with(4)
+
+    def test_sync_send_raises_rate_limit_error(self, config):
+        body = b'{"ok": false, "error_code": 429, "description": "Too Many Requests", "parameters": {"retry_after": 9}}'
+        error = urllib.error.HTTPError("https://example", 429, "Too Many Requests", {}, BytesIO(body))
+        with (
+            patch.object(notify_telegram, "Config", config),
+            patch("notify_telegram.urllib.request.build_opener") as mock_builder,
+        ):
+            mock_builder.return_value.open.side_effect = error
+            with pytest.raises(notify_telegram.RateLimitError) as exc_info:
+                notify_telegram.send_telegram_message("hi")
+        assert exc_info.value.retry_after == 9
+
+
+class TestRateLimitedDelivery:
+    """测试异步通知器的限速、429 处理与优先级丢弃"""
+
+    def test_429_waits_retry_after_without_using_retries(self, stub, config):
+        stub.responses = [(429, {"ok": False, "error_code": 429, "description": "Too Many Requests",
+                                 "parameters": {"retry_after": 0.3}})]  # fmt: skip
+        notifier = AsyncTelegramNotifier(config, max_retries=0)
+
+        started = time.monotonic()
+        _run(notifier, [_complete("aaaa1111")])
+
+        assert time.monotonic() - started >= 0.3
+        assert len(stub.requests) == 2
+        assert notifier.stats()["sent"] == 1
+        assert notifier.stats()["rate_limited"] == 1
+        assert "retry_after=0.3s" in Path(config.LOG_FILE).read_text(encoding="utf-8")
+
+    def test_send_rate_is_limited(self, stub, config):
+        notifier = AsyncTelegramNotifier(
+            config, scheduler=RateLimitScheduler(chat_rate=20, chat_burst=1, global_rate=0, global_burst=1)
+        )
+
+        started = time.monotonic()
+        _run(notifier, [_complete(f"session-{i}") for i in range(5)])
+
+        assert len(stub.requests) == 5
+        assert time.monotonic() - started >= 0.19
+
+    def test_full_queue_drops_low_priority_first(self, stub, config):
+        notifier = AsyncTelegramNotifier(config, queue_size=2)
+        _run(
+            notifier,
+            [
+                _tool_use("aaaa1111", "Read"),
+                _complete("bbbb2222"),
+                _complete("cccc3333"),  # 丢弃排队中的工具调用
+                _tool_use("dddd4444", "Grep"),  # 队列中只剩高优先级通知，丢弃新来的工具调用
+            ],
+        )
+
+        texts = [request["text"] for request in stub.requests]
+        assert len(texts) == 2
+        assert "bbbb2222" in texts[0] and "cccc3333" in texts[1]
+        assert notifier.stats()["dropped"] == 2
+        log = Path(config.LOG_FILE).read_text(encoding="utf-8")
+        assert "丢弃: 2" in log
+
+
+def _question(session_id: str) -> dict:
+    return {
+        "session_id": session_id,
+        "status": "USER_QUESTION",
+        "timestamp": 1.0,
+        "questions": [{"question": "继续吗？", "header": "", "options": [], "multi_select": False}],
+    }
+
+
+def _segments(directory: Path) -> list[str]:
+    return sorted(path.name for path in directory.glob("spool-*.jsonl"))
+
+
+class TestNotificationSpool:
+    """测试未送达事件的磁盘 spool"""
+
+    def test_replay_returns_unacked_events_in_order(self, tmp_path):
+        spool = NotificationSpool(tmp_path)
+        assert spool.open() == []
+        for index in range(3):
+            assert spool.add(f"e{index}", {"n": index})
+        spool.ack(["e1"])
+        spool.close()
+
+        reopened = NotificationSpool(tmp_path)
+        assert reopened.open() == [{"n": 0}, {"n": 2}]
+        assert len(reopened) == 2
+        # 压缩后只剩一个分段，且只包含未确认的事件
+        assert _segments(tmp_path) == ["spool-000002.jsonl"]
+        records = [json.loads(line) for line in (tmp_path / "spool-000002.jsonl").read_text().splitlines()]
+        assert [record["id"] for record in records] == ["e0", "e2"]
+        reopened.close()
+
+    def test_duplicates_and_torn_lines(self, tmp_path):
+        segment = tmp_path / "spool-000007.jsonl"
+        segment.write_text(
+            '{"op": "add", "id": "a", "event": {"n": 1}}\n'
+            '{"op": "add", "id": "a", "event": {"n": 1}}\n'
+            '{"op": "add", "id": "b", "event": {"n": 2}}\n'
+            '{"op": "ack", "id": "b"}\n'
+            '{"op": "add", "id": "c", "ev',
+            encoding="utf-8",
+        )
+        spool = NotificationSpool(tmp_path)
+
+        assert spool.open() == [{"n": 1}]
+        assert spool.add("a", {"n": 1}) is False
+        assert _segments(tmp_path) == ["spool-000008.jsonl"]
+        spool.ack(["a"])
+        assert spool.add("a", {"n": 1}) is False  # 刚确认过的事件不再重复发送
+        spool.close()
+
+    def test_acknowledged_segments_are_removed(self, tmp_path):
+        spool = NotificationSpool(tmp_path, segment_bytes=200)
+        spool.open()
+        for index in range(20):
+            spool.add(f"e{index}", {"payload": "x" * 50})
+        assert len(_segments(tmp_path)) > 3
+
+        spool.ack([f"e{index}" for index in range(19)])
+        assert len(_segments(tmp_path)) == 1
+        spool.ack(["e19"])
+        assert len(spool) == 0
+        spool.close()
+        assert NotificationSpool(tmp_path).open() == []
+
+    def test_event_id(self):
+        assert event_id({"event_id": "x1", "a": 1}) == "x1"
+        assert event_id({"a": 1, "b": 2}) == event_id({"b": 2, "a": 1})
+        assert event_id({"a": 1}) != event_id({"a": 2})
+
+
+class TestSpooledDelivery:
+    """测试通知器与 spool 配合：至少一次送达"""
+
+    def test_failed_events_are_replayed_after_restart(self, stub, config, tmp_path):
+        spool_dir = tmp_path / "spool"
+        stub.responses = [(500, {"ok": False, "description": "down"})]
+        first = AsyncTelegramNotifier(config, max_retries=0, spool=NotificationSpool(spool_dir))
+        _run(first, [_question("aaaa1111"), _complete("bbbb2222")])
+
+        assert first.stats()["failed"] == 1
+        assert first.stats()["spooled"] == 1
+        assert "已保留在 spool" in Path(config.LOG_FILE).read_text(encoding="utf-8")
+
+        second = AsyncTelegramNotifier(config, spool=NotificationSpool(spool_dir))
+        _run(second, [_question("aaaa1111")])  # 上游重复发送的同一事件被去重
+
+        questions = [request for request in stub.requests if "继续吗" in request["text"]]
+        assert len(questions) == 2  # 失败一次 + 重启后重放成功
+        assert second.stats()["sent"] == 1
+        assert second.stats()["spooled"] == 0
+        assert "从 spool 恢复 1 条未送达事件" in Path(config.LOG_FILE).read_text(encoding="utf-8")
+
+    def test_superseded_and_merged_events_are_acknowledged(self, stub, config, tmp_path):
+        spool = NotificationSpool(tmp_path / "spool")
+        notifier = AsyncTelegramNotifier(config, spool=spool)
+        _run(
+            notifier,
+            [_tool_use("aaaa1111", "Read"), _tool_use("aaaa1111", "Edit"), _complete("aaaa1111")]
+            + [_tool_use("bbbb2222", name) for name in ("Grep", "Bash")],
+        )
+
+        assert len(stub.requests) == 2
+        assert len(spool) == 0
+        assert NotificationSpool(tmp_path / "spool").open() == []
+
+    def test_fsync_is_batched(self, stub, config, tmp_path):
+        notifier = AsyncTelegramNotifier(config, spool=NotificationSpool(tmp_path / "spool"))
+
+        async def scenario():
+            async with notifier:
+                with patch("notify_telegram.os.fsync") as mock_fsync:
+                    for index in range(10):
+                        notifier.submit(_complete(f"session-{index}"))
+                    await asyncio.sleep(0)
+                    return mock_fsync.call_count
+
+        assert asyncio.run(scenario()) == 1
+
+
+def test_run_notifier_reads_stream_until_eof(stub, config):
+    """stdin 在独立线程中读取，输入结束后发送完剩余通知再返回"""
+    stub.delay = 0.05
+    lines = "".join(json.dumps(_tool_use("aaaa1111", f"Tool{i}")) + "\n" for i in range(20))
+    notifier = AsyncTelegramNotifier(config)
+
+    asyncio.run(asyncio.wait_for(run_notifier(StringIO(lines + "\n"), notifier), timeout=10))
+
+    # 第一条发送期间其余事件已入队并合并
+    assert len(stub.requests) < 20
+    assert notifier.stats()["coalesced"] == 20 - len(stub.requests)
+    assert len(stub.connections) == 1
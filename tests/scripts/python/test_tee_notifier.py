@@ -6,8 +6,11 @@ Tests the TeeNotifier class which manages the notify_telegram.py subprocess:
 - Subprocess lifecycle (start/write/stop)
 - Error handling (broken pipe, subprocess crash)
 - Graceful shutdown
+
+and the InProcessNotifier sink that runs notify_telegram in-process.
 """
 
+import importlib
 import sys
 from io import StringIO
 from pathlib import Path
@@ -18,7 +21,7 @@ import pytest
 # Add project path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "scripts" / "python"))
 
-from claude_monitor import TeeNotifier
+from claude_monitor import InProcessNotifier, TeeNotifier
 
 
 class TestTeeNotifierLifecycle:
@@ -261,5 +264,74 @@ class TestTeeNotifierConcurrency:
         assert mock_stdin.write.call_count == 100
 
 
+class TestInProcessNotifier:
+    """Test the in-process notify_telegram sink."""
+
+    @pytest.fixture
+    def notify_config(self, telegram_stub, tmp_path):
+        # 通过模块查找 Config：其他测试会 reload notify_telegram
+        config = importlib.import_module("notify_telegram").Config
+        with patch.multiple(
+            config,
+            BOT_TOKEN="test-token",
+            CHAT_ID="42",
+            PROXY="",
+            API_BASE=telegram_stub.url,
+            LOG_FILE=str(tmp_path / "notify.log"),
+            SPOOL_DIR=str(tmp_path / "spool"),
+            CHAT_RATE=0,
+            GLOBAL_RATE=0,
+        ):
+            yield config
+
+    def test_events_are_sent_without_subprocess(self, telegram_stub, notify_config):
+        """Structured events reach Telegram; no subprocess is spawned and stdout is left to the bus."""
+        notifier = InProcessNotifier()
+        events = [
+            {"session_id": f"session-{i}", "status": "TASK_COMPLETE", "stop_reason": "end_turn", "output": "ok"}
+            for i in range(3)
+        ]
+
+        with (
+            patch("claude_monitor.subprocess.Popen") as mock_popen,
+            patch("sys.stdout", new_callable=StringIO) as mock_stdout,
+        ):
+            assert notifier.start() is True
+            for event in events:
+                notifier.notify(event)
+            notifier.stop()
+
+        mock_popen.assert_not_called()
+        assert mock_stdout.getvalue() == ""
+        assert len(telegram_stub.requests) == 3
+        assert "session-" in telegram_stub.requests[0]["text"]
+
+    def test_start_fails_when_notifier_cannot_load(self):
+        notifier = InProcessNotifier()
+        with patch("claude_monitor._load_notify_module", side_effect=ImportError("No module named 'httpx'")):
+            assert notifier.start() is False
+
+        # Events are dropped quietly; the monitor continues with stdout only
+        notifier.notify({"status": "TASK_COMPLETE"})
+        notifier.stop()
+
+    def test_subprocess_notifier_sends_json_line(self):
+        notifier = TeeNotifier()
+        with patch.object(notifier, "send") as mock_send:
+            notifier.notify({"status": "USER_QUESTION", "text": "继续？"})
+        mock_send.assert_called_once_with('{"status": "USER_QUESTION", "text": "继续？"}')
+
+    def test_notify_skips_stdout(self):
+        """notify() feeds only the subprocess; stdout belongs to its own event-bus sink."""
+        notifier = TeeNotifier()
+        notifier._process = MagicMock()
+
+        with patch("sys.stdout", new_callable=StringIO) as mock_stdout:
+            notifier.notify({"status": "TASK_COMPLETE"})
+
+        assert mock_stdout.getvalue() == ""
+        notifier._process.stdin.write.assert_called_once_with('{"status": "TASK_COMPLETE"}\n')
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -1,11 +1,14 @@
 """Tests for CLI i18n functionality."""
 
 import json
+import os
 import time
 from unittest.mock import patch
 
 from codexspec.translator import (
     _CLI_MESSAGES_EN,
+    MessageCatalog,
+    get_message_catalog,
     load_cli_translations,
     translate,
 )
@@ -197,6 +200,72 @@ class TestTranslate:
         assert result == "cli.init.nonexistent_key"
 
 
+class TestMessageCatalog:
+    """Tests for the process-wide memoized message catalog."""
+
+    def _write(self, translations_dir, messages, mtime_ns=None):
+        en_json = translations_dir / "en.json"
+        en_json.write_text(json.dumps({"cli": {"init": messages}}), encoding="utf-8")
+        if mtime_ns is not None:
+            os.utime(en_json, ns=(mtime_ns, mtime_ns))
+        return en_json
+
+    def test_catalog_parses_file_once(self, tmp_path):
+        """Repeated lookups should not re-read an unchanged locale file."""
+        translations_dir = tmp_path / "translations"
+        translations_dir.mkdir()
+        self._write(translations_dir, {"migration_found": "Found {count} old files"})
+
+        first = get_message_catalog("en", translations_dir)
+        with patch("codexspec.translator.json.loads") as mock_loads:
+            second = get_message_catalog("en", translations_dir)
+            assert second.format("cli.init.migration_found", count=2) == "Found 2 old files"
+        assert second is first
+        mock_loads.assert_not_called()
+
+    def test_catalog_invalidated_by_mtime(self, tmp_path):
+        """A rewritten locale file should be picked up on the next lookup."""
+        translations_dir = tmp_path / "translations"
+        translations_dir.mkdir()
+        self._write(translations_dir, {"migration_found": "Old {count}"}, mtime_ns=1_000_000_000)
+        assert get_message_catalog("en", translations_dir).format("cli.init.migration_found", count=1) == "Old 1"
+
+        self._write(translations_dir, {"migration_found": "New {count}"}, mtime_ns=2_000_000_000)
+        assert get_message_catalog("en", translations_dir).format("cli.init.migration_found", count=1) == "New 1"
+
+    def test_catalog_falls_back_when_file_removed(self, tmp_path):
+        """Deleting the locale file should switch back to the code baseline."""
+        translations_dir = tmp_path / "translations"
+        translations_dir.mkdir()
+        en_json = self._write(translations_dir, {"migration_found": "Custom {count}"})
+        assert get_message_catalog("en", translations_dir).format("cli.init.migration_found", count=1) == "Custom 1"
+
+        en_json.unlink()
+        result = get_message_catalog("en", translations_dir).format("cli.init.migration_found", count=1)
+        assert result == "Found 1 old structure command files"
+
+    def test_catalog_formats_like_str_format(self):
+        """Pre-split templates should render exactly like str.format."""
+        catalog = MessageCatalog(
+            {
+                "init": {
+                    "plain": "No fields here",
+                    "braces": "Literal {{braces}} and {name}",
+                    "spec": "Count: {count:>3}",
+                    "repeat": "{name}/{name}",
+                }
+            }
+        )
+        assert catalog.format("cli.init.plain") == "No fields here"
+        assert catalog.format("cli.init.braces", name="x") == "Literal {braces} and x"
+        assert catalog.format("cli.init.spec", count=7) == "Count:   7"
+        assert catalog.format("cli.init.repeat", name="a") == "a/a"
+        assert catalog.format("cli.init.repeat") == "{name}/{name}"
+        assert catalog.format("cli.init.unknown") == "cli.init.unknown"
+        assert catalog.format("cli.init") == "cli.init"
+        assert "cli.init.plain" in catalog
+
+
 class TestEdgeCases:
     """Tests for edge cases (Task 5.1)."""
 
@@ -0,0 +1,77 @@
+"""Cold-start budget for the codexspec CLI entry point.
+
+Measured with ``python -X importtime``. Importing ``codexspec`` should cost
+little beyond typer itself, and the light subcommands (``version``, ``config``,
+``list-commands``) must not import what only ``init`` needs: yaml, the
+integrations, or the rich widgets of other commands.
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+# Target for `import codexspec`, excluding typer: the package's own import cost.
+# Before lazy imports this was ~60ms (rich, yaml, installer, integrations); it is
+# now a few milliseconds. The budget leaves headroom for slow CI machines.
+IMPORT_BUDGET_US = 25_000
+
+_INIT_ONLY = {"yaml", "codexspec.integrations", "codexspec.profile", "rich.prompt"}
+
+
+def _importtime(code: str, cwd: Path) -> dict[str, tuple[int, int]]:
+    """Run ``code`` under ``-X importtime``; map module -> (self_us, cumulative_us)."""
+    env = {k: v for k, v in os.environ.items() if k != "PYTHONDONTWRITEBYTECODE"}
+    # Warm-up run writes bytecode so the measurement reflects a normal cold start
+    # rather than source compilation.
+    subprocess.run([sys.executable, "-c", code], cwd=cwd, env=env, capture_output=True, check=False)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code], cwd=cwd, env=env, capture_output=True, text=True
+    )
+    modules: dict[str, tuple[int, int]] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        if not self_us.strip().isdigit():
+            continue  # header row
+        modules.setdefault(name.strip(), (int(self_us), int(cumulative_us)))
+    return modules
+
+
+def _run_command(command: str) -> str:
+    return f"import sys; sys.argv=['codexspec', '{command}']; from codexspec import main; main()"
+
+
+def test_import_within_budget(tmp_path: Path) -> None:
+    modules = _importtime("import codexspec", tmp_path)
+
+    assert "codexspec" in modules
+    own_cost = modules["codexspec"][1] - modules.get("typer", (0, 0))[1]
+    assert own_cost < IMPORT_BUDGET_US, f"import codexspec took {own_cost}us beyond typer"
+    for deferred in _INIT_ONLY | {
+        "rich.console",
+        "rich.panel",
+        "rich.table",
+        "codexspec.translator",
+        "codexspec.commands.installer",
+    }:
+        assert deferred not in modules, f"{deferred} imported at module load"
+
+
+@pytest.mark.parametrize(
+    ("command", "deferred"),
+    [
+        ("version", _INIT_ONLY | {"rich.table", "codexspec.translator", "codexspec.commands.installer"}),
+        ("config", _INIT_ONLY | {"rich.table", "codexspec.translator", "codexspec.commands.installer"}),
+        ("list-commands", _INIT_ONLY | {"rich.table", "rich.panel"}),
+    ],
+)
+def test_light_commands_defer_init_dependencies(tmp_path: Path, command: str, deferred: set[str]) -> None:
+    modules = _importtime(_run_command(command), tmp_path)
+
+    assert "codexspec" in modules
+    imported = sorted(deferred & modules.keys())
+    assert not imported, f"codexspec {command} imported {imported}"
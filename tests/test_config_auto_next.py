@@ -74,6 +74,10 @@ class TestReadAutoNext:
     def test_missing_file_is_false(self, tmp_path: Path) -> None:
         assert _read_auto_next(tmp_path / "nope.yml") is False
 
+    def test_commented_section_header(self, tmp_path: Path) -> None:
+        cfg = _make_config(tmp_path, "workflow:  # toggles\n  auto_next: true\n")
+        assert _read_auto_next(cfg) is True
+
 
 class TestWriteAutoNext:
     """REQ-005 / REQ-006 / REQ-011: update, insert, append; preserve comments."""
@@ -100,6 +104,11 @@ class TestWriteAutoNext:
         # the pre-existing child is preserved
         assert "other: 1" in text
 
+    def test_update_under_commented_section_header(self, tmp_path: Path) -> None:
+        cfg = _make_config(tmp_path, "workflow:  # toggles\n  auto_next: false\n")
+        assert _write_auto_next(cfg, True) is True
+        assert cfg.read_text() == "workflow:  # toggles\n  auto_next: true\n"
+
     def test_append_section_when_absent(self, tmp_path: Path) -> None:
         cfg = _make_config(tmp_path, "language:\n  output: en\n")
         assert _write_auto_next(cfg, True) is True
@@ -0,0 +1,159 @@
+"""Tests for ProjectConfig (single-parse config.yml with batched edits)."""
+
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+from typer.testing import CliRunner
+
+from codexspec import app
+from codexspec.project_config import ProjectConfig
+
+CONFIG = """# CodexSpec Configuration
+version: "1.0"
+
+language:
+  output: "zh-CN"  # base language
+  document: en
+  # Template language
+  templates: "en"
+
+workflow:
+  auto_next: true  # chain
+
+project:
+  ai: "claude"
+  created: "2026-06-21"
+"""
+
+
+def _config(tmp_path: Path, body: str = CONFIG) -> Path:
+    config_file = tmp_path / "config.yml"
+    config_file.write_text(body, encoding="utf-8")
+    return config_file
+
+
+class TestQueries:
+    """Tests for reading values from the parsed config."""
+
+    def test_language_queries(self, tmp_path: Path) -> None:
+        project_config = ProjectConfig.load(_config(tmp_path))
+
+        assert project_config.language("output") == "zh-CN"
+        assert project_config.language("interaction") is None
+        assert project_config.resolve_language("interaction") == "zh-CN"
+        assert project_config.resolve_language("document") == "en"
+        assert project_config.get("project", "ai") == "claude"
+
+    def test_parsed_once(self, tmp_path: Path) -> None:
+        config_file = _config(tmp_path)
+        project_config = ProjectConfig.load(config_file)
+
+        with patch.object(Path, "read_text", side_effect=AssertionError("re-read")):
+            assert project_config.resolve_language("commit") == "zh-CN"
+            assert project_config.auto_next is True
+            assert project_config.auto_distill is True
+
+    def test_workflow_flags_need_literal_booleans(self, tmp_path: Path) -> None:
+        project_config = ProjectConfig.load(
+            _config(tmp_path, 'workflow:\n  auto_next: "true"\n  auto_distill: false  # off\n')
+        )
+
+        assert project_config.auto_next is False
+        assert project_config.auto_distill is False
+
+    def test_commented_section_headers(self, tmp_path: Path) -> None:
+        project_config = ProjectConfig.load(
+            _config(tmp_path, 'language:  # x\n  output: "ja"\n  document: # unset\nworkflow: # x\n  auto_next: true\n')
+        )
+
+        assert project_config.has_section("language")
+        assert project_config.language("output") == "ja"
+        assert project_config.get("language", "document") == ""
+        assert project_config.auto_next is True
+
+    def test_keys_are_scoped_to_their_section(self, tmp_path: Path) -> None:
+        project_config = ProjectConfig.load(_config(tmp_path, "project:\n  output: ja\n  auto_next: true\n"))
+
+        assert project_config.language("output") is None
+        assert project_config.auto_next is False
+
+    def test_missing_file(self, tmp_path: Path) -> None:
+        project_config = ProjectConfig.load(tmp_path / "missing.yml")
+
+        assert project_config.exists is False
+        assert project_config.resolve_language("interaction") == "en"
+        assert project_config.auto_distill is True
+
+
+class TestEdits:
+    """Tests for batched, comment-preserving edits."""
+
+    def test_batched_edits_write_once(self, tmp_path: Path) -> None:
+        config_file = _config(tmp_path)
+        project_config = ProjectConfig.load(config_file)
+
+        assert project_config.set_language("interaction", "japanese")
+        assert project_config.set_language("output", "en")
+        assert project_config.set_project_ai("both")
+        assert project_config.set_workflow_flag("auto_distill", False)
+        with patch("codexspec.project_config.os.replace", wraps=os.replace) as mock_replace:
+            assert project_config.save()
+
+        assert mock_replace.call_count == 1
+        reloaded = ProjectConfig.load(config_file)
+        assert reloaded.language("interaction") == "ja"
+        assert reloaded.language("output") == "en"
+        assert reloaded.get("project", "ai") == "both"
+        assert reloaded.auto_distill is False
+        text = config_file.read_text(encoding="utf-8")
+        assert "# CodexSpec Configuration" in text
+        assert "  # Template language" in text
+        assert "auto_next: true  # chain" in text
+        assert not (tmp_path / "config.yml.tmp").exists()
+
+    def test_unchanged_value_is_not_written(self, tmp_path: Path) -> None:
+        project_config = ProjectConfig.load(_config(tmp_path, 'language:\n  output: "en"\n'))
+
+        assert project_config.set_language("output", "en")
+        with patch("codexspec.project_config.os.replace") as mock_replace:
+            assert project_config.save()
+        mock_replace.assert_not_called()
+
+    def test_edit_under_commented_section_header(self, tmp_path: Path) -> None:
+        config_file = _config(tmp_path, "language:  # languages\n  output: en\n")
+        project_config = ProjectConfig.load(config_file)
+
+        assert project_config.set_language("interaction", "ja")
+        assert project_config.save()
+
+        text = config_file.read_text(encoding="utf-8")
+        assert text.count("language:") == 1
+        assert ProjectConfig.load(config_file).language("interaction") == "ja"
+
+    def test_language_key_needs_language_section(self, tmp_path: Path) -> None:
+        project_config = ProjectConfig.load(_config(tmp_path, 'version: "1.0"\nlanguage: en\n'))
+
+        assert project_config.set_language("interaction", "ja") is False
+        assert project_config.set_project_ai("codex") is False
+
+
+def test_init_on_existing_config_writes_config_once(tmp_path: Path) -> None:
+    """Re-running init with several language flags edits config.yml in one write."""
+    runner = CliRunner()
+    project = tmp_path / "p"
+    assert runner.invoke(app, ["init", str(project), "--no-git", "--lang", "en"]).exit_code == 0
+
+    with patch("codexspec.project_config.os.replace", wraps=os.replace) as mock_replace:
+        result = runner.invoke(
+            app,
+            ["init", str(project), "--no-git", "--force", "--ai", "both", "--lang", "ja", "--commit-lang", "en"],
+        )
+
+    assert result.exit_code == 0, result.output
+    config_writes = [call for call in mock_replace.call_args_list if Path(call.args[1]).name == "config.yml"]
+    assert len(config_writes) == 1
+    project_config = ProjectConfig.load(project / ".codexspec" / "config.yml")
+    assert project_config.language("output") == "ja"
+    assert project_config.language("commit") == "en"
+    assert project_config.get("project", "ai") == "both"